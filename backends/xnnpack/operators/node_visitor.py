@@ -4,11 +4,10 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import ctypes
-import hashlib
-import logging
 
-from typing import cast, Dict, List, Optional, Tuple
+from typing import cast, Dict, Hashable, List, Optional, Tuple
 
 import torch
 from executorch.backends.transforms import get_shape
@@ -18,6 +17,10 @@ from executorch.backends.xnnpack._passes.channels_last_tagged_reshape_pass impor
 )
 
 from executorch.backends.xnnpack.operators.quant_params import QuantParams
+from executorch.backends.xnnpack.operators.weight_preparation import (
+    tensor_cache_key,
+    WeightPreparer,
+)
 
 from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
     ConstantDataOffset,
@@ -51,10 +54,6 @@ XNN_TYPE_MAP = {
     torch.float32: XNNDatatype.xnn_datatype_fp32,
 }
 
-from executorch.backends.xnnpack.serialization.xnnpack_graph_serialize import (
-    CONSTANT_TENSOR_ALIGNMENT,
-)
-
 
 class InputTypeToIndex:
     """
@@ -91,10 +90,14 @@ class NodeVisitor:
         exported_program: ExportedProgram,
         external_ids: Dict,
         named_data_store: NamedDataStore,
+        weight_preparer: Optional[WeightPreparer] = None,
     ) -> None:
         self._external_ids = external_ids or {}
         self._exported_program = exported_program or None
         self._named_data_store = named_data_store
+        self._weight_preparer: WeightPreparer = weight_preparer or WeightPreparer(
+            named_data_store
+        )
 
     @property
     def external_ids(self) -> Dict:
@@ -290,14 +293,12 @@ class NodeVisitor:
                 scale.untyped_storage().data_ptr(),
                 ctypes.POINTER(ctypes.c_char * num_bytes),
             ).contents
-            scale_name = hashlib.sha256(bytes(scale_array)).hexdigest()
-            xnn_graph.constant_data.append(
-                ConstantDataOffset(
-                    offset=UINT64_MAX, size=num_bytes, named_key=scale_name
-                )
-            )
-            self._named_data_store.add_named_data(
-                scale_name, bytes(scale_array), CONSTANT_TENSOR_ALIGNMENT
+            # The scales are added after the weights visited before them, so
+            # that the named data keeps the order of the constant data.
+            constant_data = ConstantDataOffset(offset=UINT64_MAX, size=0)
+            xnn_graph.constant_data.append(constant_data)
+            self._weight_preparer.add_data(
+                constant_data, bytes(scale_array), f"{quant_params.q_input}_scale"
             )
 
             if quant_params.is_per_channel_group:
@@ -522,6 +523,68 @@ class NodeVisitor:
         inp = inp.contiguous().view(-1)
         return (inp[1::2] << 4 | inp[::2]).view(oc, int(ic / 2))
 
+    @staticmethod
+    def _quant_params_cache_key(quant_params: Optional[QuantParams]) -> Hashable:
+        """Returns the parameters of quant_params that _transform_constant()
+        depends on, including every field read by QuantParams.quantize_tensor()."""
+        if quant_params is None:
+            return None
+        return (
+            quant_params.is_dynamic,
+            quant_params.is_qc4w,
+            quant_params.per_channel,
+            quant_params.per_channel_group,
+            quant_params.group_size,
+            quant_params.dtype,
+            quant_params.qmin,
+            quant_params.qmax,
+            quant_params.axis,
+            tensor_cache_key(quant_params.scale),
+            tensor_cache_key(quant_params.zp),
+        )
+
+    def _transform_constant(
+        self,
+        const_val: torch.Tensor,
+        convert_to_nhwc: bool,
+        swap_in_out_for_weights: bool,
+        quant_params: Optional[QuantParams],
+        force_fp32: bool,
+        groups: int,
+    ) -> torch.Tensor:
+        """
+        Quantizes and lays out constant data the way XNNPACK expects it. See
+        get_serialized_buffer_index() for the arguments.
+        """
+        const_val = const_val.contiguous()
+
+        # Quantize buffer if static data is indeed quantized
+        if quant_params is not None and not quant_params.is_dynamic:
+            const_val = quant_params.quantize_tensor(const_val).contiguous()
+        elif const_val.dtype != torch.float16 or force_fp32:
+            # ensure that the const is fp32
+            const_val = const_val.to(dtype=torch.float32).contiguous()
+
+        if swap_in_out_for_weights:
+            # Permute and reshape the tensor from (inc, oc/groups, height, width) to (oc, inc/groups, height, width)
+            # which should be used for depthwise/transpose convolution weights for XNNPACK
+            shape = const_val.shape
+            const_val = const_val.reshape(
+                (groups, const_val.shape[0] // groups) + tuple(const_val.shape[1:])
+            )
+            const_val = const_val.permute((0, 2, 1) + tuple(range(3, const_val.dim())))
+            const_val = const_val.reshape(
+                (shape[1] * groups, shape[0] // groups) + tuple(shape[2:])
+            ).contiguous()
+
+        if convert_to_nhwc:
+            const_val = const_val.to(memory_format=torch.channels_last)
+
+        if quant_params is not None and quant_params.is_qc4w:
+            const_val = self.convert_to_qc4w(const_val)
+
+        return const_val
+
     def get_serialized_buffer_index(
         self,
         tensor: torch.fx.Node,
@@ -575,61 +638,34 @@ class NodeVisitor:
         buffer_idx = len(xnn_graph.constant_data)
         const_val = get_param_tensor(self.exported_program, get_attr_node)
         assert const_val is not None and isinstance(const_val, torch.Tensor)
-        const_val = const_val.contiguous()
 
-        # Quantize buffer if static data is indeed quantized
-        if quant_params is not None and not quant_params.is_dynamic:
-            const_val = quant_params.quantize_tensor(const_val).contiguous()
-        elif const_val.dtype != torch.float16 or force_fp32:
-            # ensure that the const is fp32
-            const_val = const_val.to(dtype=torch.float32).contiguous()
-
-        if swap_in_out_for_weights:
-            # Permute and reshape the tensor from (inc, oc/groups, height, width) to (oc, inc/groups, height, width)
-            # which should be used for depthwise/transpose convolution weights for XNNPACK
-            shape = const_val.shape
-            const_val = const_val.reshape(
-                (groups, const_val.shape[0] // groups) + tuple(const_val.shape[1:])
-            )
-            const_val = const_val.permute((0, 2, 1) + tuple(range(3, const_val.dim())))
-            const_val = const_val.reshape(
-                (shape[1] * groups, shape[0] // groups) + tuple(shape[2:])
-            ).contiguous()
-
-        if convert_to_nhwc:
-            const_val = const_val.to(memory_format=torch.channels_last)
-
-        if quant_params is not None and quant_params.is_qc4w:
-            const_val = self.convert_to_qc4w(const_val)
-
-        size = const_val.untyped_storage().nbytes()
-        array_type = ctypes.c_char * size
-        array = ctypes.cast(
-            const_val.untyped_storage().data_ptr(),
-            ctypes.POINTER(array_type),
-        ).contents
-
-        check_or_raise(
-            size > 0,
-            f"Serializing constant data node {tensor} but tensor value has no bytes",
-        )
-        sha256_hash = hashlib.sha256(bytes(array))
-        named_key = sha256_hash.hexdigest()
-
-        size = const_val.untyped_storage().nbytes()
-        xnn_graph.constant_data.append(
-            ConstantDataOffset(offset=UINT64_MAX, size=size, named_key=named_key)
-        )
-
-        external_tag = tensor.meta.get("delegate_constant_tag", None)
-        logging.info(
-            f"Adding constant data with name {tensor.name}, key {named_key} and external_tag {external_tag} to named_data_store"
-        )
-        self._named_data_store.add_named_data(
-            named_key,
-            bytes(array),
-            alignment=CONSTANT_TENSOR_ALIGNMENT,
-            external_tag=external_tag,
+        # The size and key are filled in once the weight has been prepared.
+        constant_data = ConstantDataOffset(offset=UINT64_MAX, size=0)
+        xnn_graph.constant_data.append(constant_data)
+        # The weight may be transformed on another thread, after define_tensor()
+        # has swapped the per channel axis of quant_params for the serialized
+        # tensor, so the transform gets a copy of the parameters as they are now.
+        quant_params = copy.copy(quant_params)
+        self._weight_preparer.add(
+            constant_data,
+            const_val,
+            (
+                convert_to_nhwc,
+                swap_in_out_for_weights,
+                self._quant_params_cache_key(quant_params),
+                force_fp32,
+                groups,
+            ),
+            lambda const_val: self._transform_constant(
+                const_val,
+                convert_to_nhwc,
+                swap_in_out_for_weights,
+                quant_params,
+                force_fp32,
+                groups,
+            ),
+            tensor.name,
+            tensor.meta.get("delegate_constant_tag", None),
         )
 
         return buffer_idx
@@ -0,0 +1,303 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import ctypes
+import hashlib
+import logging
+import threading
+import weakref
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+import torch
+from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
+    ConstantDataOffset,
+)
+from executorch.backends.xnnpack.serialization.xnnpack_graph_serialize import (
+    CONSTANT_TENSOR_ALIGNMENT,
+)
+from executorch.backends.xnnpack.utils.utils import check_or_raise
+from executorch.exir._serialize._named_data_store import NamedDataStore
+
+
+@dataclass
+class PreparedWeight:
+    """The serialized bytes of a transformed constant, and their sha256 digest
+    which is used as the key of the data in the NamedDataStore."""
+
+    data: bytes
+    named_key: str
+
+
+def tensor_cache_key(value: Union[torch.Tensor, float, int]) -> Hashable:
+    """Returns a hashable key for a scalar or a tensor, equal for tensors with
+    the same dtype, shape and contents. Meant for small tensors, like
+    quantization scales and zero points."""
+    if not isinstance(value, torch.Tensor):
+        return value
+    data = value.detach().contiguous().reshape(-1).view(torch.uint8).numpy()
+    return value.dtype, tuple(value.shape), hashlib.sha256(data).digest()
+
+
+def prepare_weight(
+    source: torch.Tensor,
+    transform: Callable[[torch.Tensor], torch.Tensor],
+    name: str,
+) -> PreparedWeight:
+    """Transforms `source` and returns the bytes of the storage of the result.
+    The storage is hashed in place and copied once."""
+    const_val = transform(source)
+    size = const_val.untyped_storage().nbytes()
+    check_or_raise(
+        size > 0,
+        f"Serializing constant data node {name} but tensor value has no bytes",
+    )
+    array = ctypes.cast(
+        const_val.untyped_storage().data_ptr(),
+        ctypes.POINTER(ctypes.c_char * size),
+    ).contents
+    view = memoryview(array).cast("B")
+    return PreparedWeight(data=bytes(view), named_key=hashlib.sha256(view).hexdigest())
+
+
+# Number of evenly spaced elements of a weight sampled for its fingerprint.
+_NUM_SAMPLES = 64
+
+
+def _fingerprint(source: torch.Tensor) -> Hashable:
+    """Returns a cheap fingerprint of a tensor: its dtype, shape and a hash of a
+    few sampled elements. Equal tensors have equal fingerprints."""
+    flat = source.detach().reshape(-1)
+    if flat.numel() > _NUM_SAMPLES:
+        flat = flat[torch.linspace(0, flat.numel() - 1, _NUM_SAMPLES, dtype=torch.long)]
+    samples = flat.contiguous().view(torch.uint8).numpy().tobytes()
+    return source.dtype, tuple(source.shape), hash(samples)
+
+
+class WeightCache:
+    """
+    Caches prepared weights by source tensor contents and transform parameters,
+    so that a weight shared by several partitions or methods, e.g. a tied
+    embedding and LM head, is only transformed and hashed once. Partitioners
+    copy constants used by several partitions, and every method has its own
+    copy of the weights, so the same weight usually comes from several tensors.
+
+    Weights are looked up by a sampled fingerprint of their source tensor, and
+    then compared in full with torch.equal(). Entries only hold a weak
+    reference to their source tensor, and are dropped when it is garbage
+    collected or not used if it was modified in place.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (fingerprint, params) -> [(source, source version, prepared weight)].
+        self._buckets: Dict[
+            Hashable,
+            List[Tuple["weakref.ref[torch.Tensor]", int, PreparedWeight]],
+        ] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(bucket) for bucket in self._buckets.values())
+
+    def get(self, source: torch.Tensor, params: Hashable) -> Optional[PreparedWeight]:
+        with self._lock:
+            bucket = list(self._buckets.get((_fingerprint(source), params), ()))
+        for ref, version, prepared in bucket:
+            candidate = ref()
+            if candidate is None or candidate._version != version:
+                continue
+            if candidate is source or torch.equal(candidate, source):
+                return prepared
+        return None
+
+    def put(
+        self, source: torch.Tensor, params: Hashable, prepared: PreparedWeight
+    ) -> None:
+        key = (_fingerprint(source), params)
+
+        def evict(ref: "weakref.ref[torch.Tensor]") -> None:
+            with self._lock:
+                bucket = [
+                    entry for entry in self._buckets.get(key, ()) if entry[0] is not ref
+                ]
+                if bucket:
+                    self._buckets[key] = bucket
+                else:
+                    self._buckets.pop(key, None)
+
+        with self._lock:
+            self._buckets.setdefault(key, []).append(
+                (weakref.ref(source, evict), source._version, prepared)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# Set by share_prepared_weights() while weights are shared between partitions.
+_shared_weight_cache: Optional[WeightCache] = None
+
+
+@contextmanager
+def share_prepared_weights() -> Iterator[WeightCache]:
+    """
+    Shares prepared weights between all the XNNPACK partitions preprocessed
+    within this block, including those of other methods, e.g. a tied embedding
+    and LM head lowered to separate delegates. Outside of it, each preprocess()
+    call only reuses the weights it prepared itself.
+
+    Entries are matched by contents rather than tensor identity, so the cache
+    must only be shared while the weights it has seen are not modified.
+    """
+    global _shared_weight_cache
+    previous = _shared_weight_cache
+    cache = previous if previous is not None else WeightCache()
+    _shared_weight_cache = cache
+    try:
+        yield cache
+    finally:
+        _shared_weight_cache = previous
+
+
+@dataclass
+class _PendingWeight:
+    constant_data: ConstantDataOffset
+    # None for data added with add_data(), which is not cached.
+    source: Optional[torch.Tensor]
+    params: Hashable
+    prepared: "Future[PreparedWeight]"
+    cached: bool
+    name: str
+    external_tag: Optional[str]
+
+
+class WeightPreparer:
+    """
+    Prepares the constant data of a partition. Weights are transformed on the
+    given executor while the nodes of the partition are visited, and all
+    constant data is added to the NamedDataStore in the order it was added to
+    the preparer by flush(). Without an executor, constant data is prepared and
+    added right away.
+
+    Without a cache, prepared weights are cached by this preparer only, unless
+    share_prepared_weights() is active.
+    """
+
+    def __init__(
+        self,
+        named_data_store: NamedDataStore,
+        executor: Optional[Executor] = None,
+        cache: Optional[WeightCache] = None,
+    ) -> None:
+        self._named_data_store = named_data_store
+        self._executor = executor
+        if cache is None:
+            cache = _shared_weight_cache
+        self._cache: WeightCache = cache if cache is not None else WeightCache()
+        self._pending: List[_PendingWeight] = []
+        # Weights being prepared, by (id(source), params).
+        self._in_flight: Dict[Tuple[int, Hashable], "Future[PreparedWeight]"] = {}
+
+    def add(
+        self,
+        constant_data: ConstantDataOffset,
+        source: torch.Tensor,
+        params: Hashable,
+        transform: Callable[[torch.Tensor], torch.Tensor],
+        name: str,
+        external_tag: Optional[str] = None,
+    ) -> None:
+        """
+        Prepares `transform(source)` for `constant_data`, whose size and named
+        key are filled in when the weight is added to the NamedDataStore.
+
+        Args:
+            constant_data: Entry of the XNNGraph's constant data to fill in.
+            source: The constant tensor in the exported program.
+            params: Hashable parameters of `transform`. Weights are reused for
+                the same source and parameters.
+            transform: Converts the source tensor to the tensor to serialize.
+            name: Name of the node of the constant, for error messages.
+            external_tag: The external file to store the weight in, if any.
+        """
+        prepared = None
+        cached = self._cache.get(source, params)
+        if cached is not None:
+            prepared = Future()
+            prepared.set_result(cached)
+        else:
+            prepared = self._in_flight.get((id(source), params))
+        if prepared is None:
+            if self._executor is None:
+                prepared = Future()
+                prepared.set_result(prepare_weight(source, transform, name))
+            else:
+                prepared = self._executor.submit(
+                    prepare_weight, source, transform, name
+                )
+            self._in_flight[(id(source), params)] = prepared
+        self._pending.append(
+            _PendingWeight(
+                constant_data,
+                source,
+                params,
+                prepared,
+                cached is not None,
+                name,
+                external_tag,
+            )
+        )
+        if self._executor is None:
+            self.flush()
+
+    def add_data(
+        self,
+        constant_data: ConstantDataOffset,
+        data: bytes,
+        name: str,
+        external_tag: Optional[str] = None,
+    ) -> None:
+        """
+        Adds constant data that is already serialized, e.g. quantization
+        scales, for `constant_data` after the weights added before it.
+        """
+        prepared = Future()
+        prepared.set_result(
+            PreparedWeight(data=data, named_key=hashlib.sha256(data).hexdigest())
+        )
+        self._pending.append(
+            _PendingWeight(
+                constant_data, None, None, prepared, True, name, external_tag
+            )
+        )
+        if self._executor is None:
+            self.flush()
+
+    def flush(self) -> None:
+        """Waits for the pending weights and adds them to the NamedDataStore,
+        in the order they were added to this preparer."""
+        pending, self._pending = self._pending, []
+        self._in_flight.clear()
+        for weight in pending:
+            prepared = weight.prepared.result()
+            if not weight.cached:
+                assert weight.source is not None
+                self._cache.put(weight.source, weight.params, prepared)
+            weight.constant_data.size = len(prepared.data)
+            weight.constant_data.named_key = prepared.named_key
+            logging.info(
+                f"Adding constant data with name {weight.name}, key {prepared.named_key} and external_tag {weight.external_tag} to named_data_store"
+            )
+            self._named_data_store.add_named_data(
+                prepared.named_key,
+                prepared.data,
+                alignment=CONSTANT_TENSOR_ALIGNMENT,
+                external_tag=weight.external_tag,
+            )
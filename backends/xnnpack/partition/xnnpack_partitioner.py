@@ -36,11 +36,14 @@ class XnnpackPartitioner(ConfigerationBasedPartitioner):
         ] = None,
         per_op_mode=False,
         verbose: bool = False,
+        merge_by_level: bool = False,
         **kwargs,
     ):
         """
         @verbose: if True, print out more information about the partitioner.
             Default level is WARNING. If verbose is True, level is set to DEBUG.
+        @merge_by_level: if True, merge matched nodes with propose_partitions_by_level,
+            which scales to very large graphs but may propose more partitions.
         """
         if verbose:
             logger.setLevel(logging.DEBUG)
@@ -63,7 +66,7 @@ class XnnpackPartitioner(ConfigerationBasedPartitioner):
         # per_op_mode takes the first match from a partitioner config, any
         # subsequent matches that overlap with the first match are not partitioned
         self.per_op_mode = per_op_mode
-        super().__init__(delegation_spec, initialized_configs)
+        super().__init__(delegation_spec, initialized_configs, merge_by_level)
 
     def generate_partitions(self, ep: ExportedProgram) -> List[Partition]:
         """
@@ -4,6 +4,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import functools
 import json
 
 import logging
@@ -18,6 +19,11 @@ from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import XNNGr
 from executorch.exir._serialize._dataclass import _DataclassEncoder
 
 from executorch.exir._serialize._flatbuffer import _flatc_compile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_dataclass
+from executorch.exir._serialize._flatbuffer_schema import (
+    _FlatbufferSchema,
+    _parse_flatbuffer_schema,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
@@ -301,19 +307,21 @@ def pretty_print_xnngraph(xnnpack_graph_json: str, filename: Optional[str] = Non
 _delegate_instance_id = 0
 
 
-def convert_to_flatbuffer(xnnpack_graph: XNNGraph) -> bytes:
-    global _delegate_instance_id
-    sanity_check_xnngraph_dataclass(xnnpack_graph)
-    xnnpack_graph_json = json.dumps(xnnpack_graph, cls=_DataclassEncoder)
-
-    # Log the XNNGraph if debugging
-    if logger.getEffectiveLevel() == logging.DEBUG:
-        filename: str = f"./xnnpack_delegate_graph_{_delegate_instance_id}.json"
-        logger.debug(f"Writing XNNGraph to {filename}")
-        pretty_print_xnngraph(xnnpack_graph_json, filename)
+@functools.lru_cache(maxsize=None)
+def _get_schema() -> _FlatbufferSchema:
+    """Returns the parsed XNNGraph schema. Cached, since it never changes."""
+    return _parse_flatbuffer_schema(
+        {"schema.fbs": pkg_resources.resource_string(__name__, "schema.fbs")},
+        "schema.fbs",
+    )
 
-    _delegate_instance_id += 1
 
+def _convert_to_flatbuffer_with_flatc(xnnpack_graph: XNNGraph) -> bytes:
+    """Converts the XNNGraph to a flatbuffer through JSON and the flatc
+    executable. Produces the same data as convert_to_flatbuffer(), one flatc
+    process per graph.
+    """
+    xnnpack_graph_json = json.dumps(xnnpack_graph, cls=_DataclassEncoder)
     with tempfile.TemporaryDirectory() as d:
         schema_path = os.path.join(d, "schema.fbs")
         with open(schema_path, "wb") as schema_file:
@@ -328,6 +336,25 @@ def convert_to_flatbuffer(xnnpack_graph: XNNGraph) -> bytes:
             return output_file.read()
 
 
+def convert_to_flatbuffer(xnnpack_graph: XNNGraph) -> bytes:
+    global _delegate_instance_id
+    sanity_check_xnngraph_dataclass(xnnpack_graph)
+
+    # Log the XNNGraph if debugging
+    if logger.getEffectiveLevel() == logging.DEBUG:
+        filename: str = f"./xnnpack_delegate_graph_{_delegate_instance_id}.json"
+        logger.debug(f"Writing XNNGraph to {filename}")
+        pretty_print_xnngraph(
+            json.dumps(xnnpack_graph, cls=_DataclassEncoder), filename
+        )
+
+    _delegate_instance_id += 1
+
+    # Build the flatbuffer in-process: a model lowered with per-op partitions
+    # has one graph per op, too many to run flatc for each of them.
+    return bytes(_serialize_dataclass(_get_schema(), xnnpack_graph).to_cord())
+
+
 def serialize_xnnpack_binary(
     xnnpack_graph: XNNGraph, constant_data_bytes: bytearray
 ) -> bytes:
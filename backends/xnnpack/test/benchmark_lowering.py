@@ -0,0 +1,109 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmarks lowering a model with many XNNPACK partitions.
+
+Usage:
+    python -m executorch.backends.xnnpack.test.benchmark_lowering
+
+Lowers a stack of Linear/ReLU layers with XnnpackPartitioner(per_op_mode=True),
+which creates one delegate per op, serializing each XNNGraph either in-process
+or through JSON and one flatc process per graph. Both must produce the same
+program.
+"""
+
+import argparse
+import time
+from typing import Callable, Tuple
+from unittest.mock import patch
+
+import torch
+from executorch.backends.xnnpack.partition.xnnpack_partitioner import XnnpackPartitioner
+from executorch.backends.xnnpack.serialization import xnnpack_graph_serialize
+from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import XNNGraph
+from executorch.exir import to_edge
+
+
+class _Layers(torch.nn.Module):
+    def __init__(self, num_layers: int, dim: int) -> None:
+        super().__init__()
+        self.layers = torch.nn.Sequential(
+            *(
+                module
+                for _ in range(num_layers)
+                for module in (torch.nn.Linear(dim, dim), torch.nn.ReLU())
+            )
+        )
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.layers(x)
+
+
+def _lower(
+    model: torch.nn.Module,
+    example_inputs: Tuple[torch.Tensor, ...],
+    convert: Callable[[XNNGraph], bytes],
+) -> Tuple[float, float, int, bytes]:
+    """Lowers and serializes the model, converting each XNNGraph with
+    `convert`. Returns the total time, the time spent converting, the number of
+    graphs and the serialized program."""
+    convert_time = 0.0
+    num_graphs = 0
+
+    def timed_convert(xnnpack_graph: XNNGraph) -> bytes:
+        nonlocal convert_time, num_graphs
+        start = time.perf_counter()
+        data = convert(xnnpack_graph)
+        convert_time += time.perf_counter() - start
+        num_graphs += 1
+        return data
+
+    start = time.perf_counter()
+    with patch.object(xnnpack_graph_serialize, "convert_to_flatbuffer", timed_convert):
+        edge = to_edge(torch.export.export(model, example_inputs)).to_backend(
+            XnnpackPartitioner(per_op_mode=True)
+        )
+    total_time = time.perf_counter() - start
+    return total_time, convert_time, num_graphs, edge.to_executorch().buffer
+
+
+def _convert_with_flatc(xnnpack_graph: XNNGraph) -> bytes:
+    xnnpack_graph_serialize.sanity_check_xnngraph_dataclass(xnnpack_graph)
+    return xnnpack_graph_serialize._convert_to_flatbuffer_with_flatc(xnnpack_graph)
+
+
+def bench(num_layers: int, dim: int) -> None:
+    model = _Layers(num_layers, dim).eval()
+    example_inputs = (torch.randn(1, dim),)
+    flatc_total, flatc_convert, num_graphs, flatc_program = _lower(
+        model, example_inputs, _convert_with_flatc
+    )
+    total, convert, _, program = _lower(
+        model, example_inputs, xnnpack_graph_serialize.convert_to_flatbuffer
+    )
+    assert program == flatc_program, "Programs differ"
+    print(
+        f"{num_layers:>8} {num_graphs:>10} {flatc_total:10.3f} s {total:10.3f} s "
+        + f"{flatc_convert:10.3f} s {convert:10.3f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-layers", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--dim", type=int, default=64)
+    args = parser.parse_args()
+
+    print(
+        f"{'layers':>8} {'delegates':>10} {'flatc':>12} {'in-process':>12} "
+        + f"{'flatc ser.':>12} {'in-proc ser.':>12}"
+    )
+    for num_layers in args.num_layers:
+        bench(num_layers, args.dim)
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -8,11 +8,26 @@ import unittest
 
 from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
     ConstantDataOffset,
+    OutputMinMax,
+    PerChannelGroupQuant,
+    PerChannelQuant,
+    PerTensorQuant,
+    PerTokenDynamicQuant,
+    XNNAdd,
+    XNNDatatype,
+    XNNFullyConnected,
     XNNGraph,
+    XNNQuantizedTensorValue,
+    XNNStaticReshape,
+    XNNTensorValue,
+    XNode,
+    XValue,
 )
 
 from executorch.backends.xnnpack.serialization.xnnpack_graph_serialize import (
+    _convert_to_flatbuffer_with_flatc,
     _HEADER_BYTEORDER,
+    convert_to_flatbuffer,
     serialize_xnnpack_binary,
     XNNHeader,
 )
@@ -48,3 +63,59 @@ class TestSerialization(unittest.TestCase):
         self.assertEqual(
             serialized_binary[flatbuffer_offset:][XNNHeader.MAGIC_OFFSET], b"XN01"
         )
+
+    def test_convert_to_flatbuffer_matches_flatc(self):
+        def tensor_value(id_out, datatype=XNNDatatype.xnn_datatype_fp32):
+            return XNNTensorValue(
+                datatype=datatype,
+                num_dims=2,
+                dims=[1, 4],
+                constant_buffer_idx=0,
+                external_id=0,
+                flags=0,
+                id_out=id_out,
+            )
+
+        def quantized_value(id_out, datatype, quant_params):
+            return XValue(
+                XNNQuantizedTensorValue(tensor_value(id_out, datatype), quant_params)
+            )
+
+        xnn_graph = XNNGraph(
+            version="0",
+            xnodes=[
+                XNode(XNNAdd(0, 1, 2, 0), 0, OutputMinMax(0.0, "inf")),
+                XNode(XNNFullyConnected(2, 3, 4, 5, 0), 1),
+                XNode(XNNStaticReshape(2, [2, 2], 5, 6, 0), 2),
+            ],
+            xvalues=[
+                XValue(tensor_value(0)),
+                quantized_value(
+                    3,
+                    XNNDatatype.xnn_datatype_qcint8,
+                    PerChannelQuant([0.5, 0.25], 0, scale_buffer_idx=0, num_scales=2),
+                ),
+                quantized_value(
+                    4, XNNDatatype.xnn_datatype_qint8, PerTensorQuant(0.1, 3)
+                ),
+                quantized_value(
+                    5,
+                    XNNDatatype.xnn_datatype_qbint4,
+                    PerChannelGroupQuant(
+                        [1.0, 2.0], 0, 32, scale_buffer_idx=1, num_scales=2
+                    ),
+                ),
+                quantized_value(
+                    6, XNNDatatype.xnn_datatype_qdint8, PerTokenDynamicQuant(1)
+                ),
+            ],
+            num_externs=2,
+            input_ids=[0, 1],
+            output_ids=[6],
+            constant_data=[ConstantDataOffset(0, 0), ConstantDataOffset(16, 32, "w")],
+        )
+
+        self.assertEqual(
+            convert_to_flatbuffer(xnn_graph),
+            _convert_to_flatbuffer_with_flatc(xnn_graph),
+        )
@@ -0,0 +1,249 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import gc
+import hashlib
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import torch
+from executorch.backends.xnnpack import xnnpack_preprocess
+from executorch.backends.xnnpack.operators import weight_preparation
+from executorch.backends.xnnpack.operators.node_visitor import NodeVisitor
+from executorch.backends.xnnpack.operators.weight_preparation import (
+    prepare_weight,
+    PreparedWeight,
+    share_prepared_weights,
+    WeightCache,
+    WeightPreparer,
+)
+from executorch.backends.xnnpack.partition.xnnpack_partitioner import XnnpackPartitioner
+from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
+    ConstantDataOffset,
+)
+from executorch.backends.xnnpack.utils.xnnpack_constants import UINT64_MAX
+from executorch.backends.xnnpack.xnnpack_preprocess import XnnpackBackend
+from executorch.exir import to_edge
+from executorch.exir._serialize._named_data_store import NamedDataStore
+
+
+class TestWeightPreparation(unittest.TestCase):
+    def test_prepare_weight(self) -> None:
+        weight = torch.randn(2, 3, 4, 4)
+        prepared = prepare_weight(
+            weight, lambda t: t.to(memory_format=torch.channels_last), "weight"
+        )
+        # Channels last storage is in NHWC order.
+        expected = weight.permute(0, 2, 3, 1).contiguous().numpy().tobytes()
+        self.assertEqual(prepared.data, expected)
+        self.assertEqual(prepared.named_key, hashlib.sha256(expected).hexdigest())
+
+    def test_cache_matches_contents(self) -> None:
+        cache = WeightCache()
+        weight = torch.randn(8, 8)
+        prepared = PreparedWeight(b"\x00", "key")
+        cache.put(weight, "params", prepared)
+
+        self.assertIs(cache.get(weight, "params"), prepared)
+        self.assertIs(cache.get(weight.clone(), "params"), prepared)
+        self.assertIsNone(cache.get(weight, "other params"))
+        self.assertIsNone(cache.get(weight + 1, "params"))
+
+    def test_cache_skips_modified_source(self) -> None:
+        cache = WeightCache()
+        weight = torch.randn(8, 8)
+        cache.put(weight, "params", PreparedWeight(b"\x00", "key"))
+
+        weight.add_(1)
+        self.assertIsNone(cache.get(weight, "params"))
+
+    def test_cache_drops_collected_source(self) -> None:
+        cache = WeightCache()
+        weight = torch.randn(8, 8)
+        cache.put(weight, "params", PreparedWeight(b"\x00", "key"))
+        self.assertEqual(len(cache), 1)
+
+        del weight
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+
+    def test_preparer_adds_in_order(self) -> None:
+        weights = [torch.full((4,), float(i)) for i in range(8)]
+        named_data_store = NamedDataStore()
+        constant_data = [ConstantDataOffset(UINT64_MAX, 0) for _ in weights]
+        with ThreadPoolExecutor(4) as executor:
+            preparer = WeightPreparer(named_data_store, executor, WeightCache())
+            for i, weight in enumerate(weights):
+                preparer.add(
+                    constant_data[i], weight, None, lambda t: t * 2, f"weight_{i}"
+                )
+            preparer.flush()
+
+        output = named_data_store.get_named_data_store_output()
+        for i, weight in enumerate(weights):
+            expected = (weight * 2).numpy().tobytes()
+            self.assertEqual(constant_data[i].size, len(expected))
+            self.assertEqual(
+                constant_data[i].named_key, hashlib.sha256(expected).hexdigest()
+            )
+            self.assertEqual(output.buffers[i].buffer, expected)
+
+    def test_preparer_adds_data_in_order(self) -> None:
+        named_data_store = NamedDataStore()
+        constant_data = [ConstantDataOffset(UINT64_MAX, 0) for _ in range(3)]
+        with ThreadPoolExecutor(2) as executor:
+            preparer = WeightPreparer(named_data_store, executor, WeightCache())
+            preparer.add(
+                constant_data[0], torch.ones(4), None, lambda t: t * 2, "weight"
+            )
+            preparer.add_data(constant_data[1], b"scales", "scales")
+            preparer.add(constant_data[2], torch.ones(2), None, lambda t: t * 3, "bias")
+            preparer.flush()
+
+        output = named_data_store.get_named_data_store_output()
+        expected = [
+            (torch.ones(4) * 2).numpy().tobytes(),
+            b"scales",
+            (torch.ones(2) * 3).numpy().tobytes(),
+        ]
+        self.assertEqual([entry.buffer for entry in output.buffers], expected)
+        self.assertEqual(
+            [data.named_key for data in constant_data],
+            [hashlib.sha256(data).hexdigest() for data in expected],
+        )
+        self.assertEqual(
+            named_data_store.pte_data,
+            {hashlib.sha256(data).hexdigest(): i for i, data in enumerate(expected)},
+        )
+
+    def test_quant_params_cache_key_includes_groups(self) -> None:
+        def quant_params(group_size: int) -> SimpleNamespace:
+            return SimpleNamespace(
+                is_dynamic=False,
+                is_qc4w=False,
+                per_channel=True,
+                per_channel_group=group_size > 0,
+                group_size=group_size,
+                dtype=torch.int8,
+                qmin=-128,
+                qmax=127,
+                axis=0,
+                scale=torch.ones(4, 2),
+                zp=torch.zeros(4, 2),
+            )
+
+        self.assertNotEqual(
+            NodeVisitor._quant_params_cache_key(quant_params(16)),
+            NodeVisitor._quant_params_cache_key(quant_params(32)),
+        )
+        self.assertNotEqual(
+            NodeVisitor._quant_params_cache_key(quant_params(0)),
+            NodeVisitor._quant_params_cache_key(quant_params(32)),
+        )
+
+    def test_shared_weights_prepared_once(self) -> None:
+        class SharedConv(torch.nn.Module):
+            def __init__(self) -> None:
+                super().__init__()
+                self.conv = torch.nn.Conv2d(3, 3, 3, padding=1)
+
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                # cumsum is not supported by XNNPACK, so each conv is lowered
+                # to its own delegate with a copy of the weights.
+                return self.conv(torch.cumsum(self.conv(x), 1))
+
+        def lower() -> bytes:
+            return (
+                to_edge(
+                    torch.export.export(SharedConv().eval(), (torch.randn(1, 3, 8, 8),))
+                )
+                .to_backend(XnnpackPartitioner())
+                .to_executorch()
+                .buffer
+            )
+
+        prepared = []
+
+        def counting_prepare_weight(*args):
+            prepared.append(args[2])
+            return prepare_weight(*args)
+
+        # Each partition prepares its own copy of the weight and bias, unless
+        # they are shared.
+        torch.manual_seed(0)
+        with patch.object(
+            weight_preparation, "prepare_weight", counting_prepare_weight
+        ):
+            unshared_program = lower()
+        self.assertEqual(len(prepared), 4)
+
+        prepared.clear()
+        torch.manual_seed(0)
+        with patch.object(
+            weight_preparation, "prepare_weight", counting_prepare_weight
+        ), share_prepared_weights():
+            program = lower()
+
+        self.assertEqual(len(prepared), 2)
+        self.assertEqual(program, unshared_program)
+
+    def _preprocess_quantized(self, module: torch.nn.Module, serial: bool):
+        from executorch.backends.xnnpack.quantizer.xnnpack_quantizer import (
+            get_symmetric_quantization_config,
+            XNNPACKQuantizer,
+        )
+        from torchao.quantization.pt2e.quantize_pt2e import convert_pt2e, prepare_pt2e
+
+        torch.manual_seed(0)
+        inputs = (torch.randn(1, 4, 8, 8),)
+        quantizer = XNNPACKQuantizer().set_global(
+            get_symmetric_quantization_config(is_per_channel=True)
+        )
+        prepared = prepare_pt2e(
+            torch.export.export_for_training(module.eval(), inputs).module(),
+            quantizer,
+        )
+        prepared(*inputs)
+        # Without folding, the fp32 weights are quantized by the visitors.
+        converted = convert_pt2e(prepared, fold_quantize=False)
+        edge_program = to_edge(
+            torch.export.export(converted, inputs)
+        ).exported_program()
+
+        def delayed_prepare_weight(*args):
+            # Let the nodes be visited before the weight is transformed.
+            time.sleep(0.05)
+            return prepare_weight(*args)
+
+        with patch.object(weight_preparation, "prepare_weight", delayed_prepare_weight):
+            if serial:
+                with patch.object(
+                    xnnpack_preprocess,
+                    "WeightPreparer",
+                    lambda named_data_store, executor: WeightPreparer(named_data_store),
+                ):
+                    result = XnnpackBackend.preprocess(edge_program, [])
+            else:
+                result = XnnpackBackend.preprocess(edge_program, [])
+        return result.processed_bytes, [
+            entry.buffer for entry in result.data_store_output.buffers
+        ]
+
+    def test_swapped_per_channel_axis(self) -> None:
+        # Depthwise and transposed conv weights are serialized with their
+        # per channel axis swapped, after they are submitted for preparation.
+        for module in (
+            torch.nn.Conv2d(4, 4, 3, groups=4),
+            torch.nn.ConvTranspose2d(4, 6, 3),
+        ):
+            with self.subTest(module=module):
+                self.assertEqual(
+                    self._preprocess_quantized(module, serial=False),
+                    self._preprocess_quantized(module, serial=True),
+                )
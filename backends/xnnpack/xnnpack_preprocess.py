@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, final, List
 
@@ -15,7 +16,11 @@ from executorch.backends.xnnpack._passes.convert_to_linear import ConvertToLinea
 from executorch.backends.xnnpack._passes.tag_implicit_q_dq_pass import (
     TagImplicitQDqPass,
 )
-from executorch.backends.xnnpack.operators.node_visitor import get_node_visitors
+from executorch.backends.xnnpack.operators.node_visitor import (
+    get_node_visitors,
+    NodeVisitor,
+)
+from executorch.backends.xnnpack.operators.weight_preparation import WeightPreparer
 
 from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
     ConstantDataOffset,
@@ -97,6 +102,36 @@ def assert_default_dim_order(edge_graph_module: torch.fx.GraphModule) -> None:
                 )
 
 
+def visit_nodes(
+    graph_module: torch.fx.GraphModule,
+    node_visitors: Dict[str, NodeVisitor],
+    xnnpack_graph: XNNGraph,
+    vals_to_ids: Dict[torch.fx.Node, int],
+) -> None:
+    for node in graph_module.graph.nodes:
+        if node.op == "call_function":
+            logger.info(f"Visiting: {node}, {node.target.__name__}")
+            if node.target.__name__ in node_visitors:
+                node_visitors[node.target.__name__].define_node(
+                    node,
+                    xnnpack_graph,
+                    vals_to_ids,
+                    node.meta.get("debug_handle", DEFAULT_DEBUG_HANDLE),
+                )
+            else:
+                raise RuntimeError(
+                    f"For {node}, {node.op}:{node.target.__name__} is not supported in XNNPACK Delegate"
+                )
+        elif node.op in [
+            "get_attr",
+            "placeholder",
+            "output",
+        ]:
+            continue
+        else:
+            raise RuntimeError(f"{node.op} is not supported in XNNPACK")
+
+
 @final
 class XnnpackBackend(BackendDetails):
     @staticmethod
@@ -160,30 +195,16 @@ class XnnpackBackend(BackendDetails):
         )
 
         constant_data_bytes = bytearray()
-        node_visitors = get_node_visitors(ep, node_to_external_map, named_data_store)
-
-        for node in graph_module.graph.nodes:
-            if node.op == "call_function":
-                logger.info(f"Visiting: {node}, {node.target.__name__}")
-                if node.target.__name__ in node_visitors:
-                    node_visitors[node.target.__name__].define_node(
-                        node,
-                        xnnpack_graph,
-                        vals_to_ids,
-                        node.meta.get("debug_handle", DEFAULT_DEBUG_HANDLE),
-                    )
-                else:
-                    raise RuntimeError(
-                        f"For {node}, {node.op}:{node.target.__name__} is not supported in XNNPACK Delegate"
-                    )
-            elif node.op in [
-                "get_attr",
-                "placeholder",
-                "output",
-            ]:
-                continue
-            else:
-                raise RuntimeError(f"{node.op} is not supported in XNNPACK")
+        # Constants are transformed and hashed on worker threads while the
+        # nodes are visited; torch ops and hashlib release the GIL.
+        with ThreadPoolExecutor() as executor:
+            weight_preparer = WeightPreparer(named_data_store, executor)
+            node_visitors = get_node_visitors(
+                ep, node_to_external_map, named_data_store, weight_preparer
+            )
+            visit_nodes(graph_module, node_visitors, xnnpack_graph, vals_to_ids)
+            weight_preparer.flush()
+
         return PreprocessResult(
             processed_bytes=serialize_xnnpack_binary(
                 xnnpack_graph, constant_data_bytes
@@ -8,9 +8,12 @@
 
 # TODO(T138924864): Refactor to unify the serialization for bundled program and executorch program.
 
+import functools
 import json
 import os
 import tempfile
+from dataclasses import is_dataclass
+from typing import Dict
 
 import executorch.devtools.bundled_program.schema as bp_schema
 
@@ -20,6 +23,12 @@ from executorch.devtools.bundled_program.core import BundledProgram
 
 from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
 from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_dataclass
+from executorch.exir._serialize._flatbuffer_reader import _read_dataclass
+from executorch.exir._serialize._flatbuffer_schema import (
+    _FlatbufferSchema,
+    _parse_flatbuffer_schema,
+)
 
 # The prefix of schema files used for bundled program
 BUNDLED_PROGRAM_SCHEMA_NAME = "bundled_program_schema"
@@ -34,6 +43,26 @@ def write_schema(d: str, schema_name: str) -> None:
         )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_schema() -> _FlatbufferSchema:
+    """Returns the parsed bundled program schema. Cached, since it never changes."""
+    return _parse_flatbuffer_schema(
+        {
+            f"{name}.fbs": pkg_resources.resource_string(__name__, f"{name}.fbs")
+            for name in (BUNDLED_PROGRAM_SCHEMA_NAME, SCALAR_TYPE_SCHEMA_NAME)
+        },
+        f"{BUNDLED_PROGRAM_SCHEMA_NAME}.fbs",
+    )
+
+
+# Table name -> the dataclass that represents it in bp_schema.
+_BUNDLED_PROGRAM_CLASSES: Dict[str, type] = {
+    name: value
+    for name, value in vars(bp_schema).items()
+    if isinstance(value, type) and is_dataclass(value)
+}
+
+
 def serialize_from_bundled_program_to_json(
     bundled_program: bp_schema.BundledProgram,
 ) -> str:
@@ -94,8 +123,11 @@ def serialize_from_bundled_program_to_flatbuffer(
 
     bundled_program_in_schema = bundled_program.serialize_to_schema()
 
-    return convert_to_flatbuffer(
-        serialize_from_bundled_program_to_json(bundled_program_in_schema)
+    # Serialize in-process rather than through JSON and flatc, so that the
+    # program and the tensor data are copied straight into the flatbuffer
+    # instead of being written out as JSON lists of integers.
+    return bytes(
+        _serialize_dataclass(_get_schema(), bundled_program_in_schema).to_cord()
     )
 
 
@@ -119,4 +151,4 @@ def deserialize_from_flatbuffer_to_bundled_program(
     Returns:
         A `BundledProgram` instance.
     """
-    return deserialize_from_json_to_bundled_program(convert_from_flatbuffer(flatbuffer))
+    return _read_dataclass(_get_schema(), _BUNDLED_PROGRAM_CLASSES, flatbuffer)
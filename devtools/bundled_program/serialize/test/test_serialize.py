@@ -11,8 +11,12 @@ import unittest
 from executorch.devtools.bundled_program.core import BundledProgram
 
 from executorch.devtools.bundled_program.serialize import (
+    convert_from_flatbuffer,
+    convert_to_flatbuffer,
     deserialize_from_flatbuffer_to_bundled_program,
+    deserialize_from_json_to_bundled_program,
     serialize_from_bundled_program_to_flatbuffer,
+    serialize_from_bundled_program_to_json,
 )
 from executorch.devtools.bundled_program.util.test_util import (
     get_common_executorch_program,
@@ -35,3 +39,25 @@ class TestSerialize(unittest.TestCase):
             regenerate_bundled_program_in_schema,
             "Regenerated bundled program mismatches original one",
         )
+
+    def test_bundled_program_serialization_matches_flatc(self) -> None:
+        executorch_program, method_test_suites = get_common_executorch_program()
+
+        bundled_program = BundledProgram(executorch_program, method_test_suites)
+        flat_buffer_bundled_program = serialize_from_bundled_program_to_flatbuffer(
+            bundled_program
+        )
+        self.assertEqual(
+            flat_buffer_bundled_program,
+            convert_to_flatbuffer(
+                serialize_from_bundled_program_to_json(
+                    bundled_program.serialize_to_schema()
+                )
+            ),
+        )
+        self.assertEqual(
+            deserialize_from_flatbuffer_to_bundled_program(flat_buffer_bundled_program),
+            deserialize_from_json_to_bundled_program(
+                convert_from_flatbuffer(flat_buffer_bundled_program)
+            ),
+        )
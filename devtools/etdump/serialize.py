@@ -6,16 +6,33 @@
 
 # pyre-strict
 
+import functools
 import json
 import os
 import tempfile
+from dataclasses import is_dataclass
+from typing import Dict, Iterator
+
+import executorch.devtools.etdump.schema_flatcc as etdump_schema
 
 import pkg_resources
-from executorch.devtools.etdump.schema_flatcc import ETDumpFlatCC
+from executorch.devtools.etdump.schema_flatcc import ETDumpFlatCC, RunData
 
 from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
 
 from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_dataclass
+from executorch.exir._serialize._flatbuffer_reader import (
+    _Buffer,
+    _DataclassReader,
+    _flatbuffer_view,
+    _FlatbufferTableView,
+    _read_dataclass,
+)
+from executorch.exir._serialize._flatbuffer_schema import (
+    _FlatbufferSchema,
+    _parse_flatbuffer_schema,
+)
 
 # The prefix of schema files used for etdump
 ETDUMP_FLATCC_SCHEMA_NAME = "etdump_schema_flatcc"
@@ -30,6 +47,30 @@ def _write_schema(d: str, schema_name: str) -> None:
         )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_schema() -> _FlatbufferSchema:
+    """Returns the parsed ETDump schema. Cached, since it never changes."""
+    return _parse_flatbuffer_schema(
+        {
+            f"{name}.fbs": pkg_resources.resource_string(__name__, f"{name}.fbs")
+            for name in (ETDUMP_FLATCC_SCHEMA_NAME, SCALAR_TYPE_SCHEMA_NAME)
+        },
+        f"{ETDUMP_FLATCC_SCHEMA_NAME}.fbs",
+    )
+
+
+# Table name -> the dataclass that represents it in schema_flatcc. The root
+# table is named ETDump in the schema.
+_ETDUMP_CLASSES: Dict[str, type] = {
+    **{
+        name: value
+        for name, value in vars(etdump_schema).items()
+        if isinstance(value, type) and is_dataclass(value)
+    },
+    "ETDump": ETDumpFlatCC,
+}
+
+
 def _serialize_from_etdump_to_json(etdump: ETDumpFlatCC) -> str:
     return json.dumps(etdump, cls=_DataclassEncoder, indent=4)
 
@@ -91,7 +132,9 @@ def serialize_to_etdump_flatcc(
     Returns:
         Serialized etdump binary blob using the FlatCC schema
     """
-    return _convert_to_flatcc(_serialize_from_etdump_to_json(etdump))
+    # Serialized in-process rather than through JSON and flatc, so that
+    # tensor data and delegate metadata are copied straight into the flatbuffer.
+    return bytes(_serialize_dataclass(_get_schema(), etdump).to_cord())
 
 
 def deserialize_from_etdump_flatcc(
@@ -105,6 +148,46 @@ def deserialize_from_etdump_flatcc(
     Returns:
         Deserialized ETDump python object.
     """
-    return _deserialize_from_json_to_etdump_flatcc(
-        _convert_from_flatcc(data, size_prefixed)
+    return _read_dataclass(
+        _get_schema(), _ETDUMP_CLASSES, _strip_size_prefix(data, size_prefixed)
     )
+
+
+def _strip_size_prefix(data: _Buffer, size_prefixed: bool) -> _Buffer:
+    # Skip the 4-byte size prefix, which flatc would check and drop.
+    return memoryview(data)[4:] if size_prefixed else data
+
+
+def view_etdump_flatcc(
+    data: _Buffer, size_prefixed: bool = True
+) -> _FlatbufferTableView:
+    """
+    Returns a lazy, read-only view of an etdump binary blob, without decoding
+    it. The view has the fields of ETDumpFlatCC, which are only decoded when
+    accessed; run_data and events are sequences of views. Use this to look at
+    parts of a large ETDump.
+    Args:
+        data: Serialized etdump binary blob. It is not copied, and must stay
+            alive while the view is in use.
+    Returns:
+        A view of the ETDump.
+    """
+    return _flatbuffer_view(_get_schema(), _strip_size_prefix(data, size_prefixed))
+
+
+def iter_run_data_from_etdump_flatcc(
+    data: _Buffer, size_prefixed: bool = True
+) -> Iterator[RunData]:
+    """
+    Deserializes the runs of an etdump binary blob one at a time, so that only
+    one run is held in memory at once.
+    Args:
+        data: Serialized etdump binary blob. It is not copied, and must stay
+            alive until the iteration is done.
+    Returns:
+        An iterator over the deserialized RunData python objects, in order.
+    """
+    data = _strip_size_prefix(data, size_prefixed)
+    reader = _DataclassReader(_get_schema(), _ETDUMP_CLASSES, data)
+    for run_data in _flatbuffer_view(_get_schema(), data).run_data:
+        yield reader.read(run_data)
@@ -0,0 +1,191 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+"""Benchmarks ETDump deserialization on a large synthetic ETDump.
+
+Usage:
+    python -m executorch.devtools.etdump.tests.benchmark_deserialize \\
+        [--etdump FILE] [--num-runs N] [--num-events N]
+
+Without --etdump, builds an ETDump like those of long profiling sessions:
+--num-runs runs of --num-events events each, alternating operator profiling
+events and debug events holding intermediate tensors. The in-process reader
+is compared against decompiling the ETDump to JSON with flatc, which is only
+run when the ETDump is small enough (see --max-flatc-events); both must
+produce the same results.
+"""
+
+import argparse
+import time
+from typing import Callable, Optional
+
+import executorch.devtools.etdump.schema_flatcc as flatcc
+from executorch.devtools.etdump.serialize import (
+    _convert_from_flatcc,
+    _deserialize_from_json_to_etdump_flatcc,
+    deserialize_from_etdump_flatcc,
+    iter_run_data_from_etdump_flatcc,
+    serialize_to_etdump_flatcc,
+    view_etdump_flatcc,
+)
+from executorch.exir.scalar_type import ScalarType
+
+
+def _profile_event(index: int) -> flatcc.Event:
+    return flatcc.Event(
+        profile_event=flatcc.ProfileEvent(
+            name=f"native_call_op_{index % 64}.out",
+            chain_index=0,
+            instruction_id=index,
+            delegate_debug_id_int=None,
+            delegate_debug_id_str=None,
+            delegate_debug_metadata=None,
+            start_time=1000 * index,
+            end_time=1000 * index + 500,
+        ),
+        allocation_event=None,
+        debug_event=None,
+    )
+
+
+def _debug_event(index: int) -> flatcc.Event:
+    return flatcc.Event(
+        profile_event=None,
+        allocation_event=None,
+        debug_event=flatcc.DebugEvent(
+            name=None,
+            chain_index=0,
+            instruction_id=index,
+            delegate_debug_id_int=None,
+            delegate_debug_id_str=None,
+            debug_entry=flatcc.Value(
+                val=flatcc.ValueType.TENSOR.value,
+                tensor=flatcc.Tensor(
+                    scalar_type=ScalarType.FLOAT,
+                    sizes=[1, 64],
+                    strides=[64, 1],
+                    offset=256 * index,
+                ),
+                tensor_list=None,
+                int_value=None,
+                float_value=None,
+                double_value=None,
+                bool_value=None,
+                output=flatcc.Bool(bool_val=False),
+            ),
+        ),
+    )
+
+
+def make_etdump(num_runs: int, num_events: int) -> flatcc.ETDumpFlatCC:
+    events = [
+        _debug_event(i) if i % 2 else _profile_event(i) for i in range(num_events)
+    ]
+    return flatcc.ETDumpFlatCC(
+        version=0,
+        run_data=[
+            flatcc.RunData(
+                name="forward",
+                bundled_input_index=-1,
+                allocators=[],
+                events=events,
+            )
+            for _ in range(num_runs)
+        ],
+    )
+
+
+def _time(name: str, fn: Callable[[], object], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    assert best is not None
+    print(f"  {name:<24} {best:8.3f} s")
+    return best
+
+
+def _total_operator_time(data: bytes) -> int:
+    """Sums the durations of profiling events, through a lazy view."""
+    total = 0
+    for run_data in view_etdump_flatcc(data).run_data:
+        for event in run_data.events:
+            profile_event = event.profile_event
+            if profile_event is not None:
+                total += profile_event.end_time - profile_event.start_time
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--etdump", help="Benchmark the ETDump in this file.")
+    parser.add_argument("--num-runs", type=int, default=1000)
+    parser.add_argument("--num-events", type=int, default=1000)
+    parser.add_argument(
+        "--max-flatc-events",
+        type=int,
+        default=200000,
+        help="Skip flatc on ETDumps with more events than this.",
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.etdump:
+        with open(args.etdump, "rb") as f:
+            data = f.read()
+    else:
+        flatbuffer = serialize_to_etdump_flatcc(
+            make_etdump(args.num_runs, args.num_events)
+        )
+        # ETDumps written by the runtime are size prefixed.
+        data = len(flatbuffer).to_bytes(4, "little") + flatbuffer
+    etdump = deserialize_from_etdump_flatcc(data)
+    num_events = sum(len(run_data.events or []) for run_data in etdump.run_data)
+    print(
+        f"ETDump: {len(data) / 2**20:.1f} MiB, {len(etdump.run_data)} runs, "
+        + f"{num_events} events"
+    )
+
+    flatc_time: Optional[float] = None
+    if num_events <= args.max_flatc_events:
+        flatc_time = _time(
+            "flatc --json",
+            lambda: _deserialize_from_json_to_etdump_flatcc(_convert_from_flatcc(data)),
+            args.repeat,
+        )
+        assert etdump == _deserialize_from_json_to_etdump_flatcc(
+            _convert_from_flatcc(data)
+        ), "Deserialized ETDumps differ"
+    reader_time = _time(
+        "in-process reader",
+        lambda: deserialize_from_etdump_flatcc(data),
+        args.repeat,
+    )
+    iter_time = _time(
+        "run by run",
+        lambda: sum(1 for _ in iter_run_data_from_etdump_flatcc(data)),
+        args.repeat,
+    )
+    assert (
+        list(iter_run_data_from_etdump_flatcc(data)) == etdump.run_data
+    ), "Deserialized runs differ"
+    view_time = _time(
+        "lazy view (sum times)", lambda: _total_operator_time(data), args.repeat
+    )
+    if flatc_time is not None:
+        print(f"  reader speedup over flatc: {flatc_time / reader_time:.1f}x")
+    print(
+        f"  per run: {1000 * iter_time / max(len(etdump.run_data), 1):.2f} ms, "
+        + f"lazy view scan: {view_time / max(num_events, 1) * 1e6:.2f} us/event"
+    )
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
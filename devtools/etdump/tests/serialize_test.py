@@ -15,8 +15,14 @@ from typing import List
 import executorch.devtools.etdump.schema_flatcc as flatcc
 
 from executorch.devtools.etdump.serialize import (
+    _convert_from_flatcc,
+    _convert_to_flatcc,
+    _deserialize_from_json_to_etdump_flatcc,
+    _serialize_from_etdump_to_json,
     deserialize_from_etdump_flatcc,
+    iter_run_data_from_etdump_flatcc,
     serialize_to_etdump_flatcc,
+    view_etdump_flatcc,
 )
 from executorch.exir._serialize._dataclass import _DataclassEncoder
 
@@ -140,3 +146,57 @@ class TestSerializeFlatCC(unittest.TestCase):
                 )
             ),
         )
+
+    def test_matches_flatc(self) -> None:
+        program = get_sample_etdump_flatcc()
+
+        flatcc_from_py = serialize_to_etdump_flatcc(program)
+        self.assertEqual(
+            flatcc_from_py, _convert_to_flatcc(_serialize_from_etdump_to_json(program))
+        )
+        self.assertEqual(
+            deserialize_from_etdump_flatcc(flatcc_from_py, size_prefixed=False),
+            _deserialize_from_json_to_etdump_flatcc(
+                _convert_from_flatcc(flatcc_from_py, size_prefixed=False)
+            ),
+        )
+
+    def test_deserialize_size_prefixed(self) -> None:
+        program = get_sample_etdump_flatcc()
+
+        flatcc_from_py = serialize_to_etdump_flatcc(program)
+        size_prefixed = len(flatcc_from_py).to_bytes(4, "little") + flatcc_from_py
+        self.assertEqual(program, deserialize_from_etdump_flatcc(size_prefixed))
+
+    def test_view(self) -> None:
+        program = get_sample_etdump_flatcc()
+
+        view = view_etdump_flatcc(serialize_to_etdump_flatcc(program), False)
+        self.assertEqual(view.version, program.version)
+        self.assertEqual(len(view.run_data), len(program.run_data))
+        run_data = view.run_data[0]
+        self.assertEqual(run_data.name, "test_block")
+        events = program.run_data[0].events
+        self.assertEqual(len(run_data.events), len(events))
+        for event_view, event in zip(run_data.events, events):
+            if event.profile_event is None:
+                self.assertIsNone(event_view.profile_event)
+                continue
+            self.assertEqual(event_view.profile_event.name, event.profile_event.name)
+            self.assertEqual(
+                event_view.profile_event.end_time, event.profile_event.end_time
+            )
+
+    def test_iter_run_data(self) -> None:
+        program = get_sample_etdump_flatcc()
+        program.run_data.append(program.run_data[0])
+
+        flatcc_from_py = serialize_to_etdump_flatcc(program)
+        size_prefixed = len(flatcc_from_py).to_bytes(4, "little") + flatcc_from_py
+        self.assertEqual(
+            list(iter_run_data_from_etdump_flatcc(size_prefixed)), program.run_data
+        )
+        self.assertEqual(
+            list(iter_run_data_from_etdump_flatcc(flatcc_from_py, False)),
+            program.run_data,
+        )
@@ -9,6 +9,7 @@
 from executorch.devtools.inspector._inspector import (
     Event,
     EventBlock,
+    EventColumns,
     Inspector,
     PerfData,
 )
@@ -17,6 +18,7 @@ from executorch.devtools.inspector._inspector_utils import compare_results, Time
 __all__ = [
     "Event",
     "EventBlock",
+    "EventColumns",
     "Inspector",
     "PerfData",
     "compare_results",
@@ -8,6 +8,7 @@
 
 import dataclasses
 import logging
+import multiprocessing
 import sys
 import warnings
 from collections import defaultdict, OrderedDict
@@ -55,6 +56,7 @@ from executorch.devtools.inspector._inspector_utils import (
     inflate_runtime_output,
     is_debug_output,
     is_inference_output_equal,
+    map_debug_buffer,
     ProgramOutput,
     RESERVED_FRAMEWORK_EVENT_NAMES,
     TimeScale,
@@ -64,6 +66,7 @@ from executorch.devtools.inspector._intermediate_output_capturer import (
     IntermediateOutputCapturer,
 )
 from executorch.exir import ExportedProgram
+from executorch.exir._multiprocessing import fork_process_pool
 
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -266,20 +269,26 @@ DelegateMetadata = TypedDict(
 
 @dataclass
 class PerfData:
-    def __init__(self, raw: List[float]):
-        self.raw: List[float] = raw
+    def __init__(self, raw: Union[List[float], np.ndarray]):
+        # A NumPy array when the EventBlock was generated with columnar=True.
+        self.raw: Union[List[float], np.ndarray] = raw
+
+    @cached_property
+    def _percentiles(self) -> np.ndarray:
+        # Computed together, so that the data is only sorted once.
+        return np.percentile(self.raw, [10, 50, 90])
 
     @property
     def p10(self) -> float:
-        return np.percentile(self.raw, 10)
+        return self._percentiles[0]
 
     @property
     def p50(self) -> float:
-        return np.percentile(self.raw, 50)
+        return self._percentiles[1]
 
     @property
     def p90(self) -> float:
-        return np.percentile(self.raw, 90)
+        return self._percentiles[2]
 
     @property
     def avg(self) -> float:
@@ -287,10 +296,14 @@ class PerfData:
 
     @property
     def min(self) -> float:
+        if isinstance(self.raw, np.ndarray):
+            return self.raw.min()
         return min(self.raw)
 
     @property
     def max(self) -> float:
+        if isinstance(self.raw, np.ndarray):
+            return self.raw.max()
         return max(self.raw)
 
 
@@ -483,6 +496,30 @@ class Event:
             elapsed_time = end_time - start_time
         return elapsed_time
 
+    @staticmethod
+    def _calculate_elapsed_times(
+        start_times: np.ndarray, end_times: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized _calculate_elapsed_time, over arrays of uint64 timestamps
+        """
+        max_uint32 = 2**32 - 1
+        wrapped = start_times > end_times
+        if wrapped.any():
+            start_time, end_time = start_times[wrapped][0], end_times[wrapped][0]
+            if (start_times[wrapped] > max_uint32).any() or (
+                end_times[wrapped] > max_uint32
+            ).any():
+                raise ValueError(
+                    f"Expected start_time ({start_time}) and end_time ({end_time}) to be less than {max_uint32} for cases where there is wrap-around of time values."
+                )
+        # Unsigned arithmetic wraps around, so both branches can be computed.
+        return np.where(
+            wrapped,
+            (np.uint64(max_uint32) - start_times) + end_times,
+            end_times - start_times,
+        )
+
     @staticmethod
     def _populate_event_signature_fields(
         ret_event: "Event",
@@ -602,6 +639,78 @@ class Event:
         if len(stime) > 0:
             ret_event._start_time = stime
 
+    @staticmethod
+    def _gen_from_columns(
+        signature: EventSignature,
+        instruction_event: InstructionEvent,
+        start_times: Optional[np.ndarray],
+        end_times: Optional[np.ndarray],
+        durations: np.ndarray,
+        delegate_debug_metadatas: List[bytes],
+        scale_factor: float = 1.0,
+        output_buffer: Optional[bytes] = None,
+        delegate_metadata_parser: Optional[
+            Callable[[List[str]], Dict[str, Any]]
+        ] = None,
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ] = None,
+    ) -> "Event":
+        """
+        Columnar counterpart of _gen_from_inference_events: given an EventSignature,
+        the start and end times of its ProfileEvent in each run, and its InstructionEvent
+        in the first run (for debug data), return the matching Event.
+
+        The durations of the event are written to `durations`, which the perf_data of the
+        Event refers to.
+        """
+        ret_event: Event = Event(
+            name="",
+            _instruction_id=signature.instruction_id,
+            _delegate_metadata_parser=delegate_metadata_parser,
+            _delegate_time_scale_converter=delegate_time_scale_converter,
+        )
+
+        Event._populate_event_signature_fields(
+            ret_event, signature.profile_event_signature
+        )
+        if start_times is not None and end_times is not None:
+            if (
+                ret_event.is_delegated_op
+                and (convert_time_scale := ret_event._delegate_time_scale_converter)
+                is not None
+            ):
+                # The converter is not necessarily vectorized.
+                durations[:] = [
+                    Event._calculate_elapsed_time(
+                        convert_time_scale(ret_event.name, start_time),
+                        convert_time_scale(ret_event.name, end_time),
+                    )
+                    for start_time, end_time in zip(
+                        start_times.tolist(), end_times.tolist()
+                    )
+                ]
+            else:
+                durations[:] = Event._calculate_elapsed_times(start_times, end_times)
+                # Scale factor should only be applied to non-delegated ops
+                if not ret_event.is_delegated_op:
+                    durations /= scale_factor
+            ret_event.perf_data = PerfData(durations)
+            ret_event._start_time = start_times
+            if any(delegate_debug_metadatas):
+                ret_event._delegate_debug_metadatas = [
+                    metadata if metadata else ""
+                    for metadata in delegate_debug_metadatas
+                ]
+
+        Event._populate_debugging_related_fields(
+            ret_event,
+            signature.debug_event_signature,
+            [instruction_event],
+            output_buffer,
+        )
+        return ret_event
+
     @staticmethod
     def _populate_debugging_related_fields(
         ret_event: "Event",
@@ -677,6 +786,392 @@ class Event:
                     self.op_types += [node.op]
 
 
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    """Returns a 1D object array of the values, which may themselves be sequences"""
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+@dataclass
+class EventColumns:
+    r"""
+    Profiling data of the `Event`\ s of an `EventBlock` as NumPy arrays, with one column
+    per `Event` (i.e. per `EventSignature`) and one row per run of the block.
+
+    Available as `EventBlock.columns` when the `EventBlock`\ s are generated with
+    columnar=True.
+
+    Args:
+        signatures: Signature of the `Event` of each column.
+        names: Name of each `Event`.
+        instruction_ids: Instruction id of each `Event`, -1 if absent.
+        delegate_debug_identifiers: Delegate debug identifier of each `Event`, or None.
+        debug_handles: Debug handles of each `Event`, or None. Populated from ETRecord.
+        profiled: Whether each `Event` has profiling data.
+        start_times: Start time of each `Event` in each run, in the source time scale.
+            0 for `Event`\ s without profiling data.
+        end_times: End time of each `Event` in each run, in the source time scale.
+            0 for `Event`\ s without profiling data.
+        durations: Duration of each `Event` in each run, in the target time scale.
+            NaN for `Event`\ s without profiling data. The perf_data of each `Event`
+            refers to its column.
+        etdump_indices: Index of the ETDump of each run, when aggregating multiple
+            ETDumps (see Inspector's etdump_paths).
+    """
+
+    signatures: Tuple[EventSignature, ...]
+    names: np.ndarray
+    instruction_ids: np.ndarray
+    delegate_debug_identifiers: np.ndarray
+    debug_handles: np.ndarray
+    profiled: np.ndarray
+    start_times: np.ndarray
+    end_times: np.ndarray
+    durations: np.ndarray
+    etdump_indices: Optional[np.ndarray] = None
+
+    @property
+    def num_runs(self) -> int:
+        return self.durations.shape[0]
+
+    def summary(self, by_etdump: bool = False) -> pd.DataFrame:
+        """
+        Aggregates the durations of each profiled `Event` over all the runs
+
+        Args:
+            by_etdump: Aggregate the runs of each ETDump separately, e.g. to compare
+                the latency distributions of the devices the ETDumps were collected
+                on. Requires etdump_indices.
+
+        Returns:
+            A pandas DataFrame with one row per profiled `Event` (per ETDump if
+            by_etdump), with the count, percentiles, average, min, max and total of
+            its durations.
+        """
+        if not by_etdump:
+            return self._summarize(self.durations)
+        if self.etdump_indices is None:
+            raise ValueError("Runs are not from multiple ETDumps.")
+        return pd.concat(
+            [
+                self._summarize(self.durations[self.etdump_indices == etdump_index])
+                .assign(etdump_index=etdump_index)
+                .set_index("etdump_index", append=True)
+                for etdump_index in np.unique(self.etdump_indices)
+            ]
+        ).reset_index(level="etdump_index")
+
+    def _summarize(self, durations: np.ndarray) -> pd.DataFrame:
+        columns = np.flatnonzero(self.profiled)
+        durations = durations[:, columns]
+        p10, p50, p90 = np.percentile(durations, [10, 50, 90], axis=0)
+        return pd.DataFrame(
+            {
+                "event_name": self.names[columns],
+                "instruction_id": self.instruction_ids[columns],
+                "delegate_debug_identifier": self.delegate_debug_identifiers[columns],
+                "count": np.full(len(columns), durations.shape[0]),
+                "p10": p10,
+                "p50": p50,
+                "p90": p90,
+                "avg": durations.mean(axis=0),
+                "min": durations.min(axis=0, initial=np.inf),
+                "max": durations.max(axis=0, initial=-np.inf),
+                "total": durations.sum(axis=0),
+            }
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Converts the profiling data into a DataFrame with one row per run of each
+        profiled `Event`
+
+        Returns:
+            A pandas DataFrame with the run index (and ETDump index, if aggregated),
+            `Event` index (column), metadata, start and end times, and duration of each
+            profiled event instance.
+        """
+        columns = np.flatnonzero(self.profiled)
+        num_runs = self.num_runs
+        etdump_columns = (
+            {"etdump_index": np.repeat(self.etdump_indices, len(columns))}
+            if self.etdump_indices is not None
+            else {}
+        )
+        return pd.DataFrame(
+            {
+                **etdump_columns,
+                "run_index": np.repeat(np.arange(num_runs), len(columns)),
+                "event_index": np.tile(columns, num_runs),
+                "event_name": np.tile(self.names[columns], num_runs),
+                "instruction_id": np.tile(self.instruction_ids[columns], num_runs),
+                "delegate_debug_identifier": np.tile(
+                    self.delegate_debug_identifiers[columns], num_runs
+                ),
+                "debug_handles": np.tile(self.debug_handles[columns], num_runs),
+                "start_time": self.start_times[:, columns].ravel(),
+                "end_time": self.end_times[:, columns].ravel(),
+                "duration": self.durations[:, columns].ravel(),
+            }
+        )
+
+
+class _RunLayout:
+    """
+    The EventSignatures of a run and the positions of their events in it, shared by
+    all the runs whose events have the same layout (see _event_layout_key)
+    """
+
+    def __init__(self, run: flatcc.RunData, run_events: List[flatcc.Event]) -> None:
+        event_signatures = EventBlock._gen_event_signatures(run_events)
+        self.run_signature = RunSignature(
+            name=run.name,
+            events=tuple(event_signatures.keys()),
+            bundled_input_index=run.bundled_input_index,
+        )
+        self.instruction_events: List[InstructionEvent] = list(
+            event_signatures.values()
+        )
+
+        positions = {
+            id(find_populated_event(event)): i for i, event in enumerate(run_events)
+        }
+        # Columns with a ProfileEvent, and the positions of those events
+        self.profiled_columns: List[int] = []
+        self.profile_event_positions: List[int] = []
+        # Columns with DebugEvents, and the positions of those events
+        self.debug_columns: List[int] = []
+        self.debug_event_positions: List[List[int]] = []
+        for column, instruction_event in enumerate(self.instruction_events):
+            if (profile_events := instruction_event.profile_events) is not None:
+                self.profiled_columns.append(column)
+                self.profile_event_positions.append(positions[id(profile_events[0])])
+            if (debug_events := instruction_event.debug_events) is not None:
+                self.debug_columns.append(column)
+                self.debug_event_positions.append(
+                    [positions[id(debug_event)] for debug_event in debug_events]
+                )
+        self.has_run_outputs: bool = any(
+            event.debug_event is not None
+            and is_debug_output(event.debug_event.debug_entry)
+            for event in run_events
+        )
+
+
+def _event_layout_key(event: flatcc.Event) -> Tuple[Any, ...]:
+    """
+    Returns the fields of an event that determine the EventSignatures of its run
+    """
+    populated_event = find_populated_event(event)
+    return (
+        isinstance(populated_event, ProfileEvent),
+        populated_event.name,
+        populated_event.chain_index,
+        populated_event.instruction_id,
+        populated_event.delegate_debug_id_int,
+        populated_event.delegate_debug_id_str,
+        isinstance(populated_event, DebugEvent)
+        and is_debug_output(populated_event.debug_entry),
+    )
+
+
+class _ColumnarRunGroup:
+    """
+    Accumulates the timestamps of the runs with the same RunSignature, one row per run
+    """
+
+    def __init__(self, layout: _RunLayout) -> None:
+        self.run_signature: RunSignature = layout.run_signature
+        # InstructionEvents of the first run, from which debug data is taken
+        self.instruction_events: List[InstructionEvent] = layout.instruction_events
+        self.profiled_columns: List[int] = layout.profiled_columns
+        self.num_runs = 0
+        # Timestamps of the runs added since the last compact()
+        self.start_times: List[List[int]] = []
+        self.end_times: List[List[int]] = []
+        # Timestamps of the other runs, as (start_times, end_times) arrays
+        self.time_chunks: List[Tuple[np.ndarray, np.ndarray]] = []
+        # Run index -> delegate debug metadata of each profiled column, for the runs
+        # that have any
+        self.delegate_debug_metadatas: Dict[int, List[bytes]] = {}
+        self.run_output: ProgramOutput = []
+        # Index of the ETDump of each run, when aggregating multiple ETDumps
+        self.etdump_indices: Optional[np.ndarray] = None
+
+    def compact(self) -> None:
+        """
+        Moves the timestamps of the added runs into arrays, which are smaller, and
+        faster to pickle and merge
+        """
+        if len(self.start_times) == 0:
+            return
+        shape = (len(self.start_times), len(self.profiled_columns))
+        self.time_chunks.append(
+            (
+                np.array(self.start_times, dtype=np.uint64).reshape(shape),
+                np.array(self.end_times, dtype=np.uint64).reshape(shape),
+            )
+        )
+        self.start_times = []
+        self.end_times = []
+
+    def merge(self, other: "_ColumnarRunGroup") -> None:
+        """
+        Appends the runs of another group with the same RunSignature, e.g. from another
+        ETDump. Debug data and run outputs are taken from this group, and are not
+        compared with the other group's, since they may come from different inputs.
+        """
+        assert other.run_signature == self.run_signature
+        self.compact()
+        other.compact()
+        self.time_chunks.extend(other.time_chunks)
+        for run, metadatas in other.delegate_debug_metadatas.items():
+            self.delegate_debug_metadatas[self.num_runs + run] = metadatas
+        if self.etdump_indices is not None and other.etdump_indices is not None:
+            self.etdump_indices = np.concatenate(
+                [self.etdump_indices, other.etdump_indices]
+            )
+        self.num_runs += other.num_runs
+
+    def add_run(
+        self,
+        layout: _RunLayout,
+        run_events: List[flatcc.Event],
+        output_buffer: Optional[bytes],
+    ) -> None:
+        profile_events = [
+            run_events[position].profile_event
+            for position in layout.profile_event_positions
+        ]
+        self.start_times.append([event.start_time for event in profile_events])
+        self.end_times.append([event.end_time for event in profile_events])
+        metadatas = [event.delegate_debug_metadata for event in profile_events]
+        if any(metadatas):
+            self.delegate_debug_metadatas[self.num_runs] = metadatas
+
+        if self.num_runs > 0:
+            self._verify_debug_data(layout, run_events, output_buffer)
+        self.num_runs += 1
+
+        # Populate (or Verify if already populated) Run Outputs
+        run_outputs: ProgramOutput = (
+            EventBlock._collect_run_outputs(run_events, output_buffer)
+            if layout.has_run_outputs
+            else []
+        )
+        if len(self.run_output) == 0:
+            self.run_output.extend(run_outputs)
+        else:
+            verify_debug_data_equivalence(self.run_output, run_outputs)
+
+    def _verify_debug_data(
+        self,
+        layout: _RunLayout,
+        run_events: List[flatcc.Event],
+        output_buffer: Optional[bytes],
+    ) -> None:
+        for column, positions in zip(
+            layout.debug_columns, layout.debug_event_positions
+        ):
+            first_debug_events = self.instruction_events[column].debug_events or []
+            for position, first_debug_event in zip(positions, first_debug_events):
+                debug_event = run_events[position].debug_event
+                assert debug_event is not None
+                v1 = inflate_runtime_output(debug_event.debug_entry, output_buffer)
+                v2 = inflate_runtime_output(
+                    first_debug_event.debug_entry, output_buffer
+                )
+                assert is_inference_output_equal(
+                    v1, v2
+                ), """Corresponding debug events in multiple iterations of the model
+                must have the same debug entry values. This is not the case for the
+                intermediate data present in this ETDump and indicates potential issues
+                with the model/runtime."""
+
+    def gen_events(
+        self,
+        scale_factor: float,
+        output_buffer: Optional[bytes],
+        delegate_metadata_parser: Optional[Callable[[List[str]], Dict[str, Any]]],
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ],
+    ) -> Tuple[List[Event], EventColumns]:
+        self.compact()
+        signatures = self.run_signature.events or ()
+        num_runs, num_events = self.num_runs, len(signatures)
+        profiled = np.zeros(num_events, dtype=bool)
+        profiled[self.profiled_columns] = True
+        start_times = np.zeros((num_runs, num_events), dtype=np.uint64)
+        end_times = np.zeros((num_runs, num_events), dtype=np.uint64)
+        row = 0
+        for chunk_start_times, chunk_end_times in self.time_chunks:
+            rows = slice(row, row + len(chunk_start_times))
+            start_times[rows, profiled] = chunk_start_times
+            end_times[rows, profiled] = chunk_end_times
+            row = rows.stop
+        durations = np.full((num_runs, num_events), np.nan)
+
+        events = []
+        profiled_index = 0
+        for column, (signature, instruction_event) in enumerate(
+            zip(signatures, self.instruction_events)
+        ):
+            column_start_times = column_end_times = None
+            metadatas: List[bytes] = []
+            if profiled[column]:
+                column_start_times = start_times[:, column]
+                column_end_times = end_times[:, column]
+                if self.delegate_debug_metadatas:
+                    metadatas = [
+                        (
+                            run_metadatas[profiled_index]
+                            if (run_metadatas := self.delegate_debug_metadatas.get(run))
+                            else b""
+                        )
+                        for run in range(num_runs)
+                    ]
+                profiled_index += 1
+            events.append(
+                Event._gen_from_columns(
+                    signature,
+                    instruction_event,
+                    column_start_times,
+                    column_end_times,
+                    durations[:, column],
+                    metadatas,
+                    scale_factor,
+                    output_buffer,
+                    delegate_metadata_parser,
+                    delegate_time_scale_converter,
+                )
+            )
+
+        columns = EventColumns(
+            signatures=signatures,
+            names=_object_array([event.name for event in events]),
+            instruction_ids=np.array(
+                [
+                    event._instruction_id if event._instruction_id is not None else -1
+                    for event in events
+                ],
+                dtype=np.int64,
+            ),
+            delegate_debug_identifiers=_object_array(
+                [event.delegate_debug_identifier for event in events]
+            ),
+            debug_handles=_object_array([None] * num_events),
+            profiled=profiled,
+            start_times=start_times,
+            end_times=end_times,
+            durations=durations,
+            etdump_indices=self.etdump_indices,
+        )
+        return events, columns
+
+
 @dataclass
 class EventBlock:
     r"""
@@ -690,6 +1185,7 @@ class EventBlock:
 
         bundled_input_idx: Index of the Bundled Input that this EventBlock corresponds to.
         run_output: Run output extracted from the encapsulated Events
+        columns: Profiling data of the Events as NumPy arrays, if generated with columnar=True.
     """
 
     name: str
@@ -699,6 +1195,9 @@ class EventBlock:
     bundled_input_index: Optional[int] = None
     run_output: Optional[ProgramOutput] = None
     reference_output: Optional[ProgramOutput] = None
+    columns: Optional[EventColumns] = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
 
     def to_dataframe(
         self, include_units: bool = False, include_delegate_debug_data: bool = False
@@ -719,7 +1218,7 @@ class EventBlock:
 
         units = " (" + self.target_time_scale.value + ")" if include_units else ""
 
-        df = pd.concat([e.to_dataframe(units) for e in self.events], ignore_index=True)
+        df = self._events_to_dataframe(units)
         df.insert(
             0,
             "event_block_name",
@@ -752,6 +1251,69 @@ class EventBlock:
 
         return df
 
+    def _events_to_dataframe(self, units: str) -> pd.DataFrame:
+        """
+        Equivalent to concatenating Event.to_dataframe() of each Event, but builds the
+        DataFrame once from its columns
+        """
+        if len(self.events) == 0:
+            return pd.concat([e.to_dataframe(units) for e in self.events])
+
+        # Event.asdict() wraps the values that are lists in a list, for a single row
+        event_dicts = [event.asdict(_units=units) for event in self.events]
+        columns = {
+            key: [
+                value[0] if isinstance(value := event_dict[key], list) else value
+                for event_dict in event_dicts
+            ]
+            for key in event_dicts[0]
+        }
+        # Match the dtypes of concatenated single row DataFrames: columns with a None
+        # are objects, rather than e.g. floats with NaNs
+        return pd.DataFrame(
+            {
+                key: (
+                    pd.Series(values, dtype=object)
+                    if any(value is None for value in values)
+                    else pd.Series(values)
+                )
+                for key, values in columns.items()
+            }
+        )
+
+    @staticmethod
+    def _gen_event_signatures(
+        run_events: List[flatcc.Event],
+    ) -> Dict[EventSignature, InstructionEvent]:
+        """
+        Given the events of a run, map the EventSignatures of the run to the
+        InstructionEvents with the signature
+        """
+        # Collate the run_events into InstructionEvents
+        instruction_events: List[InstructionEvent] = InstructionEvent.gen_from_events(
+            run_events
+        )
+
+        # Map EventSignatures to the InstructionEvents
+        event_signatures: Dict[EventSignature, InstructionEvent] = OrderedDict()
+        for instruction_event in instruction_events:
+            if (
+                instruction_event.debug_events is None
+                and instruction_event.profile_events is None
+            ):
+                # Currently corresponds to run output
+                continue
+
+            generated_event_signatures: List[
+                Tuple[EventSignature, InstructionEvent]
+            ] = EventSignature.gen_from_instruction_event(instruction_event)
+            for (
+                event_signature,
+                filtered_instruction_event,
+            ) in generated_event_signatures:
+                event_signatures[event_signature] = filtered_instruction_event
+        return event_signatures
+
     @staticmethod
     def _gen_from_etdump(
         etdump: ETDumpFlatCC,
@@ -764,6 +1326,7 @@ class EventBlock:
         delegate_time_scale_converter: Optional[
             Callable[[Union[int, str], Union[int, float]], Union[int, float]]
         ] = None,
+        columnar: bool = False,
     ) -> List["EventBlock"]:
         """
         Given an etdump, generate a list of EventBlocks corresponding to the
@@ -775,7 +1338,19 @@ class EventBlock:
         An optional buffer to inflate etdump references
 
         An optional delegate metadata parser function to parse delegate profiling metadata
+
+        If columnar is set, the timestamps of runs with the same RunSignature are
+        collected into NumPy arrays (see EventColumns) instead of per run objects
         """
+        if columnar:
+            return EventBlock._gen_from_etdump_columnar(
+                etdump,
+                source_time_scale,
+                target_time_scale,
+                output_buffer,
+                delegate_metadata_parser,
+                delegate_time_scale_converter,
+            )
 
         # Map each RunSignatures to instances of its constituent events.
         #   The value of the map is a GroupedRunInstance which contains:
@@ -795,29 +1370,10 @@ class EventBlock:
             if (run_events := run.events) is None:
                 continue
 
-            # Collate the run_events into InstructionEvents
-            instruction_events: List[InstructionEvent] = (
-                InstructionEvent.gen_from_events(run_events)
-            )
-
             # Map EventSignatures to the InstructionEvents
-            event_signatures: Dict[EventSignature, InstructionEvent] = OrderedDict()
-            for instruction_event in instruction_events:
-                if (
-                    instruction_event.debug_events is None
-                    and instruction_event.profile_events is None
-                ):
-                    # Currently corresponds to run output
-                    continue
-
-                generated_event_signatures: List[
-                    Tuple[EventSignature, InstructionEvent]
-                ] = EventSignature.gen_from_instruction_event(instruction_event)
-                for (
-                    event_signature,
-                    filtered_instruction_event,
-                ) in generated_event_signatures:
-                    event_signatures[event_signature] = filtered_instruction_event
+            event_signatures: Dict[EventSignature, InstructionEvent] = (
+                EventBlock._gen_event_signatures(run_events)
+            )
 
             # Create a RunSignature from the EventSignatures
             run_signature = RunSignature(
@@ -878,6 +1434,98 @@ class EventBlock:
 
         return event_blocks
 
+    @staticmethod
+    def _gen_from_etdump_columnar(
+        etdump: ETDumpFlatCC,
+        source_time_scale: TimeScale,
+        target_time_scale: TimeScale,
+        output_buffer: Optional[bytes],
+        delegate_metadata_parser: Optional[Callable[[List[str]], Dict[str, Any]]],
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ],
+    ) -> List["EventBlock"]:
+        """
+        Columnar implementation of _gen_from_etdump.
+
+        The EventSignatures of a run are only computed for the first run with each
+        layout of events (usually, the first run of each RunSignature). The timestamps
+        of the following runs are then read from the positions of their events.
+        """
+        return EventBlock._gen_from_run_groups(
+            EventBlock._gen_run_groups(etdump, output_buffer),
+            source_time_scale,
+            target_time_scale,
+            output_buffer,
+            delegate_metadata_parser,
+            delegate_time_scale_converter,
+        )
+
+    @staticmethod
+    def _gen_run_groups(
+        etdump: ETDumpFlatCC, output_buffer: Optional[bytes]
+    ) -> Dict[RunSignature, _ColumnarRunGroup]:
+        """
+        Given an etdump, group the timestamps of its runs by RunSignature
+        """
+        layouts: Dict[Tuple[Any, ...], _RunLayout] = {}
+        run_groups: Dict[RunSignature, _ColumnarRunGroup] = {}
+        for run in etdump.run_data:
+            if (run_events := run.events) is None:
+                continue
+
+            layout_key = (
+                run.name,
+                run.bundled_input_index,
+                tuple(_event_layout_key(event) for event in run_events),
+            )
+            layout = layouts.get(layout_key)
+            if layout is None:
+                layout = layouts[layout_key] = _RunLayout(run, run_events)
+
+            run_group = run_groups.get(layout.run_signature)
+            if run_group is None:
+                run_group = run_groups[layout.run_signature] = _ColumnarRunGroup(layout)
+            run_group.add_run(layout, run_events, output_buffer)
+        return run_groups
+
+    @staticmethod
+    def _gen_from_run_groups(
+        run_groups: Mapping[RunSignature, _ColumnarRunGroup],
+        source_time_scale: TimeScale,
+        target_time_scale: TimeScale,
+        output_buffer: Optional[bytes],
+        delegate_metadata_parser: Optional[Callable[[List[str]], Dict[str, Any]]],
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ],
+    ) -> List["EventBlock"]:
+        """
+        Construct an EventBlock for each group of runs
+        """
+        event_blocks = []
+        scale_factor = calculate_time_scale_factor(source_time_scale, target_time_scale)
+        for run_signature, run_group in run_groups.items():
+            events, columns = run_group.gen_events(
+                scale_factor,
+                output_buffer,
+                delegate_metadata_parser,
+                delegate_time_scale_converter,
+            )
+            event_blocks.append(
+                EventBlock(
+                    name=run_signature.name,
+                    events=events,
+                    source_time_scale=source_time_scale,
+                    target_time_scale=target_time_scale,
+                    bundled_input_index=run_signature.bundled_input_index,
+                    run_output=run_group.run_output,
+                    columns=columns,
+                )
+            )
+
+        return event_blocks
+
     @staticmethod
     def _collect_run_outputs(
         events: List[flatcc.Event], output_buffer: Optional[bytes] = None
@@ -970,6 +1618,62 @@ class EventBlock:
                     if key in str(delegate_debug_id):
                         event.debug_handles = value
 
+        if self.columns is not None:
+            self.columns.debug_handles = _object_array(
+                [event.debug_handles for event in self.events]
+            )
+
+
+def _gen_run_groups_from_etdump_path(
+    etdump_path: str,
+) -> Dict[RunSignature, _ColumnarRunGroup]:
+    """
+    Parses an ETDump and groups its runs, in a worker process of Inspector
+    """
+    run_groups = EventBlock._gen_run_groups(
+        gen_etdump_object(etdump_path=etdump_path), output_buffer=None
+    )
+    for run_group in run_groups.values():
+        run_group.compact()
+    return run_groups
+
+
+def _gen_run_groups_from_etdump_paths(
+    etdump_paths: Sequence[str], max_workers: Optional[int]
+) -> Dict[RunSignature, _ColumnarRunGroup]:
+    """
+    Parses the ETDumps in parallel, and merges the runs with the same RunSignature
+    across ETDumps, tagging each run with the index of its ETDump
+    """
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    max_workers = min(max_workers, len(etdump_paths))
+    pool = None
+    if max_workers > 1:
+        pool = fork_process_pool(max_workers, "parsing ETDumps serially")
+    if pool is not None:
+        with pool:
+            etdump_run_groups = list(
+                pool.map(_gen_run_groups_from_etdump_path, etdump_paths)
+            )
+    else:
+        etdump_run_groups = [
+            _gen_run_groups_from_etdump_path(etdump_path)
+            for etdump_path in etdump_paths
+        ]
+
+    run_groups: Dict[RunSignature, _ColumnarRunGroup] = {}
+    for etdump_index, groups in enumerate(etdump_run_groups):
+        for run_signature, run_group in groups.items():
+            run_group.etdump_indices = np.full(
+                run_group.num_runs, etdump_index, dtype=np.int64
+            )
+            if run_signature in run_groups:
+                run_groups[run_signature].merge(run_group)
+            else:
+                run_groups[run_signature] = run_group
+    return run_groups
+
 
 class Inspector:
     """
@@ -997,23 +1701,36 @@ class Inspector:
             Callable[[Union[int, str], Union[int, float]], Union[int, float]]
         ] = None,
         enable_module_hierarchy: bool = False,
+        columnar: bool = False,
+        etdump_paths: Optional[Sequence[str]] = None,
+        max_workers: Optional[int] = None,
     ) -> None:
         r"""
         Initialize an `Inspector` instance with the underlying `EventBlock`\ s populated with data from the provided ETDump path or binary,
         and optional ETRecord path.
 
         Args:
-            etdump_path: Path to the ETDump file. Either this parameter or etdump_data should be provided.
-            etdump_data: ETDump binary. Either this parameter or etdump_path should be provided.
+            etdump_path: Path to the ETDump file. Exactly one of etdump_path, etdump_data or etdump_paths should be provided.
+            etdump_data: ETDump binary. Exactly one of etdump_path, etdump_data or etdump_paths should be provided.
             etrecord: Optional ETRecord object or path to the ETRecord file.
             source_time_scale: The time scale of the performance data retrieved from the runtime. The default time hook implentation in the runtime returns NS.
             target_time_scale: The target time scale to which the users want their performance data converted to. Defaults to MS.
             debug_buffer_path: Debug buffer file path that contains the debug data referenced by ETDump for intermediate and program outputs.
+                    The file is memory-mapped, and the tensors in debug_data are views of it, so it is only read as they are accessed.
             delegate_metadata_parser: Optional function to parse delegate metadata from an Profiling Event. Expected signature of the function is:
                     (delegate_metadata_list: List[bytes]) -> Union[List[str], Dict[str, Any]]
             delegate_time_scale_converter: Optional function to convert the time scale of delegate profiling data. If not given, use the conversion ratio of
                     target_time_scale/source_time_scale.
             enable_module_hierarchy: Enable submodules in the operator graph. Defaults to False.
+            columnar: Collect the profiling data of each EventBlock into NumPy arrays, available as EventBlock.columns,
+                    instead of objects per event and per run. Faster and smaller for ETDumps with many runs. PerfData.raw and
+                    Event.start_time are NumPy arrays in this mode. Defaults to False.
+            etdump_paths: Paths to multiple ETDump files of the same model, e.g. collected on different devices. The ETDumps are
+                    parsed in parallel, and the runs with the same signature are merged into one EventBlock, in columnar mode, with
+                    EventBlock.columns.etdump_indices giving the ETDump of each run (see EventColumns.summary(by_etdump=True)).
+                    Debug data and run outputs are taken from the first run of each EventBlock, and are not available with
+                    debug_buffer_path. The ETRecord is parsed and correlated only once.
+            max_workers: Maximum number of worker processes parsing etdump_paths. Defaults to the number of CPUs. The ETDumps are parsed serially where worker processes cannot safely be forked: on platforms without fork, on macOS and while other threads are running.
 
         Returns:
             None
@@ -1045,16 +1762,68 @@ class Inspector:
         else:
             raise TypeError("Unsupported ETRecord type")
 
+        if etdump_paths is not None:
+            if etdump_path is not None or etdump_data is not None:
+                raise ValueError(
+                    "Expecting exactly one of etdump_path, etdump_data or etdump_paths to be specified."
+                )
+            if len(etdump_paths) == 0:
+                raise ValueError("Expecting at least one path in etdump_paths.")
+            if debug_buffer_path is not None:
+                raise ValueError(
+                    "debug_buffer_path is not supported with etdump_paths."
+                )
+            # Create EventBlocks from the runs of all the ETDumps
+            self.event_blocks = EventBlock._gen_from_run_groups(
+                _gen_run_groups_from_etdump_paths(etdump_paths, max_workers),
+                source_time_scale=self._source_time_scale,
+                target_time_scale=self._target_time_scale,
+                output_buffer=None,
+                delegate_metadata_parser=delegate_metadata_parser,
+                delegate_time_scale_converter=delegate_time_scale_converter,
+            )
+        else:
+            self.event_blocks = self._gen_event_blocks(
+                etdump_path,
+                etdump_data,
+                debug_buffer_path,
+                delegate_metadata_parser,
+                delegate_time_scale_converter,
+                columnar,
+            )
+
+        # Connect ETRecord to EventBlocks
+        self.op_graph_dict: Optional[Mapping[str, OperatorGraph]] = None
+
+        # _consume_etrecord() will populate the _reference_outputs dict
+        # Key str is method name; value is list of ProgramOutputs because of list of test cases
+        self._reference_outputs: Dict[str, List[ProgramOutput]] = {}
+        self._enable_module_hierarchy = enable_module_hierarchy
+        self._aot_intermediate_outputs: Optional[Dict[Tuple[int, ...], Any]] = None
+        self._consume_etrecord()
+
+    def _gen_event_blocks(
+        self,
+        etdump_path: Optional[str],
+        etdump_data: Optional[bytes],
+        debug_buffer_path: Optional[str],
+        delegate_metadata_parser: Optional[Callable[[List[str]], Dict[str, Any]]],
+        delegate_time_scale_converter: Callable[
+            [Union[int, str], Union[int, float]], Union[int, float]
+        ],
+        columnar: bool,
+    ) -> List[EventBlock]:
+        """
+        Create EventBlocks from a single ETDump
+        """
         if (etdump_path is None) == (etdump_data is None):
             raise ValueError(
                 "Expecting exactly one of etdump_path or etdump_data to be specified."
             )
 
-        # Create EventBlocks from ETDump
         etdump = gen_etdump_object(etdump_path=etdump_path, etdump_data=etdump_data)
         if debug_buffer_path is not None:
-            with open(debug_buffer_path, "rb") as f:
-                output_buffer = f.read()
+            output_buffer = map_debug_buffer(debug_buffer_path)
         else:
             output_buffer = None
             warnings.warn(
@@ -1062,25 +1831,16 @@ class Inspector:
                 stacklevel=1,
             )
 
-        self.event_blocks = EventBlock._gen_from_etdump(
+        return EventBlock._gen_from_etdump(
             etdump=etdump,
             source_time_scale=self._source_time_scale,
             target_time_scale=self._target_time_scale,
             output_buffer=output_buffer,
             delegate_metadata_parser=delegate_metadata_parser,
             delegate_time_scale_converter=delegate_time_scale_converter,
+            columnar=columnar,
         )
 
-        # Connect ETRecord to EventBlocks
-        self.op_graph_dict: Optional[Mapping[str, OperatorGraph]] = None
-
-        # _consume_etrecord() will populate the _reference_outputs dict
-        # Key str is method name; value is list of ProgramOutputs because of list of test cases
-        self._reference_outputs: Dict[str, List[ProgramOutput]] = {}
-        self._enable_module_hierarchy = enable_module_hierarchy
-        self._aot_intermediate_outputs: Optional[Dict[Tuple[int, ...], Any]] = None
-        self._consume_etrecord()
-
     def _consume_etrecord(self) -> None:
         """
         If an ETRecord is provided, connect it to the EventBlocks and populate the Event metadata.
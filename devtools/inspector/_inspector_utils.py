@@ -7,6 +7,8 @@
 # pyre-unsafe
 
 import math
+import mmap
+import os
 import sys
 from dataclasses import dataclass
 from enum import Enum
@@ -122,9 +124,22 @@ def is_inference_output_equal(
         return False
 
 
+def map_debug_buffer(debug_buffer_path: str) -> Union[bytes, mmap.mmap]:
+    """
+    Memory-map the debug buffer file, so that the tensors parsed from it are views of
+    the mapping, and are only paged in when read. The mapping is copy-on-write: writes
+    to the tensors are never written back to the file.
+    """
+    with open(debug_buffer_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
 # Given a ETDump Tensor object and offset, extract into a torch.Tensor
 def _parse_tensor_value(
-    tensor: Optional[Tensor], output_buffer: Optional[bytes]
+    tensor: Optional[Tensor], output_buffer: Optional[Union[bytes, mmap.mmap]]
 ) -> torch.Tensor:
     def get_scalar_type_size(scalar_type: ScalarType) -> Tuple[torch.dtype, int]:
         """
@@ -159,22 +174,22 @@ def _parse_tensor_value(
         # Empty buffer provided. Cannot deserialize tensors.
         return torch.zeros(tensor.sizes, dtype=torch_dtype)
 
-    tensor_bytes_size = math.prod(tensor.sizes) * dtype_size
-    if tensor_bytes_size == 0:
+    numel = math.prod(tensor.sizes)
+    if numel * dtype_size == 0:
         # Empty tensor. Return empty tensor.
         return torch.zeros(tensor.sizes, dtype=torch_dtype)
 
     if tensor.offset is None:
         raise ValueError("Tensor offset cannot be None")
 
+    # A view of the buffer, rather than of a copy of the tensor's bytes
     return torch.frombuffer(
-        output_buffer[tensor.offset : tensor.offset + tensor_bytes_size],
-        dtype=torch_dtype,
+        output_buffer, dtype=torch_dtype, count=numel, offset=tensor.offset
     ).view(tensor.sizes)
 
 
 def inflate_runtime_output(
-    value: Value, output_buffer: Optional[bytes]
+    value: Value, output_buffer: Optional[Union[bytes, mmap.mmap]]
 ) -> InferenceOutput:
     """
     Parse the given ETDump Value object into an InferenceOutput object
@@ -6,10 +6,19 @@
 
 # pyre-unsafe
 
-
-from typing import Any, Dict, List, Tuple
+import heapq
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import torch
+from executorch.devtools.inspector._inspector_utils import (
+    calculate_cosine_similarity,
+    calculate_mse,
+    calculate_snr,
+    map_runtime_aot_intermediate_outputs,
+)
 from torch.fx import GraphModule
 from torch.fx.interpreter import Interpreter
 
@@ -36,6 +45,56 @@ class NodeFilter:
         )
 
 
+@dataclass
+class IntermediateOutputComparison:
+    """
+    Comparison of an AOT intermediate output with the runtime intermediate output of
+    the same (combined) debug handle.
+    Attributes:
+        aot_debug_handle: Combined debug handle of the AOT intermediate output.
+        runtime_debug_handle: Combined debug handle of the runtime intermediate output.
+        mse, snr, cosine_similarity: Metrics of each pair of values of the outputs,
+            None for non tensor values. See compare_results().
+        aot_output, runtime_output: The compared outputs, only kept for the worst
+            comparisons.
+        spill_path: File the AOT intermediate output was saved to, if spilled.
+    """
+
+    aot_debug_handle: Tuple[int, ...]
+    runtime_debug_handle: Tuple[int, ...]
+    mse: List[Optional[float]]
+    snr: List[Optional[float]]
+    cosine_similarity: List[Optional[float]]
+    aot_output: Any = None
+    runtime_output: Any = None
+    spill_path: Optional[str] = None
+
+    @property
+    def max_mse(self) -> float:
+        return max(
+            (mse for mse in self.mse if mse is not None and not math.isnan(mse)),
+            default=-math.inf,
+        )
+
+
+@dataclass
+class IntermediateOutputComparisons:
+    """
+    Result of IntermediateOutputCapturer.run_and_compare().
+    Attributes:
+        comparisons: Comparison of each mapped intermediate output, in execution order.
+        worst: The top_k comparisons with the largest MSE, in decreasing order, with
+            their outputs.
+    """
+
+    comparisons: List[IntermediateOutputComparison] = field(default_factory=list)
+    worst: List[IntermediateOutputComparison] = field(default_factory=list)
+
+
+def _as_program_output(output: Any) -> List[Any]:
+    return list(output) if isinstance(output, (tuple, list)) else [output]
+
+
 class IntermediateOutputCapturer(Interpreter):
     """
     A class that captures intermediate outputs from a PyTorch graph module.
@@ -50,34 +109,146 @@ class IntermediateOutputCapturer(Interpreter):
             NodeFilter("debug_handle", "call_function", exclude_ops=["getitem"])
         ]
 
-    # Runs the graph module and captures the intermediate outputs.
-    def run_and_capture(self, *args, **kwargs) -> Dict[Tuple[int, ...], Any]:
-        captured_outputs = {}
+    def _debug_handle_key(self, n: torch.fx.Node) -> Optional[Tuple[int, ...]]:
+        if not all(filter.matches(n) for filter in self.node_filters):
+            return None
+        debug_handle = n.meta["debug_handle"]
+        # Convert the debug handle to a tuple to use as a dictionary key
+        return (debug_handle,) if isinstance(debug_handle, int) else tuple(debug_handle)
+
+    def _run_with_hook(
+        self,
+        hook: Callable[[torch.fx.Node, Tuple[int, ...], Any], None],
+        *args,
+        **kwargs,
+    ) -> None:
+        """
+        Runs the graph module, calling hook with each filtered node, its debug handle
+        and its result.
+        """
 
         def capture_run_node(n: torch.fx.Node) -> Any:
             result = super(IntermediateOutputCapturer, self).run_node(n)
-            if all(filter.matches(n) for filter in self.node_filters):
-                debug_handle = n.meta["debug_handle"]
-                # Convert the debug handle to a tuple to use as a dictionary key
-                key = (
-                    (debug_handle,)
-                    if isinstance(debug_handle, int)
-                    else tuple(debug_handle)
-                )
-                # Handle tensor results by detaching and cloning
-                if isinstance(result, torch.Tensor):
-                    captured_outputs[key] = result.detach().clone()
-                elif isinstance(result, (tuple, list)):
-                    captured_outputs[key] = [
-                        r.detach().clone() if isinstance(r, torch.Tensor) else r
-                        for r in result
-                    ]
-                else:
-                    captured_outputs[key] = result
+            key = self._debug_handle_key(n)
+            if key is not None:
+                hook(n, key, result)
             return result
 
         original_run_node = self.run_node
         self.run_node = capture_run_node
-        self.run(*args, **kwargs)
-        self.run_node = original_run_node
+        try:
+            self.run(*args, **kwargs)
+        finally:
+            self.run_node = original_run_node
+
+    # Runs the graph module and captures the intermediate outputs.
+    def run_and_capture(self, *args, **kwargs) -> Dict[Tuple[int, ...], Any]:
+        captured_outputs = {}
+
+        def capture(n: torch.fx.Node, key: Tuple[int, ...], result: Any) -> None:
+            # Handle tensor results by detaching and cloning
+            if isinstance(result, torch.Tensor):
+                captured_outputs[key] = result.detach().clone()
+            elif isinstance(result, (tuple, list)):
+                captured_outputs[key] = [
+                    r.detach().clone() if isinstance(r, torch.Tensor) else r
+                    for r in result
+                ]
+            else:
+                captured_outputs[key] = result
+
+        self._run_with_hook(capture, *args, **kwargs)
         return captured_outputs
+
+    def run_and_compare(
+        self,
+        runtime_intermediate_outputs: Dict[Tuple[int, ...], Any],
+        *args,
+        top_k: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        **kwargs,
+    ) -> IntermediateOutputComparisons:
+        """
+        Streaming alternative to map_runtime_aot_intermediate_outputs() on the result
+        of run_and_capture(), which holds every intermediate output in memory.
+
+        The debug handles of the graph are mapped to the runtime ones before running
+        it, so each intermediate output is compared with its runtime counterpart as
+        soon as it is produced, and then released. Only the metrics are kept, plus
+        the outputs of the top_k worst comparisons, by MSE.
+
+        Args:
+            runtime_intermediate_outputs: Runtime intermediate outputs by debug handle.
+            *args, **kwargs: Inputs of the graph module.
+            top_k: Number of worst comparisons whose outputs are kept. Defaults to none.
+            spill_dir: Directory in which to save each captured intermediate output,
+                as <debug handle>.pt, to inspect them without keeping them in memory.
+
+        Returns:
+            The comparison of each mapped intermediate output.
+        """
+        # The output of each debug handle is the one of its last node, as in
+        # run_and_capture(). Map it in place of the output, which is not known yet.
+        aot_nodes = {}
+        for n in self.module.graph.nodes:
+            key = self._debug_handle_key(n)
+            if key is not None:
+                aot_nodes[key] = n
+        mapping = map_runtime_aot_intermediate_outputs(
+            aot_nodes, dict(runtime_intermediate_outputs)
+        )
+        pending = {
+            aot_node: (aot_debug_handle, runtime_debug_handle, runtime_output)
+            for (aot_debug_handle, aot_node), (
+                runtime_debug_handle,
+                runtime_output,
+            ) in mapping.items()
+        }
+
+        result = IntermediateOutputComparisons()
+        # Min heap of the worst comparisons, by MSE then reverse execution order
+        worst: List[Tuple[float, int, IntermediateOutputComparison]] = []
+
+        def compare(n: torch.fx.Node, key: Tuple[int, ...], output: Any) -> None:
+            spill_path = None
+            if spill_dir is not None:
+                spill_path = os.path.join(spill_dir, f"{'_'.join(map(str, key))}.pt")
+                torch.save(output, spill_path)
+            if n not in pending:
+                return
+            aot_debug_handle, runtime_debug_handle, runtime_output = pending.pop(n)
+            aot_values = [
+                value.detach() if isinstance(value, torch.Tensor) else value
+                for value in _as_program_output(output)
+            ]
+            runtime_values = _as_program_output(runtime_output)
+            comparison = IntermediateOutputComparison(
+                aot_debug_handle=aot_debug_handle,
+                runtime_debug_handle=runtime_debug_handle,
+                mse=calculate_mse(aot_values, runtime_values),
+                snr=calculate_snr(aot_values, runtime_values),
+                cosine_similarity=calculate_cosine_similarity(
+                    aot_values, runtime_values
+                ),
+                spill_path=spill_path,
+            )
+            result.comparisons.append(comparison)
+            if top_k is None or top_k <= 0:
+                return
+            entry = (comparison.max_mse, -len(result.comparisons), comparison)
+            if len(worst) < top_k:
+                heapq.heappush(worst, entry)
+            elif entry[:2] > worst[0][:2]:
+                _, _, released = heapq.heapreplace(worst, entry)
+                released.aot_output = released.runtime_output = None
+            else:
+                return
+            comparison.aot_output = [
+                value.clone() if isinstance(value, torch.Tensor) else value
+                for value in aot_values
+            ]
+            comparison.runtime_output = runtime_output
+
+        self._run_with_hook(compare, *args, **kwargs)
+        result.worst = [comparison for _, _, comparison in sorted(worst, reverse=True)]
+        return result
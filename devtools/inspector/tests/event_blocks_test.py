@@ -9,8 +9,10 @@ import unittest
 from typing import List, Optional, Tuple, Union
 
 import executorch.devtools.etdump.schema_flatcc as flatcc
+import numpy as np
+import pandas as pd
 from executorch.devtools.etdump.schema_flatcc import ETDumpFlatCC, ProfileEvent
-from executorch.devtools.inspector import Event, EventBlock, PerfData
+from executorch.devtools.inspector import Event, EventBlock, PerfData, TimeScale
 from executorch.devtools.inspector._inspector import (
     DelegateMetadata,
     EventSignature,
@@ -655,3 +657,117 @@ class TestEventBlock(unittest.TestCase):
                 self.assertEqual(
                     event.debug_handles, handle_map[str(event._instruction_id)]
                 )
+
+    def test_gen_from_etdump_columnar(self) -> None:
+        """
+        Test that columnar EventBlocks have the same Events as the default ones, and
+        that their EventColumns hold the profiling data of each run
+        """
+        for etdump in [
+            TestEventBlock._get_sample_etdump_flatcc(),
+            TestEventBlock._get_sample_etdump_flatcc_profiling_and_debugging(),
+            TestEventBlock._get_sample_etdump_flatcc_debug_events_only(
+                event_name="test_debug_event_only", delegate_debug_id="debug_id"
+            ),
+        ]:
+            expected_blocks = EventBlock._gen_from_etdump(etdump)
+            blocks = EventBlock._gen_from_etdump(etdump, columnar=True)
+            self.assertEqual(len(blocks), len(expected_blocks))
+            for block, expected_block in zip(blocks, expected_blocks):
+                self.assertEqual(block.name, expected_block.name)
+                self.assertEqual(len(block.events), len(expected_block.events))
+                columns = block.columns
+                self.assertIsNotNone(columns)
+                for i, (event, expected_event) in enumerate(
+                    zip(block.events, expected_block.events)
+                ):
+                    self.assertEqual(event.name, expected_event.name)
+                    self.assertEqual(
+                        event.delegate_debug_identifier,
+                        expected_event.delegate_debug_identifier,
+                    )
+                    self.assertEqual(
+                        len(event.debug_data), len(expected_event.debug_data)
+                    )
+                    self.assertEqual(columns.names[i], expected_event.name)
+                    if (expected_perf_data := expected_event.perf_data) is None:
+                        self.assertIsNone(event.perf_data)
+                        self.assertFalse(columns.profiled[i])
+                        continue
+                    self.assertTrue(columns.profiled[i])
+                    self.assertEqual(list(event.perf_data.raw), expected_perf_data.raw)
+                    self.assertEqual(
+                        list(columns.durations[:, i]), expected_perf_data.raw
+                    )
+                    self.assertEqual(
+                        list(columns.start_times[:, i]), expected_event.start_time
+                    )
+                    self.assertEqual(event.perf_data.p50, expected_perf_data.p50)
+
+    def test_gen_from_etdump_columnar_inconsistent_debug_data(self) -> None:
+        etdump: ETDumpFlatCC = (
+            TestEventBlock._get_sample_etdump_flatcc_inconsistent_debug_data()
+        )
+        with self.assertRaises(AssertionError):
+            EventBlock._gen_from_etdump(etdump, columnar=True)
+
+    def test_event_columns(self) -> None:
+        profile_events = [
+            TestEventBlock._gen_sample_profile_event("op_0", 0, (0, 10)),
+            TestEventBlock._gen_sample_profile_event("op_1", 1, (10, 30)),
+        ]
+        etdump = ETDumpFlatCC(
+            version=0,
+            run_data=[
+                flatcc.RunData(
+                    name="forward",
+                    bundled_input_index=-1,
+                    allocators=[],
+                    events=[
+                        flatcc.Event(
+                            profile_event=TestEventBlock._gen_sample_profile_event(
+                                event.name, event.instruction_id, (start, end)
+                            ),
+                            allocation_event=None,
+                            debug_event=None,
+                        )
+                        for event, (start, end) in zip(profile_events, times)
+                    ],
+                )
+                for times in [[(0, 10), (10, 30)], [(100, 120), (120, 160)]]
+            ],
+        )
+        (block,) = EventBlock._gen_from_etdump(
+            etdump, target_time_scale=TimeScale.NS, columnar=True
+        )
+        columns = block.columns
+        assert columns is not None
+        self.assertEqual(columns.num_runs, 2)
+        np.testing.assert_array_equal(columns.durations, [[10, 20], [20, 40]])
+        np.testing.assert_array_equal(columns.start_times, [[0, 10], [100, 120]])
+
+        summary = columns.summary()
+        self.assertEqual(list(summary["event_name"]), ["op_0", "op_1"])
+        self.assertEqual(list(summary["count"]), [2, 2])
+        self.assertEqual(list(summary["avg"]), [15.0, 30.0])
+        self.assertEqual(list(summary["max"]), [20.0, 40.0])
+        self.assertEqual(list(summary["total"]), [30.0, 60.0])
+
+        df = columns.to_dataframe()
+        self.assertEqual(list(df["run_index"]), [0, 0, 1, 1])
+        self.assertEqual(list(df["event_name"]), ["op_0", "op_1", "op_0", "op_1"])
+        self.assertEqual(list(df["duration"]), [10.0, 20.0, 20.0, 40.0])
+
+        block._gen_resolve_debug_handles({"0": [100], "1": [110]})
+        self.assertEqual(list(columns.debug_handles), [[100], [110]])
+
+    def test_to_dataframe_matches_event_dataframes(self) -> None:
+        etdump = TestEventBlock._get_sample_etdump_flatcc_profiling_and_debugging()
+        for block in EventBlock._gen_from_etdump(etdump):
+            expected = pd.concat(
+                [event.to_dataframe() for event in block.events], ignore_index=True
+            )
+            df = block.to_dataframe()
+            self.assertEqual(list(df.columns[1:]), list(expected.columns))
+            self.assertEqual(list(df.dtypes[1:]), list(expected.dtypes))
+            self.assertTrue(df.iloc[:, 1:].astype(str).equals(expected.astype(str)))
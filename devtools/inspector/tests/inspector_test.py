@@ -13,7 +13,7 @@ import tempfile
 import unittest
 from contextlib import redirect_stdout
 
-from typing import Callable, List, Union
+from typing import Callable, List, Tuple, Union
 
 from unittest.mock import patch
 
@@ -23,6 +23,7 @@ import torch.fx
 from executorch.devtools import generate_etrecord, parse_etrecord
 from executorch.devtools.debug_format.et_schema import OperatorNode
 from executorch.devtools.etdump.schema_flatcc import ProfileEvent
+from executorch.devtools.etdump.serialize import serialize_to_etdump_flatcc
 from executorch.devtools.etrecord._etrecord import ETRecord
 from executorch.devtools.etrecord.tests.etrecord_test import TestETRecord
 
@@ -578,6 +579,90 @@ class TestInspector(unittest.TestCase):
                 self.assertIn((key,), runtime_outputs)
                 self.assertEqual(len(runtime_outputs[(key,)]), RAW_DATA_SIZE)
 
+    def test_inspector_etdump_paths(self):
+        # Two ETDumps of the same method, e.g. from two devices, and one run of
+        # another method
+        etdumps = [
+            self._gen_etdump([("forward", [(0, 10), (10, 30)])] * 2),
+            self._gen_etdump(
+                [("forward", [(0, 20), (20, 60)]), ("backward", [(0, 5), (5, 6)])]
+            ),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            etdump_paths = []
+            for i, etdump in enumerate(etdumps):
+                etdump_path = f"{tmpdirname}/etdump_{i}.etdp"
+                with open(etdump_path, "wb") as f:
+                    f.write(etdump)
+                etdump_paths.append(etdump_path)
+            for max_workers in [1, 2]:
+                inspector = Inspector(
+                    etdump_paths=etdump_paths,
+                    source_time_scale=TimeScale.NS,
+                    target_time_scale=TimeScale.NS,
+                    max_workers=max_workers,
+                )
+                self.assertEqual(
+                    [block.name for block in inspector.event_blocks],
+                    ["forward", "backward"],
+                )
+                forward, backward = inspector.event_blocks
+                self.assertEqual(forward.events[1].perf_data.raw.tolist(), [20, 20, 40])
+                self.assertEqual(forward.columns.etdump_indices.tolist(), [0, 0, 1])
+                self.assertEqual(backward.columns.etdump_indices.tolist(), [1])
+
+                summary = forward.columns.summary(by_etdump=True)
+                self.assertEqual(summary["etdump_index"].tolist(), [0, 0, 1, 1])
+                self.assertEqual(summary["count"].tolist(), [2, 2, 1, 1])
+                self.assertEqual(summary["p50"].tolist(), [10, 20, 20, 40])
+                df = forward.columns.to_dataframe()
+                self.assertEqual(df["etdump_index"].tolist(), [0, 0, 0, 0, 1, 1])
+
+    def test_inspector_etdump_paths_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Inspector(etdump_path=ETDUMP_PATH, etdump_paths=[ETDUMP_PATH])
+        with self.assertRaises(ValueError):
+            Inspector(etdump_paths=[])
+        with self.assertRaises(ValueError):
+            Inspector(etdump_paths=[ETDUMP_PATH], debug_buffer_path="debug_buffer")
+
+    def _gen_etdump(self, runs: List[Tuple[str, List[Tuple[int, int]]]]) -> bytes:
+        """
+        Serializes an ETDump with the given runs, each a method name and the start and
+        end times of its operators
+        """
+        etdump = flatcc.ETDumpFlatCC(
+            version=0,
+            run_data=[
+                flatcc.RunData(
+                    name=name,
+                    bundled_input_index=-1,
+                    allocators=[],
+                    events=[
+                        flatcc.Event(
+                            profile_event=ProfileEvent(
+                                name=f"op_{i}",
+                                chain_index=0,
+                                instruction_id=i,
+                                delegate_debug_id_int=None,
+                                delegate_debug_id_str=None,
+                                delegate_debug_metadata=None,
+                                start_time=start_time,
+                                end_time=end_time,
+                            ),
+                            allocation_event=None,
+                            debug_event=None,
+                        )
+                        for i, (start_time, end_time) in enumerate(times)
+                    ],
+                )
+                for name, times in runs
+            ],
+        )
+        flatbuffer = serialize_to_etdump_flatcc(etdump)
+        # ETDumps written by the runtime are size prefixed
+        return len(flatbuffer).to_bytes(4, "little") + flatbuffer
+
     def _gen_random_float_list(self) -> List[float]:
         return [random.uniform(0, 10) for _ in range(RAW_DATA_SIZE)]
 
@@ -33,7 +33,9 @@ from executorch.devtools.inspector._inspector_utils import (
     EDGE_DIALECT_GRAPH_KEY,
     find_populated_event,
     gen_graphs_from_etrecord,
+    inflate_runtime_output,
     is_inference_output_equal,
+    map_debug_buffer,
     map_runtime_aot_intermediate_outputs,
     merge_overlapping_debug_handles,
     TimeScale,
@@ -317,6 +319,43 @@ class TestInspectorUtils(unittest.TestCase):
         expected = {((1, 2, 3, 4, 5, 6), 300): ((2, 3, 4, 5, 6, 7), 350)}
         self.assertEqual(actual, expected)
 
+    def test_inflate_runtime_output_from_mapped_debug_buffer(self):
+        expected = torch.arange(6, dtype=torch.float).view(2, 3)
+        value = flatcc.Value(
+            val=flatcc.ValueType.TENSOR.value,
+            tensor=flatcc.Tensor(
+                scalar_type=flatcc.ScalarType.FLOAT,
+                sizes=[2, 3],
+                strides=[3, 1],
+                offset=8,
+            ),
+            tensor_list=None,
+            int_value=None,
+            float_value=None,
+            double_value=None,
+            bool_value=None,
+            output=None,
+        )
+        with tempfile.NamedTemporaryFile() as debug_buffer_file:
+            debug_buffer_file.write(bytes(8) + expected.numpy().tobytes() + bytes(8))
+            debug_buffer_file.flush()
+            debug_buffer = map_debug_buffer(debug_buffer_file.name)
+
+            tensor = inflate_runtime_output(value, debug_buffer)
+            self.assertTrue(torch.equal(tensor, expected))
+            # The tensor is a view of the mapping, whose writes stay in memory
+            tensor[0, 0] = 42.0
+            self.assertEqual(
+                torch.frombuffer(debug_buffer, dtype=torch.float, count=1, offset=8),
+                42.0,
+            )
+            with open(debug_buffer_file.name, "rb") as f:
+                self.assertEqual(f.read()[8:12], bytes(4))
+
+    def test_map_empty_debug_buffer(self):
+        with tempfile.NamedTemporaryFile() as debug_buffer_file:
+            self.assertEqual(map_debug_buffer(debug_buffer_file.name), b"")
+
 
 def gen_mock_operator_graph_with_expected_map() -> (
     Tuple[OperatorGraph, Dict[int, OperatorNode]]
@@ -6,9 +6,15 @@
 
 # pyre-unsafe
 
+import os
+import tempfile
 import unittest
 
 import torch
+from executorch.devtools.inspector._inspector_utils import (
+    calculate_mse,
+    map_runtime_aot_intermediate_outputs,
+)
 from executorch.devtools.inspector._intermediate_output_capturer import (
     IntermediateOutputCapturer,
 )
@@ -71,3 +77,71 @@ class TestIntermediateOutputCapturer(unittest.TestCase):
                 self.assertTrue(
                     check_if_final_outputs_match(model_name, intermediate_outputs)
                 )
+
+    def test_run_and_compare(self):
+        for model_name in model_registry.keys():
+            with self.subTest(model=model_name):
+                input_tensor, _, capturer, intermediate_outputs = self._set_up_model(
+                    model_name
+                )
+                # Runtime outputs with a different error per intermediate output
+                runtime_outputs = {
+                    key: [
+                        value + i if isinstance(value, torch.Tensor) else value
+                        for value in (output if isinstance(output, list) else [output])
+                    ]
+                    for i, (key, output) in enumerate(intermediate_outputs.items())
+                }
+                # The AOT outputs are keys of the mapping, so lists are made tuples
+                mapping = map_runtime_aot_intermediate_outputs(
+                    {
+                        key: tuple(output) if isinstance(output, list) else output
+                        for key, output in intermediate_outputs.items()
+                    },
+                    dict(runtime_outputs),
+                )
+                expected = {
+                    aot_debug_handle: calculate_mse(
+                        (
+                            list(aot_output)
+                            if isinstance(aot_output, tuple)
+                            else [aot_output]
+                        ),
+                        runtime_output,
+                    )
+                    for (aot_debug_handle, aot_output), (
+                        _,
+                        runtime_output,
+                    ) in mapping.items()
+                }
+
+                with tempfile.TemporaryDirectory() as spill_dir:
+                    result = capturer.run_and_compare(
+                        runtime_outputs, input_tensor, top_k=2, spill_dir=spill_dir
+                    )
+                    self.assertEqual(len(os.listdir(spill_dir)), len(runtime_outputs))
+                    for comparison in result.comparisons:
+                        self.assertTrue(os.path.exists(comparison.spill_path))
+
+                self.assertEqual(
+                    {
+                        comparison.aot_debug_handle: comparison.mse
+                        for comparison in result.comparisons
+                    },
+                    expected,
+                )
+                # Only the worst comparisons keep their outputs
+                self.assertEqual(len(result.worst), min(2, len(expected)))
+                worst_mse = sorted(
+                    (comparison.max_mse for comparison in result.comparisons),
+                    reverse=True,
+                )
+                self.assertEqual(
+                    [comparison.max_mse for comparison in result.worst],
+                    worst_mse[: len(result.worst)],
+                )
+                for comparison in result.comparisons:
+                    self.assertEqual(
+                        comparison.aot_output is not None,
+                        any(comparison is worst for worst in result.worst),
+                    )
@@ -0,0 +1,54 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Helpers to run work in worker processes forked from this one."""
+
+# pyre-strict
+
+import logging
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+
+def _cannot_fork_reason() -> Optional[str]:
+    """Returns why worker processes cannot safely be forked, or None if they can."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return "fork is not supported on this platform"
+    if sys.platform == "darwin":
+        # System frameworks, like Accelerate used by torch, are not fork-safe.
+        return "fork is not safe on macOS"
+    if threading.active_count() > 1:
+        # A forked worker only has the calling thread, and inherits the locks
+        # held by the other threads, e.g. of logging, without their owners.
+        return f"{threading.active_count() - 1} other threads are running"
+    return None
+
+
+def fork_process_pool(
+    max_workers: int,
+    fallback: str,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+) -> Optional[ProcessPoolExecutor]:
+    """
+    Returns a pool of up to max_workers worker processes forked from this one,
+    which inherit its state instead of pickling it. Returns None, and warns that
+    the caller is `fallback` instead, if forking is not safe: on platforms
+    without fork, on macOS, and while other threads are running.
+    """
+    reason = _cannot_fork_reason()
+    if reason is not None:
+        logging.warning(f"Cannot fork worker processes ({reason}), {fallback}.")
+        return None
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=initializer,
+        initargs=initargs,
+    )
@@ -0,0 +1,91 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import hashlib
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar, Union
+
+# Bytes-like blob data. memoryviews must be contiguous and of format "B".
+Blob = Union[bytes, bytearray, memoryview]
+
+_T = TypeVar("_T")
+
+# Blobs are fingerprinted from this many evenly spaced windows of this many bytes.
+_NUM_SAMPLES = 16
+_SAMPLE_SIZE = 64
+
+
+def _fingerprint(data: Blob) -> Tuple[int, int]:
+    """Returns a cheap fingerprint of `data`: its size and a hash of a few sampled
+    windows. Equal blobs have equal fingerprints."""
+    view = memoryview(data)
+    size = len(view)
+    if size <= _NUM_SAMPLES * _SAMPLE_SIZE:
+        return size, hash(view.tobytes())
+    step = (size - _SAMPLE_SIZE) // (_NUM_SAMPLES - 1)
+    samples = b"".join(
+        view[i * step : i * step + _SAMPLE_SIZE].tobytes() for i in range(_NUM_SAMPLES)
+    )
+    return size, hash(samples)
+
+
+class DigestCache:
+    """Memoizes the sha256 digest of blobs by object identity, so that a blob
+    shared by several deduplicating stores is only hashed once.
+
+    Holds a reference to each hashed blob, so that its id is not reused while
+    the cache is alive.
+    """
+
+    def __init__(self) -> None:
+        self._digests: Dict[int, Tuple[Blob, bytes]] = {}
+
+    def digest(self, data: Blob) -> bytes:
+        entry = self._digests.get(id(data))
+        if entry is not None and entry[0] is data:
+            return entry[1]
+        hashed = hashlib.sha256(data).digest()
+        self._digests[id(data)] = (data, hashed)
+        return hashed
+
+
+class BlobIndex(Generic[_T]):
+    """Maps unique blobs to values, for deduplicating blobs without hashing all
+    of their contents.
+
+    Blobs are first bucketed by a cheap fingerprint of their size, an optional
+    caller-provided tag (e.g. the dtype of a tensor) and a sample of their
+    contents. The full sha256 digest of a blob is only computed when another blob
+    is in the same bucket, through a DigestCache that may be shared with other
+    indexes.
+    """
+
+    def __init__(self, digest_cache: Optional[DigestCache] = None) -> None:
+        self.digest_cache: DigestCache = digest_cache or DigestCache()
+        self._buckets: Dict[Tuple[Hashable, int, int], List[Tuple[Blob, _T]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def get(self, data: Blob, tag: Hashable = None) -> Optional[_T]:
+        """Returns the value of the blob equal to `data`, or None if there is
+        none. Blobs are only equal if they were added with the same tag."""
+        bucket = self._buckets.get((tag, *_fingerprint(data)))
+        if not bucket:
+            return None
+        for candidate, value in bucket:
+            if candidate is data:
+                return value
+        hashed = self.digest_cache.digest(data)
+        for candidate, value in bucket:
+            if self.digest_cache.digest(candidate) == hashed:
+                return value
+        return None
+
+    def add(self, data: Blob, value: _T, tag: Hashable = None) -> None:
+        """Adds a blob that is not in the index yet."""
+        self._buckets.setdefault((tag, *_fingerprint(data)), []).append((data, value))
@@ -8,8 +8,43 @@
 
 import enum
 import json
-from dataclasses import fields, is_dataclass
-from typing import Any, Dict, get_args, get_origin, get_type_hints, Union
+from dataclasses import Field, fields, is_dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    get_args,
+    get_origin,
+    get_type_hints,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# The names of the fields of each dataclass encoded so far, each paired with
+# the key that records the type of its value when the field is a Union.
+_encoder_plans: Dict[type, Tuple[Tuple[str, Optional[str]], ...]] = {}
+
+
+def _get_encoder_plan(cls: type) -> Tuple[Tuple[str, Optional[str]], ...]:
+    plan = _encoder_plans.get(cls)
+    if plan is None:
+        hints = get_type_hints(cls)
+        plan = tuple(
+            (
+                field.name,
+                (
+                    f"{field.name}_type"
+                    if isinstance(field.type, str)
+                    and get_origin(hints[field.name]) == Union
+                    else None
+                ),
+            )
+            for field in fields(cls)
+        )
+        _encoder_plans[cls] = plan
+    return plan
 
 
 class _DataclassEncoder(json.JSONEncoder):
@@ -17,14 +52,14 @@ class _DataclassEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
         if is_dataclass(o):
             props = {}
-            for field in fields(o):
-                props[field.name] = getattr(o, field.name)
-                origin = get_origin(get_type_hints(type(o))[field.name])
-                if isinstance(field.type, str) and origin == Union:
-                    props[f"{field.name}_type"] = type(getattr(o, field.name)).__name__
+            for name, type_key in _get_encoder_plan(type(o)):
+                value = getattr(o, name)
+                props[name] = value
+                if type_key is not None:
+                    props[type_key] = type(value).__name__
             return props
 
-        if isinstance(o, bytes):
+        if isinstance(o, (bytes, memoryview)):
             return list(o)
 
         return super().default(o)
@@ -40,20 +75,107 @@ def _is_optional(T: Any) -> bool:
     )
 
 
+# Converts a non-None JSON value to the type of a field.
 # pyre-ignore
-def _is_strict_union(T: Any, cls: Any, key: str) -> bool:
-    return isinstance(T, str) and get_origin(get_type_hints(cls)[key]) is Union
+_ValueDecoder = Callable[[Any], Any]
 
+# Returns the value of a field, given the dictionary of its dataclass.
+# pyre-ignore
+_FieldDecoder = Callable[[Dict[str, Any]], Any]
 
+# The decoder of each dataclass decoded so far.
 # pyre-ignore
-def _get_class_from_union(json_dict: Dict[str, Any], key: str, cls: Any) -> Any:
-    """Search through all possible types in the Union and select the type we
-    want to unpack (note in the serialization of a PyObject to JSON,
-    the type we want to unpack is keyed by f"{field.name}_type").
-    """
-    _type = json_dict[key + "_type"]
-    res = [x for x in get_args(get_type_hints(cls)[key]) if x.__name__ == _type]
-    return res[0]
+_decoders: Dict[Any, Callable[[Dict[str, Any]], Any]] = {}
+
+
+# pyre-ignore
+def _compile_value_decoder(T: Any, union_args: Tuple[Any, ...]) -> _ValueDecoder:
+    """Returns a function that converts JSON values to type `T`.
+    `union_args` are the types of the field when it is a Union."""
+    if is_dataclass(T):
+        return lambda value: _json_to_dataclass(value, T)
+
+    if get_origin(T) is list:
+        element_type = get_args(T)[0]
+        if not is_dataclass(element_type):
+            return list
+        return lambda value: [_json_to_dataclass(e, element_type) for e in value]
+
+    # If T is a Union, then check which type in the Union it is and initialize.
+    # eg. Double type in schema.py
+    if get_origin(T) is Union:
+
+        # pyre-ignore
+        def decode_union(value: Any) -> Any:
+            return [x for x in union_args if x == type(value)][0](value)
+
+        return decode_union
+
+    # If T is an enum then lookup the value in the enum otherwise try to
+    # cast value to whatever type is required
+    if isinstance(T, enum.EnumMeta):
+        return T.__getitem__
+    return T
+
+
+# pyre-ignore
+def _compile_field_decoder(
+    cls: Any, field: Field, hints: Dict[str, Any]
+) -> _FieldDecoder:
+    key = field.name
+    T = field.type
+
+    if isinstance(T, str) and get_origin(hints[key]) is Union:
+        # If the field is a Union type, we determine exactly what type we
+        # are trying to initialize from the name serialized next to it, and
+        # then make a recursive call construct this new class
+        classes: Dict[str, Any] = {}
+        for x in get_args(hints[key]):
+            classes.setdefault(x.__name__, x)
+        type_key = key + "_type"
+        return lambda json_dict: _json_to_dataclass(
+            json_dict[key], classes[json_dict[type_key]]
+        )
+
+    optional = _is_optional(T)
+    if optional:
+        T = get_args(T)[0]
+    decode_value = _compile_value_decoder(T, get_args(hints[key]))
+
+    # pyre-ignore
+    def decode_field(json_dict: Dict[str, Any]) -> Any:
+        if optional:
+            value = json_dict.get(key, None)
+        else:
+            try:
+                value = json_dict[key]
+            except KeyError:
+                raise TypeError(
+                    f"Invalid Buffer. Received no value for field: {key}, but {key} : {T} is not an Optional type."
+                )
+        return None if value is None else decode_value(value)
+
+    return decode_field
+
+
+# pyre-ignore
+def _get_decoder(cls: Any) -> Callable[[Dict[str, Any]], Any]:
+    """Returns a function that initializes `cls` from a dictionary. The type
+    of each field is only inspected once, when the decoder is compiled."""
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        hints = get_type_hints(cls)
+        field_decoders: List[Tuple[str, _FieldDecoder]] = [
+            (field.name, _compile_field_decoder(cls, field, hints))
+            for field in fields(cls)
+        ]
+
+        # pyre-ignore
+        def decoder(json_dict: Dict[str, Any]) -> Any:
+            return cls(**{key: decode(json_dict) for key, decode in field_decoders})
+
+        _decoders[cls] = decoder
+    return decoder
 
 
 # pyre-ignore
@@ -90,56 +212,4 @@ def _json_to_dataclass(json_dict: Dict[str, Any], cls: Any = None) -> Any:
     """
     if not is_dataclass(cls) or is_dataclass(json_dict):
         return json_dict
-
-    # initialize dataclass by iterating through all required fields
-    cls_flds = fields(cls)
-    data = {}
-    for field in cls_flds:
-        key = field.name
-        T = field.type
-
-        if _is_optional(T):
-            T = get_args(T)[0]
-            value = json_dict.get(key, None)
-        elif _is_strict_union(T, cls, key):
-            # If the field is a Union type, we determine exactly what type we
-            # are trying to initialize by calling `_get_class_from_union`, and
-            # then make a recursive call construct this new class
-            _cls = _get_class_from_union(json_dict, key, cls)
-            data[key] = _json_to_dataclass(json_dict[key], _cls)
-            continue
-        else:
-            try:
-                value = json_dict[key]
-            except KeyError:
-                raise TypeError(
-                    f"Invalid Buffer. Received no value for field: {key}, but {key} : {T} is not an Optional type."
-                )
-
-        if value is None:
-            data[key] = None
-            continue
-
-        if is_dataclass(T):
-            data[key] = _json_to_dataclass(value, T)
-            continue
-
-        if get_origin(T) is list:
-            T = get_args(T)[0]
-            data[key] = [_json_to_dataclass(e, T) for e in value]
-            continue
-
-        # If T is a Union, then check which type in the Union it is and initialize.
-        # eg. Double type in schema.py
-        if get_origin(T) is Union:
-            res = [x for x in get_args(get_type_hints(cls)[key]) if x == type(value)]
-            data[key] = res[0](value)
-            continue
-
-        # If T is an enum then lookup the value in the enum otherwise try to
-        # cast value to whatever type is required
-        if isinstance(T, enum.EnumMeta):
-            data[key] = T[value]
-        else:
-            data[key] = T(value)
-    return cls(**data)
+    return _get_decoder(cls)(json_dict)
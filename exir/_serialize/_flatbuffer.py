@@ -6,6 +6,7 @@
 
 # pyre-strict
 
+import functools
 import importlib.resources
 import os
 import re
@@ -14,8 +15,24 @@ import subprocess
 
 import tempfile
 
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Sequence
+from dataclasses import dataclass, is_dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from executorch.exir import schema as _program_schema
+from executorch.exir._serialize._flatbuffer_builder import (
+    _FinishedFlatbuffer,
+    _serialize_dataclass,
+)
+from executorch.exir._serialize._flatbuffer_reader import (
+    _flatbuffer_view,
+    _FlatbufferTableView,
+    _read_dataclass,
+)
+from executorch.exir._serialize._flatbuffer_schema import (
+    _FlatbufferSchema,
+    _parse_flatbuffer_schema,
+)
+from executorch.exir.schema import Program
 
 # If this environment variable is set to true, save the flatc input files when
 # serialization fails.
@@ -112,6 +129,10 @@ class _ResourceFiles:
         for name in self._files.keys():
             self._files[name] = patch_fn(self._files[name])
 
+    def contents(self) -> Mapping[str, bytes]:
+        """Returns the current contents of all files, keyed by resource name."""
+        return self._files
+
     def write_to(self, out_dir: str) -> None:
         """Writes the files to the specified directory. File names are based on
         the original resource names.
@@ -132,20 +153,24 @@ class _SchemaInfo:
     max_alignment: int
 
 
-def _prepare_schema(
-    out_dir: str,
+# The root program schema.
+_PROGRAM_SCHEMA: str = "program.fbs"
+# Included by the root program schema; must also be present.
+_PROGRAM_SCHEMA_DEPS: List[str] = ["scalar_type.fbs"]
+
+
+def _load_program_schema(
     constant_tensor_alignment: Optional[int] = None,
     delegate_alignment: Optional[int] = None,
-) -> _SchemaInfo:
-    """Returns the path to the program schema file after copying it and its deps
-    into out_dir. May patch the schema contents depending on the parameters to
-    this function.
-    """
-    program_schema = "program.fbs"
-    # Included by the root program schema; must also be present.
-    deps = ["scalar_type.fbs"]
+) -> Tuple[_ResourceFiles, int]:
+    """Loads the program schema and its deps, patching their contents depending
+    on the parameters to this function.
 
-    schemas = _ResourceFiles([program_schema] + deps)
+    Returns:
+        The patched schema files, and an alignment value that can satisfy all
+        "force_align" entries found in them.
+    """
+    schemas = _ResourceFiles([_PROGRAM_SCHEMA] + _PROGRAM_SCHEMA_DEPS)
 
     # Update annotated alignments in the schema files.
     schemas.patch_files(
@@ -158,13 +183,56 @@ def _prepare_schema(
     # Find the largest alignment used in the patched schema files.
     get_alignments = _SchemaMaxAlignmentGetter()
     schemas.patch_files(get_alignments)
+    return schemas, get_alignments.max_alignment
+
+
+def _prepare_schema(
+    out_dir: str,
+    constant_tensor_alignment: Optional[int] = None,
+    delegate_alignment: Optional[int] = None,
+) -> _SchemaInfo:
+    """Returns the path to the program schema file after copying it and its deps
+    into out_dir. May patch the schema contents depending on the parameters to
+    this function.
+    """
+    schemas, max_alignment = _load_program_schema(
+        constant_tensor_alignment=constant_tensor_alignment,
+        delegate_alignment=delegate_alignment,
+    )
 
     # Write the patched schema files to the filesystem.
     schemas.write_to(out_dir)
 
     return _SchemaInfo(
-        root_path=os.path.join(out_dir, program_schema),
-        max_alignment=get_alignments.max_alignment,
+        root_path=os.path.join(out_dir, _PROGRAM_SCHEMA),
+        max_alignment=max_alignment,
+    )
+
+
+@dataclass
+class _ParsedSchema:
+    schema: _FlatbufferSchema
+
+    # An alignment value that can satisfy all "force_align" entries found in the
+    # schema files.
+    max_alignment: int
+
+
+@functools.lru_cache(maxsize=None)
+def _get_program_schema(
+    constant_tensor_alignment: Optional[int] = None,
+    delegate_alignment: Optional[int] = None,
+) -> _ParsedSchema:
+    """Returns the parsed program schema, patched depending on the parameters to
+    this function. Cached, since the schema is the same for every program.
+    """
+    schemas, max_alignment = _load_program_schema(
+        constant_tensor_alignment=constant_tensor_alignment,
+        delegate_alignment=delegate_alignment,
+    )
+    return _ParsedSchema(
+        schema=_parse_flatbuffer_schema(schemas.contents(), _PROGRAM_SCHEMA),
+        max_alignment=max_alignment,
     )
 
 
@@ -319,6 +387,77 @@ def _program_json_to_flatbuffer(
             )
 
 
+@dataclass
+class _FlatbufferBuilderResult:
+    # Serialized flatbuffer data. Large blobs are referenced rather than copied.
+    data: _FinishedFlatbuffer
+
+    # The maximum "force_align" value from the schema used to serialize the data.
+    max_alignment: int
+
+
+def _program_to_flatbuffer(
+    program: Program,
+    *,
+    constant_tensor_alignment: Optional[int] = None,
+    delegate_alignment: Optional[int] = None,
+) -> _FlatbufferBuilderResult:
+    """Converts a Program into binary flatbuffer data, in-process.
+
+    Produces the same bytes as passing the JSON form of the program to
+    _program_json_to_flatbuffer(), without the intermediate JSON string and the
+    `flatc` subprocess.
+
+    Args:
+        program: The executorch.exir.schema.Program to convert.
+        constant_tensor_alignment: If provided, the alignment to use for tensor
+            data embedded in the output flatbuffer data. If not provided, uses
+            the alignment in the schema.
+        delegate_alignment: If provided, the alignment to use for delegate
+            data embedded in the output flatbuffer data. If not provided, uses
+            the alignment in the schema.
+
+    Returns: The flatbuffer data and associated metadata.
+    """
+    parsed = _get_program_schema(
+        constant_tensor_alignment=constant_tensor_alignment,
+        delegate_alignment=delegate_alignment,
+    )
+    return _FlatbufferBuilderResult(
+        data=_serialize_dataclass(parsed.schema, program),
+        max_alignment=parsed.max_alignment,
+    )
+
+
+# Table name -> the dataclass that represents it in executorch.exir.schema.
+_PROGRAM_CLASSES: Dict[str, type] = {
+    name: value
+    for name, value in vars(_program_schema).items()
+    if isinstance(value, type) and is_dataclass(value)
+}
+
+
+def _program_flatbuffer_to_program(program_flatbuffer: bytes) -> Program:
+    """Converts binary flatbuffer data into a Program, in-process.
+
+    Produces the same Program as passing the output of
+    _program_flatbuffer_to_json() to _json_to_dataclass(), without the `flatc`
+    subprocess and the intermediate JSON string.
+    """
+    # No need to patch the alignment when reading. "force_align" is only used
+    # during serialization.
+    return _read_dataclass(
+        _get_program_schema().schema, _PROGRAM_CLASSES, program_flatbuffer
+    )
+
+
+def _program_flatbuffer_view(program_flatbuffer: bytes) -> _FlatbufferTableView:
+    """Returns a lazy, read-only view of the Program table in the binary
+    flatbuffer data. The data is not copied, and must outlive the view.
+    """
+    return _flatbuffer_view(_get_program_schema().schema, program_flatbuffer)
+
+
 def _replace_infinity_in_json_file(content: bytes) -> bytes:
     """Replace -inf and inf with "inf" and "-inf" in the JSON file. program.fbs
     is used to convert from flatbuffer to JSON. +-inf float values are not
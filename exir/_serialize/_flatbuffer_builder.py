@@ -0,0 +1,397 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""Serializes schema dataclasses to binary flatbuffer data in-process.
+
+This replaces the `dataclass -> JSON -> flatc` round trip. To keep the output
+byte-for-byte identical to what `flatc --binary` produces from the JSON
+representation of the same dataclass, the builder mirrors the order in which
+the flatc JSON parser creates objects:
+
+- Child strings, vectors and tables are created depth-first, in the order that
+  the dataclass fields (and therefore the JSON keys) appear.
+- Table fields are then written in decreasing order of inline size, and for
+  fields of the same size in decreasing order of field id.
+- Fields equal to their schema default are omitted, and vtables are shared
+  between tables whose vtables are identical.
+"""
+
+import dataclasses
+import math
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from executorch.exir._serialize._cord import Cord
+from executorch.exir._serialize._flatbuffer_schema import (
+    _FieldDef,
+    _FlatbufferSchema,
+    _TableDef,
+    _TypeRef,
+)
+
+# Blobs at least this large are stored by reference in the output Cord instead
+# of being copied into the builder's scratch buffer.
+_LARGE_BLOB_SIZE: int = 4096
+
+
+def _padding_bytes(size: int, alignment: int) -> int:
+    """Returns the padding needed to align `size` to `alignment`."""
+    return -size & (alignment - 1)
+
+
+@dataclasses.dataclass
+class _FinishedFlatbuffer:
+    """A finished flatbuffer, split so that a header can be inserted after the
+    file identifier without copying the (possibly very large) body.
+    """
+
+    # Offset of the root table from the start of the data.
+    root_offset: int
+    # The file identifier, or empty if the schema does not declare one.
+    file_identifier: bytes
+    # Everything after the root offset and file identifier.
+    body: Cord
+
+    def __len__(self) -> int:
+        return 4 + len(self.file_identifier) + len(self.body)
+
+    def to_cord(self, header_data: bytes = b"") -> Cord:
+        """Returns the flatbuffer data, with `header_data` inserted just after
+        the file identifier.
+
+        To preserve the internal alignment of the flatbuffer, the caller must
+        guarantee that the length of `header_data` is a multiple of the largest
+        alignment used in the schema.
+        """
+        cord = Cord(
+            (self.root_offset + len(header_data)).to_bytes(4, byteorder="little")
+            + self.file_identifier
+            + header_data
+        )
+        cord.append(self.body)
+        return cord
+
+
+class _FlatbufferBuilder:
+    """A minimal flatbuffer builder with the same layout rules as the C++
+    `flatbuffers::FlatBufferBuilder` used by `flatc`.
+
+    Like all flatbuffer builders, data is written back to front. Offsets
+    returned by this class are measured from the end of the buffer.
+    """
+
+    def __init__(self) -> None:
+        # Data that has been written, in reverse order of appearance in the
+        # final buffer. Large blobs are kept by reference.
+        self._chunks: List[Union[bytes, memoryview]] = []
+        # Recently written small data, byte-reversed so that prepending is an
+        # append.
+        self._scratch: bytearray = bytearray()
+        self._size: int = 0
+        self._minalign: int = 1
+        # Serialized vtable -> offset, for deduplication.
+        self._vtables: Dict[bytes, int] = {}
+        # (voffset, offset) of each field written to the current table.
+        self._field_locs: List[Tuple[int, int]] = []
+        self._max_voffset: int = 0
+        self._finished: Optional[_FinishedFlatbuffer] = None
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _track_min_align(self, alignment: int) -> None:
+        if alignment > self._minalign:
+            self._minalign = alignment
+
+    def _pad(self, n: int) -> None:
+        if n:
+            self._scratch.extend(bytes(n))
+            self._size += n
+
+    def _align(self, alignment: int) -> None:
+        self._track_min_align(alignment)
+        self._pad(_padding_bytes(self._size, alignment))
+
+    def _pre_align(self, length: int, alignment: int) -> None:
+        """Aligns such that `length` bytes written next end up aligned."""
+        if length == 0:
+            return
+        self._track_min_align(alignment)
+        self._pad(_padding_bytes(self._size + length, alignment))
+
+    def _push_bytes(self, data: Union[bytes, memoryview]) -> None:
+        if len(data) >= _LARGE_BLOB_SIZE:
+            self._flush_scratch()
+            self._chunks.append(data)
+        else:
+            self._scratch.extend(bytes(data)[::-1])
+        self._size += len(data)
+
+    def _flush_scratch(self) -> None:
+        if self._scratch:
+            self._chunks.append(bytes(self._scratch[::-1]))
+            self._scratch = bytearray()
+
+    def _push_scalar(self, fmt: str, size: int, value: Any) -> int:
+        self._align(size)
+        self._scratch.extend(struct.pack("<" + fmt, value)[::-1])
+        self._size += size
+        return self._size
+
+    def _refer_to(self, offset: int) -> int:
+        self._align(4)
+        return self._size - offset + 4
+
+    def create_string(self, s: str) -> int:
+        data = s.encode("utf-8")
+        self._pre_align(len(data) + 1, 4)
+        self._pad(1)
+        self._push_bytes(data)
+        return self._push_scalar("I", 4, len(data))
+
+    def create_scalar_vector(
+        self, fmt: str, elem_size: int, values: Any, alignment: int
+    ) -> int:
+        """Creates a vector of scalars. `values` may be a `bytes` or
+        `memoryview` object when `fmt` is "B", in which case it is stored without
+        being copied.
+        """
+        n = len(values)
+        self._pre_align(n * elem_size, 4)
+        self._pre_align(n * elem_size, alignment)
+        if n:
+            if isinstance(values, (bytes, memoryview)) and fmt == "B":
+                self._push_bytes(values)
+            else:
+                self._push_bytes(struct.pack(f"<{n}{fmt}", *values))
+        return self._push_scalar("I", 4, n)
+
+    def create_offset_vector(self, offsets: List[int]) -> int:
+        n = len(offsets)
+        self._pre_align(n * 4, 4)
+        for offset in reversed(offsets):
+            self._push_scalar("I", 4, self._refer_to(offset))
+        return self._push_scalar("I", 4, n)
+
+    def start_table(self) -> int:
+        self._field_locs = []
+        self._max_voffset = 0
+        return self._size
+
+    def add_scalar(
+        self, voffset: int, fmt: str, size: int, value: Any, default: Any
+    ) -> None:
+        if value == default:
+            return
+        self._track_field(voffset, self._push_scalar(fmt, size, value))
+
+    def add_offset(self, voffset: int, offset: int) -> None:
+        self._track_field(voffset, self._push_scalar("I", 4, self._refer_to(offset)))
+
+    def _track_field(self, voffset: int, loc: int) -> None:
+        self._field_locs.append((voffset, loc))
+        self._max_voffset = max(self._max_voffset, voffset)
+
+    def end_table(self, start: int) -> int:
+        # The table starts with an soffset to its vtable.
+        self._align(4)
+        table_loc = self._size + 4
+        vtable_size = max(self._max_voffset + 2, 4)
+        vtable = [0] * (vtable_size // 2)
+        vtable[0] = vtable_size
+        vtable[1] = table_loc - start
+        for voffset, loc in self._field_locs:
+            vtable[voffset // 2] = table_loc - loc
+        vtable_bytes = struct.pack(f"<{len(vtable)}H", *vtable)
+        vtable_loc = self._vtables.get(vtable_bytes)
+        is_new = vtable_loc is None
+        if vtable_loc is None:
+            vtable_loc = table_loc + vtable_size
+            self._vtables[vtable_bytes] = vtable_loc
+        self._push_scalar("i", 4, vtable_loc - table_loc)
+        if is_new:
+            self._push_bytes(vtable_bytes)
+        self._field_locs = []
+        self._max_voffset = 0
+        return table_loc
+
+    def finish(self, root: int, file_identifier: Optional[bytes] = None) -> None:
+        file_identifier = file_identifier or b""
+        self._pre_align(4 + len(file_identifier), self._minalign)
+        # The file identifier is either empty or 4 bytes long, so this also
+        # aligns the root offset that follows it.
+        self._align(4)
+        # The root offset is relative to its own location, which comes before
+        # the file identifier.
+        root_offset = self._size + len(file_identifier) + 4 - root
+        self._flush_scratch()
+        self._finished = _FinishedFlatbuffer(
+            root_offset=root_offset,
+            file_identifier=file_identifier,
+            body=Cord(),
+        )
+        for chunk in reversed(self._chunks):
+            self._finished.body.append(chunk)
+        self._chunks = []
+
+    def output(self) -> _FinishedFlatbuffer:
+        assert self._finished is not None, "finish() must be called first"
+        return self._finished
+
+
+@dataclasses.dataclass
+class _TablePlan:
+    """How to serialize one dataclass type as one table. Computed once per
+    (dataclass type, table) pair."""
+
+    # (dataclass attribute, table field) pairs in dataclass field order, which
+    # is the order in which child objects are created.
+    read: List[Tuple[str, _FieldDef]]
+    # Table fields in the order that flatc writes them into the table:
+    # decreasing inline size, then decreasing field id.
+    write: List[_FieldDef]
+
+
+class _DataclassSerializer:
+    """Walks a schema dataclass and writes it to a _FlatbufferBuilder, in the
+    same order that `flatc` would process the JSON representation of the
+    dataclass.
+    """
+
+    def __init__(self, schema: _FlatbufferSchema) -> None:
+        self._schema = schema
+        self._builder = _FlatbufferBuilder()
+        self._plans: Dict[Tuple[type, str], _TablePlan] = {}
+
+    def serialize(self, obj: Any) -> _FinishedFlatbuffer:
+        root = self._table(self._schema.root_table, obj)
+        self._builder.finish(root, self._schema.file_identifier)
+        return self._builder.output()
+
+    def _plan(self, table: _TableDef, cls: type) -> _TablePlan:
+        plan = self._plans.get((cls, table.name))
+        if plan is not None:
+            return plan
+        if not dataclasses.is_dataclass(cls):
+            raise TypeError(f"Expected a dataclass for {table.name}, got {cls}")
+        read: List[Tuple[str, _FieldDef]] = []
+        for dc_field in dataclasses.fields(cls):
+            field_def = table.fields_by_name.get(dc_field.name)
+            if field_def is None:
+                raise ValueError(
+                    f"Field {dc_field.name} of {cls.__name__} "
+                    + f"is not present in table {table.name}"
+                )
+            if not field_def.deprecated:
+                read.append((dc_field.name, field_def))
+        write = sorted(table.fields, key=lambda f: (f.type.size, f.id), reverse=True)
+        plan = _TablePlan(read=read, write=write)
+        self._plans[(cls, table.name)] = plan
+        return plan
+
+    def _table(self, table: _TableDef, obj: Any) -> int:
+        plan = self._plan(table, type(obj))
+        # Field id -> value; the value is an offset for non-scalar fields.
+        values: Dict[int, Any] = {}
+        for name, field_def in plan.read:
+            value = getattr(obj, name)
+            if value is None:
+                continue
+            field_type = field_def.type
+            if field_type.is_scalar:
+                values[field_def.id] = self._scalar(field_type, value)
+            elif field_type.kind == "union":
+                assert field_type.name is not None
+                member = self._schema.unions[field_type.name].member(
+                    type(value).__name__
+                )
+                values[field_def.id] = self._table(
+                    self._schema.tables[member.table], value
+                )
+                type_field = self._schema.union_type_field(table, field_def)
+                values[type_field.id] = member.type_id
+            else:
+                values[field_def.id] = self._value(field_def, field_type, value)
+
+        builder = self._builder
+        start = builder.start_table()
+        for field_def in plan.write:
+            value = values.get(field_def.id)
+            if value is None:
+                continue
+            field_type = field_def.type
+            if field_type.is_scalar:
+                builder.add_scalar(
+                    field_def.voffset,
+                    field_type.format,
+                    field_type.size,
+                    value,
+                    field_def.default,
+                )
+            else:
+                builder.add_offset(field_def.voffset, value)
+        return builder.end_table(start)
+
+    def _value(
+        self, field_def: Optional[_FieldDef], field_type: _TypeRef, value: Any
+    ) -> int:
+        """Writes a string, vector or table value and returns its offset."""
+        kind = field_type.kind
+        if kind == "string":
+            return self._builder.create_string(value)
+        if kind == "table":
+            assert field_type.name is not None
+            return self._table(self._schema.tables[field_type.name], value)
+        if kind == "vector":
+            element = field_type.element
+            assert element is not None
+            alignment = (
+                field_def.force_align
+                if field_def is not None and field_def.force_align
+                else element.size
+            )
+            if element.is_scalar:
+                if not (
+                    isinstance(value, (bytes, memoryview)) and element.format == "B"
+                ):
+                    value = [self._scalar(element, v) for v in value]
+                return self._builder.create_scalar_vector(
+                    element.format, element.size, value, alignment
+                )
+            offsets = [self._value(None, element, v) for v in value]
+            return self._builder.create_offset_vector(offsets)
+        raise ValueError(f"Cannot serialize {kind} value {repr(value)}")
+
+    def _scalar(self, field_type: _TypeRef, value: Any) -> Any:
+        if field_type.kind == "enum" and isinstance(value, str):
+            # Like in JSON, enum fields may hold the name of the enum value.
+            assert field_type.name is not None
+            return self._schema.enums[field_type.name].values[value]
+        return _scalar_value(field_type, value)
+
+
+def _scalar_value(field_type: _TypeRef, value: Any) -> Any:
+    """Converts a dataclass field value to the python type expected by
+    `struct.pack` for the field's scalar type."""
+    fmt = field_type.format
+    if fmt in ("f", "d"):
+        # Non-finite values may be represented as strings; see schema.Double.
+        return float(value)
+    if fmt == "?":
+        return bool(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"Cannot store {value} in an integer field")
+    return int(value)
+
+
+def _serialize_dataclass(schema: _FlatbufferSchema, obj: Any) -> _FinishedFlatbuffer:
+    """Serializes `obj`, an instance of the dataclass that corresponds to the
+    schema's root table, to binary flatbuffer data.
+    """
+    return _DataclassSerializer(schema).serialize(obj)
@@ -0,0 +1,491 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""Reads binary flatbuffer data in-process, without `flatc`.
+
+Two styles of access are provided:
+
+- `_FlatbufferTableView` is a lazy, read-only view of a table. Fields are
+  decoded from the underlying buffer only when accessed, and `[ubyte]`
+  vectors are returned as zero-copy `memoryview` slices. Use
+  `_flatbuffer_view()` to get a view of the root table.
+- `_read_dataclass()` eagerly decodes the whole buffer into the python schema
+  dataclasses, producing the same objects as `flatc --json` followed by
+  `_json_to_dataclass()`.
+"""
+
+import dataclasses
+import enum
+import struct
+import typing
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from executorch.exir._serialize._flatbuffer_schema import (
+    _FieldDef,
+    _FlatbufferSchema,
+    _TableDef,
+    _TypeRef,
+)
+
+# Anything that supports the buffer protocol: bytes, bytearray, memoryview,
+# mmap.mmap.
+_Buffer = Union[bytes, bytearray, memoryview, Any]
+
+_U16: struct.Struct = struct.Struct("<H")
+_U32: struct.Struct = struct.Struct("<I")
+_I32: struct.Struct = struct.Struct("<i")
+
+
+class _FlatbufferData:
+    """Low-level accessors over a buffer containing flatbuffer data."""
+
+    def __init__(self, data: _Buffer) -> None:
+        self.buf: memoryview = memoryview(data).cast("B")
+
+    def root(self) -> int:
+        if len(self.buf) < 8:
+            raise ValueError(f"Flatbuffer data length {len(self.buf)} < 8")
+        return _U32.unpack_from(self.buf, 0)[0]
+
+    def field_pos(self, table_pos: int, field_def: _FieldDef) -> int:
+        """Returns the position of a field's data, or 0 if it is absent."""
+        vtable = table_pos - _I32.unpack_from(self.buf, table_pos)[0]
+        voffset = field_def.voffset
+        if voffset >= _U16.unpack_from(self.buf, vtable)[0]:
+            return 0
+        offset = _U16.unpack_from(self.buf, vtable + voffset)[0]
+        return table_pos + offset if offset else 0
+
+    def scalar(self, fmt: str, pos: int) -> Any:
+        return struct.unpack_from("<" + fmt, self.buf, pos)[0]
+
+    def deref(self, pos: int) -> int:
+        """Follows the uoffset stored at `pos`."""
+        return pos + _U32.unpack_from(self.buf, pos)[0]
+
+    def string(self, pos: int) -> str:
+        return str(self.bytes(pos), "utf-8")
+
+    def bytes(self, pos: int) -> memoryview:
+        """Returns the contents of the string or [ubyte] vector at `pos`
+        (after following its offset) without copying."""
+        start = self.deref(pos)
+        length = _U32.unpack_from(self.buf, start)[0]
+        return self.buf[start + 4 : start + 4 + length]
+
+    def vector(self, pos: int) -> Tuple[int, int]:
+        """Returns (position of the first element, number of elements)."""
+        start = self.deref(pos)
+        return start + 4, _U32.unpack_from(self.buf, start)[0]
+
+    def scalar_vector(self, element: _TypeRef, pos: int) -> List[Any]:
+        start, length = self.vector(pos)
+        return list(struct.unpack_from(f"<{length}{element.format}", self.buf, start))
+
+
+class _FlatbufferVectorView(Sequence):
+    """A lazy, read-only view of a vector of tables or strings."""
+
+    def __init__(
+        self,
+        data: _FlatbufferData,
+        start: int,
+        length: int,
+        element: Callable[[int], Any],
+    ) -> None:
+        self._data = data
+        self._start = start
+        self._length = length
+        self._element = element
+
+    def __len__(self) -> int:
+        return self._length
+
+    # pyre-ignore[14]: Sequence.__getitem__ also accepts slices.
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("flatbuffer vector index out of range")
+        return self._element(self._start + 4 * index)
+
+    def __repr__(self) -> str:
+        return f"[{', '.join(repr(e) for e in self)}]"
+
+
+class _FlatbufferTableView:
+    """A lazy, read-only view of a flatbuffer table.
+
+    Fields are accessed as attributes with the names used in the schema, so a
+    view can often stand in for the corresponding schema dataclass. Field values
+    are decoded on every access:
+
+    - Scalars and enums are returned as python numbers; absent scalars return
+      their schema default.
+    - Strings are returned as `str`; `[ubyte]` vectors as zero-copy
+      `memoryview`s; other scalar vectors as lists.
+    - Tables, vectors of tables and union values are returned as views. The
+      hidden `<field>_type` field of a union returns the member name, e.g.
+      `evalue.val_type == "Tensor"`.
+    - Absent non-scalar fields return None.
+    """
+
+    __slots__ = ("_data", "_schema", "_table", "_pos")
+
+    def __init__(
+        self,
+        data: _FlatbufferData,
+        schema: _FlatbufferSchema,
+        table: _TableDef,
+        pos: int,
+    ) -> None:
+        self._data = data
+        self._schema = schema
+        self._table = table
+        self._pos = pos
+
+    def __getattr__(self, name: str) -> Any:
+        field_def = self._table.fields_by_name.get(name)
+        if field_def is None:
+            raise AttributeError(f"Table {self._table.name} has no field {repr(name)}")
+        return self._field(field_def)
+
+    def __dir__(self) -> List[str]:
+        return [f.name for f in self._table.fields if not f.deprecated]
+
+    def __repr__(self) -> str:
+        name = self._table.name.split(".")[-1]
+        fields = ", ".join(f"{f}={repr(getattr(self, f))}" for f in dir(self))
+        return f"{name}View({fields})"
+
+    def _field(self, field_def: _FieldDef) -> Any:
+        data = self._data
+        field_type = field_def.type
+        pos = data.field_pos(self._pos, field_def)
+        if field_type.kind == "utype":
+            assert field_type.name is not None
+            type_id = data.scalar("B", pos) if pos else 0
+            member = self._schema.unions[field_type.name].member_by_id(type_id)
+            return member.name if member is not None else None
+        if field_type.is_scalar:
+            return data.scalar(field_type.format, pos) if pos else field_def.default
+        if not pos:
+            return None
+        if field_type.kind == "string":
+            return data.string(pos)
+        if field_type.kind == "table":
+            assert field_type.name is not None
+            return self._view(self._schema.tables[field_type.name], data.deref(pos))
+        if field_type.kind == "union":
+            type_field = self._schema.union_type_field(self._table, field_def)
+            type_pos = data.field_pos(self._pos, type_field)
+            assert field_type.name is not None
+            member = self._schema.unions[field_type.name].member_by_id(
+                data.scalar("B", type_pos) if type_pos else 0
+            )
+            if member is None:
+                return None
+            return self._view(self._schema.tables[member.table], data.deref(pos))
+        # Vectors.
+        element = field_type.element
+        assert element is not None
+        if element.is_scalar:
+            if element.format == "B":
+                return data.bytes(pos)
+            return data.scalar_vector(element, pos)
+        start, length = data.vector(pos)
+        if element.kind == "string":
+            return _FlatbufferVectorView(data, start, length, data.string)
+        assert element.name is not None
+        table = self._schema.tables[element.name]
+        return _FlatbufferVectorView(
+            data, start, length, lambda p: self._view(table, data.deref(p))
+        )
+
+    def _view(self, table: _TableDef, pos: int) -> "_FlatbufferTableView":
+        return _FlatbufferTableView(self._data, self._schema, table, pos)
+
+
+def _flatbuffer_view(schema: _FlatbufferSchema, data: _Buffer) -> _FlatbufferTableView:
+    """Returns a lazy view of the root table of the flatbuffer in `data`.
+
+    `data` is not copied, and must stay alive (and, for an mmap, open) while
+    the view or anything returned from it is in use.
+    """
+    fb = _FlatbufferData(data)
+    return _FlatbufferTableView(fb, schema, schema.root_table, fb.root())
+
+
+@dataclasses.dataclass
+class _FieldPlan:
+    """How to decode one table field into one dataclass attribute."""
+
+    name: str
+    field_def: _FieldDef
+    # Enum class to convert scalar values to, if any.
+    enum_cls: Optional[type]
+    # Names of the values of an enum field held in a `str` attribute, if any.
+    enum_names: Optional[Dict[int, str]]
+    # Whether the attribute may be None when the field is absent.
+    optional: bool
+    # Whether the attribute is a `bytes` holding a [ubyte] vector.
+    is_bytes: bool
+
+
+# Decodes the value of a field, given the positions of its table and of the
+# field's data.
+_FieldDecoder = Callable[[int, int], Any]
+
+# Marks fields that must be present in the buffer.
+_REQUIRED = object()
+
+
+class _TableDecoder:
+    """Decodes one table into one dataclass.
+
+    Field offsets are read once per vtable, rather than once per field of every
+    table: flatbuffer builders share vtables between tables with the same
+    layout, so the many tables of a type in a large buffer typically use only a
+    handful of them.
+    """
+
+    def __init__(self, buf: memoryview, cls: type) -> None:
+        self._buf = buf
+        self._cls = cls
+        # One entry per dataclass field, filled in by _DataclassReader after
+        # construction, since decoders of nested tables may refer back to this
+        # one. A voffset of 0 marks a field that is never read.
+        self.names: List[str] = []
+        self.voffsets: List[int] = []
+        self.decoders: List[_FieldDecoder] = []
+        # Values of absent fields, or _REQUIRED.
+        self.defaults: List[Any] = []
+        self._vtables: Dict[int, List[int]] = {}
+
+    def _field_offsets(self, vtable: int) -> List[int]:
+        vtable_size = _U16.unpack_from(self._buf, vtable)[0]
+        return [
+            (
+                _U16.unpack_from(self._buf, vtable + voffset)[0]
+                if 0 < voffset < vtable_size
+                else 0
+            )
+            for voffset in self.voffsets
+        ]
+
+    def decode(self, pos: int) -> Any:
+        vtable = pos - _I32.unpack_from(self._buf, pos)[0]
+        offsets = self._vtables.get(vtable)
+        if offsets is None:
+            offsets = self._vtables[vtable] = self._field_offsets(vtable)
+        kwargs: Dict[str, Any] = {}
+        for name, offset, decoder, default in zip(
+            self.names, offsets, self.decoders, self.defaults
+        ):
+            if offset:
+                kwargs[name] = decoder(pos, pos + offset)
+            elif default is _REQUIRED:
+                raise TypeError(
+                    f"Invalid Buffer. Received no value for field: {name}, "
+                    + f"but {name} is not an Optional type."
+                )
+            else:
+                kwargs[name] = default
+        return self._cls(**kwargs)
+
+
+class _DataclassReader:
+    """Eagerly decodes flatbuffer data into schema dataclasses.
+
+    A decoder is compiled for each table and dataclass on first use, so that
+    decoding a table does not look anything up in the schema.
+    """
+
+    def __init__(
+        self,
+        schema: _FlatbufferSchema,
+        classes: Mapping[str, type],
+        data: _Buffer,
+    ) -> None:
+        self._schema = schema
+        self._classes = classes
+        self._data = _FlatbufferData(data)
+        self._plans: Dict[type, List[_FieldPlan]] = {}
+        self._decoders: Dict[Tuple[str, type], _TableDecoder] = {}
+
+    def read(self, view: Optional[_FlatbufferTableView] = None) -> Any:
+        """Decodes the root table, or the table of `view`, which must be a view
+        of the same data as this reader."""
+        if view is None:
+            table, pos = self._schema.root_table, self._data.root()
+        else:
+            table, pos = view._table, view._pos
+        return self._decoder(table, self._class(table.name)).decode(pos)
+
+    def _class(self, name: str) -> type:
+        short_name = name.split(".")[-1]
+        cls = self._classes.get(short_name)
+        if cls is None:
+            raise ValueError(f"No dataclass provided for {short_name}")
+        return cls
+
+    def _plan(self, table: _TableDef, cls: type) -> List[_FieldPlan]:
+        plan = self._plans.get(cls)
+        if plan is not None:
+            return plan
+        hints = typing.get_type_hints(cls)
+        plan = []
+        for dc_field in dataclasses.fields(cls):
+            field_def = table.fields_by_name.get(dc_field.name)
+            if field_def is None:
+                raise ValueError(
+                    f"Field {dc_field.name} of {cls.__name__} "
+                    + f"is not present in table {table.name}"
+                )
+            hint = hints[dc_field.name]
+            args = typing.get_args(hint)
+            optional = typing.get_origin(hint) is Union and type(None) in args
+            if optional:
+                hint = args[0]
+            enum_cls = (
+                hint if isinstance(hint, type) and issubclass(hint, enum.Enum) else None
+            )
+            enum_names = None
+            if hint is str and field_def.type.kind == "enum":
+                assert field_def.type.name is not None
+                enum_names = {
+                    v: k
+                    for k, v in self._schema.enums[field_def.type.name].values.items()
+                }
+            plan.append(
+                _FieldPlan(
+                    dc_field.name,
+                    field_def,
+                    enum_cls,
+                    enum_names,
+                    optional,
+                    hint is bytes,
+                )
+            )
+        self._plans[cls] = plan
+        return plan
+
+    def _decoder(self, table: _TableDef, cls: type) -> _TableDecoder:
+        decoder = self._decoders.get((table.name, cls))
+        if decoder is not None:
+            return decoder
+        decoder = self._decoders[(table.name, cls)] = _TableDecoder(self._data.buf, cls)
+        for fp in self._plan(table, cls):
+            field_def = fp.field_def
+            field_type = field_def.type
+            decoder.names.append(fp.name)
+            if field_type.is_scalar:
+                default = field_def.default
+                if fp.enum_cls:
+                    default = fp.enum_cls(default)
+                elif fp.enum_names is not None:
+                    default = fp.enum_names.get(default, str(default))
+                decoder.voffsets.append(field_def.voffset)
+                decoder.decoders.append(self._scalar_decoder(fp))
+                decoder.defaults.append(default)
+                continue
+            # Deprecated fields are read as absent.
+            decoder.voffsets.append(0 if field_def.deprecated else field_def.voffset)
+            decoder.decoders.append(self._field_decoder(table, fp))
+            decoder.defaults.append(None if fp.optional else _REQUIRED)
+        return decoder
+
+    def _field_decoder(self, table: _TableDef, fp: _FieldPlan) -> _FieldDecoder:
+        if fp.is_bytes:
+            data = self._data
+            return lambda _, pos: bytes(data.bytes(pos))
+        if fp.field_def.type.kind == "union":
+            return self._union_decoder(table, fp.field_def)
+        value_decoder = self._value_decoder(fp.field_def.type)
+        return lambda _, pos: value_decoder(pos)
+
+    def _scalar_decoder(self, fp: _FieldPlan) -> _FieldDecoder:
+        buf = self._data.buf
+        unpack_from = struct.Struct("<" + fp.field_def.type.format).unpack_from
+        enum_cls = fp.enum_cls
+        enum_names = fp.enum_names
+        if enum_cls is not None:
+            return lambda _, pos: enum_cls(unpack_from(buf, pos)[0])
+        if enum_names is not None:
+
+            def enum_name(_: int, pos: int) -> str:
+                value = unpack_from(buf, pos)[0]
+                # flatc writes values that are not in the enum as numbers.
+                return enum_names.get(value, str(value))
+
+            return enum_name
+        return lambda _, pos: unpack_from(buf, pos)[0]
+
+    def _union_decoder(self, table: _TableDef, field_def: _FieldDef) -> _FieldDecoder:
+        data = self._data
+        type_field = self._schema.union_type_field(table, field_def)
+        assert field_def.type.name is not None
+        union = self._schema.unions[field_def.type.name]
+
+        def decode_union(table_pos: int, pos: int) -> Any:
+            type_pos = data.field_pos(table_pos, type_field)
+            type_id = data.scalar("B", type_pos) if type_pos else 0
+            member = union.member_by_id(type_id)
+            if member is None:
+                raise ValueError(f"Unknown {field_def.name}_type {type_id}")
+            return self._decoder(
+                self._schema.tables[member.table], self._class(member.name)
+            ).decode(data.deref(pos))
+
+        return decode_union
+
+    def _value_decoder(self, field_type: _TypeRef) -> Callable[[int], Any]:
+        """Returns a decoder of the string, table or vector at a position."""
+        data = self._data
+        buf = data.buf
+        kind = field_type.kind
+        if kind == "string":
+            return data.string
+        if kind == "table":
+            assert field_type.name is not None
+            decode = self._decoder(
+                self._schema.tables[field_type.name], self._class(field_type.name)
+            ).decode
+            return lambda pos: decode(pos + _U32.unpack_from(buf, pos)[0])
+        element = field_type.element
+        if element is None:
+            raise ValueError(f"Cannot decode {kind} fields into dataclasses")
+        if element.is_scalar:
+            return lambda pos: data.scalar_vector(element, pos)
+        decode_element = self._value_decoder(element)
+
+        def decode_vector(pos: int) -> List[Any]:
+            start, length = data.vector(pos)
+            return [decode_element(start + 4 * i) for i in range(length)]
+
+        return decode_vector
+
+
+def _read_dataclass(
+    schema: _FlatbufferSchema, classes: Mapping[str, type], data: _Buffer
+) -> Any:
+    """Decodes the flatbuffer in `data` into schema dataclasses.
+
+    Args:
+        schema: The schema of the data.
+        classes: Map of table name (without namespace) to the dataclass that
+            represents it. Union values are looked up by union member name.
+        data: The flatbuffer data.
+
+    Returns:
+        An instance of the class that represents the schema's root table.
+    """
+    return _DataclassReader(schema, classes, data).read()
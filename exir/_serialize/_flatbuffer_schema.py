@@ -0,0 +1,492 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""An in-memory model of the flatbuffer schema (.fbs) subset used by ExecuTorch.
+
+The model is consumed by the in-process flatbuffer builder and reader, which
+use it to map the python schema dataclasses to and from binary flatbuffer data
+without going through JSON and the `flatc` tool.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+# Scalar type name -> (struct format character, size in bytes).
+_SCALAR_TYPES: Dict[str, Tuple[str, int]] = {
+    "bool": ("?", 1),
+    "byte": ("b", 1),
+    "int8": ("b", 1),
+    "ubyte": ("B", 1),
+    "uint8": ("B", 1),
+    "short": ("h", 2),
+    "int16": ("h", 2),
+    "ushort": ("H", 2),
+    "uint16": ("H", 2),
+    "int": ("i", 4),
+    "int32": ("i", 4),
+    "uint": ("I", 4),
+    "uint32": ("I", 4),
+    "float": ("f", 4),
+    "float32": ("f", 4),
+    "long": ("q", 8),
+    "int64": ("q", 8),
+    "ulong": ("Q", 8),
+    "uint64": ("Q", 8),
+    "double": ("d", 8),
+    "float64": ("d", 8),
+}
+
+# Size in bytes of offsets to strings, vectors and tables.
+_UOFFSET_SIZE: int = 4
+
+
+@dataclass
+class _EnumDef:
+    name: str
+    # Name of the underlying scalar type.
+    underlying: str
+    values: Dict[str, int]
+
+
+@dataclass
+class _UnionMember:
+    # Name used in the `<field>_type` discriminator, e.g. "XNNAdd".
+    name: str
+    # Fully-qualified name of the table that holds the member's value.
+    table: str
+    # The discriminator value. NONE is always zero.
+    type_id: int
+
+
+@dataclass
+class _UnionDef:
+    name: str
+    members: List[_UnionMember]
+
+    def member(self, name: str) -> _UnionMember:
+        for m in self.members:
+            if m.name == name:
+                return m
+        raise ValueError(f"{repr(name)} is not a member of union {self.name}")
+
+    def member_by_id(self, type_id: int) -> Optional[_UnionMember]:
+        if 0 < type_id <= len(self.members):
+            return self.members[type_id - 1]
+        return None
+
+
+@dataclass
+class _TypeRef:
+    """The type of a table field.
+
+    `kind` is one of "scalar", "string", "vector", "table", "enum", "union" or
+    "utype" (the hidden discriminator field that accompanies a union field).
+    """
+
+    kind: str
+    # Scalar type name for "scalar", underlying scalar for "enum" and "utype".
+    scalar: Optional[str] = None
+    # Fully-qualified name for "table", "enum", "union" and "utype".
+    name: Optional[str] = None
+    # Element type for "vector".
+    element: Optional["_TypeRef"] = None
+
+    # Derived from the fields above.
+    is_scalar: bool = field(init=False)
+    # Inline size in bytes of a field of this type.
+    size: int = field(init=False)
+    # The struct format character for scalar types, or "" for other types.
+    format: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.is_scalar = self.kind in ("scalar", "enum", "utype")
+        if self.is_scalar:
+            assert self.scalar is not None, f"{self.kind} requires a scalar type"
+            self.format, self.size = _SCALAR_TYPES[self.scalar]
+        else:
+            self.format, self.size = "", _UOFFSET_SIZE
+
+
+@dataclass
+class _FieldDef:
+    name: str
+    type: _TypeRef
+    # Index of the field in its table's vtable.
+    id: int
+    # Default value for scalar fields.
+    default: Union[int, float, bool, None] = None
+    deprecated: bool = False
+    # Value of the (force_align: N) attribute, if present.
+    force_align: Optional[int] = None
+
+    @property
+    def voffset(self) -> int:
+        """Offset of this field's entry in the vtable."""
+        return 4 + 2 * self.id
+
+
+@dataclass
+class _TableDef:
+    name: str
+    fields: List[_FieldDef] = field(default_factory=list)
+    fields_by_name: Dict[str, _FieldDef] = field(default_factory=dict)
+
+
+@dataclass
+class _FlatbufferSchema:
+    tables: Dict[str, _TableDef]
+    enums: Dict[str, _EnumDef]
+    unions: Dict[str, _UnionDef]
+    root_type: str
+    file_identifier: Optional[bytes]
+
+    @property
+    def root_table(self) -> _TableDef:
+        return self.tables[self.root_type]
+
+    def union_type_field(self, table: _TableDef, union_field: _FieldDef) -> _FieldDef:
+        """Returns the hidden discriminator field of a union field."""
+        return table.fields_by_name[union_field.name + "_type"]
+
+
+_TOKEN_RE: re.Pattern[str] = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<number>[-+]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?))
+    |(?P<ident>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    |(?P<punct>[{}()\[\]:;,=])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m is None:
+            raise ValueError(f"Unexpected character {repr(text[pos])} in schema")
+        pos = m.end()
+        if m.lastgroup not in ("ws", "comment"):
+            tokens.append(m.group())
+    return tokens
+
+
+def _parse_number(token: str) -> Union[int, float]:
+    try:
+        return int(token, 0)
+    except ValueError:
+        return float(token)
+
+
+@dataclass
+class _RawField:
+    name: str
+    type_name: str
+    is_vector: bool
+    default: Optional[str]
+    attributes: Dict[str, Optional[str]]
+
+
+class _TokenStream:
+    """A cursor over the tokens of one schema file."""
+
+    def __init__(self, file_name: str, text: str) -> None:
+        self._file_name = file_name
+        self._tokens: List[str] = _tokenize(text)
+        self._pos = 0
+
+    def at_end(self) -> bool:
+        return self._pos >= len(self._tokens)
+
+    def peek(self) -> str:
+        if self.at_end():
+            raise ValueError(f"{self._file_name}: unexpected end of schema")
+        return self._tokens[self._pos]
+
+    def next(self) -> str:
+        token = self.peek()
+        self._pos += 1
+        return token
+
+    def accept(self, token: str) -> bool:
+        """Consumes the next token if it matches `token`."""
+        if not self.at_end() and self._tokens[self._pos] == token:
+            self._pos += 1
+            return True
+        return False
+
+    def expect(self, token: str) -> None:
+        if not self.accept(token):
+            raise ValueError(
+                f"{self._file_name}: expected {repr(token)}, got {repr(self.peek())}"
+            )
+
+
+class _SchemaParser:
+    """Parses the subset of the flatbuffer IDL used by ExecuTorch schemas:
+    namespaces, includes, enums, unions (including aliased members) and tables.
+    """
+
+    def __init__(self, files: Mapping[str, bytes]) -> None:
+        self._files = files
+        self._parsed_files: List[str] = []
+        self._raw_tables: List[Tuple[str, str, List[_RawField]]] = []
+        self._enums: Dict[str, _EnumDef] = {}
+        self._raw_unions: List[Tuple[str, str, List[Tuple[str, str]]]] = []
+        self.root_type: Optional[Tuple[str, str]] = None
+        self.file_identifier: Optional[bytes] = None
+
+    def parse_file(self, name: str, is_root: bool) -> None:
+        if name in self._parsed_files:
+            return
+        self._parsed_files.append(name)
+        if name not in self._files:
+            raise ValueError(f"Schema file {repr(name)} is not available")
+        tokens = _TokenStream(name, self._files[name].decode("utf-8"))
+        namespace = ""
+        while not tokens.at_end():
+            keyword = tokens.next()
+            if keyword in ("enum", "union", "table", "struct"):
+                self._parse_definition(keyword, namespace, tokens)
+                continue
+            value = tokens.next().strip('"')
+            tokens.expect(";")
+            if keyword == "include":
+                self.parse_file(value.split("/")[-1], is_root=False)
+            elif keyword == "namespace":
+                namespace = value
+            elif keyword == "file_identifier" and is_root:
+                self.file_identifier = value.encode("ascii")
+            elif keyword == "root_type" and is_root:
+                self.root_type = (namespace, value)
+            elif keyword not in (
+                "native_include",
+                "file_identifier",
+                "file_extension",
+                "attribute",
+                "root_type",
+            ):
+                raise ValueError(f"{name}: unsupported schema keyword {repr(keyword)}")
+
+    def _parse_definition(
+        self, keyword: str, namespace: str, tokens: _TokenStream
+    ) -> None:
+        name = tokens.next()
+        qualified = _qualify(namespace, name)
+        if keyword == "enum":
+            tokens.expect(":")
+            underlying = tokens.next()
+            values: Dict[str, int] = {}
+            next_value = 0
+            for value_name, value in self._parse_members(tokens, "="):
+                if value is not None:
+                    next_value = int(_parse_number(value))
+                values[value_name] = next_value
+                next_value += 1
+            self._enums[qualified] = _EnumDef(qualified, underlying, values)
+        elif keyword == "union":
+            members = [
+                (member, table or member)
+                for member, table in self._parse_members(tokens, ":")
+            ]
+            self._raw_unions.append((namespace, name, members))
+        elif keyword == "table":
+            tokens.expect("{")
+            fields: List[_RawField] = []
+            while not tokens.accept("}"):
+                fields.append(self._parse_field(tokens))
+            self._raw_tables.append((namespace, name, fields))
+        else:
+            raise ValueError(f"Flatbuffer structs are not supported ({name})")
+
+    def _parse_members(
+        self, tokens: _TokenStream, separator: str
+    ) -> List[Tuple[str, Optional[str]]]:
+        """Parses the `{ A, B <separator> value, }` body of an enum or union."""
+        tokens.expect("{")
+        members: List[Tuple[str, Optional[str]]] = []
+        while not tokens.accept("}"):
+            member = tokens.next()
+            value = tokens.next() if tokens.accept(separator) else None
+            members.append((member, value))
+            tokens.accept(",")
+        return members
+
+    def _parse_field(self, tokens: _TokenStream) -> _RawField:
+        name = tokens.next()
+        tokens.expect(":")
+        is_vector = tokens.accept("[")
+        type_name = tokens.next()
+        if is_vector:
+            tokens.expect("]")
+        default = tokens.next() if tokens.accept("=") else None
+        attributes: Dict[str, Optional[str]] = {}
+        if tokens.accept("("):
+            while not tokens.accept(")"):
+                attr_name = tokens.next()
+                attr_value = tokens.next().strip('"') if tokens.accept(":") else None
+                attributes[attr_name] = attr_value
+                tokens.accept(",")
+        tokens.expect(";")
+        return _RawField(name, type_name, is_vector, default, attributes)
+
+    def _resolve(
+        self, namespace: str, name: str, candidates: Mapping[str, object]
+    ) -> Optional[str]:
+        """Resolves a possibly-unqualified type name using flatc's lookup rules:
+        innermost namespace first, then outward."""
+        parts = namespace.split(".") if namespace else []
+        for n in range(len(parts), -1, -1):
+            qualified = _qualify(".".join(parts[:n]), name)
+            if qualified in candidates:
+                return qualified
+        return None
+
+    def build(self) -> _FlatbufferSchema:
+        tables: Dict[str, _TableDef] = {
+            _qualify(ns, n): _TableDef(_qualify(ns, n)) for ns, n, _ in self._raw_tables
+        }
+        unions: Dict[str, _UnionDef] = {}
+        for ns, union_name, raw_members in self._raw_unions:
+            members: List[_UnionMember] = []
+            for type_id, (member_name, member_table) in enumerate(raw_members, 1):
+                table = self._resolve(ns, member_table, tables)
+                if table is None:
+                    raise ValueError(
+                        f"Union {union_name} member {member_table} is not a table"
+                    )
+                members.append(_UnionMember(member_name, table, type_id))
+            qualified = _qualify(ns, union_name)
+            unions[qualified] = _UnionDef(qualified, members)
+
+        for ns, table_name, raw_fields in self._raw_tables:
+            table = tables[_qualify(ns, table_name)]
+            explicit_ids = all("id" in f.attributes for f in raw_fields) and raw_fields
+            next_id = 0
+            for raw in raw_fields:
+                type_ref = self._type_ref(ns, raw.type_name, tables, unions)
+                if raw.is_vector:
+                    if type_ref.kind == "union":
+                        raise ValueError(
+                            f"Vectors of unions are not supported ({raw.name})"
+                        )
+                    type_ref = _TypeRef(kind="vector", element=type_ref)
+                if explicit_ids:
+                    field_id = int(raw.attributes["id"] or 0)
+                else:
+                    field_id = next_id + (1 if type_ref.kind == "union" else 0)
+                if type_ref.kind == "union":
+                    # A union field is preceded by a hidden discriminator field.
+                    type_field = _FieldDef(
+                        name=raw.name + "_type",
+                        type=_TypeRef(kind="utype", scalar="ubyte", name=type_ref.name),
+                        id=field_id - 1,
+                        default=0,
+                        deprecated="deprecated" in raw.attributes,
+                    )
+                    table.fields.append(type_field)
+                    table.fields_by_name[type_field.name] = type_field
+                force_align = raw.attributes.get("force_align")
+                field_def = _FieldDef(
+                    name=raw.name,
+                    type=type_ref,
+                    id=field_id,
+                    default=self._default(raw.default, type_ref),
+                    deprecated="deprecated" in raw.attributes,
+                    force_align=int(force_align) if force_align else None,
+                )
+                table.fields.append(field_def)
+                table.fields_by_name[raw.name] = field_def
+                next_id = field_id + 1
+            table.fields.sort(key=lambda f: f.id)
+
+        if self.root_type is None:
+            raise ValueError("Schema does not declare a root_type")
+        root = self._resolve(self.root_type[0], self.root_type[1], tables)
+        if root is None:
+            raise ValueError(f"Unknown root_type {self.root_type[1]}")
+        return _FlatbufferSchema(
+            tables=tables,
+            enums=self._enums,
+            unions=unions,
+            root_type=root,
+            file_identifier=self.file_identifier,
+        )
+
+    def _type_ref(
+        self,
+        namespace: str,
+        type_name: str,
+        tables: Mapping[str, _TableDef],
+        unions: Mapping[str, _UnionDef],
+    ) -> _TypeRef:
+        if type_name in _SCALAR_TYPES:
+            return _TypeRef(kind="scalar", scalar=type_name)
+        if type_name == "string":
+            return _TypeRef(kind="string")
+        resolved = self._resolve(namespace, type_name, tables)
+        if resolved is not None:
+            return _TypeRef(kind="table", name=resolved)
+        resolved = self._resolve(namespace, type_name, self._enums)
+        if resolved is not None:
+            return _TypeRef(
+                kind="enum", scalar=self._enums[resolved].underlying, name=resolved
+            )
+        resolved = self._resolve(namespace, type_name, unions)
+        if resolved is not None:
+            return _TypeRef(kind="union", name=resolved)
+        raise ValueError(f"Unknown type {repr(type_name)} in namespace {namespace}")
+
+    def _default(
+        self, default: Optional[str], type_ref: _TypeRef
+    ) -> Union[int, float, bool, None]:
+        if not type_ref.is_scalar:
+            return None
+        scalar = type_ref.scalar
+        is_float = scalar in ("float", "float32", "double", "float64")
+        if default is None:
+            return False if scalar == "bool" else (0.0 if is_float else 0)
+        if type_ref.kind == "enum":
+            assert type_ref.name is not None
+            enum_values = self._enums[type_ref.name].values
+            if default in enum_values:
+                return enum_values[default]
+        if scalar == "bool":
+            return default == "true" or default == "1"
+        value = _parse_number(default)
+        if is_float:
+            return float(value)
+        return int(value)
+
+
+def _qualify(namespace: str, name: str) -> str:
+    return f"{namespace}.{name}" if namespace else name
+
+
+def _parse_flatbuffer_schema(
+    files: Mapping[str, bytes], root_file: str
+) -> _FlatbufferSchema:
+    """Parses a flatbuffer schema.
+
+    Args:
+        files: Map of schema file name to file contents. Must contain
+            `root_file` and every file that it (transitively) includes.
+        root_file: Name of the file that declares the root_type and
+            file_identifier.
+
+    Returns:
+        The parsed schema.
+    """
+    parser = _SchemaParser(files)
+    parser.parse_file(root_file, is_root=True)
+    return parser.build()
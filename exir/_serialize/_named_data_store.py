@@ -6,13 +6,14 @@
 
 # pyre-strict
 
-import hashlib
 import math
 from dataclasses import dataclass
 
 # from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from executorch.exir._serialize._blob_index import BlobIndex
+
 
 @dataclass
 class BufferEntry:
@@ -68,10 +69,9 @@ class NamedDataStore:
     # Map of {filename: {key: buffer_index}}.
     external_data: Dict[str, Dict[str, int]]
 
-    # Cache of the data hash for deduplication.
-    # Use a hash instead of the data as a key because a sha256 collision is
-    # unlikely, and the data may be large.
-    data_hash_to_buffer_idx: Dict[bytes, int]
+    # Index of the unique data for deduplication. Only hashes data in full
+    # (sha256) when another blob has the same size and sampled contents.
+    data_to_buffer_idx: BlobIndex[int]
     # Cache of the key to buffer idx to ensure uniqueness.
     # If a key is added multiple times, check the buffer idx to ensure that the
     # data is identical too.
@@ -85,7 +85,7 @@ class NamedDataStore:
         self.pte_data = {}
         self.external_data = {}
 
-        self.data_hash_to_buffer_idx = {}
+        self.data_to_buffer_idx = BlobIndex()
         self.key_to_buffer_idx = {}
 
     def _add_named_data_to_map(
@@ -111,14 +111,11 @@ class NamedDataStore:
             ValueError: when the key exists in the store, and corresponding data
                 is different.
         """
-        # Get data hash.
-        hashed = hashlib.sha256(data).digest()
-
         # Check if the key exists.
         buffer_idx = self.key_to_buffer_idx.get(key, -1)
         if buffer_idx != -1:
             # If the key exists, the corresponding data must be identical.
-            if self.data_hash_to_buffer_idx.get(hashed, -1) != buffer_idx:
+            if self.data_to_buffer_idx.get(data) != buffer_idx:
                 raise ValueError(
                     f"Duplicate key {key} with different data. "
                     f"Existing data: {self.buffers[buffer_idx].buffer}. "
@@ -129,8 +126,9 @@ class NamedDataStore:
             )
         else:
             # Key doesn't exist; check if the data exists.
-            buffer_idx = self.data_hash_to_buffer_idx.get(hashed, -1)
-            if buffer_idx != -1:
+            existing_idx = self.data_to_buffer_idx.get(data)
+            if existing_idx is not None:
+                buffer_idx = existing_idx
                 # The data exists; update the alignment.
                 self.buffers[buffer_idx].alignment = math.lcm(
                     self.buffers[buffer_idx].alignment, alignment
@@ -139,7 +137,7 @@ class NamedDataStore:
                 # The data doesn't exist; add it to the data store.
                 buffer_idx = len(self.buffers)
                 self.buffers.append(BufferEntry(data, alignment))
-                self.data_hash_to_buffer_idx[hashed] = buffer_idx
+                self.data_to_buffer_idx.add(data, buffer_idx)
 
             # Add key to the map and the key cache.
             local_key_to_buffer_idx[key] = buffer_idx
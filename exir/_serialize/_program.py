@@ -9,18 +9,21 @@
 import copy
 import json
 import math
+import mmap
 import re
 
 from dataclasses import dataclass
-from typing import ClassVar, Dict, List, Literal, Optional, Tuple
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple, Union
 
 from executorch.exir._serialize._cord import Cord
 from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
 from executorch.exir._serialize._flatbuffer import (
-    _FlatbufferResult,
-    _program_flatbuffer_to_json,
-    _program_json_to_flatbuffer,
+    _FlatbufferBuilderResult,
+    _program_flatbuffer_to_program,
+    _program_flatbuffer_view,
+    _program_to_flatbuffer,
 )
+from executorch.exir._serialize._flatbuffer_reader import _FlatbufferTableView
 from executorch.exir._serialize._named_data_store import (
     BufferEntry,
     NamedDataStoreOutput,
@@ -29,11 +32,13 @@ from executorch.exir._serialize._named_data_store import (
 from executorch.exir._serialize.padding import aligned_size, pad_to, padding_required
 
 from executorch.exir.schema import (
+    BackendDelegate,
     BackendDelegateDataReference,
     BackendDelegateInlineData,
     Buffer,
     DataLocation,
     DataSegment,
+    ExecutionPlan,
     NamedData,
     Program,
     SubsegmentOffsets,
@@ -378,6 +383,30 @@ def _extract_named_data(
     program.named_data = named_data
 
 
+def _copy_for_segment_extraction(program: Program) -> Program:
+    """Returns a copy of the program that serialize_pte_binary() may modify.
+
+    Only the objects that segment extraction modifies in-place are copied: the
+    Program itself, the segment list, and the execution plans and delegates
+    along with their data references. All other objects, including every
+    Buffer and BackendDelegateInlineData, are shared with the original.
+    """
+    program = copy.copy(program)
+    program.segments = list(program.segments)
+    execution_plan: List[ExecutionPlan] = []
+    for plan in program.execution_plan:
+        plan = copy.copy(plan)
+        delegates: List[BackendDelegate] = []
+        for delegate in plan.delegates:
+            delegate = copy.copy(delegate)
+            delegate.processed = copy.copy(delegate.processed)
+            delegates.append(delegate)
+        plan.delegates = delegates
+        execution_plan.append(plan)
+    program.execution_plan = execution_plan
+    return program
+
+
 def serialize_pte_binary(
     program: Program,
     *,
@@ -415,10 +444,9 @@ def serialize_pte_binary(
     if constant_tensor_alignment is None:
         constant_tensor_alignment = ALIGNMENT
 
-    # Don't modify the original program.
-    # TODO(T144120904): Could avoid yet more huge copies with a more shallow
-    # copy, reusing the actual data blobs.
-    program = copy.deepcopy(program)
+    # Don't modify the original program. Only copy the parts that are rewritten
+    # below, sharing the potentially huge data blobs with the original.
+    program = _copy_for_segment_extraction(program)
 
     # Store extracted segment data, with any buffer-specific alignment.
     # This may be constant data, delegate data or named data.
@@ -485,15 +513,15 @@ def serialize_pte_binary(
         segments_data.append(segment.data)
 
     # Convert to a standard flatbuffer binary.
-    result: _FlatbufferResult = _program_json_to_flatbuffer(
-        _program_to_json(program),
+    result: _FlatbufferBuilderResult = _program_to_flatbuffer(
+        program,
         constant_tensor_alignment=constant_tensor_alignment,
         delegate_alignment=delegate_alignment,
     )
 
     # If there are no segments present, do not insert the extended header.
     if len(segments_data) == 0:
-        return Cord(result.data)
+        return result.data.to_cord()
 
     # Size of the header to insert. Its size is padded to the largest
     # force_align value present in the schema.
@@ -516,28 +544,22 @@ def serialize_pte_binary(
     ).to_bytes()
     header_data = pad_to(header_data, padded_header_length)
 
-    # Insert the header into the flatbuffer data.
-    program_data: bytes = _insert_flatbuffer_header(
-        flatbuffer_data=result.data,
-        magic_regex=r"ET[0-9a-zA-Z][0-9a-zA-Z]",
-        header_data=header_data,
-    )
-    assert len(program_data) == program_size
-
-    # Potentially large. Try to free it as soon as we can.
-    del result.data
-
-    # Double-check that the extended header is in the right place and has the
-    # right contents.
-    eh = _get_extended_header(program_data)
-    assert eh is not None
-    assert eh.program_size == program_size
-    assert eh.segment_base_offset == segment_base_offset
+    # Insert the header into the flatbuffer data. The builder keeps the data
+    # after the file identifier separate, so this does not copy it.
+    if not re.match(
+        r"ET[0-9a-zA-Z][0-9a-zA-Z]",
+        result.data.file_identifier.decode(errors="replace"),
+    ):
+        raise ValueError(
+            f"Flatbuffer file identifier {repr(result.data.file_identifier)} "
+            + "is not a program identifier"
+        )
 
     # Construct the final pte file containing:
     # - program data; written to offset 0.
     # - segments data (optional); aligned to segment_alignment.
-    pte_data = Cord(program_data)
+    pte_data = result.data.to_cord(header_data)
+    assert len(pte_data) == program_size
     if len(segments_data) > 0:
         padding_length = padding_required(len(pte_data), segment_alignment)
         pte_data.append(b"\x00" * padding_length)
@@ -632,8 +654,8 @@ def deserialize_pte_binary(program_data: bytes) -> Program:
         segment_base_offset = eh.segment_base_offset
 
     # Parse the flatbuffer data.
-    program: Program = _json_to_program(
-        _program_flatbuffer_to_json(program_data[:program_size])
+    program: Program = _program_flatbuffer_to_program(
+        memoryview(program_data)[:program_size]
     )
 
     if segment_base_offset != 0:
@@ -643,3 +665,121 @@ def deserialize_pte_binary(program_data: bytes) -> Program:
         )
 
     return program
+
+
+class ProgramView:
+    """A read-only view of a serialized PTE file that does not copy its data.
+
+    Flatbuffer tables are decoded only when accessed through `program`, and
+    segment, constant and delegate data are returned as `memoryview` slices of
+    the original data. Use `from_file()` to memory-map a file from disk, so that
+    only the pages that are actually accessed are read.
+
+    The underlying data must remain valid while the view, or any value read
+    from it, is in use. For views created by `from_file()`, all memoryviews
+    returned from the view must be released before calling `close()`.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        self._mmap: Optional[mmap.mmap] = None
+        self._data: memoryview = memoryview(data)
+        self._program_size: int = len(self._data)
+        self._segment_base_offset: int = 0
+
+        # Look for an extended header to see if segments follow the flatbuffer
+        # data.
+        eh = _get_extended_header(bytes(self._data[:32]))
+        if eh is not None:
+            self._program_size = eh.program_size
+            self._segment_base_offset = eh.segment_base_offset
+        self._program: Optional[_FlatbufferTableView] = _program_flatbuffer_view(
+            self._data[: self._program_size]
+        )
+
+    @property
+    def program(self) -> _FlatbufferTableView:
+        """A lazy view of the Program table. Attributes have the same names as
+        the fields of executorch.exir.schema.Program."""
+        if self._program is None:
+            raise ValueError("ProgramView is closed")
+        return self._program
+
+    @staticmethod
+    def from_file(path: str) -> "ProgramView":
+        """Returns a view of the PTE file at `path`, backed by a read-only mmap."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = ProgramView(mapped)
+        view._mmap = mapped
+        return view
+
+    def close(self) -> None:
+        """Releases the view's references to the data, and closes the mmap if
+        the view was created by `from_file()`."""
+        self._program = None
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "ProgramView":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def segment(self, index: int) -> memoryview:
+        """Returns the data of `program.segments[index]`."""
+        segments = self.program.segments
+        if segments is None or not 0 <= index < len(segments):
+            raise IndexError(f"Segment index {index} out of range")
+        segment = segments[index]
+        if self._segment_base_offset == 0:
+            raise ValueError("Program data is not followed by segment data")
+        start = self._segment_base_offset + segment.offset
+        if start + segment.size > len(self._data):
+            raise ValueError(
+                f"Segment {index} (offset {segment.offset}, size {segment.size}) "
+                + f"overflows data length {len(self._data)}"
+            )
+        return self._data[start : start + segment.size]
+
+    def constant_buffer(self, index: int) -> memoryview:
+        """Returns the data of constant buffer `index`, whether it is stored in
+        the constant segment or inline in `program.constant_buffer`.
+
+        Like deserialize_pte_binary(), data stored in the constant segment
+        includes any padding up to the start of the next buffer.
+        """
+        constant_segment = self.program.constant_segment
+        offsets = constant_segment.offsets if constant_segment is not None else []
+        if len(offsets) == 0:
+            buffers = self.program.constant_buffer
+            if buffers is None or not 0 <= index < len(buffers):
+                raise IndexError(f"Constant buffer index {index} out of range")
+            return buffers[index].storage
+        if not 0 <= index < len(offsets):
+            raise IndexError(f"Constant buffer index {index} out of range")
+        segment = self.segment(constant_segment.segment_index)
+        end = offsets[index + 1] if index < len(offsets) - 1 else len(segment)
+        return segment[offsets[index] : end]
+
+    def delegate_data(self, plan_index: int, delegate_index: int) -> memoryview:
+        """Returns the processed data of the delegate
+        `program.execution_plan[plan_index].delegates[delegate_index]`."""
+        delegate = self.program.execution_plan[plan_index].delegates[delegate_index]
+        index = delegate.processed.index
+        if delegate.processed.location == DataLocation.SEGMENT:
+            return self.segment(index)
+        return self.program.backend_delegate_data[index].data
+
+    def named_data(self, key: str) -> memoryview:
+        """Returns the data of the named data entry with the given key."""
+        for entry in self.program.named_data or []:
+            if entry.key == key:
+                return self.segment(entry.segment_index)
+        raise KeyError(key)
+
+    def to_program(self) -> Program:
+        """Decodes the whole file into a Program, like deserialize_pte_binary()."""
+        return deserialize_pte_binary(bytes(self._data))
@@ -31,8 +31,24 @@ def serialize_for_executorch(
     named_data_store: Optional[NamedDataStoreOutput] = None,
 ) -> Tuple[Cord, Dict[str, Cord]]:
     """Serialize the output from Emitter into ExecuTorch artifacts; PTE and PTD files."""
+    pte = serialize_pte_for_executorch(emitter_output, config, named_data_store)
+    ptd_files = serialize_ptd_for_executorch(
+        emitter_output, config, data_serializer, named_data_store
+    )
+    return pte, ptd_files
+
+
+def serialize_pte_for_executorch(
+    emitter_output: EmitterOutput,
+    config: ExecutorchBackendConfig,
+    named_data_store: Optional[NamedDataStoreOutput] = None,
+) -> Cord:
+    """Serialize the output from Emitter into a PTE file.
 
-    # Serialize PTE file.
+    The returned Cord refers to the constant, delegate and named data blobs
+    held by `emitter_output` and `named_data_store` rather than copying them,
+    so writing it to a file streams each segment from its source data.
+    """
     pte_named_data = None
     if (
         named_data_store is not None
@@ -46,7 +62,7 @@ def serialize_for_executorch(
             pte_data=named_data_store.pte_data,
             external_data={},
         )
-    pte: Cord = _serialize_pte_binary(
+    return _serialize_pte_binary(
         program=emitter_output.program,
         mutable_data=emitter_output.mutable_data,
         extract_delegate_segments=config.extract_delegate_segments,
@@ -56,6 +72,15 @@ def serialize_for_executorch(
         named_data=pte_named_data,
     )
 
+
+def serialize_ptd_for_executorch(
+    emitter_output: EmitterOutput,
+    config: ExecutorchBackendConfig,
+    data_serializer: DataSerializer,
+    named_data_store: Optional[NamedDataStoreOutput] = None,
+) -> Dict[str, Cord]:
+    """Serialize the external tensors and named data from Emitter into PTD
+    files, keyed by external tag."""
     # Serialize PTD files.
     ptd_files: Dict[str, Cord] = {}
 
@@ -78,7 +103,7 @@ def serialize_for_executorch(
     if len(fqn_to_tensor_layout) == 0 and (
         named_data_store is None or len(named_data_store.external_data) == 0
     ):
-        return pte, ptd_files
+        return ptd_files
 
     # Consolidate tensors and opaque data with the same external tag so they
     # can be saved to the same PTD.
@@ -138,4 +163,4 @@ def serialize_for_executorch(
             )
         )
 
-    return pte, ptd_files
+    return ptd_files
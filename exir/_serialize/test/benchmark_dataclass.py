@@ -0,0 +1,184 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+"""Benchmarks the dataclass JSON codec on a Program.
+
+Usage:
+    python -m executorch.exir._serialize.test.benchmark_dataclass [--pte FILE]
+
+Without --pte, exports a GPT-style decoder (token embedding, causally masked
+transformer layers and an LM head) to a Program. The codec is compared against
+the previous implementation, which inspected the type hints of every field of
+every object it visited; both must produce the same results.
+"""
+
+import argparse
+import enum
+import json
+import time
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, get_args, get_origin, get_type_hints, Union
+
+import torch
+from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
+from executorch.exir._serialize._flatbuffer import (
+    _program_flatbuffer_to_json,
+    _program_to_flatbuffer,
+)
+from executorch.exir._serialize._program import deserialize_pte_binary
+from executorch.exir.schema import Program
+
+
+class _UncachedDataclassEncoder(json.JSONEncoder):
+    """_DataclassEncoder, inspecting the fields of every object it visits."""
+
+    def default(self, o: Any) -> Any:
+        if is_dataclass(o):
+            props = {}
+            for field in fields(o):
+                props[field.name] = getattr(o, field.name)
+                origin = get_origin(get_type_hints(type(o))[field.name])
+                if isinstance(field.type, str) and origin == Union:
+                    props[f"{field.name}_type"] = type(getattr(o, field.name)).__name__
+            return props
+        if isinstance(o, (bytes, memoryview)):
+            return list(o)
+        return super().default(o)
+
+
+def _uncached_json_to_dataclass(json_dict: Dict[str, Any], cls: Any = None) -> Any:
+    """_json_to_dataclass, inspecting the fields of every object it visits."""
+    if not is_dataclass(cls) or is_dataclass(json_dict):
+        return json_dict
+    data = {}
+    for field in fields(cls):
+        key, T = field.name, field.type
+        hint = get_type_hints(cls)[key]
+        if get_origin(T) is Union and isinstance(None, get_args(T)[-1]):
+            T = get_args(T)[0]
+            value = json_dict.get(key, None)
+        elif isinstance(T, str) and get_origin(hint) is Union:
+            _type = json_dict[key + "_type"]
+            _cls = [x for x in get_args(hint) if x.__name__ == _type][0]
+            data[key] = _uncached_json_to_dataclass(json_dict[key], _cls)
+            continue
+        else:
+            value = json_dict[key]
+        if value is None:
+            data[key] = None
+        elif is_dataclass(T):
+            data[key] = _uncached_json_to_dataclass(value, T)
+        elif get_origin(T) is list:
+            T = get_args(T)[0]
+            data[key] = [_uncached_json_to_dataclass(e, T) for e in value]
+        elif get_origin(T) is Union:
+            data[key] = [x for x in get_args(hint) if x == type(value)][0](value)
+        elif isinstance(T, enum.EnumMeta):
+            data[key] = T[value]
+        else:
+            data[key] = T(value)
+    return cls(**data)
+
+
+class _Decoder(torch.nn.Module):
+    def __init__(self, num_layers: int, dim: int, vocab_size: int) -> None:
+        super().__init__()
+        self.embedding = torch.nn.Embedding(vocab_size, dim)
+        self.layers = torch.nn.TransformerEncoder(
+            torch.nn.TransformerEncoderLayer(
+                dim, 4, dim_feedforward=4 * dim, batch_first=True, norm_first=True
+            ),
+            num_layers,
+        )
+        self.lm_head = torch.nn.Linear(dim, vocab_size, bias=False)
+
+    def forward(self, tokens: torch.Tensor) -> torch.Tensor:
+        seq_len = tokens.shape[1]
+        mask = torch.nn.Transformer.generate_square_subsequent_mask(seq_len)
+        return self.lm_head(self.layers(self.embedding(tokens), mask, is_causal=True))
+
+
+def make_decoder_program(num_layers: int, dim: int, vocab_size: int) -> Program:
+    from executorch.exir import to_edge
+
+    model = _Decoder(num_layers, dim, vocab_size).eval()
+    tokens = torch.zeros(1, 32, dtype=torch.long)
+    program = torch.export.export(model, (tokens,), strict=True)
+    return to_edge(program).to_executorch().executorch_program
+
+
+def _time(name: str, fn: Callable[[], object], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    assert best is not None
+    print(f"  {name:<24} {best:8.3f} s")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pte", help="Benchmark the program in this .pte file.")
+    parser.add_argument("--num-layers", type=int, default=32)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--vocab-size", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pte:
+        with open(args.pte, "rb") as f:
+            program = deserialize_pte_binary(f.read())
+    else:
+        program = make_decoder_program(args.num_layers, args.dim, args.vocab_size)
+    plan = program.execution_plan[0]
+    print(
+        f"Program: {len(plan.values)} values, "
+        + f"{sum(len(chain.instructions) for chain in plan.chains)} instructions"
+    )
+
+    print("Program -> JSON:")
+    uncached_time = _time(
+        "uncached",
+        lambda: json.dumps(program, cls=_UncachedDataclassEncoder),
+        args.repeat,
+    )
+    cached_time = _time(
+        "compiled field plans",
+        lambda: json.dumps(program, cls=_DataclassEncoder),
+        args.repeat,
+    )
+    assert json.dumps(program, cls=_UncachedDataclassEncoder) == json.dumps(
+        program, cls=_DataclassEncoder
+    ), "Encodings differ"
+    print(f"  speedup: {uncached_time / cached_time:.1f}x")
+
+    # Decode the JSON produced by flatc, in which enums are named.
+    data = bytes(_program_to_flatbuffer(program).data.to_cord())
+    program_json = json.loads(_program_flatbuffer_to_json(data))
+    print("JSON -> Program:")
+    uncached_time = _time(
+        "uncached",
+        lambda: _uncached_json_to_dataclass(program_json, Program),
+        args.repeat,
+    )
+    cached_time = _time(
+        "compiled field plans",
+        lambda: _json_to_dataclass(program_json, Program),
+        args.repeat,
+    )
+    assert _uncached_json_to_dataclass(program_json, Program) == _json_to_dataclass(
+        program_json, Program
+    ), "Decoded programs differ"
+    print(f"  speedup: {uncached_time / cached_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,201 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+"""Benchmarks Program serialization and deserialization paths.
+
+Usage:
+    python -m executorch.exir._serialize.test.benchmark_serialize [--pte FILE]
+
+Without --pte, benchmarks a synthetic program shaped like an unrolled LLM
+decoder: many tensor values and kernel calls, plus inline delegate data.
+"""
+
+import argparse
+import time
+from typing import Callable, List, Optional
+
+from executorch.exir._serialize._flatbuffer import (
+    _program_flatbuffer_to_json,
+    _program_flatbuffer_to_program,
+    _program_json_to_flatbuffer,
+    _program_to_flatbuffer,
+)
+from executorch.exir._serialize._program import (
+    _json_to_program,
+    _program_to_json,
+    deserialize_pte_binary,
+    ProgramView,
+)
+from executorch.exir.scalar_type import ScalarType
+from executorch.exir.schema import (
+    AllocationDetails,
+    BackendDelegate,
+    BackendDelegateDataReference,
+    BackendDelegateInlineData,
+    Chain,
+    ContainerMetadata,
+    DataLocation,
+    EValue,
+    ExecutionPlan,
+    Instruction,
+    Int,
+    KernelCall,
+    Operator,
+    Program,
+    SubsegmentOffsets,
+    Tensor,
+    TensorShapeDynamism,
+)
+
+
+def make_synthetic_program(
+    num_layers: int, delegate_blob_size: int, num_delegates: int
+) -> Program:
+    """Returns a program with `num_layers` blocks of ten kernel calls each."""
+    values: List[EValue] = []
+    instructions: List[Instruction] = []
+    for layer in range(num_layers):
+        for i in range(10):
+            values.append(
+                EValue(
+                    Tensor(
+                        scalar_type=ScalarType.FLOAT,
+                        storage_offset=0,
+                        sizes=[1, 128, 4096],
+                        dim_order=[0, 1, 2],
+                        requires_grad=False,
+                        layout=0,
+                        data_buffer_idx=0,
+                        allocation_info=AllocationDetails(
+                            memory_id=1,
+                            memory_offset_low=(layer * 10 + i) * 4096,
+                            memory_offset_high=0,
+                        ),
+                        shape_dynamism=TensorShapeDynamism.STATIC,
+                    )
+                )
+            )
+            values.append(EValue(Int(i)))
+            n = len(values)
+            instructions.append(
+                Instruction(KernelCall(op_index=i, args=[n - 4, n - 2, n - 1]))
+            )
+    delegate_data = [
+        BackendDelegateInlineData(data=bytes([i % 256]) * delegate_blob_size)
+        for i in range(num_delegates)
+    ]
+    delegates = [
+        BackendDelegate(
+            id="XnnpackBackend",
+            processed=BackendDelegateDataReference(
+                location=DataLocation.INLINE, index=i
+            ),
+            compile_specs=[],
+        )
+        for i in range(num_delegates)
+    ]
+    return Program(
+        version=0,
+        execution_plan=[
+            ExecutionPlan(
+                name="forward",
+                container_meta_type=ContainerMetadata("", ""),
+                values=values,
+                inputs=[0],
+                outputs=[len(values) - 2],
+                chains=[
+                    Chain(
+                        inputs=[],
+                        outputs=[],
+                        instructions=instructions,
+                        stacktrace=None,
+                    )
+                ],
+                operators=[
+                    Operator(name=f"aten::op{i}", overload="out") for i in range(10)
+                ],
+                delegates=delegates,
+                non_const_buffer_sizes=[0, num_layers * 10 * 4096],
+            )
+        ],
+        constant_buffer=[],
+        backend_delegate_data=delegate_data,
+        segments=[],
+        constant_segment=SubsegmentOffsets(segment_index=0, offsets=[]),
+    )
+
+
+def _time(name: str, fn: Callable[[], object], repeat: int) -> Optional[float]:
+    best: Optional[float] = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {name:<40} {best:8.3f} s")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pte", help="Benchmark the program in this .pte file.")
+    parser.add_argument("--num-layers", type=int, default=2000)
+    parser.add_argument("--num-delegates", type=int, default=4)
+    parser.add_argument("--delegate-blob-size", type=int, default=16 * 1024 * 1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pte:
+        with open(args.pte, "rb") as f:
+            program = deserialize_pte_binary(f.read())
+    else:
+        program = make_synthetic_program(
+            args.num_layers, args.delegate_blob_size, args.num_delegates
+        )
+
+    builder_size = len(_program_to_flatbuffer(program).data)
+    flatc_size = len(_program_json_to_flatbuffer(_program_to_json(program)).data)
+    print(f"Flatbuffer size: {builder_size} bytes (flatc: {flatc_size} bytes)")
+
+    print("Program -> flatbuffer:")
+    flatc_time = _time(
+        "JSON + flatc",
+        lambda: _program_json_to_flatbuffer(_program_to_json(program)),
+        args.repeat,
+    )
+    builder_time = _time(
+        "in-process builder", lambda: _program_to_flatbuffer(program), args.repeat
+    )
+    if flatc_time and builder_time:
+        print(f"  speedup: {flatc_time / builder_time:.1f}x")
+
+    data = bytes(_program_to_flatbuffer(program).data.to_cord())
+
+    def read_one_delegate() -> None:
+        view = ProgramView(data)
+        if len(view.program.backend_delegate_data) > 0:
+            len(view.program.backend_delegate_data[0].data)
+
+    print("Flatbuffer -> Program:")
+    flatc_time = _time(
+        "flatc + JSON",
+        lambda: _json_to_program(_program_flatbuffer_to_json(data)),
+        args.repeat,
+    )
+    reader_time = _time(
+        "in-process reader",
+        lambda: _program_flatbuffer_to_program(data),
+        args.repeat,
+    )
+    if flatc_time and reader_time:
+        print(f"  speedup: {flatc_time / reader_time:.1f}x")
+    _time("lazy view, one delegate blob", read_one_delegate, args.repeat)
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,64 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import hashlib
+import unittest
+from unittest.mock import patch
+
+from executorch.exir._serialize._blob_index import BlobIndex, DigestCache
+
+
+class TestBlobIndex(unittest.TestCase):
+    def test_get_and_add(self) -> None:
+        index: BlobIndex[int] = BlobIndex()
+        self.assertIsNone(index.get(b"abc"))
+        index.add(b"abc", 0)
+        index.add(b"abd", 1)
+        self.assertEqual(index.get(b"abc"), 0)
+        self.assertEqual(index.get(bytearray(b"abd")), 1)
+        self.assertEqual(index.get(memoryview(b"abc")), 0)
+        self.assertIsNone(index.get(b"abe"))
+        self.assertEqual(len(index), 2)
+
+    def test_tag(self) -> None:
+        index: BlobIndex[int] = BlobIndex()
+        index.add(b"\x00" * 4, 0, tag="float32")
+        self.assertEqual(index.get(b"\x00" * 4, tag="float32"), 0)
+        self.assertIsNone(index.get(b"\x00" * 4, tag="int32"))
+
+    def test_only_hashes_collision_candidates(self) -> None:
+        # Large blobs that differ outside of the sampled windows.
+        size = 1 << 20
+        first = bytearray(size)
+        second = bytearray(size)
+        second[12345] = 1
+        third = bytes(size // 2)
+
+        index: BlobIndex[int] = BlobIndex()
+        with patch("hashlib.sha256", wraps=hashlib.sha256) as sha256:
+            index.add(bytes(first), 0)
+            index.add(third, 1)
+            # Different sizes: no need to hash.
+            self.assertIsNone(index.get(bytes(size // 4)))
+            self.assertEqual(sha256.call_count, 0)
+            # Same size and samples: both blobs are hashed to tell them apart.
+            self.assertIsNone(index.get(bytes(second)))
+            self.assertEqual(sha256.call_count, 2)
+            index.add(bytes(second), 2)
+            self.assertEqual(index.get(bytes(first)), 0)
+
+    def test_digest_cache_hashes_once(self) -> None:
+        cache = DigestCache()
+        data = b"x" * 100
+        with patch("hashlib.sha256", wraps=hashlib.sha256) as sha256:
+            digest = cache.digest(data)
+            self.assertEqual(cache.digest(data), digest)
+            self.assertEqual(sha256.call_count, 1)
+            # Equal data in a different object is hashed again.
+            self.assertEqual(cache.digest(bytes(bytearray(data))), digest)
+            self.assertEqual(sha256.call_count, 2)
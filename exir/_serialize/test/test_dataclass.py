@@ -0,0 +1,124 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import enum
+import json
+import unittest
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from executorch.exir._serialize._dataclass import (
+    _DataclassEncoder,
+    _decoders,
+    _json_to_dataclass,
+)
+
+
+class Color(enum.IntEnum):
+    RED = 1
+    GREEN = 2
+
+
+@dataclass
+class Leaf:
+    value: int
+
+
+@dataclass
+class OtherLeaf:
+    name: str
+
+
+Payload = Union[Leaf, OtherLeaf]
+
+
+@dataclass
+class Node:
+    payload: "Payload"
+    children: List[Leaf]
+    color: Color
+    number: Union[int, str]
+    data: bytes
+    note: Optional[str] = None
+    parent: Optional[Leaf] = None
+
+
+def _to_dict(obj: object) -> object:
+    return json.loads(json.dumps(obj, cls=_DataclassEncoder))
+
+
+class TestDataclassCodec(unittest.TestCase):
+    def test_encode(self) -> None:
+        node = Node(
+            payload=OtherLeaf("x"),
+            children=[Leaf(1), Leaf(2)],
+            color=Color.GREEN,
+            number="inf",
+            data=b"\x01\x02",
+        )
+        self.assertEqual(
+            _to_dict(node),
+            {
+                "payload": {"name": "x"},
+                # String annotated Unions record the type of their value.
+                "payload_type": "OtherLeaf",
+                "children": [{"value": 1}, {"value": 2}],
+                "color": 2,
+                "number": "inf",
+                "data": [1, 2],
+                "note": None,
+                "parent": None,
+            },
+        )
+
+    def test_decode(self) -> None:
+        node = _json_to_dataclass(
+            {
+                "payload": {"value": 3},
+                "payload_type": "Leaf",
+                "children": [{"value": 1}],
+                "color": "RED",
+                "number": 7,
+                "data": [1, 2],
+                "parent": {"value": 4},
+            },
+            Node,
+        )
+        self.assertEqual(
+            node,
+            Node(
+                payload=Leaf(3),
+                children=[Leaf(1)],
+                color=Color.RED,
+                number=7,
+                data=b"\x01\x02",
+                note=None,
+                parent=Leaf(4),
+            ),
+        )
+        self.assertIs(type(node.payload), Leaf)
+        self.assertIs(type(node.color), Color)
+        self.assertIs(type(node.data), bytes)
+
+    def test_decode_missing_field(self) -> None:
+        with self.assertRaisesRegex(TypeError, "no value for field: children"):
+            _json_to_dataclass(
+                {"payload": {"value": 3}, "payload_type": "Leaf"},
+                Node,
+            )
+
+    def test_decode_non_dataclass(self) -> None:
+        self.assertEqual(_json_to_dataclass([1, 2], List[int]), [1, 2])
+        leaf = Leaf(1)
+        self.assertIs(_json_to_dataclass(leaf, Leaf), leaf)
+
+    def test_decoder_is_compiled_once(self) -> None:
+        _json_to_dataclass({"value": 1}, Leaf)
+        decoder = _decoders[Leaf]
+        self.assertEqual(_json_to_dataclass({"value": 2}, Leaf), Leaf(2))
+        self.assertIs(_decoders[Leaf], decoder)
@@ -15,10 +15,35 @@ from unittest.mock import patch
 
 from executorch.exir._serialize import _flatbuffer
 from executorch.exir._serialize._flatbuffer import (
+    _program_flatbuffer_to_json,
+    _program_flatbuffer_to_program,
+    _program_flatbuffer_view,
     _program_json_to_flatbuffer,
+    _program_to_flatbuffer,
     _ResourceFiles,
     _SchemaInfo,
 )
+from executorch.exir._serialize._program import _json_to_program, _program_to_json
+from executorch.exir.backend.compile_spec_schema import CompileSpec
+from executorch.exir.schema import (
+    BackendDelegate,
+    BackendDelegateDataReference,
+    BackendDelegateInlineData,
+    BoolList,
+    Buffer,
+    DataLocation,
+    DataSegment,
+    Double,
+    DoubleList,
+    EValue,
+    Frame,
+    FrameList,
+    IntList,
+    NamedData,
+    Program,
+    SubsegmentOffsets,
+)
+from executorch.exir.tests.common import get_test_program
 
 
 def read_file(dir: str, filename: str) -> bytes:
@@ -329,3 +354,142 @@ class TestProgramJsonToFlatbuffer(unittest.TestCase):
         )
         self.assertNotIn("Moved input files", err_msg)
         self.assertNotIn("Failed to save input files", err_msg)
+
+
+def make_program_with_all_field_types() -> Program:
+    """Returns a program that uses every kind of field in the program schema."""
+    program = get_test_program()
+    plan = program.execution_plan[0]
+    plan.values.extend(
+        [
+            EValue(Double(float("inf"))),
+            EValue(Double(float("-inf"))),
+            EValue(Double(-2.5)),
+            EValue(IntList([1, -(2**40), 3])),
+            EValue(IntList([])),
+            EValue(DoubleList([1.0, -0.5])),
+            EValue(BoolList([True, False, True])),
+        ]
+    )
+    plan.chains[0].stacktrace = [
+        FrameList(items=[Frame("f.py", 3, "fn", "x = y + \u00e9")]),
+        FrameList(items=[]),
+    ]
+    # Both empty and large blobs, which the builder stores by reference, and
+    # a view like the emitter creates.
+    program.constant_buffer = [
+        Buffer(storage=b""),
+        Buffer(storage=b"\x01\x02\x03"),
+        Buffer(storage=bytes(range(256)) * 64),
+        Buffer(storage=memoryview(b"\x04\x05\x06")),
+    ]
+    program.backend_delegate_data = [
+        BackendDelegateInlineData(data=b""),
+        BackendDelegateInlineData(data=b"\x55" * 5000),
+    ]
+    plan.delegates = [
+        BackendDelegate(
+            id=f"delegate{i}",
+            processed=BackendDelegateDataReference(
+                location=DataLocation.INLINE, index=i
+            ),
+            compile_specs=[CompileSpec("key", b"\x01\x02"), CompileSpec("", b"")],
+        )
+        for i in range(2)
+    ]
+    program.segments = [DataSegment(offset=0, size=100), DataSegment(128, 2**40)]
+    program.mutable_data_segments = [SubsegmentOffsets(1, [0, 16, 2**33])]
+    program.named_data = [NamedData("a", 0), NamedData("b", 1)]
+    return program
+
+
+class TestProgramToFlatbuffer(unittest.TestCase):
+    def assert_same_as_flatc(
+        self,
+        program: Program,
+        constant_tensor_alignment: Optional[int] = None,
+        delegate_alignment: Optional[int] = None,
+    ) -> None:
+        """Checks that the in-process builder produces the same bytes as flatc."""
+        expected = _program_json_to_flatbuffer(
+            _program_to_json(program),
+            constant_tensor_alignment=constant_tensor_alignment,
+            delegate_alignment=delegate_alignment,
+        )
+        actual = _program_to_flatbuffer(
+            program,
+            constant_tensor_alignment=constant_tensor_alignment,
+            delegate_alignment=delegate_alignment,
+        )
+        self.assertEqual(actual.max_alignment, expected.max_alignment)
+        self.assertEqual(bytes(actual.data.to_cord()), expected.data)
+
+    def test_test_program(self) -> None:
+        self.assert_same_as_flatc(get_test_program())
+
+    def test_all_field_types(self) -> None:
+        program = make_program_with_all_field_types()
+        self.assert_same_as_flatc(program)
+        self.assert_same_as_flatc(
+            program, constant_tensor_alignment=32, delegate_alignment=8
+        )
+
+    def test_insert_header(self) -> None:
+        result = _program_to_flatbuffer(get_test_program())
+        data = bytes(result.data.to_cord())
+        header = b"\xaa" * result.max_alignment
+        with_header = bytes(result.data.to_cord(header))
+
+        # Same as _insert_flatbuffer_header(): the root offset is adjusted and
+        # the header follows the file identifier.
+        root_offset = int.from_bytes(data[0:4], byteorder="little")
+        self.assertEqual(
+            int.from_bytes(with_header[0:4], byteorder="little"),
+            root_offset + len(header),
+        )
+        self.assertEqual(with_header[4:8], b"ET12")
+        self.assertEqual(with_header[8 : 8 + len(header)], header)
+        self.assertEqual(with_header[8 + len(header) :], data[8:])
+
+
+class TestProgramFlatbufferToProgram(unittest.TestCase):
+    def assert_same_as_flatc(self, program: Program) -> None:
+        """Checks that the in-process reader produces the same Program as flatc."""
+        data = _program_json_to_flatbuffer(_program_to_json(program)).data
+        expected = _json_to_program(_program_flatbuffer_to_json(data))
+        actual = _program_flatbuffer_to_program(data)
+        self.assertEqual(actual, expected)
+        # Enum and bytes fields should have the same types as well.
+        self.assertEqual(_program_to_json(actual), _program_to_json(expected))
+
+    def test_test_program(self) -> None:
+        self.assert_same_as_flatc(get_test_program())
+
+    def test_all_field_types(self) -> None:
+        self.assert_same_as_flatc(make_program_with_all_field_types())
+
+    def test_view(self) -> None:
+        program = make_program_with_all_field_types()
+        data = bytes(_program_to_flatbuffer(program).data.to_cord())
+        view = _program_flatbuffer_view(data)
+
+        plan = view.execution_plan[0]
+        self.assertEqual(plan.name, program.execution_plan[0].name)
+        self.assertEqual(len(plan.values), len(program.execution_plan[0].values))
+        self.assertEqual(plan.values[-1].val_type, "BoolList")
+        self.assertEqual(plan.values[-1].val.items, [True, False, True])
+        self.assertEqual(plan.values[-7].val.double_val, float("inf"))
+        self.assertEqual(
+            plan.chains[0].stacktrace[0].items[0].context, "x = y + \u00e9"
+        )
+        self.assertEqual(len(plan.chains[0].stacktrace[1].items), 0)
+        self.assertEqual(view.mutable_data_segments[0].offsets, [0, 16, 2**33])
+
+        # [ubyte] vectors are views into the original data.
+        storage = view.constant_buffer[2].storage
+        self.assertIsInstance(storage, memoryview)
+        self.assertEqual(storage.obj, data)
+        self.assertEqual(bytes(storage), program.constant_buffer[2].storage)
+
+        with self.assertRaises(AttributeError):
+            _ = view.no_such_field
@@ -11,11 +11,17 @@ import copy
 import difflib
 import json
 import math
+import os
+import tempfile
 import unittest
 
 from typing import List, Sequence
+from unittest.mock import patch
 
-from executorch.exir._serialize._flatbuffer import _program_flatbuffer_to_json
+from executorch.exir._serialize._flatbuffer import (
+    _program_flatbuffer_to_json,
+    _program_to_flatbuffer,
+)
 from executorch.exir._serialize._named_data_store import (
     BufferEntry,
     NamedDataStoreOutput,
@@ -26,6 +32,7 @@ from executorch.exir._serialize._program import (
     _json_to_program,
     _program_to_json,
     deserialize_pte_binary,
+    ProgramView,
     serialize_pte_binary,
 )
 from executorch.exir._serialize.padding import aligned_size
@@ -980,6 +987,127 @@ class TestProgram(unittest.TestCase):
             buffers[2].buffer,
         )
 
+    def test_input_program_not_modified_or_copied(self) -> None:
+        program = get_test_program()
+        constant_blobs = (self.gen_blob_data(64, b"\x10\x11\x01"),)
+        delegate_blobs = (
+            self.gen_blob_data(SEGMENT_ALIGNMENT // 2, b"\x30\x33\x03"),
+            b"",
+        )
+        add_constant_data(program, constant_blobs)
+        add_delegate_data(program, program.execution_plan[0], delegate_blobs)
+        program.segments = []
+        original = copy.deepcopy(program)
+        named_data = NamedDataStoreOutput(
+            buffers=[BufferEntry(buffer=b"\x01\x02", alignment=8)],
+            pte_data={"key0": 0},
+            external_data={},
+        )
+
+        # Serialization must not deep-copy the program, which would duplicate
+        # all of its data blobs.
+        with patch.object(copy, "deepcopy", side_effect=AssertionError("deepcopy")):
+            pte_data = bytes(
+                serialize_pte_binary(
+                    program,
+                    mutable_data=[Buffer(storage=b"\x05" * 8)],
+                    extract_delegate_segments=True,
+                    segment_alignment=SEGMENT_ALIGNMENT,
+                    named_data=named_data,
+                )
+            )
+
+        self.assertEqual(program, original)
+        program2 = deserialize_pte_binary(pte_data)
+        self.assertEqual(
+            canonicalize_delegate_indices(program2).backend_delegate_data,
+            canonicalize_delegate_indices(original).backend_delegate_data,
+        )
+
+    def test_program_view(self) -> None:
+        program = get_test_program()
+        constant_blobs = (
+            self.gen_blob_data(CONSTANT_TENSOR_ALIGNMENT // 2, b"\x10\x11\x01"),
+            self.gen_blob_data(CONSTANT_TENSOR_ALIGNMENT + 1, b"\x20\x22\x02"),
+        )
+        delegate_blobs = (
+            self.gen_blob_data(SEGMENT_ALIGNMENT // 2, b"\x30\x33\x03"),
+            self.gen_blob_data(SEGMENT_ALIGNMENT + 1, b"\x40\x44\x04"),
+        )
+        add_constant_data(program, constant_blobs)
+        add_delegate_data(program, program.execution_plan[0], delegate_blobs)
+        named_data = NamedDataStoreOutput(
+            buffers=[
+                BufferEntry(buffer=self.gen_blob_data(8, b"\x50\x55\x05"), alignment=8)
+            ],
+            pte_data={"key0": 0},
+            external_data={},
+        )
+
+        # Constant data is stored inline when the flatbuffer is not wrapped
+        # by serialize_pte_binary().
+        with ProgramView(bytes(_program_to_flatbuffer(program).data.to_cord())) as view:
+            for i, blob in enumerate(constant_blobs):
+                self.assertEqual(bytes(view.constant_buffer(i)), blob)
+            with self.assertRaises(IndexError):
+                view.constant_buffer(len(constant_blobs))
+
+        for extract_segments in (False, True):
+            pte_data = bytes(
+                serialize_pte_binary(
+                    program,
+                    extract_delegate_segments=extract_segments,
+                    segment_alignment=SEGMENT_ALIGNMENT,
+                    constant_tensor_alignment=CONSTANT_TENSOR_ALIGNMENT,
+                    named_data=named_data if extract_segments else None,
+                )
+            )
+            with ProgramView(pte_data) as view:
+                self.assertEqual(view.program.version, program.version)
+                self.assertEqual(
+                    view.program.execution_plan[0].name,
+                    program.execution_plan[0].name,
+                )
+                # Constant data keeps its padding in the constant segment, like
+                # deserialize_pte_binary().
+                for i, blob in enumerate(constant_blobs):
+                    data = view.constant_buffer(i)
+                    self.assertIsInstance(data, memoryview)
+                    self.assertEqual(bytes(data[: len(blob)]), blob)
+                for i, blob in enumerate(delegate_blobs):
+                    self.assertEqual(bytes(view.delegate_data(0, i)), blob)
+                if extract_segments:
+                    self.assertEqual(
+                        bytes(view.named_data("key0")),
+                        self.gen_blob_data(8, b"\x50\x55\x05"),
+                    )
+                with self.assertRaises(KeyError):
+                    view.named_data("missing")
+                self.assertEqual(view.to_program(), deserialize_pte_binary(pte_data))
+
+    def test_program_view_from_file(self) -> None:
+        program = get_test_program()
+        add_delegate_data(program, program.execution_plan[0], [b"\x01" * 300])
+        pte_data = bytes(
+            serialize_pte_binary(
+                program,
+                extract_delegate_segments=True,
+                segment_alignment=SEGMENT_ALIGNMENT,
+            )
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "program.pte")
+            with open(path, "wb") as f:
+                f.write(pte_data)
+            view = ProgramView.from_file(path)
+            data = view.delegate_data(0, 0)
+            self.assertEqual(bytes(data), b"\x01" * 300)
+            data.release()
+            self.assertEqual(view.to_program(), deserialize_pte_binary(pte_data))
+            view.close()
+            with self.assertRaises(ValueError):
+                _ = view.program
+
 
 # Common data for extended header tests. The two example values should produce
 # the example data.
@@ -7,17 +7,23 @@
 
 import copy
 import logging
+import multiprocessing
 from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from functools import singledispatch
-from typing import Dict, Generator, List, Mapping
+from typing import Dict, Generator, List, Mapping, Optional, Tuple, Type
 
 import torch
 
+from executorch.exir._multiprocessing import fork_process_pool
 from executorch.exir.backend.backend_details import BackendDetails, PreprocessResult
 from executorch.exir.backend.compile_spec_schema import CompileSpec
 
 from executorch.exir.backend.partitioner import Partitioner, PartitionResult
+from executorch.exir.backend.preprocess_cache import (
+    _overrides_preprocess_multimethod,
+    PreprocessCache,
+)
 from executorch.exir.backend.utils import (
     _maybe_duplicate_constant_nodes,
     is_identical_graph,
@@ -25,7 +31,7 @@ from executorch.exir.backend.utils import (
 
 from executorch.exir.delegate import executorch_call_delegate, get_lowered_module_name
 
-from executorch.exir.graph_module import get_control_flow_submodules
+from executorch.exir.graph_module import _get_submodule, get_control_flow_submodules
 from executorch.exir.lowered_backend_module import (
     _unsafe_adjust_original_program,
     create_exported_program_from_submodule,
@@ -37,6 +43,7 @@ from executorch.exir.program._fake_program import (
     update_to_real_program,
 )
 from torch._export.utils import is_buffer, is_lifted_tensor_constant, is_param
+from torch._export.verifier import SpecViolationError
 from torch.export.exported_program import ExportedProgram, InputSpec, OutputSpec
 
 
@@ -111,11 +118,17 @@ def _(
     # All backend implementation are final, so we don't need to consider nested subclasses.
     for cls in BackendDetails.__subclasses__():
         if backend_id == cls.__name__:
-            copied_edge_program = copy.deepcopy(edge_program)
-            preprocess_result: PreprocessResult = cls.preprocess(
-                copied_edge_program,
-                compile_specs,
-            )
+            preprocess_result: PreprocessResult
+            if _PREPROCESS_CACHE is not None:
+                preprocess_result = _PREPROCESS_CACHE.preprocess(
+                    cls, edge_program, compile_specs
+                )
+            else:
+                copied_edge_program = copy.deepcopy(edge_program)
+                preprocess_result = cls.preprocess(
+                    copied_edge_program,
+                    compile_specs,
+                )
             lowered_module = LoweredBackendModule(
                 edge_program=edge_program,
                 backend_id=backend_id,
@@ -156,6 +169,99 @@ def validation_disabled() -> Generator[None, None, None]:
         _ENABLE_VALIDATION = existing_setting
 
 
+_PREPROCESS_CACHE: Optional[PreprocessCache] = None
+
+
+def set_preprocess_cache(cache: Optional[PreprocessCache]) -> None:
+    """
+    Sets the cache of preprocess results used by to_backend, or disables
+    caching if `cache` is None.
+    """
+    global _PREPROCESS_CACHE
+    _PREPROCESS_CACHE = cache
+
+
+@contextmanager
+def preprocess_cache_enabled(
+    cache: Optional[PreprocessCache] = None,
+) -> Generator[PreprocessCache, None, None]:
+    """
+    Caches the results of backend preprocessing within this context, in `cache`
+    or in a new in-memory PreprocessCache. Lowering a partition that was
+    already lowered with the same backend and compile specs, e.g. by an earlier
+    run of the same export, reuses the result instead of calling the backend
+    again. Identical blocks within one graph are still preprocessed separately,
+    since their node names and debug handles differ.
+
+    Example:
+        with preprocess_cache_enabled(PreprocessCache(cache_dir)) as cache:
+            edge_program = edge_program.to_backend(partitioner)
+        print(cache.hits, cache.misses)
+    """
+    global _PREPROCESS_CACHE
+    existing_cache = _PREPROCESS_CACHE
+    if cache is None:
+        cache = PreprocessCache()
+    set_preprocess_cache(cache)
+    try:
+        yield cache
+    finally:
+        _PREPROCESS_CACHE = existing_cache
+
+
+_INCREMENTAL_VALIDATION: bool = False
+
+
+@contextmanager
+def incremental_validation() -> Generator[None, None, None]:
+    """
+    Within this context, to_backend(edge_program, partitioner) only checks
+    the part of the program changed by each lowered partition as it is
+    inserted, instead of validating the whole program after every partition.
+    The whole program is still validated once at the end. This makes lowering
+    programs with many partitions linear rather than quadratic in the size of
+    the graph, at the cost of reporting some errors after all partitions have
+    been lowered.
+    """
+    global _INCREMENTAL_VALIDATION
+    existing_setting = _INCREMENTAL_VALIDATION
+    _INCREMENTAL_VALIDATION = True
+    try:
+        yield
+    finally:
+        _INCREMENTAL_VALIDATION = existing_setting
+
+
+# Maximum number of worker processes preprocessing partitions within
+# parallel_preprocess(), or None to lower partitions one at a time.
+_PREPROCESS_WORKERS: Optional[int] = None
+
+
+@contextmanager
+def parallel_preprocess(
+    max_workers: Optional[int] = None,
+) -> Generator[None, None, None]:
+    """
+    Lowers the partitions of to_backend(edge_program, partitioner) in two
+    phases within this context. All partitions are first extracted from the
+    graph, then preprocessed by their backends in up to `max_workers` forked
+    worker processes (one per CPU by default), and finally inserted back into
+    the graph, which is validated once. Partitions are preprocessed serially
+    where worker processes cannot safely be forked: on platforms without fork,
+    on macOS and while other threads are running.
+
+    Backends must not rely on side effects of preprocess() in the lowering
+    process, as it may run in a worker process.
+    """
+    global _PREPROCESS_WORKERS
+    existing_setting = _PREPROCESS_WORKERS
+    _PREPROCESS_WORKERS = max_workers or multiprocessing.cpu_count()
+    try:
+        yield
+    finally:
+        _PREPROCESS_WORKERS = existing_setting
+
+
 def _get_node_list_with_same_tag(
     tagged_graph_module: torch.fx.GraphModule,
     tag: str,
@@ -200,7 +306,7 @@ def _insert_lowered_submodule(
     is_submodule: bool,
     toplevel_input_specs_to_delete: Dict[str, InputSpec],
     toplevel_output_specs_to_delete: Dict[str, OutputSpec],
-):
+) -> torch.fx.Node:
     owning_graph_module = call_submodule_node.graph.owning_module
     # call delegate args should only use user_inputs
     call_delegate_args = []
@@ -251,6 +357,54 @@ def _insert_lowered_submodule(
             toplevel_input_specs_to_delete,
             toplevel_output_specs_to_delete,
         )
+    return call_delegate_node
+
+
+def _validate_inserted_submodule(
+    owning_program: ExportedProgram,
+    call_delegate_node: torch.fx.Node,
+    is_submodule: bool,
+) -> None:
+    """
+    Checks the part of the owning program changed by _insert_lowered_submodule:
+    the delegate call, its inputs and users, and for toplevel partitions the
+    graph signature, whose constants and outputs may have been moved into the
+    delegate.
+    """
+    graph = call_delegate_node.graph
+    _, lowered_module, _ = _get_submodule(graph.owning_module, call_delegate_node, 0)
+    if not isinstance(lowered_module, LoweredBackendModule):
+        raise SpecViolationError(
+            f"Delegate {call_delegate_node} calls {type(lowered_module)}, not a LoweredBackendModule"
+        )
+    if "val" not in call_delegate_node.meta:
+        raise SpecViolationError(f"Delegate {call_delegate_node} has no meta['val']")
+    for node in call_delegate_node.all_input_nodes:
+        if node.graph is not graph or node._sort_key >= call_delegate_node._sort_key:
+            raise SpecViolationError(
+                f"Delegate {call_delegate_node} uses {node} before it is defined"
+            )
+    for node in call_delegate_node.users:
+        if node.graph is not graph or node._sort_key <= call_delegate_node._sort_key:
+            raise SpecViolationError(
+                f"{node} uses delegate {call_delegate_node} before it is defined"
+            )
+    if is_submodule:
+        return
+
+    signature = owning_program.graph_signature
+    placeholders = [node.name for node in graph.find_nodes(op="placeholder")]
+    input_names = [spec.arg.name for spec in signature.input_specs]
+    if placeholders != input_names:
+        raise SpecViolationError(
+            f"Graph inputs {placeholders} do not match the input specs {input_names}"
+        )
+    (output_node,) = graph.find_nodes(op="output")
+    if len(output_node.args[0]) != len(signature.output_specs):
+        raise SpecViolationError(
+            f"Graph has {len(output_node.args[0])} outputs, but the signature has "
+            + f"{len(signature.output_specs)} output specs"
+        )
 
 
 def _partition_and_lower_one_graph_module(
@@ -317,7 +471,7 @@ def _partition_and_lower_one_graph_module(
             delegation_spec.compile_specs,
         )
 
-        _insert_lowered_submodule(
+        call_delegate_node = _insert_lowered_submodule(
             submodule_program,
             owning_program,
             call_module_node,
@@ -327,7 +481,12 @@ def _partition_and_lower_one_graph_module(
             toplevel_input_specs_to_delete,
             toplevel_output_specs_to_delete,
         )
-        owning_program._validate()
+        if _INCREMENTAL_VALIDATION:
+            _validate_inserted_submodule(
+                owning_program, call_delegate_node, is_submodule
+            )
+        else:
+            owning_program._validate()
 
     return tagged_graph_module
 
@@ -419,11 +578,22 @@ def _(
     for tag, _ in partitioner_result.partition_tags.items():
         _maybe_duplicate_constant_nodes(tagged_exported_program, tag)
 
-    tagged_graph_module = _partition_and_lower(
-        tagged_exported_program.graph_module,
-        partitioner_result,
-        tagged_exported_program,
-    )
+    if _PREPROCESS_WORKERS is not None:
+        tagged_graph_module = _partition_and_lower_in_two_phases(
+            tagged_exported_program.graph_module,
+            partitioner_result,
+            tagged_exported_program,
+            _PREPROCESS_WORKERS,
+        )
+    else:
+        tagged_graph_module = _partition_and_lower(
+            tagged_exported_program.graph_module,
+            partitioner_result,
+            tagged_exported_program,
+        )
+        if _INCREMENTAL_VALIDATION:
+            # Partitions were only checked locally as they were inserted.
+            tagged_exported_program._validate()
 
     # Partitioner added delegation tags to the graph module nodes,
     # we make sure to remove them after we finished partition_and_lower
@@ -562,6 +732,179 @@ def _create_partitions(
     return backend_id_to_call_submodules
 
 
+def _create_partitions_in_order(
+    tagged_graph_module: torch.fx.GraphModule,
+    partition_result: PartitionResult,
+    owning_program: ExportedProgram,
+    is_submodule: bool = False,
+) -> List[torch.fx.Node]:
+    """
+    Creates the partitions like _create_partitions, and returns their
+    call_module nodes in the order in which _partition_and_lower lowers them.
+    """
+    tag_order = {
+        f"fused_{tag}": i for i, tag in enumerate(partition_result.partition_tags)
+    }
+    call_submodule_nodes = sorted(
+        (
+            node
+            for nodes in _create_partitions_in_graph_module(
+                tagged_graph_module, partition_result, owning_program, is_submodule
+            ).values()
+            for node in nodes
+        ),
+        key=lambda node: tag_order[node.target],
+    )
+    for _, submod, _ in get_control_flow_submodules(tagged_graph_module):
+        call_submodule_nodes.extend(
+            _create_partitions_in_order(
+                submod, partition_result, owning_program, is_submodule=True
+            )
+        )
+    return call_submodule_nodes
+
+
+def _insert_preprocess_result(
+    backend_id: str,
+    preprocess_result: PreprocessResult,
+    call_submodule_node: torch.fx.Node,
+    owning_program: ExportedProgram,
+) -> None:
+    """
+    Replaces a partition created by _create_partitions with its lowered module.
+    """
+    submodule_program = call_submodule_node.meta["submodule_program"]
+    lowered_module = LoweredBackendModule(
+        edge_program=submodule_program,
+        backend_id=backend_id,
+        processed_bytes=preprocess_result.processed_bytes,
+        compile_specs=call_submodule_node.meta["compile_spec"],
+        named_data_store_output=preprocess_result.data_store_output,
+    )
+    lowered_module.meta = {
+        "debug_handle_map": preprocess_result.debug_handle_map,
+    }
+    is_submodule = call_submodule_node.meta["is_submodule"]
+    toplevel_input_specs_to_delete = call_submodule_node.meta[
+        "toplevel_input_specs_to_delete"
+    ]
+    toplevel_output_specs_to_delete = call_submodule_node.meta[
+        "toplevel_output_specs_to_delete"
+    ]
+    submodule_output_node = call_submodule_node.meta["submodule_output_node"]
+
+    _insert_lowered_submodule(
+        submodule_program,
+        owning_program,
+        call_submodule_node,
+        submodule_output_node,
+        lowered_module,
+        is_submodule,
+        toplevel_input_specs_to_delete,
+        toplevel_output_specs_to_delete,
+    )
+
+
+_PreprocessJob = Tuple[Type[BackendDetails], ExportedProgram, List[CompileSpec]]
+
+# Set in each worker process by _init_preprocess_worker().
+_preprocess_jobs: Optional[List[_PreprocessJob]] = None
+
+
+def _init_preprocess_worker(jobs: List[_PreprocessJob]) -> None:
+    global _preprocess_jobs
+    _preprocess_jobs = jobs
+
+
+def _preprocess_in_worker(index: int) -> PreprocessResult:
+    jobs = _preprocess_jobs
+    assert jobs is not None, "Worker was not initialized"
+    backend, edge_program, compile_specs = jobs[index]
+    # The forked worker has its own copy of the program, so it is not copied.
+    return backend.preprocess(edge_program, compile_specs)
+
+
+def _preprocess_all(
+    jobs: List[_PreprocessJob], max_workers: int
+) -> List[PreprocessResult]:
+    """
+    Preprocesses each (backend, program, compile specs) job, in up to
+    max_workers forked worker processes. Forking lets the workers inherit the
+    programs rather than pickling them, only the results are sent back.
+    """
+    keys: List[Optional[str]] = [None] * len(jobs)
+    results: List[Optional[PreprocessResult]] = [None] * len(jobs)
+    if _PREPROCESS_CACHE is not None:
+        for i, (backend, edge_program, compile_specs) in enumerate(jobs):
+            keys[i], results[i] = _PREPROCESS_CACHE.lookup(
+                backend, edge_program, compile_specs
+            )
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    pool = None
+    if max_workers > 1 and len(missing) > 1:
+        pool = fork_process_pool(
+            min(max_workers, len(missing)),
+            "preprocessing serially",
+            _init_preprocess_worker,
+            (jobs,),
+        )
+    if pool is not None:
+        with pool:
+            for i, result in zip(missing, pool.map(_preprocess_in_worker, missing)):
+                results[i] = result
+    else:
+        for i in missing:
+            backend, edge_program, compile_specs = jobs[i]
+            results[i] = backend.preprocess(copy.deepcopy(edge_program), compile_specs)
+
+    if _PREPROCESS_CACHE is not None:
+        for i in missing:
+            _PREPROCESS_CACHE.store(keys[i], results[i])
+    return results  # pyre-ignore[7]
+
+
+def _partition_and_lower_in_two_phases(
+    tagged_graph_module: torch.fx.GraphModule,
+    partition_result: PartitionResult,
+    owning_program: ExportedProgram,
+    max_workers: int,
+) -> torch.fx.GraphModule:
+    """
+    Partitions and lowers the graph module like _partition_and_lower, but
+    preprocesses all of the partitions at once, in up to max_workers worker
+    processes, and validates the owning program once at the end.
+    """
+    call_submodule_nodes = _create_partitions_in_order(
+        tagged_graph_module, partition_result, owning_program
+    )
+
+    backend_name_to_subclass = {
+        subclass.__name__: subclass for subclass in BackendDetails.__subclasses__()
+    }
+    jobs = []
+    for node in call_submodule_nodes:
+        backend_id = node.meta["backend_id"]
+        if backend_id not in backend_name_to_subclass:
+            raise NotImplementedError(f"Backend {backend_id} was not found.")
+        jobs.append(
+            (
+                backend_name_to_subclass[backend_id],
+                node.meta["submodule_program"],
+                node.meta["compile_spec"],
+            )
+        )
+
+    preprocess_results = _preprocess_all(jobs, max_workers)
+    for node, preprocess_result in zip(call_submodule_nodes, preprocess_results):
+        _insert_preprocess_result(
+            node.meta["backend_id"], preprocess_result, node, owning_program
+        )
+    owning_program._validate()
+
+    return tagged_graph_module
+
+
 def lower_all_submodules_to_backend(
     backend_id: str,
     method_to_submodules_nodes: Dict[str, List[torch.fx.Node]],
@@ -570,72 +913,65 @@ def lower_all_submodules_to_backend(
     """
     Lower all submodules nodes given in the method_to_submodule_nodes map to backend_id.
     """
-    # The created exported program for the submodules are in the call_module node's meta data
-    # We just map the method_to_submodule_nodes directly to the method_to_partitioned_exported_programs
-    method_to_partitioned_program = {
-        method_name: [
-            # perform deep copy here in case backends change graph inside preprocess method
-            copy.deepcopy(node.meta["submodule_program"])
-            for node in call_submodule_nodes
-        ]
-        for method_name, call_submodule_nodes in method_to_submodules_nodes.items()
-    }
-    method_to_compile_specs = {
-        method_name: [node.meta["compile_spec"] for node in call_submodule_nodes]
-        for method_name, call_submodule_nodes in method_to_submodules_nodes.items()
-    }
-
     backend_name_to_subclass = {
         subclass.__name__: subclass for subclass in BackendDetails.__subclasses__()
     }
     if backend_id not in backend_name_to_subclass:
         raise NotImplementedError(f"Backend {backend_id} was not found.")
 
-    method_to_preprocess_result: dict[str, List[PreprocessResult]] = (
-        backend_name_to_subclass[backend_id].preprocess_multimethod(
-            method_to_partitioned_program, method_to_compile_specs
-        )
-    )
+    backend = backend_name_to_subclass[backend_id]
+    method_to_preprocess_result: Dict[str, List[PreprocessResult]]
+    if _PREPROCESS_WORKERS is not None and not _overrides_preprocess_multimethod(
+        backend
+    ):
+        # The default preprocess_multimethod preprocesses each partition
+        # independently, so the partitions can be preprocessed concurrently.
+        jobs = [
+            (backend, node.meta["submodule_program"], node.meta["compile_spec"])
+            for call_submodule_nodes in method_to_submodules_nodes.values()
+            for node in call_submodule_nodes
+        ]
+        preprocess_results = iter(_preprocess_all(jobs, _PREPROCESS_WORKERS))
+        method_to_preprocess_result = {
+            method_name: [next(preprocess_results) for _ in call_submodule_nodes]
+            for method_name, call_submodule_nodes in method_to_submodules_nodes.items()
+        }
+    else:
+        # The created exported program for the submodules are in the call_module node's meta data
+        # We just map the method_to_submodule_nodes directly to the method_to_partitioned_exported_programs
+        # The preprocess cache copies the programs it passes to the backend itself.
+        copy_program = copy.deepcopy if _PREPROCESS_CACHE is None else lambda p: p
+        method_to_partitioned_program = {
+            method_name: [
+                # perform deep copy here in case backends change graph inside preprocess method
+                copy_program(node.meta["submodule_program"])
+                for node in call_submodule_nodes
+            ]
+            for method_name, call_submodule_nodes in method_to_submodules_nodes.items()
+        }
+        method_to_compile_specs = {
+            method_name: [node.meta["compile_spec"] for node in call_submodule_nodes]
+            for method_name, call_submodule_nodes in method_to_submodules_nodes.items()
+        }
+        if _PREPROCESS_CACHE is not None:
+            method_to_preprocess_result = _PREPROCESS_CACHE.preprocess_multimethod(
+                backend, method_to_partitioned_program, method_to_compile_specs
+            )
+        else:
+            method_to_preprocess_result = backend.preprocess_multimethod(
+                method_to_partitioned_program, method_to_compile_specs
+            )
 
     for method_name in method_to_preprocess_result.keys():
         owning_program = method_to_tagged_edge_program[method_name]
         list_of_preprocess_results = method_to_preprocess_result[method_name]
         list_of_call_submodule_nodes = method_to_submodules_nodes[method_name]
-        list_of_compile_specs = method_to_compile_specs[method_name]
-        for preprocess_result, call_submodule_node, compile_spec in zip(
+        for preprocess_result, call_submodule_node in zip(
             list_of_preprocess_results,
             list_of_call_submodule_nodes,
-            list_of_compile_specs,
         ):
-            submodule_program = call_submodule_node.meta["submodule_program"]
-            lowered_module = LoweredBackendModule(
-                edge_program=submodule_program,
-                backend_id=backend_id,
-                processed_bytes=preprocess_result.processed_bytes,
-                compile_specs=compile_spec,
-                named_data_store_output=preprocess_result.data_store_output,
-            )
-            lowered_module.meta = {
-                "debug_handle_map": preprocess_result.debug_handle_map,
-            }
-            is_submodule = call_submodule_node.meta["is_submodule"]
-            toplevel_input_specs_to_delete = call_submodule_node.meta[
-                "toplevel_input_specs_to_delete"
-            ]
-            toplevel_output_specs_to_delete = call_submodule_node.meta[
-                "toplevel_output_specs_to_delete"
-            ]
-            submodule_output_node = call_submodule_node.meta["submodule_output_node"]
-
-            _insert_lowered_submodule(
-                submodule_program,
-                owning_program,
-                call_submodule_node,
-                submodule_output_node,
-                lowered_module,
-                is_submodule,
-                toplevel_input_specs_to_delete,
-                toplevel_output_specs_to_delete,
+            _insert_preprocess_result(
+                backend_id, preprocess_result, call_submodule_node, owning_program
             )
 
 
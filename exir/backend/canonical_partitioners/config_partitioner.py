@@ -4,8 +4,11 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import torch
 from executorch.exir.backend.backend_details import ExportedProgram
@@ -105,11 +108,16 @@ class ConfigerationBasedPartitioner(Partitioner):
         self,
         delegation_spec: DelegationSpec,
         partitioner_configs: Iterable[PartitionerConfig],
+        merge_by_level: bool = False,
     ):
         """
         Configeration based partitioner. We supply the partitioner with a set of configerations
         which describe the node type, constraints, and any dependencies required to be partitioned
         with the node. We use the configerations to partition the graph module.
+
+        If merge_by_level is True, the matched nodes are merged into partitions with
+        propose_partitions_by_level(), which scales linearly with the size of the graph,
+        instead of the CapabilityBasedPartitioner.
         """
         super().__init__()
         # Initialize partitioner configs map {"target_name": PartitionerConfig}
@@ -125,6 +133,33 @@ class ConfigerationBasedPartitioner(Partitioner):
                 self.target_partitioner_configs[target_name] = config
 
         self.delegation_spec = delegation_spec
+        self.merge_by_level = merge_by_level
+        # Config resolved for each node target, as target names are costly to format
+        self._target_configs: Dict[Any, Optional[PartitionerConfig]] = {}
+        # check_constraints results of the filter_fn returned by
+        # ops_to_not_decompose(), by (config, node), as the same node can be
+        # filtered several times while lowering. Cleared by partition(), as
+        # the nodes may have changed since.
+        self._constraint_results: Dict[
+            Tuple[PartitionerConfig, torch.fx.Node], bool
+        ] = {}
+        # Seconds spent checking and matching nodes in the last call to
+        # get_matched_nodes_from_configs(), by PartitionerConfig class name
+        self.config_match_times: Dict[str, float] = {}
+
+    def get_config(self, node: torch.fx.Node) -> Optional[PartitionerConfig]:
+        """
+        Returns the PartitionerConfig whose target_name matches the target of
+        this node, or None if there is no such config.
+        """
+        if node.op != "call_function":
+            return None
+        if node.target not in self._target_configs:
+            target_name = format_target_name(node.target.__name__)  # pyre-ignore
+            self._target_configs[node.target] = self.target_partitioner_configs.get(
+                target_name, None
+            )
+        return self._target_configs[node.target]
 
     def ops_to_not_decompose(
         self,
@@ -136,19 +171,15 @@ class ConfigerationBasedPartitioner(Partitioner):
             to determine if this op is indeed partitionable. We grab the check_constraint
             function of this op from the config and use it to filter.
             """
-            if node.op != "call_function":
+            config = self.get_config(node)
+            # only filter_fn if config has original_aten
+            if config is None or not config.get_original_aten():
                 return False
-            target_name = format_target_name(node.target.__name__)  # pyre-ignore
-
-            if target_name in self.target_partitioner_configs:
-                config = self.target_partitioner_configs[target_name]
-                # only filter_fn if config has original_aten
-                if config.get_original_aten():
-                    return self.target_partitioner_configs[
-                        target_name
-                    ].check_constraints(node, ep)
 
-            return False
+            key = (config, node)
+            if key not in self._constraint_results:
+                self._constraint_results[key] = config.check_constraints(node, ep)
+            return self._constraint_results[key]
 
         # Get list of original aten targets which we do not want to decomp
         do_not_decomp = []
@@ -162,18 +193,34 @@ class ConfigerationBasedPartitioner(Partitioner):
     def get_matched_nodes_from_configs(
         self, ep: ExportedProgram
     ) -> List[List[torch.fx.Node]]:
+        # index the nodes by config in one pass over the graph
+        nodes_by_config: Dict[int, List[Tuple[int, torch.fx.Node]]] = defaultdict(list)
+        configs: Dict[int, PartitionerConfig] = {}
+        for position, node in enumerate(ep.graph_module.graph.nodes):
+            node_config = self.get_config(node)
+            if node_config is not None:
+                configs[id(node_config)] = node_config
+                nodes_by_config[id(node_config)].append((position, node))
+
         # gather supported nodes
-        matched_nodes = []
-        gm = ep.graph_module
-        for node in gm.graph.nodes:
-            if node.op == "call_function":
-                target = format_target_name(node.target.__name__)
-                if target in self.target_partitioner_configs:
-                    node_config = self.target_partitioner_configs[target]
-                    if node_config.check_constraints(node, ep):
-                        matched_nodes.append(node_config.get_partition(node, ep))
-
-        return matched_nodes
+        matches: List[Tuple[int, List[torch.fx.Node]]] = []
+        self.config_match_times = defaultdict(float)
+        for config_id, nodes in nodes_by_config.items():
+            node_config = configs[config_id]
+            start = time.perf_counter()
+            for position, node in nodes:
+                if node_config.check_constraints(node, ep):
+                    matches.append((position, node_config.get_partition(node, ep)))
+            self.config_match_times[type(node_config).__name__] += (
+                time.perf_counter() - start
+            )
+
+        for config_name, seconds in self.config_match_times.items():
+            logging.debug(f"{config_name} matched nodes in {seconds:.6f}s")
+
+        # keep the matches in graph order
+        matches.sort(key=lambda match: match[0])
+        return [matched_nodes for _, matched_nodes in matches]
 
     def generate_partitions(self, ep: ExportedProgram) -> List[Partition]:
         matched_nodes = self.get_matched_nodes_from_configs(ep)
@@ -181,10 +228,12 @@ class ConfigerationBasedPartitioner(Partitioner):
         partitions = generate_partitions_from_list_of_nodes(
             ep.graph_module,
             matched_nodes,
+            merge_by_level=self.merge_by_level,
         )
         return partitions
 
     def partition(self, exported_program: ExportedProgram) -> PartitionResult:
+        self._constraint_results.clear()
         partitions = self.generate_partitions(exported_program)
 
         # tag nodes
@@ -5,7 +5,9 @@
 # LICENSE file in the root directory of this source tree.
 
 import logging
-from typing import List, Optional
+import operator
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
 
 import torch
 from torch.fx.passes.infra.partitioner import CapabilityBasedPartitioner, Partition
@@ -17,6 +19,7 @@ def generate_partitions_from_list_of_nodes(
     graph_module: torch.fx.GraphModule,
     pattern_list: Optional[List[List[torch.fx.Node]]] = None,
     op_support: Optional[OperatorSupportBase] = None,
+    merge_by_level: bool = False,
 ) -> List[Partition]:
     final_op_support: Optional[OperatorSupportBase] = op_support
 
@@ -40,14 +43,17 @@ def generate_partitions_from_list_of_nodes(
         final_op_support is not None
     ), "Did not give a pattern or OperatorSupportBase instance to partition with"
 
-    # Run the CapabilityBasedPartitioner to return the largest possible
-    # subgraphs containing the nodes with the tags
-    capability_partitioner = CapabilityBasedPartitioner(
-        graph_module,
-        final_op_support,
-        allows_single_node_partition=True,
-    )
-    partition_list = capability_partitioner.propose_partitions()
+    if merge_by_level:
+        partition_list = propose_partitions_by_level(graph_module, final_op_support)
+    else:
+        # Run the CapabilityBasedPartitioner to return the largest possible
+        # subgraphs containing the nodes with the tags
+        capability_partitioner = CapabilityBasedPartitioner(
+            graph_module,
+            final_op_support,
+            allows_single_node_partition=True,
+        )
+        partition_list = capability_partitioner.propose_partitions()
 
     # Remove the metadata field we added
     for partition in partition_list:
@@ -56,6 +62,102 @@ def generate_partitions_from_list_of_nodes(
     return partition_list
 
 
+def _is_getitem(node: torch.fx.Node) -> bool:
+    return node.op == "call_function" and node.target == operator.getitem
+
+
+def _get_supported_nodes(
+    graph_module: torch.fx.GraphModule, op_support: OperatorSupportBase
+) -> Set[torch.fx.Node]:
+    submodules = dict(graph_module.named_modules())
+    supported: Set[torch.fx.Node] = set()
+    for node in graph_module.graph.nodes:
+        if _is_getitem(node) and all(
+            _is_getitem(user) for user in node.args[0].users  # pyre-ignore
+        ):
+            # Like CapabilityBasedPartitioner, getitem nodes are put in the same
+            # partition as the tuple they unpack.
+            if node.args[0] in supported:
+                supported.add(node)
+        elif op_support.is_node_supported(submodules, node):
+            supported.add(node)
+    return supported
+
+
+def propose_partitions_by_level(
+    graph_module: torch.fx.GraphModule,
+    op_support: OperatorSupportBase,
+) -> List[Partition]:
+    """
+    Linear time alternative to CapabilityBasedPartitioner.propose_partitions().
+
+    CapabilityBasedPartitioner tries to merge every partition with every other
+    one and runs a cycle check for each attempt, which does not scale to graphs
+    with 100k+ nodes. Instead, each node is given a level, such that levels
+    never increase along an edge, and decrease after each unsupported node from
+    which a supported node can be reached. A path leaving a partition through
+    such a node can then never come back to it, so grouping the supported nodes
+    by level gives partitions which can each be fused into a single node
+    without creating a cycle.
+
+    Nodes are given the level of their supported inputs when possible, or else
+    the one of their users. This gives the same partitions as the
+    CapabilityBasedPartitioner for most models, but the latter can also merge
+    partitions at different levels when there is no path between them.
+
+    Args:
+        graph_module: Module that we want to partition
+        op_support: Decides which nodes can be put into a partition
+
+    Returns
+        A list of partitions, in topological order, where single node
+        partitions are allowed.
+    """
+    supported = _get_supported_nodes(graph_module, op_support)
+
+    # Unsupported nodes from which a supported node can be reached. Only these
+    # separate one level from the next.
+    barriers: Set[torch.fx.Node] = set()
+    # Lowest level each node can be given
+    min_levels: Dict[torch.fx.Node, int] = {}
+    for node in reversed(graph_module.graph.nodes):
+        level = 0
+        for user in node.users:
+            level = max(level, min_levels[user] + (user in barriers))
+        min_levels[node] = level
+        if node not in supported and any(
+            user in supported or user in barriers for user in node.users
+        ):
+            barriers.add(node)
+
+    # Nodes with a supported input are raised to the highest level their inputs
+    # allow, to join the partition of that input. Other supported nodes keep
+    # their lowest level, to join the partition of their users.
+    top_level = max(min_levels.values(), default=0) + 1
+    levels: Dict[torch.fx.Node, int] = {}
+    for node in graph_module.graph.nodes:
+        level = min(
+            (levels[input_node] for input_node in node.all_input_nodes),
+            default=top_level,
+        )
+        if node not in supported:
+            levels[node] = level - (node in barriers)
+        elif any(input_node in supported for input_node in node.all_input_nodes):
+            levels[node] = level
+        else:
+            levels[node] = min_levels[node]
+
+    nodes_by_level: Dict[int, List[torch.fx.Node]] = defaultdict(list)
+    for node in graph_module.graph.nodes:
+        if node in supported:
+            nodes_by_level[levels[node]].append(node)
+
+    return [
+        Partition(id=partition_id, nodes=nodes_by_level[level])
+        for partition_id, level in enumerate(sorted(nodes_by_level, reverse=True))
+    ]
+
+
 def generate_pattern_op_partitions(
     graph_module: torch.fx.GraphModule,
     patterns: Optional[List[torch.fx.Graph]] = None,
@@ -0,0 +1,405 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import copy
+import dataclasses
+import enum
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import torch
+from executorch.exir.backend.backend_details import BackendDetails, PreprocessResult
+from executorch.exir.backend.compile_spec_schema import CompileSpec
+from executorch.exir.lowered_backend_module import LoweredBackendModule
+from torch.export.exported_program import ExportedProgram
+
+# Bump when the format of the cache key or of the cached results changes.
+_CACHE_VERSION = 1
+
+# Node metadata that differs between identical exports of the same model, or
+# that only serves debugging, and must not be part of the cache key.
+_IGNORED_META_KEYS = frozenset(["from_node", "seq_nr", "stack_trace"])
+
+
+class _Uncacheable(Exception):
+    """Raised for values of a program that cannot be part of a cache key."""
+
+
+def _tensor_digest(tensor: torch.Tensor) -> str:
+    if tensor.is_quantized or tensor.layout != torch.strided:
+        raise _Uncacheable(f"tensor with layout {tensor.layout}")
+    data = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+    return hashlib.sha256(data.numpy()).hexdigest()
+
+
+def _canonicalize(value: Any, node_ids: Dict[torch.fx.Node, int]) -> Any:  # noqa: C901
+    """Returns a representation of `value` that only consists of builtin types
+    and whose repr() is stable across processes. Nodes are replaced by their
+    position in the graph."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, torch.fx.Node):
+        return ("node", node_ids[value])
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, *(_canonicalize(v, node_ids) for v in value))
+    if isinstance(value, dict):
+        return (
+            "dict",
+            *(
+                (_canonicalize(k, node_ids), _canonicalize(v, node_ids))
+                for k, v in value.items()
+            ),
+        )
+    if isinstance(value, (bytes, bytearray)):
+        return ("bytes", hashlib.sha256(value).hexdigest())
+    if isinstance(value, torch.Tensor):
+        # Fake tensors of node metadata only describe the tensor.
+        return ("tensor", str(value.dtype), tuple(value.shape), value.stride())
+    if isinstance(
+        value,
+        (torch.SymInt, torch.SymFloat, torch.SymBool, torch.dtype, torch.device),
+    ):
+        return str(value)
+    if isinstance(value, (torch.memory_format, torch.layout)):
+        return str(value)
+    if isinstance(value, (torch._ops.OpOverload, torch._ops.HigherOrderOperator)):
+        return ("op", str(value))
+    if isinstance(value, enum.Enum):
+        return ("enum", type(value).__qualname__, value.name)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (
+            type(value).__qualname__,
+            *(
+                (field.name, _canonicalize(getattr(value, field.name), node_ids))
+                for field in dataclasses.fields(value)
+            ),
+        )
+    if isinstance(value, type) or callable(value):
+        module = getattr(value, "__module__", None)
+        name = getattr(value, "__qualname__", None) or getattr(value, "__name__", None)
+        if module is None or name is None or "<locals>" in name:
+            raise _Uncacheable(f"callable {value!r}")
+        # Edge ops also have a __name__ like aten.add.Tensor.
+        return ("callable", module, name, getattr(value, "__name__", None))
+    raise _Uncacheable(f"value of type {type(value).__qualname__}")
+
+
+def _canonicalize_attr(value: Any) -> Any:
+    if isinstance(value, LoweredBackendModule):
+        return (
+            "lowered",
+            value.backend_id,
+            hashlib.sha256(value.processed_bytes).hexdigest(),
+            _canonicalize(value.compile_specs, {}),
+        )
+    if isinstance(value, torch.fx.GraphModule):
+        return ("graph", _canonicalize_graph(value))
+    if isinstance(value, torch.Tensor):
+        return ("tensor", str(value.dtype), tuple(value.shape), _tensor_digest(value))
+    raise _Uncacheable(f"attribute of type {type(value).__qualname__}")
+
+
+def _canonicalize_graph(graph_module: torch.fx.GraphModule) -> List[Any]:
+    node_ids: Dict[torch.fx.Node, int] = {}
+    nodes = []
+    for node in graph_module.graph.nodes:
+        node_ids[node] = len(node_ids)
+        meta = {k: v for k, v in node.meta.items() if k not in _IGNORED_META_KEYS}
+        entry = [
+            node.name,
+            node.op,
+            _canonicalize(node.target, node_ids),
+            _canonicalize(node.args, node_ids),
+            _canonicalize(node.kwargs, node_ids),
+            _canonicalize(dict(sorted(meta.items())), node_ids),
+        ]
+        if node.op == "get_attr":
+            entry.append(
+                _canonicalize_attr(
+                    functools.reduce(getattr, node.target.split("."), graph_module)
+                )
+            )
+        nodes.append(entry)
+    return nodes
+
+
+def _canonicalize_program(edge_program: ExportedProgram) -> List[Any]:
+    signature = edge_program.graph_signature
+    constants = []
+    for name, value in sorted(
+        [*edge_program.state_dict.items(), *edge_program.constants.items()]
+    ):
+        if not isinstance(value, torch.Tensor):
+            raise _Uncacheable(f"constant {name} of type {type(value).__qualname__}")
+        constants.append(
+            (name, str(value.dtype), tuple(value.shape), _tensor_digest(value))
+        )
+    return [
+        _canonicalize_graph(edge_program.graph_module),
+        _canonicalize(signature.input_specs, {}),
+        _canonicalize(signature.output_specs, {}),
+        constants,
+        sorted(str(item) for item in edge_program.range_constraints.items()),
+    ]
+
+
+def preprocess_cache_key(
+    backend: Type[BackendDetails],
+    edge_program: ExportedProgram,
+    compile_specs: List[CompileSpec],
+    salt: str = "",
+) -> Optional[str]:
+    """
+    Returns the content-addressed cache key of preprocessing `edge_program`
+    with `backend` and `compile_specs`, or None if the program cannot be cached.
+
+    The key is a sha256 digest of the graph (node names, ops, arguments and
+    metadata, like debug handles and tensor shapes), the graph signature, the
+    contents of the constants, the compile specs, the backend class and the
+    versions of torch and of the cache format. Node metadata that differs
+    between exports of the same model, like stack traces, is not part of the
+    key.
+
+    Node names and debug handles are part of the key because backends may embed
+    them in their results, e.g. XNNPACK stores the debug handle of each node in
+    the processed bytes. So a partition only matches the same partition of an
+    identical export, not an identical block elsewhere in the same graph, whose
+    nodes have other names and debug handles.
+    """
+    try:
+        canonical = [
+            _CACHE_VERSION,
+            torch.__version__,
+            salt,
+            backend.__module__,
+            backend.__qualname__,
+            _canonicalize(compile_specs, {}),
+            _canonicalize_program(edge_program),
+        ]
+    except _Uncacheable as e:
+        logging.debug(f"Not caching preprocess result of {backend.__name__}: {e}")
+        return None
+    return hashlib.sha256(repr(canonical).encode("utf-8")).hexdigest()
+
+
+def _overrides_preprocess_multimethod(backend: Type[BackendDetails]) -> bool:
+    for cls in backend.__mro__:
+        if cls is BackendDetails:
+            return False
+        if "preprocess_multimethod" in vars(cls):
+            return True
+    return False
+
+
+class PreprocessCache:
+    """
+    Caches the results of BackendDetails.preprocess() by the contents of the
+    preprocessed program, so that lowering the same partition again, e.g. when
+    re-running an export script or lowering the same model to several programs,
+    skips the backend. Repeated blocks within one model are not matched with
+    each other, see preprocess_cache_key().
+
+    Results are kept in memory, and are also stored in `cache_dir` if given, so
+    that they are shared with other caches using the same directory, like later
+    runs of the same script. Results are stored as pickles, so the directory
+    must only be writable by trusted users.
+
+    Backends are assumed to be deterministic functions of the program and the
+    compile specs. Pass a different `salt` to ignore the results stored by
+    another version of a backend.
+
+    Attributes:
+        hits: Number of partitions whose result was found in the cache.
+        misses: Number of partitions that were preprocessed by the backend.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, salt: str = "") -> None:
+        self.cache_dir = cache_dir
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._results: Dict[str, Any] = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def clear(self) -> None:
+        """Drops the results held in memory, and resets the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _path(self, key: str) -> str:
+        assert self.cache_dir is not None
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _get(self, key: Optional[str]) -> Optional[Any]:
+        if key is None:
+            return None
+        with self._lock:
+            result = self._results.get(key)
+        if result is None and self.cache_dir is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    result = pickle.load(f)
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logging.warning(f"Failed to load preprocess result {key}: {e}")
+                return None
+            with self._lock:
+                self._results[key] = result
+        # Copy so that callers modifying the result do not modify the cache.
+        return copy.deepcopy(result)
+
+    def _put(self, key: Optional[str], result: Any) -> None:
+        if key is None:
+            return
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._results[key] = result
+        if self.cache_dir is None:
+            return
+        try:
+            # Write atomically, so that concurrent readers never see partial files.
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(result, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, pickle.PicklingError) as e:
+            logging.warning(f"Failed to store preprocess result {key}: {e}")
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def lookup(
+        self,
+        backend: Type[BackendDetails],
+        edge_program: ExportedProgram,
+        compile_specs: List[CompileSpec],
+    ) -> Tuple[Optional[str], Optional[PreprocessResult]]:
+        """
+        Returns the cache key of preprocessing `edge_program`, and the cached
+        result if there is one. A missing result is counted as a miss, and
+        should be preprocessed and passed to store() with the returned key.
+        """
+        key = preprocess_cache_key(backend, edge_program, compile_specs, self.salt)
+        result = self._get(key)
+        if result is not None:
+            self._count(1, 0)
+        else:
+            self._count(0, 1)
+        return key, result
+
+    def store(self, key: Optional[str], result: PreprocessResult) -> None:
+        """Stores a result under a key returned by lookup(). Results of
+        programs that cannot be cached, whose key is None, are dropped."""
+        self._put(key, result)
+
+    def preprocess(
+        self,
+        backend: Type[BackendDetails],
+        edge_program: ExportedProgram,
+        compile_specs: List[CompileSpec],
+    ) -> PreprocessResult:
+        """
+        Returns backend.preprocess(edge_program, compile_specs), from the cache
+        if possible. The backend is given a copy of `edge_program`.
+        """
+        key, result = self.lookup(backend, edge_program, compile_specs)
+        if result is not None:
+            return result
+        result = backend.preprocess(copy.deepcopy(edge_program), compile_specs)
+        self.store(key, result)
+        return result
+
+    def preprocess_multimethod(
+        self,
+        backend: Type[BackendDetails],
+        edge_programs: Dict[str, List[ExportedProgram]],
+        compile_specs: Dict[str, List[List[CompileSpec]]],
+    ) -> Dict[str, List[PreprocessResult]]:
+        """
+        Returns backend.preprocess_multimethod(edge_programs, compile_specs),
+        from the cache if possible. The backend is given copies of the programs.
+
+        Backends that override preprocess_multimethod may share information
+        across partitions, so their results are cached for all of the
+        partitions together. Otherwise, results are cached per partition.
+        """
+        keys = {
+            method_name: [
+                preprocess_cache_key(backend, program, specs, self.salt)
+                for program, specs in zip(programs, compile_specs[method_name])
+            ]
+            for method_name, programs in edge_programs.items()
+        }
+        num_programs = sum(len(programs) for programs in edge_programs.values())
+
+        if _overrides_preprocess_multimethod(backend):
+            all_keys = [key for method_keys in keys.values() for key in method_keys]
+            key = None
+            if None not in all_keys:
+                key = hashlib.sha256(
+                    repr(sorted((name, keys[name]) for name in keys)).encode("utf-8")
+                ).hexdigest()
+            results = self._get(key)
+            if results is not None:
+                self._count(num_programs, 0)
+                return results
+            self._count(0, num_programs)
+            results = backend.preprocess_multimethod(
+                copy.deepcopy(edge_programs), compile_specs
+            )
+            self._put(key, results)
+            return results
+
+        results: Dict[str, List[Optional[PreprocessResult]]] = {}
+        missing_programs: Dict[str, List[ExportedProgram]] = {}
+        missing_specs: Dict[str, List[List[CompileSpec]]] = {}
+        for method_name, programs in edge_programs.items():
+            results[method_name] = []
+            for i, program in enumerate(programs):
+                result = self._get(keys[method_name][i])
+                results[method_name].append(result)
+                if result is None:
+                    missing_programs.setdefault(method_name, []).append(
+                        copy.deepcopy(program)
+                    )
+                    missing_specs.setdefault(method_name, []).append(
+                        compile_specs[method_name][i]
+                    )
+        num_missing = sum(len(programs) for programs in missing_programs.values())
+        self._count(num_programs - num_missing, num_missing)
+        if missing_programs:
+            missing_results = backend.preprocess_multimethod(
+                missing_programs, missing_specs
+            )
+            for method_name, method_results in results.items():
+                new_results = iter(missing_results.get(method_name, ()))
+                for i, result in enumerate(method_results):
+                    if result is None:
+                        result = next(new_results)
+                        method_results[i] = result
+                        self._put(keys[method_name][i], result)
+        return results  # pyre-ignore[7]
@@ -10,11 +10,17 @@ from typing import List, Optional, Tuple
 
 import torch
 from executorch.exir import EdgeCompileConfig, to_edge
+from executorch.exir.backend.canonical_partitioners.config_partitioner import (
+    ConfigerationBasedPartitioner,
+    PartitionerConfig,
+)
 from executorch.exir.backend.canonical_partitioners.pattern_op_partitioner import (
     generate_partitions_from_list_of_nodes,
+    propose_partitions_by_level,
 )
+from executorch.exir.backend.partitioner import DelegationSpec
 from executorch.exir.dialects._ops import ops as exir_ops
-from torch.export import export
+from torch.export import export, ExportedProgram
 from torch.fx.node import Node
 from torch.fx.passes.operator_support import OperatorSupportBase
 
@@ -69,11 +75,12 @@ class TestGraphPartition(unittest.TestCase):
         graph_module: torch.fx.GraphModule,
         supported_modules: List[torch.nn.Module],
         op_support: Optional[OperatorSupportBase] = None,
+        merge_by_level: bool = False,
     ) -> List:
         node_list = self.get_node_list(graph_module, supported_modules)
 
         partition_list = generate_partitions_from_list_of_nodes(
-            graph_module, node_list, op_support
+            graph_module, node_list, op_support, merge_by_level
         )
 
         return partition_list
@@ -246,3 +253,169 @@ class TestGraphPartition(unittest.TestCase):
 
         self.assertEqual(node_list_1, partition_1)
         self.assertEqual(node_list_2, partition_2)
+
+    def test_merge_by_level(self):
+        """
+        check partitions merged by level match the ones from the CapabilityBasedPartitioner
+        """
+
+        class TestModule(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.conv1 = torch.nn.Conv2d(32, 32, 1)
+                self.conv2 = torch.nn.Conv2d(32, 32, 1)
+                self.relu = torch.nn.ReLU()
+
+            def forward(self, x: torch.Tensor):
+                a = self.conv1(x)
+                b, _ = torch.max(self.conv2(a), dim=2)
+                c, _ = torch.max(a, dim=2)
+                d = self.relu(b - c)
+                return self.relu(d * d)
+
+        example_inputs = (torch.rand(1, 32, 16, 16),)
+        graph_module = self.get_graph_module(TestModule(), example_inputs)
+        supported_module = [
+            "torch.nn.modules.conv.Conv2d",
+            "torch.nn.modules.activation.ReLU",
+        ]
+
+        partitions = [
+            sorted(
+                sorted(node.name for node in partition.nodes)
+                for partition in self.extract_partition_list(
+                    graph_module, supported_module, merge_by_level=merge_by_level
+                )
+            )
+            for merge_by_level in [False, True]
+        ]
+
+        self.assertEqual(len(partitions[0]), 3)
+        self.assertEqual(partitions[1], partitions[0])
+
+    def test_merge_by_level_large_graph(self):
+        """
+        check partitions of a graph with 100k nodes can be proposed quickly, and that
+        supported nodes are only merged when there is no unsupported node between them
+        """
+
+        class TestOperatorSupport(OperatorSupportBase):
+            def is_node_supported(self, submodules, node: torch.fx.Node) -> bool:
+                return node.target is torch.relu
+
+        graph = torch.fx.Graph()
+        x = graph.placeholder("x")
+        y = x
+        for i in range(100000):
+            x = graph.call_function(torch.cumsum if i % 4 == 3 else torch.relu, (x,))
+            if i % 4 == 0:
+                # branch to a supported node after the next unsupported node
+                y = graph.call_function(torch.relu, (x,))
+            elif i % 4 == 3:
+                x = graph.call_function(torch.add, (x, y))
+        graph.output(x)
+        graph_module = torch.fx.GraphModule(torch.nn.Module(), graph)
+
+        partitions = propose_partitions_by_level(graph_module, TestOperatorSupport())
+
+        self.assertEqual(len(partitions), 25000)
+        for partition_id, partition in enumerate(partitions):
+            self.assertEqual(partition.id, partition_id)
+            self.assertEqual(len(partition.nodes), 4)
+            self.assertTrue(all(node.target is torch.relu for node in partition.nodes))
+
+
+class AddConfig(PartitionerConfig):
+    target_name = "add.Tensor"
+
+    def __init__(self):
+        self.checked: List[torch.fx.Node] = []
+
+    def check_constraints(self, node: torch.fx.Node, ep: ExportedProgram) -> bool:
+        self.checked.append(node)
+        # x + x and a + y are not supported
+        return node.args[1].op != "placeholder"
+
+    def get_original_aten(self) -> Optional[torch._ops.OpOverload]:
+        return torch.ops.aten.add.Tensor
+
+    def get_partition(
+        self, node: torch.fx.Node, ep: ExportedProgram
+    ) -> List[torch.fx.Node]:
+        return [node]
+
+
+class ReLUConfig(AddConfig):
+    target_name = "relu.default"
+
+    def check_constraints(self, node: torch.fx.Node, ep: ExportedProgram) -> bool:
+        self.checked.append(node)
+        return True
+
+    def get_original_aten(self) -> Optional[torch._ops.OpOverload]:
+        return torch.ops.aten.relu.default
+
+
+class TestConfigerationBasedPartitioner(unittest.TestCase):
+    class TestModule(torch.nn.Module):
+        def forward(self, x: torch.Tensor, y: torch.Tensor):
+            a = torch.relu(x + x)
+            return torch.relu(a + y) + a
+
+    def export(self) -> ExportedProgram:
+        inputs = (torch.rand(2, 2), torch.rand(2, 2))
+        return to_edge(export(self.TestModule(), inputs)).exported_program()
+
+    def test_matched_nodes_in_graph_order(self):
+        ep = self.export()
+        partitioner = ConfigerationBasedPartitioner(
+            DelegationSpec("Backend", []), [AddConfig(), ReLUConfig()]
+        )
+
+        matched_nodes = partitioner.get_matched_nodes_from_configs(ep)
+
+        self.assertEqual(
+            [node.name for nodes in matched_nodes for node in nodes],
+            ["aten_relu_default", "aten_relu_default_1", "aten_add_tensor_2"],
+        )
+        self.assertEqual(
+            partitioner.config_match_times.keys(), {"AddConfig", "ReLUConfig"}
+        )
+
+    def test_filter_fn_checks_constraints_once(self):
+        ep = torch.export.export(
+            self.TestModule(), (torch.rand(2, 2), torch.rand(2, 2))
+        )
+        config = AddConfig()
+        partitioner = ConfigerationBasedPartitioner(
+            DelegationSpec("Backend", []), [config, ReLUConfig()]
+        )
+        ops, filter_fn = partitioner.ops_to_not_decompose(ep)
+
+        self.assertEqual(
+            set(ops), {torch.ops.aten.add.Tensor, torch.ops.aten.relu.default}
+        )
+        for _ in range(2):
+            supported = [node.name for node in ep.graph.nodes if filter_fn(node)]
+            self.assertEqual(supported, ["relu", "relu_1", "add_2"])
+        self.assertEqual(len(config.checked), 3)
+
+    def test_partition_clears_checked_constraints(self):
+        ep = torch.export.export(
+            self.TestModule(), (torch.rand(2, 2), torch.rand(2, 2))
+        )
+        config = AddConfig()
+        partitioner = ConfigerationBasedPartitioner(
+            DelegationSpec("Backend", []), [config, ReLUConfig()]
+        )
+        _, filter_fn = partitioner.ops_to_not_decompose(ep)
+        for node in ep.graph.nodes:
+            filter_fn(node)
+        self.assertEqual(len(config.checked), 3)
+
+        # Nodes may change between lowering calls, so partitioning checks the
+        # constraints again.
+        partitioner.partition(self.export())
+        for node in ep.graph.nodes:
+            filter_fn(node)
+        self.assertEqual(len(config.checked), 9)
@@ -0,0 +1,83 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from unittest.mock import patch
+
+import torch
+from executorch.exir import to_edge
+from executorch.exir.backend import backend_api
+from executorch.exir.backend.backend_api import incremental_validation, to_backend
+from executorch.exir.backend.test.op_partitioner_demo import AddAttributePartitionerDemo
+from executorch.exir.lowered_backend_module import get_lowered_submodules
+from torch._export.verifier import SpecViolationError
+from torch.export import export
+from torch.export.exported_program import ExportedProgram
+
+
+class AddConstants(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.a = torch.nn.Parameter(torch.ones(2, 2))
+        self.register_buffer("b", torch.full((2, 2), 2.0))
+
+    def forward(self, x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+        # sub is not partitioned, so each add is lowered with its constant.
+        return ((x + self.a) - y) + self.b
+
+
+class TestIncrementalValidation(unittest.TestCase):
+    def export(self) -> ExportedProgram:
+        inputs = (torch.ones(2, 2), torch.ones(2, 2))
+        return to_edge(export(AddConstants(), inputs, strict=True)).exported_program()
+
+    def lower(self) -> ExportedProgram:
+        return to_backend(self.export(), AddAttributePartitionerDemo())
+
+    def test_matches_full_validation(self) -> None:
+        expected = self.lower()
+        with incremental_validation():
+            lowered = self.lower()
+
+        self.assertEqual(len(get_lowered_submodules(lowered.graph_module)), 2)
+        self.assertEqual(lowered.graph_module.code, expected.graph_module.code)
+        self.assertEqual(lowered.graph_signature, expected.graph_signature)
+        self.assertEqual(lowered.state_dict.keys(), expected.state_dict.keys())
+        inputs = (torch.ones(2, 2), torch.ones(2, 2))
+        self.assertTrue(
+            torch.allclose(lowered.module()(*inputs), AddConstants()(*inputs))
+        )
+
+    def test_validates_once(self) -> None:
+        validate = ExportedProgram._validate
+        edge_programs = [self.export(), self.export()]
+        with patch.object(
+            ExportedProgram, "_validate", autospec=True, side_effect=validate
+        ) as mock_validate:
+            to_backend(edge_programs[0], AddAttributePartitionerDemo())
+            full_count = mock_validate.call_count
+            mock_validate.reset_mock()
+            with incremental_validation():
+                to_backend(edge_programs[1], AddAttributePartitionerDemo())
+            incremental_count = mock_validate.call_count
+
+        # The owning program is validated once after both partitions, instead
+        # of after each of them.
+        self.assertEqual(full_count - incremental_count, 1)
+
+    def test_checks_inserted_submodule(self) -> None:
+        insert_lowered_submodule = backend_api._insert_lowered_submodule
+
+        def insert_without_val(*args, **kwargs) -> torch.fx.Node:
+            call_delegate_node = insert_lowered_submodule(*args, **kwargs)
+            del call_delegate_node.meta["val"]
+            return call_delegate_node
+
+        with patch.object(
+            backend_api, "_insert_lowered_submodule", insert_without_val
+        ), incremental_validation():
+            with self.assertRaisesRegex(SpecViolationError, "has no meta"):
+                self.lower()
@@ -0,0 +1,139 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from typing import List, Tuple
+from unittest.mock import patch
+
+import torch
+from executorch.exir import EdgeCompileConfig, EdgeProgramManager, to_edge
+from executorch.exir.backend.backend_api import (
+    parallel_preprocess,
+    preprocess_cache_enabled,
+    to_backend,
+)
+from executorch.exir.backend.test.op_partitioner_demo import AddMulPartitionerDemo
+from executorch.exir.graph_module import get_control_flow_submodules
+from executorch.exir.lowered_backend_module import get_lowered_submodules
+from functorch.experimental import control_flow
+from torch.export import export
+from torch.export.exported_program import ExportedProgram
+
+
+class ThreePartitions(torch.nn.Module):
+    def forward(self, x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+        x = torch.mm(x + y, y)
+        x = torch.mm(x - y, y) + x
+        return (x - y) + y
+
+
+def lowered_modules(graph_module: torch.fx.GraphModule) -> List[Tuple[str, bytes]]:
+    lowered = sorted(
+        (name, lowered_module.processed_bytes)
+        for name, lowered_module, _ in get_lowered_submodules(graph_module)
+    )
+    for _, submodule, _ in get_control_flow_submodules(graph_module):
+        lowered.extend(lowered_modules(submodule))
+    return lowered
+
+
+def to_executorch(edge_program: ExportedProgram) -> bytes:
+    return (
+        EdgeProgramManager(
+            {"forward": edge_program},
+            compile_config=EdgeCompileConfig(_check_ir_validity=False),
+        )
+        .to_executorch()
+        .buffer
+    )
+
+
+class TestParallelPreprocess(unittest.TestCase):
+    def export(self, model: torch.nn.Module) -> EdgeProgramManager:
+        inputs = (torch.ones(2, 2), torch.ones(2, 2))
+        return to_edge(export(model, inputs, strict=True))
+
+    def lower(self, model: torch.nn.Module) -> ExportedProgram:
+        return to_backend(
+            self.export(model).exported_program(), AddMulPartitionerDemo()
+        )
+
+    def test_matches_serial(self) -> None:
+        for max_workers in [1, 2]:
+            # to_executorch() modifies the lowered program.
+            expected = self.lower(ThreePartitions())
+            self.assertEqual(len(lowered_modules(expected.graph_module)), 3)
+            with parallel_preprocess(max_workers):
+                lowered = self.lower(ThreePartitions())
+            self.assertEqual(
+                lowered_modules(lowered.graph_module),
+                lowered_modules(expected.graph_module),
+            )
+            self.assertEqual(to_executorch(lowered), to_executorch(expected))
+
+    def test_multi_method_matches_serial(self) -> None:
+        expected = (
+            self.export(ThreePartitions())
+            .to_backend(AddMulPartitionerDemo())
+            .to_executorch()
+            .buffer
+        )
+        with parallel_preprocess(2):
+            lowered = (
+                self.export(ThreePartitions())
+                .to_backend(AddMulPartitionerDemo())
+                .to_executorch()
+                .buffer
+            )
+        self.assertEqual(lowered, expected)
+
+    def test_control_flow(self) -> None:
+        def true_fn(x, y):
+            return (x - y) + y
+
+        def false_fn(x, y):
+            return torch.mm(x - y, y) - y
+
+        class Module(torch.nn.Module):
+            def forward(self, x, y):
+                x = x + y
+                x = control_flow.cond(x[0][0] == 1, true_fn, false_fn, [x, y])
+                return x - y
+
+        expected = self.lower(Module())
+        with parallel_preprocess(2):
+            lowered = self.lower(Module())
+
+        self.assertEqual(len(lowered_modules(lowered.graph_module)), 3)
+        self.assertEqual(
+            lowered_modules(lowered.graph_module),
+            lowered_modules(expected.graph_module),
+        )
+        inputs = (torch.ones(2, 2), torch.ones(2, 2))
+        self.assertTrue(torch.allclose(lowered.module()(*inputs)[0], Module()(*inputs)))
+
+    def test_validates_once(self) -> None:
+        validate = ExportedProgram._validate
+        with patch.object(
+            ExportedProgram, "_validate", autospec=True, side_effect=validate
+        ) as mock_validate:
+            self.lower(ThreePartitions())
+            serial_count = mock_validate.call_count
+            mock_validate.reset_mock()
+            with parallel_preprocess(2):
+                self.lower(ThreePartitions())
+            parallel_count = mock_validate.call_count
+
+        # Once for all three partitions, instead of once per partition.
+        self.assertEqual(serial_count - parallel_count, 2)
+
+    def test_preprocess_cache(self) -> None:
+        with parallel_preprocess(2), preprocess_cache_enabled() as cache:
+            expected = self.lower(ThreePartitions())
+            lowered = self.lower(ThreePartitions())
+            self.export(ThreePartitions()).to_backend(AddMulPartitionerDemo())
+        self.assertEqual((cache.hits, cache.misses), (6, 3))
+        self.assertEqual(to_executorch(lowered), to_executorch(expected))
@@ -0,0 +1,195 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import tempfile
+import unittest
+from typing import List
+from unittest.mock import patch
+
+import torch
+from executorch.exir import to_edge
+from executorch.exir.backend.backend_api import (
+    MethodProgramsPartitionerSpec,
+    preprocess_cache_enabled,
+    to_backend,
+)
+from executorch.exir.backend.canonical_partitioners.all_node_partitioner import (
+    AllNodePartitioner,
+)
+from executorch.exir.backend.compile_spec_schema import CompileSpec
+from executorch.exir.backend.preprocess_cache import (
+    preprocess_cache_key,
+    PreprocessCache,
+)
+from executorch.exir.backend.test.backend_with_compiler_demo import (
+    BackendWithCompilerDemo,
+)
+from executorch.exir.backend.test.backend_with_preprocess_all_demo import (
+    FirstBackendWithPreprocessAll,
+)
+from executorch.exir.backend.test.op_partitioner_demo import AddMulPartitionerDemo
+from executorch.exir.lowered_backend_module import get_lowered_submodules
+from torch.export.exported_program import ExportedProgram
+
+
+class MatMulAdd(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.weight = torch.nn.Parameter(torch.ones(4, 4))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.mm(x, self.weight) + x
+
+
+def export(weight: float = 1.0) -> ExportedProgram:
+    model = MatMulAdd()
+    with torch.no_grad():
+        model.weight.fill_(weight)
+    return to_edge(torch.export.export(model, (torch.ones(2, 4),))).exported_program()
+
+
+def processed_bytes(edge_program: ExportedProgram) -> List[bytes]:
+    return [
+        lowered_module.processed_bytes
+        for _, lowered_module, _ in get_lowered_submodules(edge_program.graph_module)
+    ]
+
+
+class TestPreprocessCache(unittest.TestCase):
+    def test_key(self) -> None:
+        specs = [CompileSpec("max_value", bytes([4]))]
+        key = preprocess_cache_key(BackendWithCompilerDemo, export(), specs)
+        self.assertIsNotNone(key)
+        self.assertEqual(
+            preprocess_cache_key(BackendWithCompilerDemo, export(), specs), key
+        )
+        self.assertNotEqual(
+            preprocess_cache_key(BackendWithCompilerDemo, export(2.0), specs), key
+        )
+        self.assertNotEqual(
+            preprocess_cache_key(
+                BackendWithCompilerDemo,
+                export(),
+                [CompileSpec("max_value", bytes([5]))],
+            ),
+            key,
+        )
+        self.assertNotEqual(
+            preprocess_cache_key(FirstBackendWithPreprocessAll, export(), specs),
+            key,
+        )
+        self.assertNotEqual(
+            preprocess_cache_key(BackendWithCompilerDemo, export(), specs, "salt"),
+            key,
+        )
+
+    def test_key_includes_debug_handles(self) -> None:
+        # Backends may embed debug handles in their results, so a partition
+        # with other debug handles, like a repeated block, is not a hit.
+        specs = [CompileSpec("max_value", bytes([4]))]
+        edge_program = export()
+        key = preprocess_cache_key(BackendWithCompilerDemo, edge_program, specs)
+        for node in edge_program.graph.nodes:
+            if "debug_handle" in node.meta:
+                node.meta["debug_handle"] += 10
+        self.assertNotEqual(
+            preprocess_cache_key(BackendWithCompilerDemo, edge_program, specs), key
+        )
+
+    def test_to_backend(self) -> None:
+        specs = [CompileSpec("max_value", bytes([4]))]
+        expected = to_backend("BackendWithCompilerDemo", export(), specs)
+
+        with preprocess_cache_enabled() as cache:
+            lowered = to_backend("BackendWithCompilerDemo", export(), specs)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            with patch.object(
+                BackendWithCompilerDemo,
+                "preprocess",
+                side_effect=AssertionError("Not cached"),
+            ):
+                cached = to_backend("BackendWithCompilerDemo", export(), specs)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            to_backend("BackendWithCompilerDemo", export(2.0), specs)
+            to_backend(
+                "BackendWithCompilerDemo",
+                export(),
+                [CompileSpec("max_value", bytes([5]))],
+            )
+            self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+        self.assertEqual(lowered.processed_bytes, expected.processed_bytes)
+        self.assertEqual(cached.processed_bytes, expected.processed_bytes)
+        self.assertEqual(cached.meta, expected.meta)
+
+    def test_partitioner(self) -> None:
+        expected = processed_bytes(to_backend(export(), AddMulPartitionerDemo()))
+
+        with preprocess_cache_enabled() as cache:
+            self.assertEqual(
+                processed_bytes(to_backend(export(), AddMulPartitionerDemo())),
+                expected,
+            )
+            self.assertEqual(
+                processed_bytes(to_backend(export(), AddMulPartitionerDemo())),
+                expected,
+            )
+        self.assertEqual(cache.misses, len(expected))
+        self.assertEqual(cache.hits, len(expected))
+
+    def test_cache_dir(self) -> None:
+        specs = [CompileSpec("max_value", bytes([4]))]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with preprocess_cache_enabled(PreprocessCache(cache_dir)) as cache:
+                expected = to_backend("BackendWithCompilerDemo", export(), specs)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+            with preprocess_cache_enabled(PreprocessCache(cache_dir)) as cache:
+                lowered = to_backend("BackendWithCompilerDemo", export(), specs)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            self.assertEqual(lowered.processed_bytes, expected.processed_bytes)
+
+            with preprocess_cache_enabled(PreprocessCache(cache_dir, "v2")) as cache:
+                to_backend("BackendWithCompilerDemo", export(), specs)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_preprocess_multimethod(self) -> None:
+        class Sin(torch.nn.Module):
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return torch.sin(x)
+
+        class Add(torch.nn.Module):
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return x + x
+
+        def lower(backend_id: str) -> List[bytes]:
+            partitioner = AllNodePartitioner(
+                backend_id, [CompileSpec("max_value", bytes([3]))]
+            )
+            lowered = to_backend(
+                MethodProgramsPartitionerSpec(
+                    {
+                        "sin": to_edge(
+                            torch.export.export(Sin(), (torch.ones(1),))
+                        ).exported_program(),
+                        "add": to_edge(
+                            torch.export.export(Add(), (torch.ones(1),))
+                        ).exported_program(),
+                    },
+                    {"sin": partitioner, "add": partitioner},
+                )
+            )
+            return processed_bytes(lowered["sin"]) + processed_bytes(lowered["add"])
+
+        # BackendWithCompilerDemo results are cached per partition, and
+        # FirstBackendWithPreprocessAll results for all partitions together.
+        for backend_id in ["BackendWithCompilerDemo", "FirstBackendWithPreprocessAll"]:
+            expected = lower(backend_id)
+            with preprocess_cache_enabled() as cache:
+                self.assertEqual(lower(backend_id), expected)
+                self.assertEqual(lower(backend_id), expected)
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
@@ -105,3 +105,10 @@ class ExecutorchBackendConfig:
 
     # If set to true, we run quant fusion and constant propagation passes
     do_quant_fusion_and_const_prop: bool = False
+
+    # If set to true, the PTE file is not serialized when the
+    # ExecutorchProgramManager is constructed. Instead, each call to save() or
+    # write_to_file() lays out the file and writes every segment straight from
+    # its source data to the output, so the serialized file is never held in
+    # memory.
+    streaming_serialization: bool = False
@@ -29,7 +29,6 @@ their instructions.
 
 # pyre-strict
 import ctypes
-import hashlib
 import operator
 import typing
 import warnings
@@ -40,6 +39,7 @@ import executorch.exir.memory as memory
 import executorch.extension.pytree as ex_pytree
 import torch
 import torch.fx
+from executorch.exir._serialize._blob_index import BlobIndex, DigestCache
 from executorch.exir.delegate import executorch_call_delegate, is_lowered_module
 from executorch.exir.dialects.backend._ops import BackendOpOverload
 from executorch.exir.dialects.edge._ops import EdgeOpOverload
@@ -99,6 +99,17 @@ from torch.utils import _pytree as pytree
 from typing_extensions import TypeAlias
 
 
+def _storage_view(storage: torch.UntypedStorage) -> memoryview:
+    """Returns a read-only byte view of a CPU storage, without copying it. The view keeps the
+    storage alive and aliases it: in-place changes to the tensor show up in the Program and its
+    serialized output until it is written out. Copies and pickles of the Program hold bytes
+    instead, see schema.Buffer."""
+    array = (ctypes.c_char * storage.nbytes()).from_address(storage.data_ptr())
+    # pyre-ignore[16]: ctypes arrays accept arbitrary attributes.
+    array._storage = storage
+    return memoryview(array).cast("B").toreadonly()
+
+
 @dataclass
 class _ProgramState:
     """State shared between all methods of a program and the graph module it represents.
@@ -110,11 +121,13 @@ class _ProgramState:
     # Parallel list of specs and the buffers that backed them, have to add + 1 to any index in here
     # as index 0 in the constant_buffer is reserved.
     allocated_specs: List[TensorSpec] = field(default_factory=list)
+    # Hashes each constant and delegate payload at most once, shared by the indexes below.
+    digest_cache: DigestCache = field(default_factory=DigestCache)
     # Weights in any arbitrary graph_module only need to compare against weights from previously
-    # emitted graph modules, not any weights emitted from itself. This should speed up the lookup,
-    # from O(N) to O(1)
-    cached_spec_hash_values: Dict[str, int] = field(default_factory=dict)
-    cached_spec_mutable_hash_values: Dict[str, int] = field(default_factory=dict)
+    # emitted graph modules, not any weights emitted from itself. Maps each unique constant to its
+    # index in constant_buffer (or mutable_buffer), without hashing most of them in full.
+    cached_spec_hash_values: BlobIndex[int] = field(default_factory=BlobIndex)
+    cached_spec_mutable_hash_values: BlobIndex[int] = field(default_factory=BlobIndex)
     # The 0 index is reserved to be pointed to by non-constant tensors, so add an empty placeholder.
     constant_buffer: List[Buffer] = field(default_factory=lambda: [Buffer(storage=b"")])
     # The 0 index is reserved to be pointed to by non-constant tensors, so add an empty placeholder.
@@ -127,12 +140,22 @@ class _ProgramState:
 
     # Constants are optionally stored in external files.
     # Aggregate unique external constants into one buffer.
-    external_constant_buffer: List[bytes] = field(default_factory=list)
-    external_constant_hash: Dict[str, int] = field(default_factory=dict)
+    external_constant_buffer: List[Union[bytes, memoryview]] = field(
+        default_factory=list
+    )
+    external_constant_hash: BlobIndex[int] = field(default_factory=BlobIndex)
     # Each constant_tag groups a set of constants together.
     # {constant_tag: {fqn: index into external_constant_buffer}}
     external_constant_map: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        for index in (
+            self.cached_spec_hash_values,
+            self.cached_spec_mutable_hash_values,
+            self.external_constant_hash,
+        ):
+            index.digest_cache = self.digest_cache
+
 
 @dataclass
 class _EmitterState:
@@ -375,8 +398,7 @@ class _Emitter(torch.fx.Interpreter):
     def _save_new_const_tensor(
         self,
         spec: TensorSpec,
-        buffer_data: bytes,
-        hashed: str,
+        buffer_data: Union[bytes, memoryview],
         allocation_info: Optional[AllocationDetails] = None,
         constant_tag: Optional[str] = None,
     ) -> int:
@@ -401,7 +423,9 @@ class _Emitter(torch.fx.Interpreter):
             # We will need to create 2 segments in that case, but it'll be a bit until we see this case. LLM finetuning will probably require this.
 
             buffer_idx = len(self.program_state.external_constant_buffer)
-            self.program_state.external_constant_hash[hashed] = buffer_idx
+            self.program_state.external_constant_hash.add(
+                buffer_data, buffer_idx, spec.dtype
+            )
             self.program_state.external_constant_buffer.append(buffer_data)
             if constant_tag not in self.program_state.external_constant_map:
                 self.program_state.external_constant_map[constant_tag] = {}
@@ -411,12 +435,16 @@ class _Emitter(torch.fx.Interpreter):
         # Tensor is mutable with initial state. Place into mutable segment
         elif allocation_info:
             buffer_idx = len(self.program_state.mutable_buffer)
-            self.program_state.cached_spec_mutable_hash_values[hashed] = buffer_idx
+            self.program_state.cached_spec_mutable_hash_values.add(
+                buffer_data, buffer_idx, spec.dtype
+            )
             self.program_state.mutable_buffer.append(buffer)
         # Tensor is stored in the PTE file.
         else:
             buffer_idx = len(self.program_state.constant_buffer)
-            self.program_state.cached_spec_hash_values[hashed] = buffer_idx
+            self.program_state.cached_spec_hash_values.add(
+                buffer_data, buffer_idx, spec.dtype
+            )
             self.program_state.constant_buffer.append(buffer)
 
         return buffer_idx
@@ -440,39 +468,30 @@ class _Emitter(torch.fx.Interpreter):
         if spec.const:
             # Tensor with a blob we need to serialize. May not actually be constant at runtime
             # if it's a weight with an associated gradient.
-            spec_array_type = (
-                ctypes.c_char * typing.cast(torch.UntypedStorage, spec.storage).nbytes()
-            )
-
+            # A view of the storage rather than a copy; it is only copied when the program is
+            # written out.
             buffer_data = (
-                bytes(
-                    ctypes.cast(
-                        typing.cast(torch.UntypedStorage, spec.storage).data_ptr(),
-                        ctypes.POINTER(spec_array_type),
-                    ).contents
-                )
+                _storage_view(typing.cast(torch.UntypedStorage, spec.storage))
                 if spec.allocated_memory != 0
                 else b""
             )
 
-            hashed = hashlib.sha256(buffer_data).hexdigest()
-
             if allocation_info and spec.extra_tensor_info is None:
-                buffer_idx = self.program_state.cached_spec_mutable_hash_values.get(
-                    hashed, -1
-                )
+                constant_index = self.program_state.cached_spec_mutable_hash_values
             elif (
                 spec.extra_tensor_info is not None
                 and spec.extra_tensor_info.location == TensorDataLocation.EXTERNAL
             ):
-                buffer_idx = self.program_state.external_constant_hash.get(hashed, -1)
+                constant_index = self.program_state.external_constant_hash
             else:
-                buffer_idx = self.program_state.cached_spec_hash_values.get(hashed, -1)
+                constant_index = self.program_state.cached_spec_hash_values
+            cached_idx = constant_index.get(buffer_data, spec.dtype)
+            buffer_idx = -1 if cached_idx is None else cached_idx
 
             # Haven't seen this constant before.
             if buffer_idx == -1:
                 buffer_idx = self._save_new_const_tensor(
-                    spec, buffer_data, hashed, allocation_info, constant_tag
+                    spec, buffer_data, allocation_info, constant_tag
                 )
 
             if spec.const and spec.nbytes() != len(buffer_data):
@@ -1085,7 +1104,7 @@ class _Emitter(torch.fx.Interpreter):
         """Emit the delegates inputs and outputs as specified by the schema, then emit the
         delegate's blob."""
         processed_bytes = lowered_module.processed_bytes
-        hashed = hashlib.sha256(processed_bytes).hexdigest()
+        hashed = self.program_state.digest_cache.digest(processed_bytes).hex()
         delegate_index = self.emitter_state.delegate_cache.get(hashed)
         delegate_ret = None
 
@@ -1124,7 +1143,6 @@ class _Emitter(torch.fx.Interpreter):
         if delegate_index is None:
             # Allocate an entry for the data. TODO(T150113674): Reuse any duplicate entries if
             # present.
-            hashed = hashlib.sha256(processed_bytes).hexdigest()
             data_index: Optional[int] = (
                 self.program_state.backend_delegate_data_cache.get(hashed)
             )
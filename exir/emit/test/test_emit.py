@@ -6,6 +6,7 @@
 
 # pyre-unsafe
 
+import pickle
 import typing
 import unittest
 from contextlib import contextmanager
@@ -1057,6 +1058,48 @@ class TestEmit(unittest.TestCase):
             program_sigmoid._emitter_output.program.execution_plan[0],
         )
 
+    def test_emit_constants_without_copying(self) -> None:
+        class TwoLinears(torch.nn.Module):
+            def __init__(self) -> None:
+                super().__init__()
+                self.first = torch.nn.Linear(64, 64)
+                self.second = torch.nn.Linear(64, 64)
+                # Equal but distinct weights are deduplicated.
+                with torch.no_grad():
+                    self.second.weight.copy_(self.first.weight)
+
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return self.second(self.first(x))
+
+        model = TwoLinears()
+        program_manager = to_edge(
+            export(model, (torch.ones(1, 64),), strict=True)
+        ).to_executorch()
+        program = program_manager._emitter_output.program
+
+        # reserved spot, shared weight, two biases
+        self.assertEqual(len(program.constant_buffer), 4)
+        weight = program.constant_buffer[1].storage
+        # Constants are views of the tensor storage rather than copies.
+        self.assertIsInstance(weight, memoryview)
+        self.assertEqual(bytes(weight), model.first.weight.detach().numpy().tobytes())
+
+        # The serialized program holds the same data.
+        deserialized = deserialize_pte_binary(program_manager.buffer)
+        self.assertEqual(
+            [bytes(buffer.storage) for buffer in deserialized.constant_buffer],
+            [bytes(buffer.storage) for buffer in program.constant_buffer],
+        )
+
+        # Copies and pickles of the program hold a snapshot of the constants.
+        expected = bytes(weight)
+        copied = deepcopy(program)
+        pickled = pickle.dumps(program)
+        with torch.no_grad():
+            model.first.weight.add_(1.0)
+        self.assertEqual(copied.constant_buffer[1].storage, expected)
+        self.assertEqual(pickle.loads(pickled).constant_buffer[1].storage, expected)
+
     def test_emit_weight_deduplication(self) -> None:
         class SimpleLinear(torch.nn.Module):
             def __init__(self) -> None:
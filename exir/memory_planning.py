@@ -6,10 +6,13 @@
 
 # pyre-strict
 
+import bisect
 import functools
 import itertools
 import logging
 import operator
+import random
+import time
 import typing
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -22,7 +25,7 @@ from executorch.exir.delegate import executorch_call_delegate
 from executorch.exir.error import internal_assert, InternalError
 from executorch.exir.operator.convert import is_inplace_variant, is_out_variant
 from executorch.exir.schema import TensorShapeDynamism
-from executorch.exir.tensor import TensorSpec
+from executorch.exir.tensor import calculate_aligned_num_bytes, TensorSpec
 
 from torch import fx
 from torch.export.exported_program import ExportGraphSignature, InputKind
@@ -505,6 +508,93 @@ class AllocationSpec:
     spec: TensorSpec
 
 
+class _LifetimeIndex:
+    r"""
+    Sparse segment tree over lifetime indices. Each added range combines a
+    value into every index in the range; a query combines the values at every
+    index in a range. `combine` must be associative, commutative, idempotent
+    and have 0 as identity: max() for non-negative values, or bitwise or for
+    sets stored as bitmasks. Both operations take O(log T) combines, where T
+    is the largest lifetime index.
+    """
+
+    def __init__(self, combine: Callable[[int, int], int]) -> None:
+        self.combine = combine
+        # Number of leaves; a power of two larger than every indexed lifetime.
+        self.num_leaves: int = 1
+        # Combined value of every range that intersects each node's range.
+        self.subtree: Dict[int, int] = {}
+        # Combined value of every range that covers each node's whole range.
+        self.tag: Dict[int, int] = {}
+        # Every range added, for re-indexing when the tree grows.
+        self.ranges: List[Tuple[int, int, int]] = []
+
+    def add(self, start: int, end: int, value: int) -> None:
+        """Combines `value` into every index in the inclusive range [start, end]."""
+        self.ranges.append((start, end, value))
+        if end < self.num_leaves:
+            self._add(start, end, value)
+            return
+        while self.num_leaves <= end:
+            self.num_leaves *= 2
+        self.subtree, self.tag = {}, {}
+        for range_start, range_end, range_value in self.ranges:
+            self._add(range_start, range_end, range_value)
+
+    def _add(self, start: int, end: int, value: int) -> None:
+        combine, subtree, tag = self.combine, self.subtree, self.tag
+        lo = start + self.num_leaves
+        hi = end + 1 + self.num_leaves
+        first, last = lo >> 1, (hi - 1) >> 1
+        while lo < hi:
+            if lo & 1:
+                subtree[lo] = combine(subtree.get(lo, 0), value)
+                tag[lo] = combine(tag.get(lo, 0), value)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                subtree[hi] = combine(subtree.get(hi, 0), value)
+                tag[hi] = combine(tag.get(hi, 0), value)
+            lo >>= 1
+            hi >>= 1
+        # Values only ever grow, so ancestors can combine the new value
+        # directly instead of recomputing from their children.
+        for node in (first, last):
+            while node:
+                subtree[node] = combine(subtree.get(node, 0), value)
+                node >>= 1
+
+    def query(self, start: int, end: int) -> int:
+        """Returns the combined value of every index in [start, end]."""
+        end = min(end, self.num_leaves - 1)
+        if start > end:
+            return 0
+        combine, subtree, tag = self.combine, self.subtree, self.tag
+        result = 0
+        lo = start + self.num_leaves
+        hi = end + 1 + self.num_leaves
+        first, last = lo >> 1, (hi - 1) >> 1
+        while lo < hi:
+            if lo & 1:
+                result = combine(result, subtree.get(lo, 0))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                result = combine(result, subtree.get(hi, 0))
+            lo >>= 1
+            hi >>= 1
+        # Ranges that cover an ancestor of the queried nodes also cover the
+        # queried range. The two ancestor paths merge at a common ancestor.
+        while first != last:
+            result = combine(result, combine(tag.get(first, 0), tag.get(last, 0)))
+            first >>= 1
+            last >>= 1
+        while first:
+            result = combine(result, tag.get(first, 0))
+            first >>= 1
+        return result
+
+
 @dataclass
 class SharedObject:
     r"""
@@ -599,6 +689,90 @@ def _find_max_overlapping_allocations_offset(
     return max_offset
 
 
+class _SharedObjectPool:
+    r"""
+    The shared objects of one memory hierarchy, indexed by the lifetimes of
+    their allocations so that pick_shared_obj() does not need to scan every
+    allocation of every shared object:
+
+    - `busy` maps each lifetime index to the set of shared objects (as a bitmask
+      of SharedObject.idx) with an allocation live at that index.
+    - `full` does the same for allocations that reach the end of their shared
+      object, which leave no room above them for any later allocation.
+    - `max_end` holds, per shared object, the largest end offset (plus one) of
+      its allocations live at each lifetime index.
+    """
+
+    def __init__(self, shared_objects: List[SharedObject]) -> None:
+        self.shared_objects = shared_objects
+        self.busy = _LifetimeIndex(operator.or_)
+        self.full = _LifetimeIndex(operator.or_)
+        self.max_end: List[_LifetimeIndex] = []
+        for sobj in shared_objects:
+            for alloc in sobj.allocations:
+                self._index(sobj, alloc.offset, alloc.spec)
+
+    def _index(self, sobj: SharedObject, offset: int, spec: TensorSpec) -> None:
+        start, end = spec.lifetime
+        while len(self.max_end) <= sobj.idx:
+            self.max_end.append(_LifetimeIndex(max))
+        bit = 1 << sobj.idx
+        alloc_end = offset + spec.allocated_memory
+        self.busy.add(start, end, bit)
+        if alloc_end >= sobj.size:
+            self.full.add(start, end, bit)
+        # Stored plus one, so that zero-sized allocations at offset 0 are
+        # distinguishable from no allocation.
+        self.max_end[sobj.idx].add(start, end, alloc_end + 1)
+
+    def pick(
+        self, spec: TensorSpec, allow_overlapping_allocations: bool
+    ) -> SharedObject:
+        shared_objects = self.shared_objects
+        size = spec.allocated_memory
+        start, end = spec.lifetime
+        busy = self.busy.query(start, end)
+
+        picked = None
+        offset = 0
+        # The first shared object without an allocation live during spec's
+        # lifetime is the lowest zero bit of `busy`.
+        first_free = ((busy + 1) & ~busy).bit_length() - 1
+        if first_free < len(shared_objects):
+            picked = shared_objects[first_free]
+            assert picked.size >= size, "Allocation specs are not sorted"
+        elif allow_overlapping_allocations:
+            candidates = busy
+            if size > 0:
+                candidates &= ~self.full.query(start, end)
+            # Visit candidates in order of idx, like a scan over the list.
+            while candidates:
+                lowest = candidates & -candidates
+                candidates ^= lowest
+                sobj = shared_objects[lowest.bit_length() - 1]
+                max_offset = self.max_end[sobj.idx].query(start, end) - 1
+                if max_offset > 0 and max_offset + size <= sobj.size:
+                    picked = sobj
+                    offset = max_offset
+                    break
+
+        if picked is None:
+            picked = SharedObject(
+                len(shared_objects),
+                -1,
+                size,
+                start,
+                end,
+            )
+            shared_objects.append(picked)
+
+        picked.first_used_index = min(picked.first_used_index, start)
+        picked.last_used_index = max(picked.last_used_index, end)
+        picked.allocations.append(AllocationSpec(offset, spec))
+        self._index(picked, offset, spec)
+        return picked
+
+
 def pick_shared_obj(
     shared_objects: List[SharedObject],
     spec: TensorSpec,
@@ -654,45 +828,12 @@ def pick_shared_obj(
     - All the allocations within a bucket follow this:
       - Span, defined by allocation's offset + size, of two allocations can only overlap,
         if their timelines do not overlap.
-    """
-    picked = None
-    for sobj in shared_objects:
-        if _does_not_overlap(sobj, spec):
-            assert sobj.size >= spec.allocated_memory, "Allocation specs are not sorted"
-            picked = sobj
-            sobj.first_used_index = min(sobj.first_used_index, spec.lifetime[0])
-            sobj.last_used_index = max(sobj.last_used_index, spec.lifetime[1])
-            allocation_spec = AllocationSpec(0, spec)
-            picked.allocations.append(allocation_spec)
-            break
-
-    if picked is None and allow_overlapping_allocations:
-        for sobj in shared_objects:
-            max_offset = _find_max_overlapping_allocations_offset(sobj, spec)
-            if max_offset > 0:
-                if max_offset + spec.allocated_memory <= sobj.size:
-                    picked = sobj
-                    sobj.first_used_index = min(sobj.first_used_index, spec.lifetime[0])
-                    sobj.last_used_index = max(sobj.last_used_index, spec.lifetime[1])
-                    allocation_spec = AllocationSpec(max_offset, spec)
-                    picked.allocations.append(allocation_spec)
-                    break
 
-    if picked is None:
-        picked = SharedObject(
-            len(shared_objects),
-            -1,
-            spec.allocated_memory,
-            spec.lifetime[0],
-            spec.lifetime[1],
-        )
-        allocation_spec = AllocationSpec(0, spec)
-        picked.allocations.append(allocation_spec)
-        picked.first_used_index = spec.lifetime[0]
-        picked.last_used_index = spec.lifetime[1]
-        shared_objects.append(picked)
-
-    return picked
+    greedy() keeps a _SharedObjectPool per memory hierarchy across calls, so that
+    the overlap checks query lifetime indexes instead of scanning every prior
+    allocation. Calling this function directly indexes `shared_objects` first.
+    """
+    return _SharedObjectPool(shared_objects).pick(spec, allow_overlapping_allocations)
 
 
 def get_node_tensor_specs(
@@ -766,16 +907,12 @@ def greedy(
     greedy_result = MemoryAlgoResult({}, [])
     spec2obj = {}
     shared_objects = defaultdict(list)
+    pools: Dict[int, _SharedObjectPool] = {}
 
     # For each tensor, pick the available shared object with closest size to
     # the tensor. If there are no available shared object left, create a new
-    # one.
-    import bisect
-
-    sorted_specs = []
-    for spec in specs:
-        bisect.insort(sorted_specs, spec, key=lambda x: x.allocated_memory)
-
+    # one. Sorting is stable, so equally-sized specs keep their relative order.
+    sorted_specs = sorted(specs, key=lambda x: x.allocated_memory)
     sorted_specs.reverse()
 
     for spec in sorted_specs:
@@ -788,11 +925,10 @@ def greedy(
             spec_alloc_result.mem_id = spec.mem_id
         greedy_result.spec_dict[spec] = spec_alloc_result
         spec.realign(alignment)
-        spec2obj[spec] = pick_shared_obj(
-            shared_objects[spec_alloc_result.mem_id],
-            spec,
-            allow_overlapping_allocations,
-        )
+        mem_id = spec_alloc_result.mem_id
+        if mem_id not in pools:
+            pools[mem_id] = _SharedObjectPool(shared_objects[mem_id])
+        spec2obj[spec] = pools[mem_id].pick(spec, allow_overlapping_allocations)
 
     if len(shared_objects) == 0:
         # Cannot find any tensor in the graph that needs to be allocated.
@@ -834,6 +970,286 @@ def greedy(
     return greedy_result
 
 
+def _prepare_offset_specs(
+    alignment: int, specs: Iterable[TensorSpec]
+) -> Tuple[MemoryAlgoResult, Dict[int, List[TensorSpec]]]:
+    r"""
+    Creates the result entry of each spec and groups the specs by memory
+    hierarchy, from largest to smallest.
+    """
+    result = MemoryAlgoResult({}, [])
+    specs_by_mem_id: Dict[int, List[TensorSpec]] = defaultdict(list)
+    sorted_specs = sorted(specs, key=lambda x: x.allocated_memory)
+    sorted_specs.reverse()
+    for spec in sorted_specs:
+        spec_alloc_result = result.spec_dict.get(spec, SpecAllocResult(0, 0, 0))
+        if spec.mem_id is None:
+            spec_alloc_result.mem_id = 1
+        else:
+            spec_alloc_result.mem_id = spec.mem_id
+        result.spec_dict[spec] = spec_alloc_result
+        spec.realign(alignment)
+        specs_by_mem_id[spec_alloc_result.mem_id].append(spec)
+    return result, specs_by_mem_id
+
+
+def _place_at_offsets(
+    specs: List[TensorSpec],
+    alignment: int,
+    bound: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Optional[Tuple[Dict[TensorSpec, int], int]]:
+    r"""
+    Places `specs` in order in a single arena, each in the smallest gap between
+    the already placed specs with an overlapping lifetime that fits it, or above
+    all of them if none does.
+
+    Returns the offset of each spec and the arena size, or None as soon as the
+    arena grows beyond `bound` or time.monotonic() passes `deadline`.
+    """
+    # Placed specs as (offset, end offset, first used index, last used index),
+    # sorted by offset.
+    placed: List[Tuple[int, int, int, int]] = []
+    offsets: Dict[TensorSpec, int] = {}
+    peak = 0
+    for spec in specs:
+        # Placing a spec scans all the placed ones, so a single placement of a
+        # large graph can take long enough to overrun the deadline on its own.
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        size = spec.allocated_memory
+        start, end = spec.lifetime
+        prev_end, offset, smallest_gap = 0, None, None
+        for alloc_offset, alloc_end, alloc_start_idx, alloc_end_idx in placed:
+            if alloc_start_idx > end or alloc_end_idx < start:
+                continue
+            gap = alloc_offset - prev_end
+            if gap >= size and (smallest_gap is None or gap < smallest_gap):
+                smallest_gap = gap
+                offset = prev_end
+            prev_end = max(prev_end, calculate_aligned_num_bytes(alloc_end, alignment))
+        if offset is None:
+            offset = prev_end
+        peak = max(peak, offset + size)
+        if bound is not None and peak > bound:
+            return None
+        bisect.insort(placed, (offset, offset + size, start, end))
+        offsets[spec] = offset
+    return offsets, peak
+
+
+def _materialize_offsets(
+    result: MemoryAlgoResult,
+    offsets: Dict[TensorSpec, int],
+    peaks: Dict[int, int],
+    graph_module: torch.fx.GraphModule,
+    extra_padding: int,
+) -> None:
+    r"""
+    Fills in the offsets, memory object ids and buffer sizes of `result`, given
+    the offset of each spec and the arena size of each memory hierarchy. Each
+    memory hierarchy is a single arena placed past the buffers of the graph
+    inputs, and the specs whose storage overlaps, directly or through other
+    specs, form one memory object.
+    """
+    if len(peaks) == 0:
+        # Cannot find any tensor in the graph that needs to be allocated.
+        # Return [0, 0] to be consistent with default behavior of naive.
+        result.bufsizes = [0, 0]
+        return
+    input_bufsizes = getattr(graph_module, "input_mem_buffer_sizes", None) or []
+    input_total_sizes = [
+        input_bufsizes[mem_id] if len(input_bufsizes) > mem_id else 0
+        for mem_id in range(max(peaks.keys()) + 1)
+    ]
+    result.bufsizes = [0] * len(input_total_sizes)
+    for mem_id, peak in peaks.items():
+        result.bufsizes[mem_id] = input_total_sizes[mem_id] + peak + extra_padding
+    for spec, offset in offsets.items():
+        spec_alloc_result = result.spec_dict[spec]
+        spec_alloc_result.mem_offset = input_total_sizes[spec_alloc_result.mem_id]
+        spec_alloc_result.mem_offset += offset
+
+    mem_obj_id = -1
+    allocs_by_mem_id: Dict[int, List[Tuple[int, int, TensorSpec]]] = defaultdict(list)
+    for spec, offset in offsets.items():
+        allocs_by_mem_id[result.spec_dict[spec].mem_id].append(
+            (offset, offset + spec.allocated_memory, spec)
+        )
+    for _, allocs in sorted(allocs_by_mem_id.items(), key=lambda item: item[0]):
+        obj_end = None
+        for start, end, spec in sorted(allocs, key=lambda alloc: alloc[:2]):
+            if obj_end is None or start >= obj_end:
+                mem_obj_id += 1
+                obj_end = end
+            obj_end = max(obj_end, end)
+            result.spec_dict[spec].mem_obj_id = mem_obj_id
+
+
+def greedy_by_size_for_offset_calculation(
+    alignment: int,
+    specs: Set[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    graph_signature: ExportGraphSignature,
+    extra_padding: int = 0,
+) -> MemoryAlgoResult:
+    r"""Greedy by size algorithm for offset calculation, from
+    arxiv.org/pdf/2001.03288.pdf (as used by TFLite's arena planner).
+
+    Unlike greedy(), which groups tensors into shared objects of a fixed size,
+    each memory hierarchy is a single arena: tensors are placed from largest to
+    smallest, each in the smallest gap between the tensors with an overlapping
+    lifetime that fits it, or above all of them if none does. This fragments
+    less when tensor sizes vary widely, e.g. KV caches alongside small norms.
+
+    Args:
+        alignment: Memory alignment requirement
+        specs: Set of TensorSpec objects with updated lifetimes
+        graph_module: Graph module
+        graph_signature: Graph signature
+        extra_padding: Additional padding to add to each memory buffer (in bytes)
+
+    Returns:
+        MemoryAlgoResult containing the allocation decisions
+    """
+    result, specs_by_mem_id = _prepare_offset_specs(alignment, specs)
+    offsets: Dict[TensorSpec, int] = {}
+    peaks: Dict[int, int] = {}
+    for mem_id, mem_specs in specs_by_mem_id.items():
+        placement = _place_at_offsets(mem_specs, alignment)
+        assert placement is not None
+        mem_offsets, peaks[mem_id] = placement
+        offsets.update(mem_offsets)
+    _materialize_offsets(result, offsets, peaks, graph_module, extra_padding)
+
+    logging.debug(
+        f"greedy by size for offset calculation returns bufsizes: {result.bufsizes}"
+    )
+    return result
+
+
+def _peak_live_memory(specs: List[TensorSpec]) -> int:
+    r"""
+    Returns the largest total size of the specs live at any lifetime index, a
+    lower bound on the arena size of any placement of `specs`.
+    """
+    events: Dict[int, int] = defaultdict(int)
+    for spec in specs:
+        events[spec.lifetime[0]] += spec.allocated_memory
+        events[spec.lifetime[1] + 1] -= spec.allocated_memory
+    live, peak = 0, 0
+    for idx in sorted(events):
+        live += events[idx]
+        peak = max(peak, live)
+    return peak
+
+
+def bounded_search(
+    alignment: int,
+    specs: Set[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    graph_signature: ExportGraphSignature,
+    extra_padding: int = 0,
+    *,
+    time_budget_s: float = 10.0,
+    max_iterations: Optional[int] = None,
+    seed: int = 0,
+) -> MemoryAlgoResult:
+    r"""Searches for a smaller offset assignment within a time budget.
+
+    Offset assignment is a 2D packing problem: each tensor is a rectangle
+    spanning its lifetime on one axis and its size on the other, and the arena
+    size is the height of the packing. Starting from the placement of
+    greedy_by_size_for_offset_calculation(), this runs a local search over the
+    order in which tensors are placed by it: each step moves one tensor
+    earlier in the order and keeps the new order if it packs no higher. A
+    placement is abandoned as soon as it grows beyond the current one, and the
+    search of a memory hierarchy stops early once it reaches the largest total
+    size of the tensors live at once, which no placement can beat. The result is
+    never larger than the one of greedy() or greedy_by_size_for_offset_calculation(),
+    however soon the budget runs out.
+
+    This trades compile time for memory, so it is not part of the default
+    MemoryPlanningAlgorithmSuite; add it with functools.partial to configure the
+    budget, e.g. `partial(bounded_search, time_budget_s=120)`.
+
+    Args:
+        alignment: Memory alignment requirement
+        specs: Set of TensorSpec objects with updated lifetimes
+        graph_module: Graph module
+        graph_signature: Graph signature
+        extra_padding: Additional padding to add to each memory buffer (in bytes)
+        time_budget_s: Wall clock budget of the search, in seconds, not counting
+            the heuristic placements it starts from. Each memory hierarchy gets an
+            even share of what is left when its search starts, so the time a
+            hierarchy does not use goes to the next ones
+        max_iterations: Optional limit on the number of orders tried per memory
+            hierarchy, for reproducible results regardless of machine speed
+        seed: Seed of the random moves
+
+    Returns:
+        MemoryAlgoResult containing the best allocation decisions found
+    """
+    specs = list(specs)
+    heuristic_results = [
+        greedy(alignment, specs, graph_module, graph_signature, extra_padding),
+        greedy_by_size_for_offset_calculation(
+            alignment, specs, graph_module, graph_signature, extra_padding
+        ),
+    ]
+    result, specs_by_mem_id = _prepare_offset_specs(alignment, specs)
+    rng = random.Random(seed)
+
+    offsets: Dict[TensorSpec, int] = {}
+    peaks: Dict[int, int] = {}
+    search_deadline = time.monotonic() + time_budget_s
+    for num_searched, (mem_id, order) in enumerate(specs_by_mem_id.items()):
+        # Start from the greedy by size placement, of the specs from largest to
+        # smallest.
+        placement = _place_at_offsets(order, alignment)
+        assert placement is not None
+        best_offsets, best_peak = placement
+        now = time.monotonic()
+        deadline = now + max(0.0, search_deadline - now) / (
+            len(specs_by_mem_id) - num_searched
+        )
+        current_peak = best_peak
+        lower_bound = _peak_live_memory(order)
+        iterations = 0
+        while (
+            best_peak > lower_bound
+            and len(order) > 1
+            and (max_iterations is None or iterations < max_iterations)
+            and time.monotonic() < deadline
+        ):
+            iterations += 1
+            src = rng.randrange(1, len(order))
+            dst = rng.randrange(src)
+            candidate = order[:dst] + [order[src]] + order[dst:src] + order[src + 1 :]
+            placement = _place_at_offsets(
+                candidate, alignment, bound=current_peak, deadline=deadline
+            )
+            if placement is None:
+                continue
+            order, current_peak = candidate, placement[1]
+            if current_peak < best_peak:
+                best_offsets, best_peak = placement
+        offsets.update(best_offsets)
+        peaks[mem_id] = best_peak
+    _materialize_offsets(result, offsets, peaks, graph_module, extra_padding)
+
+    # Keep the heuristic allocation of the memory hierarchies it packs smaller.
+    for heuristic_result in heuristic_results:
+        for mem_id, bufsize in enumerate(heuristic_result.bufsizes):
+            if mem_id in peaks and bufsize < result.bufsizes[mem_id]:
+                result.bufsizes[mem_id] = bufsize
+                for spec in specs_by_mem_id[mem_id]:
+                    result.spec_dict[spec] = heuristic_result.spec_dict[spec]
+
+    logging.debug(f"bounded search returns bufsizes: {result.bufsizes}")
+    return result
+
+
 class MemoryPlanningAlgorithmSuite:
     def __init__(
         self,
@@ -896,6 +1312,14 @@ class MemoryPlanningAlgorithmSuite:
             == 1
         ), "Different memory planning algorithms should have the same number of buffers allocated."
 
+        logging.debug(
+            "Memory planning algorithm totals: "
+            + ", ".join(
+                f"{name}: {sum(mem_algo_result.bufsizes)}"
+                for name, mem_algo_result in mem_algo_results.items()
+            )
+        )
+
         # Find the algorithm that minimizes the total memory usage.
         best_algo = min(
             mem_algo_results, key=lambda k: sum(mem_algo_results[k].bufsizes)
@@ -1051,6 +1475,43 @@ def insert_calls_to_free(
     graph_module.recompile()
 
 
+def _control_flow_outputs_end(node: torch.fx.Node, node_idx: int) -> int:
+    r"""
+    Returns the last index at which an output of the control flow `node`, or of
+    the getitem nodes unpacking them, is used.
+    """
+    end = node_idx
+    for output_node in [node] + [
+        user for user in node.users if user.target is operator.getitem
+    ]:
+        for spec in tree_flatten(output_node.meta.get("spec"))[0]:
+            if isinstance(spec, TensorSpec) and spec.lifetime[1] is not None:
+                end = max(end, spec.lifetime[1])
+    return end
+
+
+def _buffer_ends_live_at(
+    specs: Iterable[TensorSpec], start_idx: int, end_idx: int, num_buffers: int
+) -> List[int]:
+    r"""
+    Returns, for each memory buffer, the end of the highest planned tensor that
+    is live at any index from `start_idx` to `end_idx`. The space above it is
+    free over that whole range.
+    """
+    ends = [0] * num_buffers
+    for spec in specs:
+        if spec.mem_id is None or spec.mem_offset is None:
+            continue
+        if spec.lifetime[1] < start_idx or spec.lifetime[0] > end_idx:
+            continue
+        if spec.mem_id >= len(ends):
+            ends.extend([0] * (spec.mem_id - len(ends) + 1))
+        ends[spec.mem_id] = max(
+            ends[spec.mem_id], spec.mem_offset + spec.allocated_memory
+        )
+    return ends
+
+
 def apply_algo(
     algo: Callable[
         ...,
@@ -1066,26 +1527,29 @@ def apply_algo(
     """
     Recursively apply algo to graph_module and its submodules for control flow.
 
-    Quite naively right now since it does not take the following optimizations
-    into considerating:
-    1. for conditional structure, true branch and false true does not overlap
-       in lifetime and can share tensor storage
-    2. tensors inside a submodule (e.g. true branch) has opportunities to share
-       storage with tensors in the outer module.
-    TODO: make these optimizations once we have some baseline working.
+    The tensors of a submodule are placed above the outer module's tensors that
+    are live from its control flow node until the last use of that node's
+    outputs, reusing the space of the others. The whole range is reserved
+    because the emitter moves the submodule's outputs into the control flow
+    node's outputs, which alias their storage after the node runs. The true and
+    false branches of a conditional never run together, so both start from the
+    same offsets and share storage.
     """
     # Extract the nodes and their lifespans from the graph_module
     # Difficult to just filter the list of specs returned by this due to
     # how we flag trainable weights.
     _ = update_all_tensors_lifetime(graph_module, graph_signature)
-    # Filter specs based on alloc_graph_input and alloc_graph_output
-    specs = collect_specs_from_nodes(
-        graph_module.graph.nodes,
-        graph_signature,
-        do_assertion=False,
-        ignore_graph_input=not alloc_graph_input,
-        ignore_graph_output=not alloc_graph_output,
-        ignore_mutable_buffers=not alloc_mutable_buffers,
+    # Filter specs based on alloc_graph_input and alloc_graph_output. Keep them
+    # in a list, since every algorithm of a suite iterates over them.
+    specs = list(
+        collect_specs_from_nodes(
+            graph_module.graph.nodes,
+            graph_signature,
+            do_assertion=False,
+            ignore_graph_input=not alloc_graph_input,
+            ignore_graph_output=not alloc_graph_output,
+            ignore_mutable_buffers=not alloc_mutable_buffers,
+        )
     )
 
     # Get extra padding for XNNPACK if needed
@@ -1102,19 +1566,42 @@ def apply_algo(
         extra_padding,
     )
 
+    # Find the free space at each control flow node before inserting calls to
+    # free, which shifts the node indices the lifetimes refer to.
+    control_flow_nodes = set(
+        itertools.chain(
+            get_cond_nodes(graph_module),
+            get_while_nodes(graph_module),
+            get_map_nodes(graph_module),
+        )
+    )
+    free_space_starts = {
+        node: _buffer_ends_live_at(
+            specs,
+            node_idx,
+            _control_flow_outputs_end(node, node_idx),
+            len(bufsizes),
+        )
+        for node_idx, node in enumerate(graph_module.graph.nodes)
+        if node in control_flow_nodes
+    }
+
     insert_calls_to_free(graph_module, set(specs))
 
+    total_bufsizes = list(bufsizes)
+
     def handle_submodule(
-        submodule_nd: torch.fx.Node, alloc_graph_input: bool = False
-    ) -> None:
-        nonlocal bufsizes
+        submodule_nd: torch.fx.Node,
+        input_mem_buffer_sizes: List[int],
+        alloc_graph_input: bool = False,
+    ) -> List[int]:
         assert submodule_nd.op == "get_attr"
         submodule = getattr(graph_module, submodule_nd.target)
         # memory planning for submodule need to be aware of the amount of
         # buffer already allocated.
-        submodule.input_mem_buffer_sizes = bufsizes
+        submodule.input_mem_buffer_sizes = list(input_mem_buffer_sizes)
 
-        bufsizes = apply_algo(
+        submodule_bufsizes = apply_algo(
             algo,
             submodule,
             alignment,
@@ -1122,21 +1609,37 @@ def apply_algo(
             alloc_graph_input=alloc_graph_input,
             alloc_graph_output=True,
         )
-        submodule.meta.update({"non_const_buffer_sizes": bufsizes})
+        submodule.meta.update({"non_const_buffer_sizes": submodule_bufsizes})
+
+        if len(submodule_bufsizes) > len(total_bufsizes):
+            total_bufsizes.extend([0] * (len(submodule_bufsizes) - len(total_bufsizes)))
+        for mem_id, bufsize in enumerate(submodule_bufsizes):
+            total_bufsizes[mem_id] = max(total_bufsizes[mem_id], bufsize)
+        return submodule_bufsizes
 
     for cond_node in get_cond_nodes(graph_module):
-        handle_submodule(typing.cast(torch.fx.Node, cond_node.args[1]))
-        handle_submodule(typing.cast(torch.fx.Node, cond_node.args[2]))
+        free_space_start = free_space_starts[cond_node]
+        handle_submodule(
+            typing.cast(torch.fx.Node, cond_node.args[1]), free_space_start
+        )
+        handle_submodule(
+            typing.cast(torch.fx.Node, cond_node.args[2]), free_space_start
+        )
 
     for while_node in get_while_nodes(graph_module):
-        handle_submodule(typing.cast(torch.fx.Node, while_node.args[0]))
-        handle_submodule(typing.cast(torch.fx.Node, while_node.args[1]))
+        cond_bufsizes = handle_submodule(
+            typing.cast(torch.fx.Node, while_node.args[0]),
+            free_space_starts[while_node],
+        )
+        handle_submodule(typing.cast(torch.fx.Node, while_node.args[1]), cond_bufsizes)
     # TODO: Add test coverage for map operator once dynamo tracing is
     # fully supported for this. T142287208
     for map_node in get_map_nodes(graph_module):
         handle_submodule(
-            typing.cast(torch.fx.Node, map_node.args[0]), alloc_graph_input=True
+            typing.cast(torch.fx.Node, map_node.args[0]),
+            free_space_starts[map_node],
+            alloc_graph_input=True,
         )
 
-    graph_module.meta.update({"non_const_buffer_sizes": bufsizes})
-    return bufsizes
+    graph_module.meta.update({"non_const_buffer_sizes": total_bufsizes})
+    return total_bufsizes
@@ -265,10 +265,11 @@ def pretty_print(obj: Any, indent: int = 0, out: Optional[TextIO] = None) -> Non
         print(obj, end="", file=out)
         return
 
-    if isinstance(obj, bytes):
+    if isinstance(obj, (bytes, memoryview)):
         r = reprlib.Repr()
         r.maxother = 1024
-        print(r.repr(obj), end="", file=out)
+        # Constants may be views of the tensor storage, see schema.Buffer.
+        print(r.repr(bytes(obj)), end="", file=out)
         return
 
     if isinstance(obj, list):
@@ -11,16 +11,23 @@ import copy
 import io
 import logging
 import os
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence, Set, TextIO, Tuple, Type, Union
 
 import torch
 import torch._export
+from executorch.exir._multiprocessing import fork_process_pool
 from executorch.exir._serialize._cord import Cord
 from executorch.exir._serialize._named_data_store import (
+    BufferEntry,
     NamedDataStore,
     NamedDataStoreOutput,
 )
-from executorch.exir._serialize._serialize import serialize_for_executorch
+from executorch.exir._serialize._serialize import (
+    serialize_for_executorch,
+    serialize_ptd_for_executorch,
+    serialize_pte_for_executorch,
+)
 from executorch.exir._serialize.data_serializer import DataSerializer
 from executorch.exir._warnings import experimental
 from executorch.exir.backend.backend_api import (
@@ -34,6 +41,10 @@ from executorch.exir.emit import emit_program, EmitterOutput
 from executorch.exir.emit._emitter import _DelegateDebugIdentifierMap
 from executorch.exir.error import ExportError
 from executorch.exir.graph_module import get_control_flow_submodules
+from executorch.exir.lowered_backend_module import (
+    get_lowered_submodules,
+    LoweredBackendModule,
+)
 from executorch.exir.operator.convert import _pybind_schema_to_native_schema
 from executorch.exir.operator.util import _QUANT_PRIMITIVES
 from executorch.exir.pass_base import PassBase
@@ -71,6 +82,7 @@ from executorch.exir.passes.spec_prop_pass import SpecPropPass
 from executorch.exir.passes.weights_to_outputs_pass import weights_to_outputs_pass
 from executorch.exir.print_program import pretty_print, print_program
 from executorch.exir.schema import Program
+from executorch.exir.serde.export_serialize import SerializedArtifact
 from executorch.exir.tracer import _default_decomposition_table
 from executorch.exir.verification.verifier import (
     EXIRATenDialectVerifier,
@@ -884,22 +896,20 @@ def _replace_aten_ops_with_transformed_ops(
             _register_no_decomp_op(op_aten)
 
         for node in program.graph.nodes:
-            is_op_supported = check_op_support(node) if check_op_support else True
             if (
                 node.op == "call_function"
                 and node.target in ops_set_to_not_decompose
-                and is_op_supported
+                and (check_op_support is None or check_op_support(node))
             ):
                 ops_to_not_decompose.add(node.target)
                 node.target = aten_op_to_transform_op[node.target]
 
         for _, submod, _ in get_control_flow_submodules(program.graph_module):
             for node in submod.graph.nodes:
-                is_op_supported = check_op_support(node) if check_op_support else True
                 if (
                     node.op == "call_function"
                     and node.target in ops_set_to_not_decompose
-                    and is_op_supported
+                    and (check_op_support is None or check_op_support(node))
                 ):
                     ops_to_not_decompose.add(node.target)
                     node.target = aten_op_to_transform_op[node.target]
@@ -982,12 +992,12 @@ def _sanity_check_graph_for_non_decomp_ops(
 
     quant_primitives = {aten_to_edge(op) for op in _QUANT_PRIMITIVES}
     for node in program.graph_module.graph.nodes:
-        is_op_supported = check_op_support(node) if check_op_support else True
         if (
             node.op == "call_function"
             and node.target in ops_set_to_not_decompose
             and node.target not in quant_primitives
-        ) and is_op_supported:
+            and (check_op_support is None or check_op_support(node))
+        ):
             warning_str = (
                 f"Node {node} with op {node.target} was not decomposed or delegated.\n"
                 + warning_str_end
@@ -998,12 +1008,12 @@ def _sanity_check_graph_for_non_decomp_ops(
                 logging.warning(warning_str)
     for _, submod, _ in get_control_flow_submodules(program.graph_module):
         for node in submod.graph.nodes:
-            is_op_supported = check_op_support(node) if check_op_support else True
             if (
                 node.op == "call_function"
                 and node.target in ops_set_to_not_decompose
                 and node.target not in quant_primitives
-            ) and is_op_supported:
+                and (check_op_support is None or check_op_support(node))
+            ):
                 warning_str = (
                     f"Node {node} with op {node.target} was not decomposed or delegated.\n"
                     + warning_str_end
@@ -1176,8 +1186,213 @@ def collect_named_data_store_from_exported_program(
     collect_named_data_store_outputs(exported_program.graph_module)
 
 
+@dataclass
+class _MethodLoweringState:
+    """The arguments of a to_edge_transform_and_lower() call, inherited by the
+    worker processes that lower its methods in parallel."""
+
+    aten_programs: Dict[str, ExportedProgram]
+    transform_passes: Optional[Union[Sequence[PassType], Dict[str, Sequence[PassType]]]]
+    partitioner: Dict[str, List[Partitioner]]
+    config: EdgeCompileConfig
+
+
+# Set in each worker process by _init_method_lowering_worker().
+_method_lowering_state: Optional[_MethodLoweringState] = None
+
+
+def _init_method_lowering_worker(state: _MethodLoweringState) -> None:
+    global _method_lowering_state
+    _method_lowering_state = state
+
+
+# A reference to a tensor of an input program: ("state_dict" or "constants", name).
+_ConstantRef = Tuple[str, str]
+
+
+@dataclass
+class _LoweredMethod:
+    """A method lowered in a worker process, in the form it is sent back to the
+    parent by _lower_method_in_worker().
+
+    Only the graphs go through exir.serde. The tensors the worker inherited from
+    the input program are sent as references to it, and the delegate payloads
+    as raw bytes, so that neither is copied into the serialized program.
+    """
+
+    artifact: SerializedArtifact
+    # For the lowered program followed by the original program of each entry of
+    # _lowered_modules(), the keys of its state_dict and constants in order,
+    # mapped to the input program's tensor if it was inherited, otherwise None.
+    constants: List[Dict[str, Dict[str, Optional[_ConstantRef]]]]
+    # The processed bytes and named data of each entry of _lowered_modules().
+    delegate_payloads: List[Tuple[bytes, Optional[NamedDataStoreOutput]]]
+
+
+def _lowered_modules(graph_module: torch.fx.GraphModule) -> List[LoweredBackendModule]:
+    """Returns the lowered modules called from graph_module, including those in its
+    control flow submodules and nested in other lowered modules, in graph order."""
+    modules = []
+    for _, module, _ in get_lowered_submodules(graph_module):
+        modules.append(module)
+        modules.extend(_lowered_modules(module.original_module.graph_module))
+    for _, submodule, _ in get_control_flow_submodules(graph_module):
+        modules.extend(_lowered_modules(submodule))
+    return modules
+
+
+def _lower_method_in_worker(name: str) -> _LoweredMethod:
+    """Runs to_edge_transform_and_lower() on the method `name` alone, and returns
+    the lowered program without the data the parent already has."""
+    from executorch.exir.serde.serialize import serialize
+
+    state = _method_lowering_state
+    assert state is not None, "Worker was not initialized"
+    transform_passes = state.transform_passes
+    if isinstance(transform_passes, dict):
+        transform_passes = {k: v for k, v in transform_passes.items() if k == name}
+    edge_manager = to_edge_transform_and_lower(
+        {name: state.aten_programs[name]},
+        transform_passes,
+        {k: v for k, v in state.partitioner.items() if k == name},
+        compile_config=state.config,
+    )
+    edge_program = edge_manager.exported_program(name)
+
+    # Tensors are only inherited if the passes did not replace them.
+    aten_program = state.aten_programs[name]
+    inherited: Dict[int, _ConstantRef] = {
+        id(tensor): ("state_dict", key)
+        for key, tensor in aten_program.state_dict.items()
+    }
+    for key, constant in aten_program.constants.items():
+        if isinstance(constant, torch.Tensor):
+            inherited[id(constant)] = ("constants", key)
+
+    lowered_modules = _lowered_modules(edge_program.graph_module)
+    constants = []
+    for program in [edge_program] + [m.original_module for m in lowered_modules]:
+        refs = {
+            "state_dict": {
+                key: inherited.get(id(value))
+                for key, value in program.state_dict.items()
+            },
+            "constants": {
+                key: inherited.get(id(value))
+                for key, value in program.constants.items()
+            },
+        }
+        # The worker's programs are discarded, so drop the inherited tensors
+        # from them rather than copying the programs.
+        program._state_dict = {
+            k: v for k, v in program.state_dict.items() if refs["state_dict"][k] is None
+        }
+        program._constants = {
+            k: v for k, v in program.constants.items() if refs["constants"][k] is None
+        }
+        constants.append(refs)
+
+    delegate_payloads = []
+    for module in lowered_modules:
+        named_data = module.named_data_store_output
+        if named_data is not None:
+            named_data = NamedDataStoreOutput(
+                [
+                    BufferEntry(bytes(entry.buffer), entry.alignment)
+                    for entry in named_data.buffers
+                ],
+                named_data.pte_data,
+                named_data.external_data,
+            )
+        delegate_payloads.append((bytes(module.processed_bytes), named_data))
+        module._processed_bytes = b""
+        module._named_data_store_output = None
+
+    return _LoweredMethod(serialize(edge_program), constants, delegate_payloads)
+
+
+def _load_lowered_method(
+    method: _LoweredMethod, aten_program: ExportedProgram
+) -> ExportedProgram:
+    """Rebuilds the program lowered by _lower_method_in_worker() from
+    aten_program."""
+    from executorch.exir.serde.serialize import deserialize
+
+    edge_program = deserialize(method.artifact)
+    lowered_modules = _lowered_modules(edge_program.graph_module)
+    assert len(lowered_modules) == len(method.delegate_payloads)
+    for module, (processed_bytes, named_data) in zip(
+        lowered_modules, method.delegate_payloads
+    ):
+        module._processed_bytes = processed_bytes
+        module._named_data_store_output = named_data
+
+    programs = [edge_program] + [m.original_module for m in lowered_modules]
+    for program, refs in zip(programs, method.constants):
+        state_dict, program_constants = program.state_dict, program.constants
+        program._state_dict = {
+            key: (
+                state_dict[key]
+                if ref is None
+                else getattr(aten_program, ref[0])[ref[1]]
+            )
+            for key, ref in refs["state_dict"].items()
+        }
+        program._constants = {
+            key: (
+                program_constants[key]
+                if ref is None
+                else getattr(aten_program, ref[0])[ref[1]]
+            )
+            for key, ref in refs["constants"].items()
+        }
+    return edge_program
+
+
+def _to_edge_transform_and_lower_in_parallel(
+    state: _MethodLoweringState,
+    constant_methods: Optional[Dict[str, Any]],
+    max_parallel_methods: int,
+) -> Optional["EdgeProgramManager"]:
+    """
+    Lowers each method of state.aten_programs independently, in up to
+    max_parallel_methods forked worker processes. Returns None if worker
+    processes cannot safely be forked, see fork_process_pool().
+
+    Forking lets the workers inherit the programs, passes and partitioners
+    rather than pickling them. Edge programs are not picklable, so each lowered
+    program is sent back as a _LoweredMethod. The programs are kept in the order
+    of state.aten_programs regardless of which worker finishes first, so that
+    their named data is merged in the same order as when lowering serially.
+    """
+    pool = fork_process_pool(
+        min(max_parallel_methods, len(state.aten_programs)),
+        "lowering methods serially",
+        _init_method_lowering_worker,
+        (state,),
+    )
+    if pool is None:
+        return None
+
+    with pool:
+        methods = pool.map(_lower_method_in_worker, state.aten_programs.keys())
+        edge_programs = {
+            name: _load_lowered_method(method, state.aten_programs[name])
+            for name, method in zip(state.aten_programs.keys(), methods)
+        }
+
+    # Match the config of the EdgeProgramManager returned when lowering serially,
+    # which to_backend() replaces.
+    lowered = any(state.partitioner.values())
+    return EdgeProgramManager(
+        edge_programs,
+        constant_methods,
+        EdgeCompileConfig(_check_ir_validity=False) if lowered else state.config,
+    )
+
+
 @et_logger("to_edge_transform_and_lower")
-def to_edge_transform_and_lower(
+def to_edge_transform_and_lower(  # noqa: C901
     programs: Union[ExportedProgram, Dict[str, ExportedProgram]],
     transform_passes: Optional[
         Union[Sequence[PassType], Dict[str, Sequence[PassType]]]
@@ -1187,6 +1402,7 @@ def to_edge_transform_and_lower(
     ] = None,
     constant_methods: Optional[Dict[str, Any]] = None,
     compile_config: Optional[EdgeCompileConfig] = None,
+    max_parallel_methods: int = 1,
 ) -> "EdgeProgramManager":
     """
     :func:`to_edge_transform_and_lower` constructs an EdgeProgramManager from a set of
@@ -1227,6 +1443,17 @@ def to_edge_transform_and_lower(
         compile_config: An optional argument used to provide greater control over the
             transformation to edge dialect process.
 
+        max_parallel_methods: If greater than one, the methods are lowered
+            independently of each other, up to this many at a time, in worker
+            processes forked from this one. Only the data the workers create is
+            sent back: tensors of `programs` are passed by reference and delegate
+            payloads as raw bytes, so the result is the same as when lowering the
+            methods one after the other. Forking the workers and rebuilding the
+            lowered graphs adds overhead, so this is only faster when partitioning
+            and preprocessing each method takes long and there are as many CPUs
+            to spare. Ignored where worker processes cannot safely be forked: on
+            platforms without fork, on macOS and while other threads are running.
+
     Returns:
         EdgeProgramManager
     """
@@ -1242,6 +1469,15 @@ def to_edge_transform_and_lower(
     elif partitioner is None:
         partitioner = {name: [] for name in aten_programs.keys()}
 
+    if max_parallel_methods > 1 and len(aten_programs) > 1:
+        parallel_edge_manager = _to_edge_transform_and_lower_in_parallel(
+            _MethodLoweringState(aten_programs, transform_passes, partitioner, config),
+            constant_methods,
+            max_parallel_methods,
+        )
+        if parallel_edge_manager is not None:
+            return parallel_edge_manager
+
     edge_manager = _gen_edge_manager_for_partitioners(
         partitioner, aten_programs, config, constant_methods
     )
@@ -1551,7 +1787,9 @@ class EdgeProgramManager:
 
         Returns:
             ExecutorchProgramManager: A manager representing the state of the EdgeProgramManager
-            after it has been transformed to the ExecuTorch backend.
+            after it has been transformed to the ExecuTorch backend. Its constants are views
+            of the weights of the programs rather than copies, so the weights must not be
+            modified in place until the program has been written out.
         """
         config = config if config else ExecutorchBackendConfig()
         execution_programs: Dict[str, ExportedProgram] = {}
@@ -1676,15 +1914,38 @@ class ExecutorchProgramManager:
         )
 
         # Serialize emitter output, ready to be written to a file.
+        self._backend_config: ExecutorchBackendConfig = backend_config
         self._data_serializer = FlatTensorSerializer()
-        self._pte_data, self._tensor_data = serialize_for_executorch(
-            self._emitter_output,
-            backend_config,
-            self._data_serializer,
-            self._named_data,
-        )
+        self._pte_data: Optional[Cord] = None
+        if backend_config.streaming_serialization:
+            # The PTE file is serialized on demand; see _get_pte_data().
+            self._tensor_data: Dict[str, Cord] = serialize_ptd_for_executorch(
+                self._emitter_output,
+                backend_config,
+                self._data_serializer,
+                self._named_data,
+            )
+        else:
+            self._pte_data, self._tensor_data = serialize_for_executorch(
+                self._emitter_output,
+                backend_config,
+                self._data_serializer,
+                self._named_data,
+            )
         self._buffer: Optional[bytes] = None
 
+    def _get_pte_data(self) -> Cord:
+        """Returns the serialized PTE file.
+
+        With streaming serialization, the file is laid out again on every call
+        and not kept alive, so that it can be written out and then freed.
+        """
+        if self._pte_data is not None:
+            return self._pte_data
+        return serialize_pte_for_executorch(
+            self._emitter_output, self._backend_config, self._named_data
+        )
+
     @property
     def methods(self) -> Set[str]:
         """
@@ -1753,7 +2014,7 @@ class ExecutorchProgramManager:
         # TODO(T181494963): update pybinding to remove buffer cache, which can consume large
         # amounts of memory longer than necessary.
         if self._buffer is None:
-            self._buffer = bytes(self._pte_data)
+            self._buffer = bytes(self._get_pte_data())
         return self._buffer
 
     def write_to_file(self, open_file: io.BufferedIOBase) -> None:
@@ -1762,7 +2023,7 @@ class ExecutorchProgramManager:
         `buffer`, as it writes to file without copying into a contiguous block of memory first,
         reducing the peak memory usage.
         """
-        self._pte_data.write_to_file(open_file)
+        self._get_pte_data().write_to_file(open_file)
 
     def write_tensor_data_to_file(self, outdir) -> None:
         """
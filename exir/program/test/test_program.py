@@ -7,11 +7,16 @@
 # pyre-unsafe
 
 import copy
+import os
+import tempfile
 import unittest
 from typing import Any, Dict
 
 import torch
 from executorch.exir import EdgeCompileConfig, ExecutorchBackendConfig
+from executorch.exir.backend.test.backend_with_named_data_map import (
+    BackendWithNDMPartitioner,
+)
 from executorch.exir.backend.test.op_partitioner_demo import (
     AddMulPartitionerDemo,
     NonDecompTestPartitioner,
@@ -22,6 +27,10 @@ from executorch.exir.lowered_backend_module import get_lowered_submodules
 from executorch.exir.pass_base import ExportPass
 from executorch.exir.passes import MemoryPlanningPass
 from executorch.exir.program._program import (
+    _init_method_lowering_worker,
+    _load_lowered_method,
+    _lower_method_in_worker,
+    _MethodLoweringState,
     _transform,
     EdgeProgramManager,
     ExecutorchProgramManager,
@@ -725,6 +734,80 @@ class TestProgramManagers(unittest.TestCase):
             1,
         )
 
+    def test_to_edge_transform_and_lower_parallel_methods(self):
+        def lower(max_parallel_methods: int) -> ExecutorchProgramManager:
+            return to_edge_transform_and_lower(
+                get_exported_programs(),
+                transform_passes={"foo": [AddToMulPassEdge()]},
+                partitioner={"forward": [AddMulPartitionerDemo()]},
+                constant_methods=get_config_methods(),
+                max_parallel_methods=max_parallel_methods,
+            ).to_executorch()
+
+        serial = lower(1)
+        parallel = lower(2)
+        self.assertEqual(parallel.methods, serial.methods)
+        self.assertEqual(parallel.config_methods, serial.config_methods)
+        self.assertEqual(
+            len(
+                get_lowered_submodules(
+                    parallel.exported_program("forward").graph_module
+                )
+            ),
+            1,
+        )
+        self.assertEqual(parallel.buffer, serial.buffer)
+
+    def test_parallel_lowering_sends_only_new_data(self):
+        class SinLinear(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.weight = torch.nn.Parameter(torch.randn(256, 256))
+
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return torch.sin(torch.mm(x, self.weight)) + 1
+
+        programs = {"forward": export(SinLinear(), (torch.ones(2, 256),), strict=True)}
+        _init_method_lowering_worker(
+            _MethodLoweringState(
+                programs,
+                None,
+                {"forward": [BackendWithNDMPartitioner()]},
+                EdgeCompileConfig(),
+            )
+        )
+        self.addCleanup(_init_method_lowering_worker, None)
+        method = _lower_method_in_worker("forward")
+
+        # The weight is sent as a reference to the input program, not its data.
+        self.assertEqual(
+            method.constants[0]["state_dict"]["weight"], ("state_dict", "weight")
+        )
+        self.assertLess(
+            len(method.artifact.state_dict),
+            programs["forward"].state_dict["weight"].nbytes,
+        )
+        # The delegate's named data is sent alongside the graph as raw bytes.
+        self.assertEqual(len(method.delegate_payloads), 1)
+        _, named_data = method.delegate_payloads[0]
+        self.assertTrue(
+            all(type(entry.buffer) is bytes for entry in named_data.buffers)
+        )
+
+        edge_program = _load_lowered_method(method, programs["forward"])
+        self.assertIs(
+            edge_program.state_dict["weight"], programs["forward"].state_dict["weight"]
+        )
+        serial = to_edge_transform_and_lower(
+            programs, partitioner=[BackendWithNDMPartitioner()]
+        ).exported_program()
+        lowered = get_lowered_submodules(edge_program.graph_module)[0][1]
+        serial_lowered = get_lowered_submodules(serial.graph_module)[0][1]
+        self.assertEqual(lowered.processed_bytes, serial_lowered.processed_bytes)
+        self.assertEqual(
+            lowered.named_data_store_output, serial_lowered.named_data_store_output
+        )
+
     def test_edge_dialect_non_core_aten_ops(self):
         class LinalgRank(torch.nn.Module):
             def __init__(self):
@@ -849,6 +932,23 @@ class TestProgramManagers(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = et.save("/tmp/test_save.pt")
 
+    def test_streaming_serialization(self):
+        model = TestLinear()
+        program = torch.export.export(model, model._get_random_inputs(), strict=True)
+        eager = to_edge(program).to_executorch()
+        streaming = to_edge(program).to_executorch(
+            ExecutorchBackendConfig(streaming_serialization=True)
+        )
+        # The PTE file is not serialized up front, and not kept after writing.
+        self.assertIsNone(streaming._pte_data)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "linear.pte")
+            streaming.save(path)
+            self.assertIsNone(streaming._pte_data)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), eager.buffer)
+        self.assertEqual(streaming.buffer, eager.buffer)
+
     def test__transform_override_verifiers(self):
         """Test that _transform can override verifiers in the exported program."""
 
@@ -8,7 +8,7 @@
 
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from executorch.exir.backend.compile_spec_schema import CompileSpec
 
@@ -165,8 +165,14 @@ class EValue:
 
 @dataclass
 class Buffer:
+    # The emitter stores constants as read-only memoryviews of their tensor storage,
+    # so that they are not copied before serialization.
     storage: bytes
 
+    def __getstate__(self) -> Dict[str, bytes]:
+        # Copies and pickles hold a snapshot of the data rather than a view.
+        return {"storage": bytes(self.storage)}
+
 
 @dataclass
 class BackendDelegateInlineData:
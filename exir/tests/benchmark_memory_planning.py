@@ -0,0 +1,227 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+"""Benchmarks memory planning algorithms.
+
+Usage:
+    python -m executorch.exir.tests.benchmark_memory_planning [--real]
+
+Plans synthetic specs shaped like an unrolled LLM decoder at increasing sizes:
+short-lived activations, a residual stream that lives for a whole layer and
+KV caches that live for the whole graph. With --real, also plans the specs of
+exported TransformerEncoder models.
+
+The greedy algorithm is compared against the linear scan over every prior
+allocation that pick_shared_obj() used before it kept lifetime indexes; both
+must produce the same allocations.
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Optional, Set, Tuple
+from unittest.mock import patch
+
+import torch
+from executorch.exir import memory_planning
+from executorch.exir.memory_planning import (
+    _does_not_overlap,
+    _find_max_overlapping_allocations_offset,
+    AllocationSpec,
+    greedy,
+    greedy_by_size_for_offset_calculation,
+    MemoryAlgoResult,
+    naive,
+    SharedObject,
+)
+from executorch.exir.tensor import TensorSpec
+
+
+def _linear_scan_pick(
+    pool: "memory_planning._SharedObjectPool",
+    spec: TensorSpec,
+    allow_overlapping_allocations: bool = True,
+) -> SharedObject:
+    """_SharedObjectPool.pick(), scanning every allocation of every shared
+    object instead of querying the pool's lifetime indexes."""
+    shared_objects = pool.shared_objects
+    picked, offset = None, 0
+    for sobj in shared_objects:
+        if _does_not_overlap(sobj, spec):
+            picked = sobj
+            break
+    if picked is None and allow_overlapping_allocations:
+        for sobj in shared_objects:
+            max_offset = _find_max_overlapping_allocations_offset(sobj, spec)
+            if max_offset > 0 and max_offset + spec.allocated_memory <= sobj.size:
+                picked, offset = sobj, max_offset
+                break
+    if picked is None:
+        picked = SharedObject(
+            len(shared_objects),
+            -1,
+            spec.allocated_memory,
+            spec.lifetime[0],
+            spec.lifetime[1],
+        )
+        shared_objects.append(picked)
+    picked.first_used_index = min(picked.first_used_index, spec.lifetime[0])
+    picked.last_used_index = max(picked.last_used_index, spec.lifetime[1])
+    picked.allocations.append(AllocationSpec(offset, spec))
+    return picked
+
+
+def _spec(numel: int, start: int, end: int) -> TensorSpec:
+    spec = TensorSpec(torch.float32, torch.Size([numel]))
+    spec.lifetime = [start, end]
+    return spec
+
+
+def make_decoder_specs(num_layers: int, seed: int = 0) -> Set[TensorSpec]:
+    """Returns specs with the lifetimes of an unrolled decoder with
+    `num_layers` layers of twenty ops each."""
+    rng = random.Random(seed)
+    ops_per_layer = 20
+    num_nodes = num_layers * ops_per_layer
+    specs = set()
+    for layer in range(num_layers):
+        base = layer * ops_per_layer
+        # KV caches live for the whole graph.
+        specs.add(_spec(64 * 1024, 0, num_nodes - 1))
+        specs.add(_spec(64 * 1024, 0, num_nodes - 1))
+        # The residual stream lives for the layer.
+        specs.add(_spec(4096, base, base + ops_per_layer))
+        for op in range(ops_per_layer):
+            numel = rng.choice([64, 4096, 4096, 11008, 32 * 128])
+            end = base + op + rng.choice([1, 1, 2, 3])
+            specs.add(_spec(numel, base + op, min(end, num_nodes - 1)))
+    return specs
+
+
+def make_encoder_specs(
+    num_layers: int,
+) -> Tuple[Set[TensorSpec], torch.fx.GraphModule]:
+    """Returns the specs planned when lowering a TransformerEncoder."""
+    from executorch.exir import ExecutorchBackendConfig, to_edge
+    from executorch.exir.passes import MemoryPlanningPass
+
+    captured = {}
+
+    def capture(alignment, specs, graph_module, graph_signature, extra_padding):
+        specs = set(specs)
+        captured["specs"], captured["graph_module"] = specs, graph_module
+        return greedy(alignment, specs, graph_module, graph_signature, extra_padding)
+
+    model = torch.nn.TransformerEncoder(
+        torch.nn.TransformerEncoderLayer(64, 4, batch_first=True), num_layers
+    ).eval()
+    to_edge(torch.export.export(model, (torch.randn(1, 8, 64),))).to_executorch(
+        ExecutorchBackendConfig(
+            memory_planning_pass=MemoryPlanningPass(
+                memory_planning.MemoryPlanningAlgorithmSuite([capture])
+            )
+        )
+    )
+    return captured["specs"], captured["graph_module"]
+
+
+def _time(fn: Callable[[], MemoryAlgoResult]) -> Tuple[float, MemoryAlgoResult]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench(
+    name: str,
+    specs: Set[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    max_linear_scan_specs: int,
+    max_by_size_specs: int,
+) -> None:
+    def run(algo: Callable[..., MemoryAlgoResult]) -> MemoryAlgoResult:
+        return algo(16, specs, graph_module, None, 0)
+
+    indexed_time, indexed = _time(lambda: run(greedy))
+    _, naive_result = _time(lambda: run(naive))
+    scan_time: Optional[float] = None
+    if len(specs) <= max_linear_scan_specs:
+        with patch.object(memory_planning._SharedObjectPool, "pick", _linear_scan_pick):
+            scan_time, scanned = _time(lambda: run(greedy))
+        assert scanned.spec_dict == indexed.spec_dict, "Allocations differ"
+        assert scanned.bufsizes == indexed.bufsizes, "Buffer sizes differ"
+    by_size_time: Optional[float] = None
+    by_size_total: Optional[int] = None
+    if len(specs) <= max_by_size_specs:
+        by_size_time, by_size = _time(
+            lambda: run(greedy_by_size_for_offset_calculation)
+        )
+        by_size_total = sum(by_size.bufsizes)
+
+    def fmt_time(seconds: Optional[float]) -> str:
+        return f"{seconds:8.3f} s" if seconds is not None else "  (skipped)"
+
+    print(
+        f"{name:<24} {len(specs):>8} {fmt_time(indexed_time)} "
+        + f"{fmt_time(scan_time)} {fmt_time(by_size_time)} "
+        + f"{sum(indexed.bufsizes):>12} "
+        + f"{by_size_total if by_size_total is not None else '-':>12} "
+        + f"{sum(naive_result.bufsizes):>12}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--num-layers", type=int, nargs="+", default=[16, 64, 256, 1024, 2560]
+    )
+    parser.add_argument(
+        "--real", action="store_true", help="Also plan exported models."
+    )
+    parser.add_argument("--real-num-layers", type=int, nargs="+", default=[8, 32, 96])
+    parser.add_argument(
+        "--max-linear-scan-specs",
+        type=int,
+        default=25000,
+        help="Skip the (quadratic) linear scan above this many specs.",
+    )
+    parser.add_argument(
+        "--max-by-size-specs",
+        type=int,
+        default=25000,
+        help="Skip the (quadratic) greedy by size algorithm above this many specs.",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'graph':<24} {'specs':>8} {'greedy':>10} {'linear scan':>10} "
+        + f"{'by size':>10} {'greedy size':>12} {'by size size':>12} "
+        + f"{'naive size':>12}"
+    )
+    graph_module = torch.fx.GraphModule(torch.nn.Module(), torch.fx.Graph())
+    for num_layers in args.num_layers:
+        bench(
+            f"decoder x{num_layers}",
+            make_decoder_specs(num_layers),
+            graph_module,
+            args.max_linear_scan_specs,
+            args.max_by_size_specs,
+        )
+    if args.real:
+        for num_layers in args.real_num_layers:
+            specs, real_graph_module = make_encoder_specs(num_layers)
+            bench(
+                f"TransformerEncoder x{num_layers}",
+                specs,
+                real_graph_module,
+                args.max_linear_scan_specs,
+                args.max_by_size_specs,
+            )
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
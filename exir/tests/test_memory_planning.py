@@ -6,22 +6,36 @@
 
 # pyre-strict
 
+import functools
 import itertools
+import random
+import time
 import unittest
 from typing import Any, Callable, List, Optional, Tuple, Type
+from unittest import mock
 
 import executorch.exir as exir
+import executorch.exir.memory_planning as memory_planning
 
 import torch
 from executorch.exir import ExecutorchBackendConfig, to_edge
 from executorch.exir.dialects._ops import ops as exir_ops
 from executorch.exir.memory_planning import (
+    _does_not_overlap,
+    _find_max_overlapping_allocations_offset,
+    _LifetimeIndex,
+    _peak_live_memory,
+    _place_at_offsets,
+    bounded_search,
     filter_nodes,
     get_node_tensor_specs,
     greedy,
+    greedy_by_size_for_offset_calculation,
     MemoryAlgoResult,
     MemoryPlanningAlgorithmSuite,
     naive,
+    pick_shared_obj,
+    SharedObject,
     Verifier,
 )
 from executorch.exir.pass_base import ExportPass, PassResult
@@ -32,6 +46,7 @@ from executorch.exir.passes import (  # noqa
     ToOutVarPass,
 )
 from executorch.exir.passes.sym_shape_eval_pass import ConstraintBasedSymShapeEvalPass
+from executorch.exir.tensor import TensorSpec
 from parameterized import parameterized
 
 from torch import nn
@@ -55,6 +70,7 @@ from torch.export.experimental import _export_forward_backward
 from torch.export.exported_program import ExportGraphSignature
 from torch.fx import Graph, GraphModule, Node
 from torch.nn import functional as F
+from torch.utils._pytree import tree_flatten
 
 torch.ops.load_library("//executorch/kernels/portable:custom_ops_generated_lib")
 
@@ -254,6 +270,8 @@ def maketest(
                 (naive, False),
                 # greedy algorithm should reuse tensor storages in the testing model
                 (greedy, True),
+                (greedy_by_size_for_offset_calculation, True),
+                (functools.partial(bounded_search, max_iterations=100), True),
             ]
 
         for algo, expect_reuse in criteria:
@@ -393,6 +411,7 @@ class TestMemoryPlanning(unittest.TestCase):
         criteria=[
             (naive, False),
             (greedy, True),
+            (greedy_by_size_for_offset_calculation, True),
         ],
     )
 
@@ -400,6 +419,7 @@ class TestMemoryPlanning(unittest.TestCase):
         LinearsWithDifferentSizeAndViewOps,
         criteria=[
             (greedy, True),
+            (greedy_by_size_for_offset_calculation, True),
         ],
     )
 
@@ -410,6 +430,7 @@ class TestMemoryPlanning(unittest.TestCase):
         criteria=[
             (naive, False),
             (greedy, True),
+            (greedy_by_size_for_offset_calculation, True),
         ],
         extra_check=ModuleListArg.extra_check,
     )
@@ -446,6 +467,222 @@ class TestVerifier(unittest.TestCase):
         self.assertFalse(Verifier.has_overlap([5, 6], [1, 2]))
 
 
+class TestPickSharedObj(unittest.TestCase):
+    def test_lifetime_index(self) -> None:
+        rng = random.Random(0)
+        index = _LifetimeIndex(max)
+        values = [0] * 300
+        for _ in range(200):
+            start = rng.randrange(len(values))
+            end = min(len(values) - 1, start + rng.choice([0, 1, 5, 50]))
+            value = rng.randrange(1, 1000)
+            index.add(start, end, value)
+            for i in range(start, end + 1):
+                values[i] = max(values[i], value)
+            start = rng.randrange(len(values))
+            end = min(len(values) - 1, start + rng.choice([0, 1, 5, 50]))
+            self.assertEqual(index.query(start, end), max(values[start : end + 1]))
+
+    def test_matches_linear_scan(self) -> None:
+        def linear_scan_pick(
+            shared_objects: List[SharedObject], spec: TensorSpec
+        ) -> Tuple[int, int]:
+            for sobj in shared_objects:
+                if _does_not_overlap(sobj, spec):
+                    return sobj.idx, 0
+            for sobj in shared_objects:
+                max_offset = _find_max_overlapping_allocations_offset(sobj, spec)
+                if max_offset > 0 and max_offset + spec.allocated_memory <= sobj.size:
+                    return sobj.idx, max_offset
+            return len(shared_objects), 0
+
+        rng = random.Random(0)
+        specs = []
+        for _ in range(300):
+            spec = TensorSpec(torch.float32, torch.Size([rng.choice([0, 1, 16, 64])]))
+            start = rng.randrange(100)
+            spec.lifetime = [start, min(99, start + rng.choice([0, 1, 2, 10, 50]))]
+            specs.append(spec)
+        specs.sort(key=lambda spec: spec.allocated_memory, reverse=True)
+
+        shared_objects: List[SharedObject] = []
+        for spec in specs:
+            expected = linear_scan_pick(shared_objects, spec)
+            sobj = pick_shared_obj(shared_objects, spec)
+            self.assertEqual((sobj.idx, sobj.allocations[-1].offset), expected)
+
+
+class TestGreedyBySizeForOffsetCalculation(unittest.TestCase):
+    def test_less_fragmentation_than_greedy(self) -> None:
+        def make_specs() -> List[TensorSpec]:
+            specs = []
+            for numel, lifetime in [(100, [0, 0]), (60, [1, 1]), (60, [1, 1])]:
+                spec = TensorSpec(torch.uint8, torch.Size([numel]))
+                spec.lifetime = lifetime
+                specs.append(spec)
+            return specs
+
+        graph_module = GraphModule(torch.nn.Module(), Graph())
+        # greedy() reuses the first shared object for one of the two 60 byte
+        # tensors, but needs a second shared object for the other.
+        self.assertEqual(greedy(1, make_specs(), graph_module, None).bufsizes, [0, 160])
+
+        specs = make_specs()
+        result = greedy_by_size_for_offset_calculation(1, specs, graph_module, None)
+        self.assertEqual(result.bufsizes, [0, 120])
+        self.assertEqual(result.spec_dict[specs[0]].mem_offset, 0)
+        self.assertEqual(
+            sorted(result.spec_dict[spec].mem_offset for spec in specs[1:]), [0, 60]
+        )
+
+    def test_alignment_padding_and_input_buffers(self) -> None:
+        specs = []
+        for numel, lifetime, mem_id in [
+            (20, [0, 1], None),
+            (3, [1, 2], None),
+            (5, [0, 2], 2),
+        ]:
+            spec = TensorSpec(torch.uint8, torch.Size([numel]))
+            spec.lifetime, spec.mem_id = lifetime, mem_id
+            specs.append(spec)
+
+        graph_module = GraphModule(torch.nn.Module(), Graph())
+        graph_module.input_mem_buffer_sizes = [0, 32]
+        result = greedy_by_size_for_offset_calculation(16, specs, graph_module, None, 4)
+        self.assertEqual(
+            [
+                (result.spec_dict[spec].mem_id, result.spec_dict[spec].mem_offset)
+                for spec in specs
+            ],
+            [(1, 32), (1, 64), (2, 0)],
+        )
+        self.assertEqual(result.bufsizes, [0, 84, 20])
+        # Specs with disjoint storage are distinct memory objects.
+        self.assertEqual(
+            [result.spec_dict[spec].mem_obj_id for spec in specs], [0, 1, 2]
+        )
+
+
+class TestBoundedSearch(unittest.TestCase):
+    def test_improves_on_heuristics(self) -> None:
+        rng = random.Random(0)
+        specs = []
+        for _ in range(40):
+            spec = TensorSpec(
+                torch.uint8, torch.Size([rng.choice([16, 32, 48, 64, 80, 112, 160])])
+            )
+            start = rng.randrange(30)
+            spec.lifetime = [start, min(29, start + rng.choice([0, 1, 2, 3, 6]))]
+            specs.append(spec)
+
+        graph_module = GraphModule(torch.nn.Module(), Graph())
+        greedy_size = greedy(16, specs, graph_module, None).bufsizes[1]
+        by_size = greedy_by_size_for_offset_calculation(16, specs, graph_module, None)
+        result = bounded_search(
+            16, specs, graph_module, None, time_budget_s=60, max_iterations=1000
+        )
+        self.assertEqual((greedy_size, by_size.bufsizes[1]), (688, 688))
+        # The search reaches the peak live memory, the smallest possible size.
+        self.assertEqual(result.bufsizes, [0, _peak_live_memory(specs)])
+        self.assertLess(result.bufsizes[1], by_size.bufsizes[1])
+
+        for lhs, rhs in itertools.combinations(specs, 2):
+            lhs_alloc, rhs_alloc = result.spec_dict[lhs], result.spec_dict[rhs]
+            disjoint = (
+                lhs_alloc.mem_offset + lhs.allocated_memory <= rhs_alloc.mem_offset
+                or rhs_alloc.mem_offset + rhs.allocated_memory <= lhs_alloc.mem_offset
+            )
+            if Verifier.lifetime_overlap(lhs, rhs):
+                self.assertTrue(disjoint)
+            # Specs sharing storage are one memory object, as the Verifier expects.
+            if not disjoint:
+                self.assertEqual(lhs_alloc.mem_obj_id, rhs_alloc.mem_obj_id)
+
+    def test_zero_budget_returns_heuristic(self) -> None:
+        specs = []
+        for numel, lifetime in [(100, [0, 0]), (60, [1, 1]), (60, [1, 1])]:
+            spec = TensorSpec(torch.uint8, torch.Size([numel]))
+            spec.lifetime = lifetime
+            specs.append(spec)
+
+        graph_module = GraphModule(torch.nn.Module(), Graph())
+        result = bounded_search(1, specs, graph_module, None, 2, time_budget_s=0)
+        self.assertEqual(result.bufsizes, [0, 122])
+
+    def test_never_worse_than_heuristics(self) -> None:
+        rng = random.Random(1)
+        specs = []
+        for _ in range(30):
+            spec = TensorSpec(torch.uint8, torch.Size([rng.randrange(1, 200)]))
+            start = rng.randrange(20)
+            spec.lifetime = [start, min(19, start + rng.randrange(5))]
+            specs.append(spec)
+
+        graph_module = GraphModule(torch.nn.Module(), Graph())
+        heuristic_size = min(
+            greedy(16, specs, graph_module, None).bufsizes[1],
+            greedy_by_size_for_offset_calculation(
+                16, specs, graph_module, None
+            ).bufsizes[1],
+        )
+        for time_budget_s, max_iterations in [(0, None), (60, 1), (60, 50)]:
+            result = bounded_search(
+                16,
+                specs,
+                graph_module,
+                None,
+                time_budget_s=time_budget_s,
+                max_iterations=max_iterations,
+            )
+            self.assertLessEqual(result.bufsizes[1], heuristic_size)
+
+    def test_placement_stops_at_deadline(self) -> None:
+        specs = []
+        for numel in [64, 32]:
+            spec = TensorSpec(torch.uint8, torch.Size([numel]))
+            spec.lifetime = [0, 1]
+            specs.append(spec)
+
+        self.assertIsNone(_place_at_offsets(specs, 16, deadline=time.monotonic() - 1))
+        placement = _place_at_offsets(specs, 16, deadline=time.monotonic() + 60)
+        self.assertIsNotNone(placement)
+        self.assertEqual(placement[1], 96)
+
+    def test_budget_split_across_memory_hierarchies(self) -> None:
+        specs = []
+        for mem_id in [1, 2]:
+            # The same specs as in test_improves_on_heuristics, which greedy by
+            # size does not pack optimally, so both hierarchies are searched.
+            rng = random.Random(0)
+            for _ in range(40):
+                spec = TensorSpec(
+                    torch.uint8,
+                    torch.Size([rng.choice([16, 32, 48, 64, 80, 112, 160])]),
+                )
+                start = rng.randrange(30)
+                spec.lifetime = [start, min(29, start + rng.choice([0, 1, 2, 3, 6]))]
+                spec.mem_id = mem_id
+                specs.append(spec)
+
+        graph_module = GraphModule(torch.nn.Module(), Graph())
+        # With the clock stopped, the first hierarchy gets half of the budget
+        # and the second one all that is left.
+        with mock.patch.object(
+            memory_planning.time, "monotonic", return_value=1000.0
+        ), mock.patch.object(
+            memory_planning, "_place_at_offsets", wraps=_place_at_offsets
+        ) as place:
+            bounded_search(
+                16, specs, graph_module, None, time_budget_s=60, max_iterations=5
+            )
+        deadlines = [
+            call.kwargs["deadline"]
+            for call in place.call_args_list
+            if "deadline" in call.kwargs
+        ]
+        self.assertEqual(sorted(set(deadlines)), [1030.0, 1060.0])
+
+
 class TestMisc(unittest.TestCase):
     def test_filter_nodes(self) -> None:
         g = Graph()
@@ -522,6 +759,11 @@ class TestMisc(unittest.TestCase):
                 [(1, 0), (3, 0), (1, 4), (3, 4), (1, 0)],
                 [0, 8, 0, 8],
             ),
+            (
+                greedy_by_size_for_offset_calculation,
+                [(1, 0), (3, 0), (1, 4), (3, 4), (1, 0)],
+                [0, 8, 0, 8],
+            ),
         ]
     )
     def test_multiple_pools(
@@ -681,6 +923,129 @@ class TestMisc(unittest.TestCase):
             5,
         )
 
+    def test_cond_branches_share_storage(self) -> None:
+        class CondModel(torch.nn.Module):
+            def forward(self, pred: torch.Tensor, x: torch.Tensor) -> torch.Tensor:
+                # y is dead by the time cond runs, z is live.
+                y = torch.mm(x, x)
+                z = y + 1
+
+                def true_fn(a: torch.Tensor) -> torch.Tensor:
+                    b = a * a
+                    return torch.mm(b, b)
+
+                def false_fn(a: torch.Tensor) -> torch.Tensor:
+                    return torch.mm(a, a) - a
+
+                return torch.cond(pred, true_fn, false_fn, [z])
+
+        graph_module = (
+            to_edge(
+                export(CondModel(), (torch.tensor(True), torch.ones(8, 8)), strict=True)
+            )
+            .to_executorch()
+            .exported_program()
+            .graph_module
+        )
+
+        def planned_specs(gm: torch.fx.GraphModule) -> List[TensorSpec]:
+            return [
+                spec
+                for node in gm.graph.nodes
+                if isinstance(spec := node.meta.get("spec"), TensorSpec)
+                and spec.mem_offset is not None
+            ]
+
+        (cond_idx,) = [
+            idx
+            for idx, node in enumerate(graph_module.graph.nodes)
+            if node.target is torch.ops.higher_order.cond
+        ]
+        live_end = max(
+            spec.mem_offset + spec.allocated_memory
+            for spec in planned_specs(graph_module)
+            if spec.lifetime[0] <= cond_idx <= spec.lifetime[1]
+        )
+
+        branches = [graph_module.submodule_0, graph_module.submodule_1]
+        branch_starts = []
+        for branch in branches:
+            specs = planned_specs(branch)
+            self.assertTrue(specs)
+            # Branch tensors only reuse the space of dead outer tensors.
+            self.assertTrue(all(spec.mem_offset >= live_end for spec in specs))
+            branch_starts.append(min(spec.mem_offset for spec in specs))
+            self.assertEqual(
+                branch.meta["non_const_buffer_sizes"],
+                graph_module.meta["non_const_buffer_sizes"],
+            )
+        # Branches never run together, so they start at the same offset.
+        self.assertEqual(branch_starts[0], branch_starts[1])
+
+    def test_cond_output_outlives_later_allocations(self) -> None:
+        class CondModel(torch.nn.Module):
+            def forward(self, pred: torch.Tensor, x: torch.Tensor) -> torch.Tensor:
+                def true_fn(a: torch.Tensor) -> torch.Tensor:
+                    return torch.mm(a, a) + 1
+
+                def false_fn(a: torch.Tensor) -> torch.Tensor:
+                    return torch.mm(a, a) - 1
+
+                # Large temporaries, dead by the time cond runs.
+                z = torch.mm(x.repeat(1, 4), x.repeat(4, 1))
+                c = torch.cond(pred, true_fn, false_fn, [z])
+                # Allocated after cond, while its result is still live.
+                y = x.repeat(4, 4)
+                return c, y * 2
+
+        graph_module = (
+            to_edge(
+                export(CondModel(), (torch.tensor(True), torch.ones(8, 8)), strict=True)
+            )
+            .to_executorch(
+                ExecutorchBackendConfig(
+                    memory_planning_pass=MemoryPlanningPass(alloc_graph_input=False)
+                )
+            )
+            .exported_program()
+            .graph_module
+        )
+
+        def planned_specs(gm: torch.fx.GraphModule) -> List[TensorSpec]:
+            return [
+                spec
+                for node in gm.graph.nodes
+                for spec in tree_flatten(node.meta.get("spec"))[0]
+                if isinstance(spec, TensorSpec) and spec.mem_offset is not None
+            ]
+
+        nodes = list(graph_module.graph.nodes)
+        (cond_idx,) = [
+            idx
+            for idx, node in enumerate(nodes)
+            if node.target is torch.ops.higher_order.cond
+        ]
+        # The emitter moves the branch output into the cond output, so the
+        # branch output storage is in use until the cond result is last used.
+        result_end = max(
+            nodes.index(user)
+            for getitem in nodes[cond_idx].users
+            for user in getitem.users
+        )
+        outer_specs = [
+            spec
+            for spec in planned_specs(graph_module)
+            if spec.lifetime[0] <= result_end and spec.lifetime[1] >= cond_idx
+        ]
+        self.assertGreater(len(outer_specs), 1)
+        for branch in [graph_module.submodule_0, graph_module.submodule_1]:
+            for branch_spec in planned_specs(branch):
+                for spec in outer_specs:
+                    self.assertFalse(
+                        Verifier.storage_overlap(spec, branch_spec),
+                        f"{spec} and branch tensor {branch_spec} share storage",
+                    )
+
     def test_placeholder_lifetime(self) -> None:
         class TestModel(torch.nn.Module):
             def __init__(self) -> None:
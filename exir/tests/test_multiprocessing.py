@@ -0,0 +1,47 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import multiprocessing
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from executorch.exir._multiprocessing import fork_process_pool
+
+
+class TestForkProcessPool(unittest.TestCase):
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods()
+        and threading.active_count() == 1,
+        "Worker processes cannot be forked",
+    )
+    @patch("sys.platform", "linux")
+    def test_forks_workers(self) -> None:
+        pool = fork_process_pool(2, "running serially")
+        self.assertIsNotNone(pool)
+        with pool:
+            self.assertNotEqual(pool.submit(os.getpid).result(), os.getpid())
+
+    def test_refuses_with_other_threads(self) -> None:
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertIsNone(fork_process_pool(2, "running serially"))
+        finally:
+            stop.set()
+            thread.join()
+        self.assertIn("running serially", logs.output[0])
+
+    @patch("sys.platform", "darwin")
+    def test_refuses_on_macos(self) -> None:
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(fork_process_pool(2, "running serially"))
+        self.assertIn("macOS", logs.output[0])
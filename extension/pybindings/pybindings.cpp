@@ -10,6 +10,8 @@
 #include <cstdio>
 #include <iostream>
 #include <memory>
+#include <mutex>
+#include <optional>
 #include <stdexcept>
 #include <unordered_map>
 
@@ -39,6 +41,7 @@
 #include <ATen/Tensor.h>
 #include <ATen/core/functional.h>
 #include <c10/core/ScalarTypeToTypeMeta.h>
+#include <torch/csrc/autograd/python_variable.h>
 #include <torch/csrc/utils/pybind.h>
 #include <torch/python.h>
 
@@ -108,6 +111,76 @@ namespace pybindings {
 
 namespace {
 
+// Set while the calling thread holds a StreamRedirect.
+thread_local bool t_streams_redirected = false;
+
+// Set while the calling thread holds a LogCapture.
+thread_local std::string* t_log_messages = nullptr;
+
+/// Redirects std::cout and std::cerr to Python's sys.stdout and sys.stderr for
+/// the duration of a call. The redirects replace process-global stream buffers
+/// and have to be undone in the reverse order, so only one thread holds them at
+/// a time. The lock is taken without the GIL, as the thread holding it may need
+/// the GIL to finish. Methods are executed without it, and collect their logs
+/// with a LogCapture instead.
+class StreamRedirect {
+ public:
+  StreamRedirect() : lock_(lock_redirect()) {
+    t_streams_redirected = true;
+  }
+
+  ~StreamRedirect() {
+    t_streams_redirected = false;
+  }
+
+ private:
+  static std::unique_lock<std::mutex> lock_redirect() {
+    static std::mutex mutex;
+    std::unique_lock<std::mutex> lock(mutex, std::defer_lock);
+    if (!lock.try_lock()) {
+      py::gil_scoped_release release;
+      lock.lock();
+    }
+    return lock;
+  }
+
+  // Members are destroyed in reverse order, so the redirects are undone
+  // before the lock is released.
+  std::unique_lock<std::mutex> lock_;
+  py::scoped_ostream_redirect stdout_redirect_;
+  py::scoped_estream_redirect stderr_redirect_;
+};
+
+/// Collects the log messages of the calling thread into `messages`, which may
+/// happen while the GIL is released, and writes them to Python's sys.stderr
+/// when destroyed. Must be created and destroyed with the GIL held.
+class LogCapture {
+ public:
+  explicit LogCapture(std::string& messages)
+      : messages_(messages), previous_(t_log_messages) {
+    t_log_messages = &messages_;
+  }
+
+  ~LogCapture() {
+    t_log_messages = previous_;
+    if (messages_.empty()) {
+      return;
+    }
+    try {
+      py::module_::import("sys").attr("stderr").attr("write")(messages_);
+    } catch (py::error_already_set&) {
+      // For example when sys.stderr is None.
+      fputs(messages_.c_str(), stderr);
+    }
+    // Keep the capacity for the next call.
+    messages_.clear();
+  }
+
+ private:
+  std::string& messages_;
+  std::string* previous_;
+};
+
 void write_data_to_file(const std::string& path, void* buf, size_t size) {
   FILE* f = fopen(path.c_str(), "w+");
   if (!f) {
@@ -154,6 +227,72 @@ void setup_output_storage(
   }
 }
 
+/// Returns the dtype of the elements of a buffer with the provided struct
+/// module style format, as used by the Python buffer protocol.
+at::ScalarType scalar_type_from_buffer_format(
+    const std::string& format,
+    py::ssize_t itemsize) {
+  // Only the native byte order is supported.
+  const bool native = format.size() == 1 ||
+      (format.size() == 2 &&
+       std::string("@=<").find(format[0]) != std::string::npos);
+  const char kind = native ? format.back() : '\0';
+  switch (kind) {
+    case '?':
+      return at::ScalarType::Bool;
+    case 'e':
+      return at::ScalarType::Half;
+    case 'f':
+      return at::ScalarType::Float;
+    case 'd':
+      return at::ScalarType::Double;
+    case 'B':
+      if (itemsize == 1) {
+        return at::ScalarType::Byte;
+      }
+      break;
+    case 'b':
+    case 'h':
+    case 'i':
+    case 'l':
+    case 'q':
+      // The size of these types depends on the platform.
+      switch (itemsize) {
+        case 1:
+          return at::ScalarType::Char;
+        case 2:
+          return at::ScalarType::Short;
+        case 4:
+          return at::ScalarType::Int;
+        case 8:
+          return at::ScalarType::Long;
+      }
+      break;
+  }
+  throw std::runtime_error(
+      "Unsupported buffer format '" + format + "' with item size " +
+      std::to_string(itemsize));
+}
+
+/// Creates a tensor aliasing the memory described by `info`, for example the
+/// one of a NumPy array. `info` must stay alive for as long as the tensor.
+at::Tensor tensor_from_buffer(const py::buffer_info& info) {
+  const auto scalar_type =
+      scalar_type_from_buffer_format(info.format, info.itemsize);
+  std::vector<int64_t> sizes(info.shape.begin(), info.shape.end());
+  std::vector<int64_t> strides;
+  strides.reserve(info.strides.size());
+  for (const auto stride : info.strides) {
+    if (stride % info.itemsize != 0) {
+      throw std::runtime_error(
+          "Buffer strides must be a multiple of the item size");
+    }
+    strides.push_back(stride / info.itemsize);
+  }
+  return at::from_blob(
+      info.ptr, sizes, strides, at::TensorOptions().dtype(scalar_type));
+}
+
 class Module final {
  public:
   explicit Module(
@@ -242,6 +381,18 @@ class Module final {
       const std::vector<EValue>& args,
       const std::optional<std::vector<Span<uint8_t>>>& output_storages =
           std::nullopt) {
+    execute_method(method_name, args, output_storages);
+    // process outputs
+    return get_outputs(method_name);
+  }
+
+  /// Executes the specified method on the provided inputs. Its outputs can be
+  /// retrieved with get_outputs().
+  void execute_method(
+      const std::string& method_name,
+      const std::vector<EValue>& args,
+      const std::optional<std::vector<Span<uint8_t>>>& output_storages =
+          std::nullopt) {
     auto& method = get_method(method_name);
     executorch::aten::ArrayRef<EValue> input_evalue_list(
         args.data(), args.size());
@@ -274,13 +425,21 @@ class Module final {
         execute_status,
         "method->execute() failed with error 0x%" PRIx32,
         static_cast<uint32_t>(execute_status));
-    // process outputs
-    return get_outputs(method_name);
   }
 
   std::vector<EValue> get_outputs(const std::string& method_name) {
+    std::vector<EValue> result;
+    get_outputs(method_name, result);
+    return result;
+  }
+
+  /// Retrieves the outputs of the specified method into `result`, reusing its
+  /// storage.
+  void get_outputs(
+      const std::string& method_name,
+      std::vector<EValue>& result) {
     auto& method = methods_[method_name];
-    std::vector<EValue> result(method->outputs_size());
+    result.resize(method->outputs_size());
 
     Error get_outputs_status =
         method->get_outputs(result.data(), method->outputs_size());
@@ -289,8 +448,6 @@ class Module final {
         "method->get_outputs() for method '%s' failed with error 0x%" PRIx32,
         method_name.c_str(),
         static_cast<uint32_t>(get_outputs_status));
-
-    return result;
   }
 
   Method& get_method(const std::string& method_name) {
@@ -670,105 +827,26 @@ struct PyModule final {
       const std::string& method_name,
       const py::sequence& inputs,
       bool clone_outputs = true) {
-    const auto inputs_size = py::len(inputs);
-    std::vector<EValue> cpp_inputs;
-    cpp_inputs.reserve(inputs_size);
-
-#ifndef USE_ATEN_LIB // Portable mode
-    // So the ETensors and their metadata stay in scope for
-    // Module->run_method.
-    std::vector<torch::executor::TensorImpl> input_tensors;
-    std::vector<std::vector<torch::executor::Tensor::SizesType>> input_sizes;
-    std::vector<std::vector<torch::executor::Tensor::StridesType>>
-        input_strides;
-    std::vector<std::vector<torch::executor::Tensor::DimOrderType>>
-        input_dim_order;
-    // We store pointers to these vector elements so important to reserve so
-    // that we don't lose those on a vector resize. Don't need to do this for
-    // the others since they are vectors of vectors, and we don't store a
-    // pointer to the root level vector data.
-    input_tensors.reserve(inputs_size);
-#endif
-
-    // Convert python objects into EValues.
-    for (size_t i = 0; i < inputs_size; ++i) {
-      auto python_input = inputs[i];
-      const std::string& type_str = py::str(python_input.get_type());
-      if (type_str == "<class 'torch.Tensor'>") {
-        auto at_tensor = python_input.cast<at::Tensor>();
-
-#ifdef USE_ATEN_LIB
-        EValue evalue(at_tensor);
-#else
-        // convert at::Tensor to torch::executor::Tensor
-        auto type =
-            torch_to_executorch_scalar_type(at_tensor.options().dtype());
-        size_t dim = at_tensor.dim();
-        // cant directly alias at::Tensor sizes and strides due to int64 vs
-        // int32 typing conflict
-        input_sizes.emplace_back(
-            at_tensor.sizes().begin(), at_tensor.sizes().end());
-        input_strides.emplace_back(
-            at_tensor.strides().begin(), at_tensor.strides().end());
-
-        // Only works for MemoryFormat::Contiguous or MemoryFormat::ChannelsLast
-        // inputs
-        std::vector<torch::executor::Tensor::DimOrderType> dim_order;
-        if (at_tensor.is_contiguous()) {
-          for (size_t cur_dim = 0; cur_dim < dim; cur_dim++) {
-            dim_order.push_back(cur_dim);
-          }
-        } else if (
-            at_tensor.is_contiguous(at::MemoryFormat::ChannelsLast) &&
-            at_tensor.dim() == 4) {
-          dim_order = decltype(dim_order)({0, 2, 3, 1});
-        } else {
-          auto error_msg = "Input " + std::to_string(i) + "for method " +
-              method_name + " should be contiguous or channels-last.";
-          throw std::runtime_error(error_msg);
-        }
-        input_dim_order.push_back(std::move(dim_order));
-        input_tensors.emplace_back(
-            type,
-            dim,
-            input_sizes.back().data(),
-            nullptr,
-            input_dim_order.back().data(),
-            input_strides.back().data());
-
-        torch::executor::Tensor temp =
-            torch::executor::Tensor(&input_tensors.back());
-        alias_etensor_to_attensor(at_tensor, temp);
-        EValue evalue(temp);
-#endif
-
-        cpp_inputs.push_back(evalue);
-      } else if (py::isinstance<py::none>(python_input)) {
-        cpp_inputs.push_back(EValue());
-      } else if (py::isinstance<py::bool_>(python_input)) {
-        cpp_inputs.push_back(EValue(py::cast<bool>(python_input)));
-      } else if (py::isinstance<py::int_>(python_input)) {
-        cpp_inputs.push_back(EValue(py::cast<int64_t>(python_input)));
-      } else {
-        throw std::runtime_error(
-            "Unsupported python type " + type_str +
-            ". Ensure that inputs are passed as a flat list of tensors.");
-      }
+    auto lock = lock_without_gil();
+    auto& state = get_method_state(method_name);
+    // Written to sys.stderr once the GIL is held again, also on errors.
+    LogCapture log_capture(state.log_messages);
+    set_inputs(method_name, inputs, state);
+
+    {
+      // The inputs and outputs are owned by C++ or kept alive by `state` while
+      // executing, so other Python threads can run in the meantime.
+      py::gil_scoped_release release;
+      module_->execute_method(
+          method_name, state.inputs, state.output_storage_spans);
+      module_->get_outputs(method_name, state.outputs);
     }
-
-    const auto& method = module_->get_method(method_name);
-    const auto num_outputs = method.outputs_size();
-    output_storages_ = make_output_storages(method);
-    std::vector<Span<uint8_t>> output_storage_spans(num_outputs);
-    for (int i = 0; i < output_storages_.size(); ++i) {
-      output_storage_spans[i] =
-          Span<uint8_t>(output_storages_[i].data(), output_storages_[i].size());
-    }
-    auto outputs =
-        module_->run_method(method_name, cpp_inputs, output_storage_spans);
+    // Don't keep the inputs alive, while keeping the capacity of the vectors.
+    state.inputs.clear();
+    state.input_buffers.clear();
 
     // Retrieve outputs
-    return get_outputs_as_py_list(outputs, clone_outputs);
+    return get_outputs_as_py_list(state.outputs, clone_outputs);
   }
 
   py::list forward(const py::sequence& inputs, bool clone_outputs = true) {
@@ -784,13 +862,16 @@ struct PyModule final {
   }
 
   bool has_etdump() {
+    auto lock = lock_without_gil();
     return module_->has_etdump();
   }
 
   void write_etdump_result_to_file(
       const std::string& path,
       const py::object& debug_buffer_path) {
-    if (!has_etdump()) {
+    // Getting the data resets the event tracer, which executing methods use.
+    auto lock = lock_without_gil();
+    if (!module_->has_etdump()) {
       throw std::runtime_error("No etdump found");
     }
     auto& etdump = module_->etdump();
@@ -820,6 +901,7 @@ struct PyModule final {
       PyBundledModule& m,
       const std::string method_name,
       size_t testset_idx) {
+    auto lock = lock_without_gil();
     const void* bundled_program_ptr = m.get_bundled_program_ptr();
     Error status = executorch::BUNDLED_PROGRAM_NAMESPACE::load_bundled_input(
         module_->get_method(method_name), bundled_program_ptr, testset_idx);
@@ -835,6 +917,7 @@ struct PyModule final {
       size_t testset_idx,
       double rtol = 1e-5,
       double atol = 1e-8) {
+    auto lock = lock_without_gil();
     const void* bundled_program_ptr = m.get_bundled_program_ptr();
     auto& method = module_->get_method(method_name);
     Error status = executorch::BUNDLED_PROGRAM_NAMESPACE::load_bundled_input(
@@ -843,7 +926,7 @@ struct PyModule final {
         status,
         "load_bundled_input failed with status 0x%" PRIx32,
         static_cast<uint32_t>(status));
-    py::list outputs = plan_execute(method_name);
+    py::list outputs = execute_loaded_inputs(method_name);
     status = executorch::BUNDLED_PROGRAM_NAMESPACE::verify_method_outputs(
         method, bundled_program_ptr, testset_idx, rtol, atol);
     THROW_IF_ERROR(
@@ -856,23 +939,8 @@ struct PyModule final {
   py::list plan_execute(
       const std::string method_name,
       bool clone_outputs = true) {
-    auto& method = module_->get_method(method_name);
-    // Need to pre-allocate space for outputs just like in run_method.
-    const auto num_outputs = method.outputs_size();
-    output_storages_ = make_output_storages(method);
-    std::vector<Span<uint8_t>> output_storage_spans(num_outputs);
-    for (int i = 0; i < output_storages_.size(); ++i) {
-      output_storage_spans[i] =
-          Span<uint8_t>(output_storages_[i].data(), output_storages_[i].size());
-    }
-    setup_output_storage(method, output_storage_spans);
-    auto status = method.execute();
-    THROW_IF_ERROR(
-        status,
-        "executing execution plan for method 'forward' failed with error: 0x%" PRIx32,
-        static_cast<uint32_t>(status));
-    const auto outputs = module_->get_outputs(method_name);
-    return get_outputs_as_py_list(outputs, clone_outputs);
+    auto lock = lock_without_gil();
+    return execute_loaded_inputs(method_name, clone_outputs);
   }
 
   py::list get_outputs_as_py_list(
@@ -916,26 +984,202 @@ struct PyModule final {
   }
 
   std::unique_ptr<PyMethodMeta> method_meta(const std::string method_name) {
+    auto lock = lock_without_gil();
     auto& method = module_->get_method(method_name);
     return std::make_unique<PyMethodMeta>(module_, method.method_meta());
   }
 
   std::vector<std::string> method_names() {
+    auto lock = lock_without_gil();
     return module_->method_names();
   }
 
  private:
+  // State of a method which is reused across executions, so that running it
+  // again with inputs of the same types does not allocate.
+  struct MethodState {
+    std::vector<EValue> inputs;
+    std::vector<EValue> outputs;
+    // Buffers that tensor inputs alias, which must stay alive until the method
+    // has been executed.
+    std::vector<py::buffer_info> input_buffers;
+#ifndef USE_ATEN_LIB // Portable mode
+    // So the ETensors and their metadata stay in scope for
+    // Module->execute_method.
+    std::vector<torch::executor::TensorImpl> input_tensors;
+    std::vector<std::vector<torch::executor::Tensor::SizesType>> input_sizes;
+    std::vector<std::vector<torch::executor::Tensor::StridesType>>
+        input_strides;
+    std::vector<std::vector<torch::executor::Tensor::DimOrderType>>
+        input_dim_order;
+#endif
+    // Need to keep-alive output storages until they can be compared in case of
+    // bundled programs.
+    std::vector<std::vector<uint8_t>> output_storages;
+    std::optional<std::vector<Span<uint8_t>>> output_storage_spans;
+    // Log messages of the current execution.
+    std::string log_messages;
+  };
+
   std::shared_ptr<Module> module_;
-  // Need to keep-alive output storages until they can be compared in case of
-  // bundled programs.
-  std::vector<std::vector<uint8_t>> output_storages_;
+  std::unordered_map<std::string, std::unique_ptr<MethodState>> method_states_;
+  // Held while using the module or method_states_, as the GIL is released
+  // while executing methods.
+  std::unique_ptr<std::mutex> mutex_ = std::make_unique<std::mutex>();
+
+  /// Locks mutex_. The GIL is released while waiting, since the thread
+  /// holding the lock might need it to finish.
+  std::unique_lock<std::mutex> lock_without_gil() {
+    std::unique_lock<std::mutex> lock(*mutex_, std::defer_lock);
+    if (!lock.try_lock()) {
+      py::gil_scoped_release release;
+      lock.lock();
+    }
+    return lock;
+  }
+
+  MethodState& get_method_state(const std::string& method_name) {
+    auto it = method_states_.find(method_name);
+    if (it != method_states_.end()) {
+      return *it->second;
+    }
+    const auto& method = module_->get_method(method_name);
+    auto state = std::make_unique<MethodState>();
+    // Pre-allocate space for the outputs that are not memory planned.
+    state->output_storages = make_output_storages(method);
+    state->output_storage_spans.emplace();
+    for (auto& output_storage : state->output_storages) {
+      state->output_storage_spans->emplace_back(
+          output_storage.data(), output_storage.size());
+    }
+    return *method_states_.emplace(method_name, std::move(state)).first->second;
+  }
+
+  /// Converts python objects into the EValue inputs of `state`.
+  void set_inputs(
+      const std::string& method_name,
+      const py::sequence& inputs,
+      MethodState& state) {
+    const auto inputs_size = py::len(inputs);
+    state.inputs.clear();
+    state.inputs.reserve(inputs_size);
+    state.input_buffers.clear();
+#ifndef USE_ATEN_LIB // Portable mode
+    // We store pointers to these vector elements so important to reserve so
+    // that we don't lose those on a vector resize. The inner vectors are
+    // reused to keep their capacity.
+    state.input_tensors.clear();
+    state.input_tensors.reserve(inputs_size);
+    state.input_sizes.resize(inputs_size);
+    state.input_strides.resize(inputs_size);
+    state.input_dim_order.resize(inputs_size);
+#endif
+
+    for (size_t i = 0; i < inputs_size; ++i) {
+      py::object python_input = inputs[i];
+      at::Tensor at_tensor;
+      if (THPVariable_Check(python_input.ptr())) {
+        at_tensor = THPVariable_Unpack(python_input.ptr());
+      } else if (py::isinstance<py::none>(python_input)) {
+        state.inputs.emplace_back();
+        continue;
+      } else if (py::isinstance<py::bool_>(python_input)) {
+        state.inputs.emplace_back(py::cast<bool>(python_input));
+        continue;
+      } else if (py::isinstance<py::int_>(python_input)) {
+        state.inputs.emplace_back(py::cast<int64_t>(python_input));
+        continue;
+      } else if (
+          PyObject_CheckBuffer(python_input.ptr()) &&
+          !py::isinstance<py::bytes>(python_input) &&
+          !py::isinstance<py::bytearray>(python_input)) {
+        // NumPy arrays and other typed buffers are aliased without copying.
+        // Methods may write to their inputs, so the buffer must be writable.
+        py::buffer_info info = python_input.cast<py::buffer>().request();
+        if (info.readonly) {
+          throw std::runtime_error(
+              "Input " + std::to_string(i) + " for method " + method_name +
+              " is a read-only buffer, pass a writable copy instead.");
+        }
+        state.input_buffers.push_back(std::move(info));
+        at_tensor = tensor_from_buffer(state.input_buffers.back());
+      } else {
+        const std::string type_str = py::str(python_input.get_type());
+        throw std::runtime_error(
+            "Unsupported python type " + type_str +
+            ". Ensure that inputs are passed as a flat list of tensors.");
+      }
+
+#ifdef USE_ATEN_LIB
+      state.inputs.emplace_back(at_tensor);
+#else
+      // convert at::Tensor to torch::executor::Tensor
+      auto type = torch_to_executorch_scalar_type(at_tensor.options().dtype());
+      size_t dim = at_tensor.dim();
+      // cant directly alias at::Tensor sizes and strides due to int64 vs
+      // int32 typing conflict
+      state.input_sizes[i].assign(
+          at_tensor.sizes().begin(), at_tensor.sizes().end());
+      state.input_strides[i].assign(
+          at_tensor.strides().begin(), at_tensor.strides().end());
+
+      // Only works for MemoryFormat::Contiguous or MemoryFormat::ChannelsLast
+      // inputs
+      auto& dim_order = state.input_dim_order[i];
+      dim_order.clear();
+      if (at_tensor.is_contiguous()) {
+        for (size_t cur_dim = 0; cur_dim < dim; cur_dim++) {
+          dim_order.push_back(cur_dim);
+        }
+      } else if (
+          at_tensor.is_contiguous(at::MemoryFormat::ChannelsLast) &&
+          at_tensor.dim() == 4) {
+        dim_order.assign({0, 2, 3, 1});
+      } else {
+        auto error_msg = "Input " + std::to_string(i) + "for method " +
+            method_name + " should be contiguous or channels-last.";
+        throw std::runtime_error(error_msg);
+      }
+      state.input_tensors.emplace_back(
+          type,
+          dim,
+          state.input_sizes[i].data(),
+          nullptr,
+          dim_order.data(),
+          state.input_strides[i].data());
+
+      torch::executor::Tensor temp =
+          torch::executor::Tensor(&state.input_tensors.back());
+      alias_etensor_to_attensor(at_tensor, temp);
+      state.inputs.emplace_back(temp);
+#endif
+    }
+  }
+
+  /// Executes a method whose inputs have already been set, for example from a
+  /// bundled program.
+  py::list execute_loaded_inputs(
+      const std::string& method_name,
+      bool clone_outputs = true) {
+    auto& method = module_->get_method(method_name);
+    auto& state = get_method_state(method_name);
+    LogCapture log_capture(state.log_messages);
+    setup_output_storage(method, *state.output_storage_spans);
+    auto status = method.execute();
+    THROW_IF_ERROR(
+        status,
+        "executing execution plan for method 'forward' failed with error: 0x%" PRIx32,
+        static_cast<uint32_t>(status));
+    module_->get_outputs(method_name, state.outputs);
+    return get_outputs_as_py_list(state.outputs, clone_outputs);
+  }
 
   std::vector<std::vector<uint8_t>> make_output_storages(const Method& method) {
     const auto num_outputs = method.outputs_size();
     // Create a buffer for each output tensor. Memory planned outputs and non
     // tensor outputs get an empty buffer in this list which is ignored later.
     std::vector<std::vector<uint8_t>> output_storages;
-    output_storages_.reserve(num_outputs);
+    output_storages.reserve(num_outputs);
     auto meta = method.method_meta();
     for (size_t i = 0; i < num_outputs; ++i) {
       auto output_type = meta.output_tag(i);
@@ -1004,8 +1248,9 @@ py::bool_ is_available(const std::string& backend_name) {
 
 PYBIND11_MODULE(EXECUTORCH_PYTHON_MODULE_NAME, m) {
   // Redirects cout and cerr for function calls this guards to the python env.
-  auto call_guard = py::
-      call_guard<py::scoped_ostream_redirect, py::scoped_estream_redirect>();
+  // Functions that execute methods are not guarded, as they release the GIL
+  // and can run in several threads at once, see StreamRedirect.
+  auto call_guard = py::call_guard<StreamRedirect>();
 
   // Bind the verification enum to python.
   py::enum_<Program::Verification>(m, "Verification")
@@ -1088,8 +1333,7 @@ PYBIND11_MODULE(EXECUTORCH_PYTHON_MODULE_NAME, m) {
           "plan_execute",
           &PyModule::plan_execute,
           py::arg("method_name"),
-          py::arg("clone_outputs") = true,
-          call_guard)
+          py::arg("clone_outputs") = true)
       .def(
           "method_meta",
           &PyModule::method_meta,
@@ -1101,14 +1345,12 @@ PYBIND11_MODULE(EXECUTORCH_PYTHON_MODULE_NAME, m) {
           &PyModule::run_method,
           py::arg("method_name"),
           py::arg("inputs") = py::list(),
-          py::arg("clone_outputs") = true,
-          call_guard)
+          py::arg("clone_outputs") = true)
       .def(
           "forward",
           &PyModule::forward,
           py::arg("inputs") = py::list(),
-          py::arg("clone_outputs") = true,
-          call_guard)
+          py::arg("clone_outputs") = true)
       .def("has_etdump", &PyModule::has_etdump, call_guard)
       .def(
           "write_etdump_result_to_file",
@@ -1120,14 +1362,12 @@ PYBIND11_MODULE(EXECUTORCH_PYTHON_MODULE_NAME, m) {
           "__call__",
           &PyModule::forward,
           py::arg("inputs") = py::list(),
-          py::arg("clone_outputs") = true,
-          call_guard)
+          py::arg("clone_outputs") = true)
       .def(
           "__call__",
           &PyModule::forward_single_input,
           py::arg("inputs") = py::list(),
-          py::arg("clone_outputs") = true,
-          call_guard);
+          py::arg("clone_outputs") = true);
 
   py::class_<PyBundledModule>(m, "BundledModule");
   py::class_<PyTensorInfo>(m, "TensorInfo")
@@ -1157,8 +1397,10 @@ namespace {
 
 // Our logs work by writing to stderr. By default this is done through fprintf
 // (as defined in posix.cpp) which then does not show up in python environments.
-// Here we override the pal to use std::cerr which can be properly redirected by
-// scoped_estream_redirect.
+// Here we override the pal to collect the logs of executing methods, which are
+// written to sys.stderr by LogCapture, and to use std::cerr which can be
+// properly redirected by StreamRedirect otherwise. Other threads keep using
+// fprintf so that they do not write to the redirect of the thread holding it.
 void emit_log_message(
     et_timestamp_t timestamp,
     et_pal_log_level_t level,
@@ -1167,7 +1409,14 @@ void emit_log_message(
     size_t line,
     const char* message,
     ET_UNUSED size_t length) {
-  std::cerr << "[" << filename << ":" << line << "] " << message << std::endl;
+  if (t_log_messages != nullptr) {
+    *t_log_messages += "[" + std::string(filename) + ":" +
+        std::to_string(line) + "] " + message + "\n";
+  } else if (t_streams_redirected) {
+    std::cerr << "[" << filename << ":" << line << "] " << message << std::endl;
+  } else {
+    fprintf(stderr, "[%s:%zu] %s\n", filename, line, message);
+  }
 }
 
 runtime::PalImpl build_pal() {
@@ -271,7 +271,8 @@ def make_test(  # noqa: C901
                     executorch_output = executorch_module(inputs)[0]  # noqa
                     tester.assertFalse(True)  # should be unreachable
                 except Exception:
-                    tester.assertTrue(str(out).find("The length of given input array"))
+                    # The logs of the execution are written to sys.stderr.
+                    tester.assertIn("The length of given input array", str(out))
 
         def test_quantized_ops(tester):
             eager_module = ModuleAdd()
@@ -474,6 +475,63 @@ def make_test(  # noqa: C901
             # This should raise a Python error, not hit a fatal assert in the C++ code.
             tester.assertRaises(RuntimeError, executorch_module, inputs)
 
+        def test_buffer_inputs(tester):
+            import array
+
+            import numpy as np
+
+            exported_program, inputs = create_program(ModuleAdd())
+            executorch_module = load_fn(exported_program.buffer)
+
+            # NumPy arrays and other buffers are passed without copying them.
+            y = memoryview(array.array("f", [1.0, 2.0, 3.0, 4.0])).cast("B")
+            executorch_output = executorch_module.forward(
+                (inputs[0].numpy(), y.cast("f", [2, 2]))
+            )[0]
+            tester.assertTrue(
+                torch.allclose(
+                    executorch_output,
+                    inputs[0] + torch.tensor([[1.0, 2.0], [3.0, 4.0]]),
+                )
+            )
+
+            # Inputs of the same types can run again without reallocating.
+            for i in range(3):
+                executorch_output = executorch_module.forward(
+                    (np.full((2, 2), i, dtype=np.float32), inputs[1])
+                )[0]
+                tester.assertTrue(torch.allclose(executorch_output, inputs[1] + i))
+
+            # Methods may write to their inputs, so read-only buffers and raw
+            # bytes are rejected.
+            read_only = np.ones((2, 2), dtype=np.float32)
+            read_only.flags.writeable = False
+            tester.assertRaises(
+                RuntimeError, executorch_module.forward, (read_only, inputs[1])
+            )
+            tester.assertRaises(
+                RuntimeError,
+                executorch_module.forward,
+                (inputs[0].numpy().tobytes(), inputs[1]),
+            )
+
+        def test_run_in_threads(tester):
+            from concurrent.futures import ThreadPoolExecutor
+
+            exported_program, inputs = create_program(ModuleAdd())
+            executorch_modules = [load_fn(exported_program.buffer) for _ in range(2)]
+
+            def run(i):
+                # Each module can be called from several threads at once, and
+                # the GIL is released while it executes.
+                x = torch.full((2, 2), float(i))
+                return executorch_modules[i % 2].forward((x, inputs[1]))[0]
+
+            with ThreadPoolExecutor(4) as executor:
+                outputs = list(executor.map(run, range(16)))
+            for i, output in enumerate(outputs):
+                tester.assertTrue(torch.allclose(output, inputs[1] + i))
+
         ######### RUN TEST CASES #########
         test_e2e(tester)
         test_multiple_entry(tester)
@@ -490,5 +548,7 @@ def make_test(  # noqa: C901
         test_bad_name(tester)
         test_verification_config(tester)
         test_unsupported_input_type(tester)
+        test_buffer_inputs(tester)
+        test_run_in_threads(tester)
 
     return wrapper
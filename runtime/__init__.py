@@ -39,10 +39,14 @@ Example output:
             [1., 1.]])]
 """
 
+import asyncio
 import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from types import ModuleType
-from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Set, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Sequence, Set, Union
 
 try:
     from executorch.extension.pybindings.portable_lib import (
@@ -57,15 +61,96 @@ except ModuleNotFoundError as e:
     ) from e
 
 
+# Each worker thread holds its own instance of the program's methods, so the
+# default is kept small rather than one thread per CPU.
+_DEFAULT_NUM_WORKERS = 2
+
+
+class _WorkerPool:
+    """A pool of threads executing the methods of a program.
+
+    Each thread loads its own instance of the program's methods, over the same
+    program data, so that they can execute concurrently. Only the program data
+    is shared: every instance has its own planned memory, and delegates that
+    prepare the weights when they are initialized hold one copy per thread,
+    e.g. XNNPACK repacks them for each instance. Methods execute without
+    redirecting stdout and stderr to Python, so their logs go to the process's
+    stderr.
+    """
+
+    def __init__(
+        self,
+        load_module: Callable[[], ExecuTorchModule],
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self._load_module = load_module
+        self._max_workers = max_workers or min(
+            _DEFAULT_NUM_WORKERS, os.cpu_count() or 1
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def _module(self) -> ExecuTorchModule:
+        module = getattr(self._local, "module", None)
+        if module is None:
+            module = self._local.module = self._load_module()
+        return module
+
+    def _run_method(self, method_name: str, inputs: Sequence[Any]) -> Sequence[Any]:
+        return self._module().run_method(method_name, inputs)
+
+    def submit(
+        self, method_name: str, inputs: Sequence[Any]
+    ) -> "Future[Sequence[Any]]":
+        """Schedules the execution of a method on one of the threads.
+
+        Args:
+            method_name: The name of the method to execute.
+            inputs: The inputs to the method.
+
+        Returns:
+            A future for the outputs of the method.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot execute methods of a closed program.")
+            # Threads are only started once the pool is used.
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self._max_workers, thread_name_prefix="executorch_worker"
+                )
+            return self._executor.submit(self._run_method, method_name, inputs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the threads, which frees their instances of the methods.
+
+        Args:
+            wait: Whether to wait for the scheduled executions to finish.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
 class Method:
     """An ExecuTorch method, loaded from a Program.
     This can be used to execute the method with inputs.
     """
 
-    def __init__(self, method_name: str, module: ExecuTorchModule) -> None:
+    def __init__(
+        self,
+        method_name: str,
+        module: ExecuTorchModule,
+        worker_pool: Optional[_WorkerPool] = None,
+    ) -> None:
         # TODO: This class should be pybind to the C++ counterpart instead of hosting ExecuTorchModule.
         self._method_name = method_name
         self._module = module
+        self._worker_pool = worker_pool
 
     def execute(self, inputs: Sequence[Any]) -> Sequence[Any]:
         """Executes the method with the given inputs.
@@ -78,6 +163,44 @@ class Method:
         """
         return self._module.run_method(self._method_name, inputs)
 
+    def execute_batch(self, inputs: Sequence[Sequence[Any]]) -> List[Sequence[Any]]:
+        """Executes the method on each of the given sets of inputs.
+
+        The executions are spread over the worker threads of the program, each
+        with its own instance of the method.
+
+        Args:
+            inputs: The sets of inputs to execute the method with.
+
+        Returns:
+            The outputs of the method for each set of inputs, in the same order.
+        """
+        if self._worker_pool is None:
+            return [self.execute(method_inputs) for method_inputs in inputs]
+        futures = [
+            self._worker_pool.submit(self._method_name, method_inputs)
+            for method_inputs in inputs
+        ]
+        return [future.result() for future in futures]
+
+    async def execute_async(self, inputs: Sequence[Any]) -> Sequence[Any]:
+        """Executes the method with the given inputs on a worker thread, without
+        blocking the event loop.
+
+        Args:
+            inputs: The inputs to the method.
+
+        Returns:
+            The outputs of the method.
+        """
+        if self._worker_pool is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.execute, inputs
+            )
+        return await asyncio.wrap_future(
+            self._worker_pool.submit(self._method_name, inputs)
+        )
+
     @property
     def metadata(self) -> MethodMeta:
         """Gets the metadata for the method.
@@ -94,17 +217,41 @@ class Program:
     This can be used to load the methods/models defined by the program.
     """
 
-    def __init__(self, module: ExecuTorchModule, data: Optional[bytes]) -> None:
+    def __init__(
+        self,
+        module: ExecuTorchModule,
+        data: Optional[bytes],
+        *,
+        load_module: Optional[Callable[[], ExecuTorchModule]] = None,
+        num_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            module: The loaded program.
+            data: The program data that `module` was loaded from, if any.
+            load_module: Loads another instance of the program over the same
+                data, for the worker threads of Method.execute_batch() and
+                Method.execute_async(). Without it, these execute the methods
+                of `module` one at a time.
+            num_workers: The number of worker threads. Defaults to 2, or
+                fewer on machines with fewer CPUs. Each thread holds its own
+                instance of the methods, see close().
+        """
         # Hold the data so the program is not freed.
         self._data = data
         self._module = module
+        self._worker_pool: Optional[_WorkerPool] = (
+            _WorkerPool(load_module, num_workers) if load_module is not None else None
+        )
         self._methods: Dict[str, Method] = {}
         # ExecuTorchModule already pre-loads all Methods when created, so this
         # doesn't do any extra work. TODO: Don't load a given Method until
         # load_method() is called. Create a separate Method instance each time,
         # to allow multiple independent instances of the same model.
         for method_name in self._module.method_names():
-            self._methods[method_name] = Method(method_name, self._module)
+            self._methods[method_name] = Method(
+                method_name, self._module, self._worker_pool
+            )
 
     @property
     def method_names(self) -> Set[str]:
@@ -124,6 +271,21 @@ class Program:
         """
         return self._methods.get(name, None)
 
+    def close(self) -> None:
+        """Stops the worker threads of Method.execute_batch() and
+        Method.execute_async(), once their scheduled executions finish, and
+        frees their instances of the methods. Method.execute() can still be
+        used afterwards, but the other execution methods raise.
+        """
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+
+    def __enter__(self) -> "Program":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
 
 class BackendRegistry:
     """The registry of backends that are available to the runtime."""
@@ -188,24 +350,39 @@ class Runtime:
         data: Union[bytes, bytearray, BinaryIO, Path, str],
         *,
         verification: Verification = Verification.InternalConsistency,
+        num_workers: Optional[int] = None,
     ) -> Program:
         """Loads an ExecuTorch program from a PTE binary.
 
         Args:
             data: The binary program data to load; typically PTE data.
             verification: level of program verification to perform.
+            num_workers: The number of threads used by Method.execute_batch()
+                and Method.execute_async(). Defaults to 2, or fewer on machines
+                with fewer CPUs. Each thread loads its own instance of the
+                methods; call Program.close() to free them.
 
         Returns:
             The loaded program.
         """
         if isinstance(data, (Path, str)):
-            m = self._legacy_module._load_for_executorch(
-                str(data),
-                enable_etdump=False,
-                debug_buffer_size=0,
-                program_verification=verification,
+            path = str(data)
+
+            def load_module_from_file() -> ExecuTorchModule:
+                # Programs loaded from the same file share its memory mapping.
+                return self._legacy_module._load_for_executorch(
+                    path,
+                    enable_etdump=False,
+                    debug_buffer_size=0,
+                    program_verification=verification,
+                )
+
+            return Program(
+                load_module_from_file(),
+                data=None,
+                load_module=load_module_from_file,
+                num_workers=num_workers,
             )
-            return Program(m, data=None)
         elif isinstance(data, BinaryIO):
             data_bytes = data.read()
         elif isinstance(data, bytearray):
@@ -216,11 +393,20 @@ class Runtime:
             raise TypeError(
                 f"Expected data to be bytes, bytearray, a path to a .pte file, or a file-like object, but got {type(data).__name__}."
             )
-        m = self._legacy_module._load_for_executorch_from_buffer(
-            data_bytes,
-            enable_etdump=False,
-            debug_buffer_size=0,
-            program_verification=verification,
-        )
 
-        return Program(m, data=data_bytes)
+        def load_module_from_buffer() -> ExecuTorchModule:
+            # The program data is not copied, so it is shared by all the
+            # programs loaded from it.
+            return self._legacy_module._load_for_executorch_from_buffer(
+                data_bytes,
+                enable_etdump=False,
+                debug_buffer_size=0,
+                program_verification=verification,
+            )
+
+        return Program(
+            load_module_from_buffer(),
+            data=data_bytes,
+            load_module=load_module_from_buffer,
+            num_workers=num_workers,
+        )
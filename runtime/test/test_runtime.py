@@ -4,6 +4,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import asyncio
 import tempfile
 import unittest
 from pathlib import Path
@@ -76,3 +77,50 @@ class RuntimeTest(unittest.TestCase):
             with open(f.name, "rb") as f:
                 program = runtime.load_program(f.read())
                 test_add(program)
+
+    def test_execute_batch(self):
+        ep, inputs = create_program(ModuleAdd())
+        runtime = Runtime.get()
+        program = runtime.load_program(
+            ep.buffer, verification=Verification.Minimal, num_workers=2
+        )
+        method = program.load_method("forward")
+        batch = [(inputs[0] * i, inputs[1]) for i in range(8)]
+        outputs = method.execute_batch(batch)
+        self.assertEqual(len(outputs), len(batch))
+        for method_inputs, method_outputs in zip(batch, outputs):
+            self.assertTrue(
+                torch.allclose(method_outputs[0], method_inputs[0] + method_inputs[1])
+            )
+
+    def test_execute_async(self):
+        ep, inputs = create_program(ModuleAdd())
+        runtime = Runtime.get()
+        program = runtime.load_program(ep.buffer, verification=Verification.Minimal)
+        method = program.load_method("forward")
+
+        async def execute_all():
+            return await asyncio.gather(
+                *(method.execute_async((inputs[0] * i, inputs[1])) for i in range(4))
+            )
+
+        outputs = asyncio.run(execute_all())
+        for i, method_outputs in enumerate(outputs):
+            self.assertTrue(
+                torch.allclose(method_outputs[0], inputs[0] * i + inputs[1])
+            )
+
+    def test_close(self):
+        ep, inputs = create_program(ModuleAdd())
+        runtime = Runtime.get()
+        with runtime.load_program(
+            ep.buffer, verification=Verification.Minimal
+        ) as program:
+            method = program.load_method("forward")
+            outputs = method.execute_batch([inputs])
+            self.assertTrue(torch.allclose(outputs[0][0], inputs[0] + inputs[1]))
+        with self.assertRaises(RuntimeError):
+            method.execute_batch([inputs])
+        # Executing on the calling thread does not need the worker threads.
+        outputs = method.execute(inputs)
+        self.assertTrue(torch.allclose(outputs[0], inputs[0] + inputs[1]))